@@ -37,6 +37,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from dotenv import load_dotenv
 
+from bollinger.services.bb_calculator import rolling_percentile_rank
+
 load_dotenv()
 
 # Configure logging
@@ -208,8 +210,8 @@ class HistoricalBBBackfill:
         df['bandwidth'] = ((df['upper_band'] - df['lower_band']) / df['middle_band']) * 100
         
         # Calculate bandwidth percentile over 126-day rolling window
-        df['bandwidth_percentile'] = df['bandwidth'].rolling(window=126, min_periods=20).apply(
-            lambda x: (x.values < x.values[-1]).sum() / len(x) * 100 if len(x) > 0 else 50
+        df['bandwidth_percentile'] = rolling_percentile_rank(
+            df['bandwidth'].to_numpy(dtype=float), 126, min_periods=20
         )
         
         # Detect squeeze (bottom 10% of bandwidth)
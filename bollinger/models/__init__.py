@@ -1,6 +1,6 @@
 """Data models for Bollinger Bands system."""
 from .bb_models import (
-    BBConfig, BollingerBands, BBResult, BBRating,
+    BBConfig, BollingerBands, BBHistory, BBResult, BBRating,
     BB_PRESETS, get_letter_grade, BBZone, TrendDirection, VolatilityState
 )
 from .signal_models import (
@@ -15,7 +15,7 @@ from .scan_models import (
 
 __all__ = [
     # BB Models
-    'BBConfig', 'BollingerBands', 'BBResult', 'BBRating',
+    'BBConfig', 'BollingerBands', 'BBHistory', 'BBResult', 'BBRating',
     'BB_PRESETS', 'get_letter_grade', 'BBZone', 'TrendDirection', 'VolatilityState',
     # Signal Models
     'SignalType', 'PatternType', 'BBSignal', 'SignalConfidence',
@@ -4,11 +4,15 @@ Core Bollinger Bands Data Models
 Defines dataclasses for BB calculations, configurations, and results.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Union
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
 
 @dataclass
 class BBConfig:
@@ -89,6 +93,76 @@ class BollingerBands:
             return "oversold"
 
 
+class BBHistory(Sequence):
+    """
+    Columnar BB time series (most recent first).
+    
+    Holds one NumPy array per BollingerBands field and only builds
+    BollingerBands objects for the elements that are accessed. Behaves
+    like the list it replaces: len(), indexing, slicing (returns a
+    BBHistory view) and iteration. Use the column attributes
+    (e.g. ``history.percent_b[:5]``) for vectorized work.
+    """
+    
+    COLUMNS = ("close", "upper", "middle", "lower",
+               "percent_b", "bandwidth", "bandwidth_percentile")
+    
+    def __init__(self, dates: np.ndarray, close: np.ndarray, upper: np.ndarray,
+                 middle: np.ndarray, lower: np.ndarray, percent_b: np.ndarray,
+                 bandwidth: np.ndarray, bandwidth_percentile: np.ndarray):
+        self.dates = dates  # datetime64[D]
+        self.close = close
+        self.upper = upper
+        self.middle = middle
+        self.lower = lower
+        self.percent_b = percent_b
+        self.bandwidth = bandwidth
+        self.bandwidth_percentile = bandwidth_percentile
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "BBHistory":
+        """
+        Build from a chronological frame with date, close, bb_upper,
+        bb_middle, bb_lower, percent_b, bandwidth, bandwidth_percentile.
+        """
+        rev = slice(None, None, -1)
+        return cls(
+            dates=pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[D]")[rev],
+            close=df["close"].to_numpy(dtype=float)[rev],
+            upper=df["bb_upper"].to_numpy(dtype=float)[rev],
+            middle=df["bb_middle"].to_numpy(dtype=float)[rev],
+            lower=df["bb_lower"].to_numpy(dtype=float)[rev],
+            percent_b=df["percent_b"].to_numpy(dtype=float)[rev],
+            bandwidth=df["bandwidth"].to_numpy(dtype=float)[rev],
+            bandwidth_percentile=df["bandwidth_percentile"].to_numpy(dtype=float)[rev],
+        )
+    
+    def _columns(self) -> List[np.ndarray]:
+        return [getattr(self, name) for name in self.COLUMNS]
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return BBHistory(self.dates[index], *[col[index] for col in self._columns()])
+        return BollingerBands(self.dates[index].item(),
+                              *[float(col[index]) for col in self._columns()])
+    
+    def __iter__(self) -> Iterator[BollingerBands]:
+        for values in zip(self.dates.tolist(), *[col.tolist() for col in self._columns()]):
+            yield BollingerBands(*values)
+    
+    def __repr__(self) -> str:
+        return f"BBHistory({len(self)} rows)"
+    
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with one column per field (most recent first)."""
+        data = {"date": self.dates}
+        data.update({name: getattr(self, name) for name in self.COLUMNS})
+        return pd.DataFrame(data)
+
+
 @dataclass
 class BBResult:
     """
@@ -103,8 +177,8 @@ class BBResult:
     # Latest values
     current: Optional[BollingerBands] = None
     
-    # Time series (most recent first)
-    history: List[BollingerBands] = field(default_factory=list)
+    # Time series (most recent first); BBCalculator returns a columnar BBHistory
+    history: Union[BBHistory, List[BollingerBands]] = field(default_factory=list)
     
     # Summary statistics
     avg_bandwidth: float = 0.0
@@ -10,7 +10,7 @@ from datetime import date
 from typing import Dict, List, Optional, Tuple
 
 from ..models.bb_models import (
-    BBConfig, BollingerBands, BBResult, BB_PRESETS
+    BBConfig, BollingerBands, BBHistory, BBResult, BB_PRESETS
 )
 
 
@@ -135,23 +135,9 @@ class BBCalculator:
         # BandWidth as percentage
         df["bandwidth"] = ((df["bb_upper"] - df["bb_lower"]) / df["bb_middle"]) * 100
         
-        # Calculate rolling percentile of bandwidth
-        def rolling_percentile(series, value, window):
-            """Calculate what percentile the current value is in the rolling window."""
-            result = []
-            for i in range(len(series)):
-                if i < window - 1:
-                    result.append(50.0)  # Default to 50 if not enough data
-                else:
-                    window_data = series.iloc[i - window + 1:i + 1]
-                    current = series.iloc[i]
-                    percentile = (window_data < current).sum() / len(window_data) * 100
-                    result.append(percentile)
-            return result
-        
-        df["bandwidth_percentile"] = rolling_percentile(
-            df["bandwidth"], df["bandwidth"], lookback
-        )
+        # Rolling percentile of bandwidth (50 until a full window is available)
+        percentile = rolling_percentile_rank(df["bandwidth"].to_numpy(dtype=float), lookback)
+        df["bandwidth_percentile"] = np.where(np.isnan(percentile), 50.0, percentile)
         
         return df
     
@@ -163,20 +149,8 @@ class BBCalculator:
         if valid_df.empty:
             return BBResult.failure(symbol, "No valid BB values calculated", self.config)
         
-        # Build history list (most recent first)
-        history = []
-        for _, row in valid_df.iloc[::-1].iterrows():
-            bb = BollingerBands(
-                date=row["date"].date() if hasattr(row["date"], "date") else row["date"],
-                close=row["close"],
-                upper=row["bb_upper"],
-                middle=row["bb_middle"],
-                lower=row["bb_lower"],
-                percent_b=row["percent_b"],
-                bandwidth=row["bandwidth"],
-                bandwidth_percentile=row["bandwidth_percentile"]
-            )
-            history.append(bb)
+        # Columnar history (most recent first)
+        history = BBHistory.from_frame(valid_df)
         
         # Calculate summary statistics
         bw_series = valid_df["bandwidth"]
@@ -189,8 +163,8 @@ class BBCalculator:
         return BBResult(
             symbol=symbol,
             config=self.config,
-            calculation_date=history[0].date if history else date.today(),
-            current=history[0] if history else None,
+            calculation_date=history.dates[0].item(),
+            current=history[0],
             history=history,
             avg_bandwidth=bw_series.mean(),
             min_bandwidth=bw_series.min(),
@@ -275,6 +249,47 @@ class BBCalculator:
         return results
 
 
+def rolling_percentile_rank(values: np.ndarray, window: int,
+                            min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Percent of each trailing window that is strictly below its last value.
+    
+    Vectorized with a strided (n x window) view instead of a Python loop
+    per row. Windows are truncated at the start of the series; NaNs count
+    towards the window length but are never "below", matching
+    ``rolling(window).apply(lambda x: (x < x[-1]).sum() / len(x) * 100)``.
+    
+    Args:
+        values: Series values in chronological order
+        window: Window length
+        min_periods: Minimum non-NaN values for a result. None requires a
+            full window (like the BBCalculator default).
+    
+    Returns:
+        Percentiles (0-100), NaN where there is not enough data
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    result = np.full(n, np.nan)
+    if n == 0 or window <= 0:
+        return result
+    
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    below = (windows < values[:, None]).sum(axis=1)
+    length = np.minimum(np.arange(1, n + 1), window)
+    
+    if min_periods is None:
+        ready = length >= window
+    else:
+        observed = np.cumsum(~np.isnan(values))
+        in_window = observed - np.concatenate([np.zeros(window, dtype=int), observed[:-window]])[:n]
+        ready = in_window >= min_periods
+    
+    result[ready] = below[ready] / length[ready] * 100
+    return result
+
+
 def calculate_bb_from_series(closes: pd.Series, 
                               period: int = 20,
                               std_dev: float = 2.0) -> Tuple[pd.Series, pd.Series, pd.Series]:
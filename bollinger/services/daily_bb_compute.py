@@ -5,17 +5,19 @@ Runs after market close to precompute BB indicators for all stocks.
 Stores results in database for fast scanning and analysis.
 """
 
+import math
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Callable
 from dataclasses import dataclass
 
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam
 from sqlalchemy.engine import Engine
 
-from ..models.bb_models import BBConfig, BollingerBands, BB_PRESETS
+from ..models.bb_models import BBConfig, BollingerBands, BBHistory, BB_PRESETS
 from ..models.scan_models import SqueezeScanResult, TrendScanResult
 from ..services.bb_calculator import BBCalculator
 from ..services.squeeze_detector import SqueezeDetector
@@ -24,6 +26,36 @@ from ..services.trend_analyzer import TrendAnalyzer
 logger = logging.getLogger(__name__)
 
 
+# Columns written to stock_bollinger_daily, in insert order
+DAILY_COLUMNS = [
+    'symbol', 'trade_date', 'close', 'upper_band', 'middle_band', 'lower_band',
+    'percent_b', 'bandwidth', 'bandwidth_percentile', 'is_squeeze', 'is_bulge',
+    'squeeze_days', 'trend', 'trend_strength', 'trend_days', 'sma_20',
+    'distance_from_middle',
+]
+
+
+def _compute_chunk(chunk: List[Tuple[str, pd.DataFrame]],
+                   trade_date: date,
+                   config: BBConfig) -> List[Tuple[str, Optional[Dict], Optional[str]]]:
+    """
+    Worker: BB, squeeze and trend derivations for a chunk of symbols.
+    
+    Module-level so it can run in a ProcessPoolExecutor.
+    
+    Returns:
+        List of (symbol, row or None, error or None)
+    """
+    calculator = BBCalculator(config)
+    out = []
+    for symbol, df in chunk:
+        try:
+            out.append((symbol, DailyBBCompute._compute_symbol(calculator, symbol, df, trade_date), None))
+        except Exception as e:
+            out.append((symbol, None, str(e)))
+    return out
+
+
 @dataclass
 class ComputeStats:
     """Statistics from a compute run."""
@@ -49,13 +81,11 @@ class DailyBBCompute:
     
     Workflow:
     1. Get list of active symbols from nse_equity_bhavcopy_full
-    2. For each symbol, fetch OHLC history (last 252 trading days)
-    3. Calculate BB indicators (standard, tight, wide presets)
-    4. Store daily BB values in stock_bollinger_daily
-    5. Detect squeeze/bulge states
-    6. Classify trends
-    7. Generate and store signals
-    8. Update scan cache for fast queries
+    2. Load close history for all symbols in one range query (last 252 trading days each)
+    3. Calculate BB indicators, squeeze and trend state per symbol,
+       fanned out over a process pool in symbol chunks when workers > 1
+    4. Upsert all daily BB values into stock_bollinger_daily in one transaction
+    5. Update scan cache for fast queries
     """
     
     # Default BB configurations to compute
@@ -68,7 +98,9 @@ class DailyBBCompute:
     def __init__(self, 
                  engine: Engine,
                  lookback_days: int = 252,
-                 progress_callback: Optional[Callable[[int, int, str], None]] = None):
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 workers: int = 1,
+                 chunk_size: int = 100):
         """
         Initialize the daily compute service.
         
@@ -76,10 +108,16 @@ class DailyBBCompute:
             engine: SQLAlchemy engine for database connection
             lookback_days: Days of history to fetch for calculations
             progress_callback: Optional callback(current, total, message) for progress updates
+            workers: Worker processes for the derivations (default 1 =
+                compute in-process, safe inside the GUI; batch/CLI runs
+                opt in, e.g. os.cpu_count())
+            chunk_size: Symbols per worker task
         """
         self.engine = engine
         self.lookback_days = lookback_days
         self.progress_callback = progress_callback
+        self.workers = workers
+        self.chunk_size = chunk_size
         
         self.calculator = BBCalculator()
         self.squeeze_detector = SqueezeDetector()
@@ -87,17 +125,22 @@ class DailyBBCompute:
     
     def run(self, 
             trade_date: Optional[date] = None,
-            symbols: Optional[List[str]] = None) -> ComputeStats:
+            symbols: Optional[List[str]] = None,
+            workers: Optional[int] = None) -> ComputeStats:
         """
         Run the daily BB computation.
         
         Args:
             trade_date: Date to compute for (default: latest available)
             symbols: Optional list of symbols to process (default: all active)
+            workers: Override the worker process count for this run
             
         Returns:
             ComputeStats with results
         """
+        if workers is not None:
+            self.workers = workers
+        
         start_time = datetime.now()
         stats = ComputeStats()
         
@@ -113,6 +156,7 @@ class DailyBBCompute:
             self._update_progress(0, 100, f"Starting computation for {trade_date}")
             
             # Get symbols to process
+            explicit_symbols = symbols is not None
             if symbols is None:
                 symbols = self._get_active_symbols(trade_date)
             
@@ -123,40 +167,35 @@ class DailyBBCompute:
             total = len(symbols)
             logger.info(f"Processing {total} symbols")
             
-            # Process each symbol
-            batch_data = []
-            for i, symbol in enumerate(symbols):
-                try:
-                    result = self._process_symbol(symbol, trade_date)
-                    if result:
-                        batch_data.append(result)
-                        stats.symbols_processed += 1
-                        
-                        # Track states
-                        if result.get('is_squeeze'):
-                            stats.squeeze_count += 1
-                        if result.get('is_bulge'):
-                            stats.bulge_count += 1
-                        if result.get('trend') == 'uptrend':
-                            stats.uptrend_count += 1
-                        elif result.get('trend') == 'downtrend':
-                            stats.downtrend_count += 1
-                    else:
-                        stats.symbols_failed += 1
-                        
-                except Exception as e:
-                    stats.symbols_failed += 1
-                    stats.errors.append(f"{symbol}: {str(e)}")
-                    logger.error(f"Error processing {symbol}: {e}")
-                
-                # Progress update every 10 symbols
-                if (i + 1) % 10 == 0:
-                    pct = int((i + 1) / total * 100)
-                    self._update_progress(pct, 100, f"Processed {i+1}/{total} symbols")
+            # One range query for every symbol's history
+            self._update_progress(5, 100, f"Loading price history for {total} symbols")
+            frames = self._fetch_ohlc_bulk(trade_date, symbols if explicit_symbols else None)
             
-            # Bulk insert results
+            # Derivations, fanned out over symbol chunks
+            batch_data, errors = self.compute_symbols(
+                [(symbol, frames.get(symbol)) for symbol in symbols], trade_date
+            )
+            for symbol, error in errors:
+                stats.errors.append(f"{symbol}: {error}")
+                logger.error(f"Error processing {symbol}: {error}")
+            
+            stats.symbols_processed = len(batch_data)
+            stats.symbols_failed = len(errors)
+            for result in batch_data:
+                # Track states
+                if result.get('is_squeeze'):
+                    stats.squeeze_count += 1
+                if result.get('is_bulge'):
+                    stats.bulge_count += 1
+                if result.get('trend') == 'uptrend':
+                    stats.uptrend_count += 1
+                elif result.get('trend') == 'downtrend':
+                    stats.downtrend_count += 1
+            
+            # Single bulk upsert
             if batch_data:
-                stats.records_inserted = self._bulk_insert(batch_data, trade_date)
+                self._update_progress(95, 100, f"Saving {len(batch_data)} rows")
+                stats.records_inserted = self._bulk_upsert(batch_data)
             
             # Update scan cache
             self._update_scan_cache(trade_date, stats)
@@ -196,6 +235,52 @@ class DailyBBCompute:
             result = conn.execute(text(query), {"trade_date": trade_date})
             return [row[0] for row in result]
     
+    def compute_symbols(self,
+                        items: List[Tuple[str, pd.DataFrame]],
+                        trade_date: date) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+        """
+        Run the BB/squeeze/trend derivations for many symbols.
+        
+        Chunks are sent to a process pool when workers > 1 and there is
+        more than one chunk; otherwise they run in-process.
+        
+        Args:
+            items: (symbol, OHLC DataFrame) pairs
+            trade_date: Date being computed
+            
+        Returns:
+            (rows for stock_bollinger_daily, [(symbol, error)])
+        """
+        config = self.BB_CONFIGS[0][1]  # Standard 20,2
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        total = len(items)
+        rows, errors = [], []
+        done = 0
+        
+        def collect(results):
+            nonlocal done
+            for symbol, row, error in results:
+                if row:
+                    rows.append(row)
+                elif error:
+                    errors.append((symbol, error))
+            done += len(results)
+            pct = 10 + int(done / total * 80) if total else 90
+            self._update_progress(pct, 100, f"Processed {done}/{total} symbols")
+        
+        if self.workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                collect(_compute_chunk(chunk, trade_date, config))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as ex:
+                futures = [ex.submit(_compute_chunk, chunk, trade_date, config) for chunk in chunks]
+                for fut in as_completed(futures):
+                    collect(fut.result())
+        
+        # Deterministic output order regardless of completion order
+        rows.sort(key=lambda r: r['symbol'])
+        return rows, errors
+    
     def _process_symbol(self, symbol: str, trade_date: date) -> Optional[Dict]:
         """
         Process a single symbol: fetch OHLC, calculate BB, detect states.
@@ -205,16 +290,26 @@ class DailyBBCompute:
         # Fetch OHLC history
         df = self._fetch_ohlc(symbol, trade_date)
         
+        self.calculator.config = self.BB_CONFIGS[0][1]  # Standard 20,2
+        return self._compute_symbol(self.calculator, symbol, df, trade_date)
+    
+    @classmethod
+    def _compute_symbol(cls, calculator: BBCalculator, symbol: str,
+                        df: Optional[pd.DataFrame], trade_date: date) -> Optional[Dict]:
+        """
+        Calculate BB and detect squeeze/trend states from a symbol's history.
+        
+        Returns dict with all computed values or None if insufficient data.
+        """
         if df is None or len(df) < 30:  # Need at least 30 days for BB
             return None
         
         # Add symbol column for calculator
+        df = df.copy()
         df['symbol'] = symbol
         
         # Calculate BB using the calculate() method
-        config = self.BB_CONFIGS[0][1]  # Standard 20,2
-        self.calculator.config = config
-        bb_result = self.calculator.calculate(df, bandwidth_lookback=126)
+        bb_result = calculator.calculate(df, bandwidth_lookback=126)
         
         if not bb_result.success or not bb_result.current:
             return None
@@ -229,9 +324,11 @@ class DailyBBCompute:
         is_squeeze = bw_percentile <= 10  # Bottom 10%
         is_bulge = bw_percentile >= 90    # Top 10%
         
+        history = bb_result.history
+        
         # Classify trend based on %b using history
-        if bb_result.history and len(bb_result.history) >= 5:
-            recent_pb = [bb.percent_b for bb in bb_result.history[:5]]  # Most recent 5
+        if len(history) >= 5:
+            recent_pb = history.percent_b[:5].tolist()  # Most recent 5
             avg_pb = sum(recent_pb) / len(recent_pb)
             
             if avg_pb > 0.7:
@@ -248,8 +345,8 @@ class DailyBBCompute:
             trend_strength = 50.0
         
         # Count consecutive days in current state using history
-        squeeze_days = self._count_consecutive_state_from_history(bb_result.history, lambda bb: bb.bandwidth_percentile <= 10) if is_squeeze else 0
-        trend_days = self._count_consecutive_trend_from_history(bb_result.history, trend)
+        squeeze_days = cls._count_leading(history.bandwidth_percentile <= 10) if is_squeeze else 0
+        trend_days = cls._count_consecutive_trend_from_history(history, trend)
         
         return {
             'symbol': symbol,
@@ -272,43 +369,29 @@ class DailyBBCompute:
             'distance_from_middle': ((latest.close - latest.middle) / latest.middle) * 100 if latest.middle else 0,
         }
     
-    def _count_consecutive_state_from_history(self, history: List, condition: Callable) -> int:
-        """Count consecutive days from history where condition is True."""
-        if not history:
-            return 0
-        count = 0
-        for bb in history:  # History is most recent first
-            if condition(bb):
-                count += 1
-            else:
-                break
-        return count
+    @staticmethod
+    def _count_leading(mask: np.ndarray) -> int:
+        """Length of the run of True values at the start of mask (most recent first)."""
+        misses = np.flatnonzero(~mask)
+        return int(misses[0]) if len(misses) else len(mask)
     
-    def _count_consecutive_trend_from_history(self, history: List, current_trend: str) -> int:
-        """Count consecutive days in the same trend."""
-        if not history or len(history) < 5:
+    @classmethod
+    def _count_consecutive_trend_from_history(cls, history: BBHistory, current_trend: str) -> int:
+        """Count consecutive days in the same trend (5-day average %b, most recent first)."""
+        if len(history) < 5:
             return 0
         
-        count = 0
         window = 5
+        avg_pb = np.convolve(history.percent_b, np.ones(window) / window, mode='valid')
         
-        for i in range(0, len(history) - window + 1):
-            recent_pb = [bb.percent_b for bb in history[i:i+window]]
-            avg_pb = sum(recent_pb) / len(recent_pb)
-            
-            if avg_pb > 0.7:
-                trend = 'uptrend'
-            elif avg_pb < 0.3:
-                trend = 'downtrend'
-            else:
-                trend = 'neutral'
-            
-            if trend == current_trend:
-                count += 1
-            else:
-                break
+        if current_trend == 'uptrend':
+            in_trend = avg_pb > 0.7
+        elif current_trend == 'downtrend':
+            in_trend = avg_pb < 0.3
+        else:
+            in_trend = ~(avg_pb > 0.7) & ~(avg_pb < 0.3)
         
-        return count
+        return cls._count_leading(in_trend)
     
     def _fetch_ohlc(self, symbol: str, end_date: date) -> Optional[pd.DataFrame]:
         """Fetch OHLC history for a symbol from Yahoo Finance data."""
@@ -335,6 +418,50 @@ class DailyBBCompute:
         # Limit to lookback_days
         return df.tail(self.lookback_days)
     
+    def _fetch_ohlc_bulk(self, end_date: date,
+                         symbols: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch close history for many symbols with one range query.
+        
+        Args:
+            end_date: Last date of history
+            symbols: Restrict to these symbols (default: every symbol in range)
+            
+        Returns:
+            Dict of symbol -> DataFrame(date, close), last lookback_days rows each
+        """
+        start_date = end_date - timedelta(days=self.lookback_days * 2)  # Extra buffer for non-trading days
+        
+        query = """
+            SELECT symbol, date, close
+            FROM yfinance_daily_quotes
+            WHERE date BETWEEN :start_date AND :end_date
+        """
+        params = {'start_date': start_date, 'end_date': end_date}
+        stmt = text(query)
+        if symbols is not None:
+            stmt = text(query + " AND symbol IN :symbols").bindparams(
+                bindparam('symbols', expanding=True)
+            )
+            params['symbols'] = list(symbols)
+        
+        with self.engine.connect() as conn:
+            df = pd.read_sql(stmt, conn, params=params)
+        
+        return self._group_history(df, self.lookback_days)
+    
+    @staticmethod
+    def _group_history(df: pd.DataFrame, lookback_days: int) -> Dict[str, pd.DataFrame]:
+        """Split a long (symbol, date, close) frame into per-symbol tails."""
+        if df.empty:
+            return {}
+        
+        df = df.sort_values(['symbol', 'date'], kind='stable')
+        return {
+            symbol: group.drop(columns='symbol').tail(lookback_days).reset_index(drop=True)
+            for symbol, group in df.groupby('symbol', sort=False)
+        }
+    
     def _count_consecutive_state(self, bb_series: List[BollingerBands], 
                                    condition: Callable[[BollingerBands], bool]) -> int:
         """Count consecutive days matching a condition from most recent."""
@@ -360,32 +487,42 @@ class DailyBBCompute:
                 break
         return count
     
-    def _bulk_insert(self, data: List[Dict], trade_date: date) -> int:
-        """Bulk insert/update BB data into database."""
+    def _bulk_upsert(self, data: List[Dict], chunk_size: int = 1000) -> int:
+        """
+        Upsert BB rows into stock_bollinger_daily in one transaction.
+        
+        Only the given symbols are touched, so a partial run (explicit
+        symbol list) leaves the other rows for the date in place.
+        """
         if not data:
             return 0
         
-        df = pd.DataFrame(data)
+        updates = ", ".join(f"{col} = VALUES({col})" for col in DAILY_COLUMNS[2:])
+        query = text(f"""
+            INSERT INTO stock_bollinger_daily ({", ".join(DAILY_COLUMNS)})
+            VALUES ({", ".join(':' + col for col in DAILY_COLUMNS)})
+            ON DUPLICATE KEY UPDATE {updates}
+        """)
+        
+        rows = [
+            {col: self._to_db_value(row.get(col)) for col in DAILY_COLUMNS}
+            for row in data
+        ]
         
-        # Use INSERT ... ON DUPLICATE KEY UPDATE for upsert
         with self.engine.begin() as conn:
-            # Delete existing data for this date (simpler than upsert for bulk)
-            conn.execute(
-                text("DELETE FROM stock_bollinger_daily WHERE trade_date = :td"),
-                {"td": trade_date}
-            )
-            
-            # Insert new data
-            df.to_sql(
-                'stock_bollinger_daily',
-                conn,
-                if_exists='append',
-                index=False,
-                method='multi',
-                chunksize=500
-            )
+            for i in range(0, len(rows), chunk_size):
+                conn.execute(query, rows[i:i + chunk_size])
         
-        return len(data)
+        return len(rows)
+    
+    @staticmethod
+    def _to_db_value(value):
+        """NumPy scalars to Python, NaN to NULL."""
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
     
     def _update_scan_cache(self, trade_date: date, stats: ComputeStats):
         """Update scan cache tables for fast lookups."""
@@ -542,8 +679,13 @@ def create_bb_tables(engine: Engine) -> bool:
 
 
 # Convenience function for running from command line
-def run_daily_compute():
-    """Run daily BB computation with database connection from environment."""
+def run_daily_compute(workers: Optional[int] = None):
+    """
+    Run daily BB computation with database connection from environment.
+    
+    Args:
+        workers: Worker processes (default: CPU count)
+    """
     import os
     from dotenv import load_dotenv
     
@@ -569,7 +711,8 @@ def run_daily_compute():
     # Run computation
     compute = DailyBBCompute(
         engine,
-        progress_callback=lambda c, t, m: print(f"[{c}%] {m}")
+        progress_callback=lambda c, t, m: print(f"[{c}%] {m}"),
+        workers=workers or os.cpu_count() or 1
     )
     
     stats = compute.run()
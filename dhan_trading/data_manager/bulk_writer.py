@@ -0,0 +1,205 @@
+"""
+Bulk OHLCV Writer
+=================
+Columnar bulk upserts for the historical downloader.
+
+Rows are built straight from DataFrame columns (no iterrows) and written
+with executemany, which PyMySQL folds into multi-row
+INSERT ... VALUES (...), (...) ON DUPLICATE KEY UPDATE statements.
+
+BulkWriter decouples those writes from the HTTP download threads: downloads
+submit frames to a bounded queue (blocking when the database falls behind)
+and a writer thread coalesces queued frames into large batches per table.
+"""
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UpsertTable:
+    """Target table of a bulk upsert: insert columns and columns refreshed on duplicate key."""
+    name: str
+    columns: Tuple[str, ...]
+    update_columns: Tuple[str, ...]
+
+    @property
+    def sql(self) -> str:
+        cols = ', '.join(self.columns)
+        placeholders = ', '.join(['%s'] * len(self.columns))
+        updates = ', '.join(f"{c} = VALUES({c})" for c in self.update_columns)
+        return f"INSERT INTO {self.name} ({cols}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {updates}"
+
+
+DAILY_OHLCV = UpsertTable(
+    'dhan_daily_ohlcv',
+    ('symbol', 'trade_date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'),
+    ('open_price', 'high_price', 'low_price', 'close_price', 'volume'),
+)
+
+MINUTE_OHLCV = UpsertTable(
+    'dhan_minute_ohlcv',
+    ('symbol', 'security_id', 'trade_datetime', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'),
+    ('open_price', 'high_price', 'low_price', 'close_price', 'volume'),
+)
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    """Column as an object array of Python scalars with NaN/NaT as None."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = np.array(series.dt.to_pydatetime(), dtype=object)
+    else:
+        values = series.to_numpy(dtype=object)
+    missing = series.isna().to_numpy()
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def frame_rows(df: pd.DataFrame, columns: Tuple[str, ...]) -> List[tuple]:
+    """Parameter tuples for executemany, built column by column."""
+    return list(zip(*(_column_values(df[c]) for c in columns)))
+
+
+def write_rows(engine, table: UpsertTable, rows: List[tuple], chunk_size: int = 10000) -> int:
+    """Upsert parameter tuples in executemany chunks inside one transaction."""
+    if not rows:
+        return 0
+    with engine.begin() as conn:
+        for i in range(0, len(rows), chunk_size):
+            conn.exec_driver_sql(table.sql, rows[i:i + chunk_size])
+    return len(rows)
+
+
+def write_frame(engine, table: UpsertTable, df: pd.DataFrame, chunk_size: int = 10000,
+                on_written: Optional[Callable[[], None]] = None) -> int:
+    """Upsert a DataFrame holding table.columns; on_written runs once it is committed."""
+    written = write_rows(engine, table, frame_rows(df, table.columns), chunk_size) if not df.empty else 0
+    if on_written is not None:
+        on_written()
+    return written
+
+
+class BulkWriter:
+    """
+    Background writer fed through a bounded queue.
+
+    submit() converts a frame to rows in the calling (download) thread and
+    blocks while the queue is full. The writer thread drains whatever is
+    queued, up to batch_rows per table, and writes each table's rows with
+    one executemany transaction, then runs the frames' on_written callbacks.
+    Write errors are logged and counted and passed to the failed frames'
+    on_failed callbacks instead; they do not stop the writer.
+
+    Usage:
+        with BulkWriter(engine) as writer:
+            writer.submit(MINUTE_OHLCV, df)
+    """
+
+    _STOP = object()
+
+    def __init__(self, engine, max_queue: int = 64, batch_rows: int = 100000, chunk_size: int = 10000):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            max_queue: Frames that may wait for the writer before submit() blocks
+            batch_rows: Rows coalesced into one write per table
+            chunk_size: Rows per executemany call
+        """
+        self.engine = engine
+        self.batch_rows = batch_rows
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self.rows_failed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'BulkWriter':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='bulk-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, table: UpsertTable, df: pd.DataFrame, on_written: Optional[Callable[[], None]] = None,
+               on_failed: Optional[Callable[[Exception], None]] = None):
+        """Queue a frame for upsert (blocks while the queue is full)."""
+        if df.empty:
+            if on_written is not None:
+                on_written()
+            return
+        self._queue.put((table, frame_rows(df, table.columns), on_written, on_failed))
+
+    def flush(self):
+        """Wait until every submitted frame has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write everything queued and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> 'BulkWriter':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            taken = 1
+            batches: Dict[UpsertTable, List[tuple]] = {}
+            callbacks: Dict[UpsertTable, List[tuple]] = {}
+
+            # Coalesce whatever is already queued
+            while True:
+                if item is self._STOP:
+                    stop = True
+                else:
+                    table, rows, on_written, on_failed = item
+                    batches.setdefault(table, []).extend(rows)
+                    callbacks.setdefault(table, []).append((on_written, on_failed))
+                if stop or sum(len(r) for r in batches.values()) >= self.batch_rows:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                    taken += 1
+                except queue.Empty:
+                    break
+
+            for table, rows in batches.items():
+                try:
+                    self.rows_written += write_rows(self.engine, table, rows, self.chunk_size)
+                except Exception as e:
+                    self.rows_failed += len(rows)
+                    logger.error(f"Bulk write of {len(rows):,} rows to {table.name} failed: {e}")
+                    self._run_callbacks(table, [(on_failed, e) for _, on_failed in callbacks[table]])
+                    continue
+                self._run_callbacks(table, [(on_written, None) for on_written, _ in callbacks[table]])
+
+            for _ in range(taken):
+                self._queue.task_done()
+
+    @staticmethod
+    def _run_callbacks(table: UpsertTable, calls: List[tuple]):
+        for callback, error in calls:
+            if callback is None:
+                continue
+            try:
+                if error is None:
+                    callback()
+                else:
+                    callback(error)
+            except Exception as e:
+                logger.error(f"Post-write callback for {table.name} failed: {e}")
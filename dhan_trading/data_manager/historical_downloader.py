@@ -15,24 +15,34 @@ Daily data: 20 years = 7300 days = ~5200 trading days (need ~3 requests per stoc
 
 Optimizations:
 - Multi-threaded parallel downloads (configurable workers)
-- Bulk database inserts via temp tables
-- Thread-safe rate limiting
+- Columnar executemany upserts, written by a background BulkWriter fed
+  through a bounded queue so downloads never wait on individual inserts
+- Shared adaptive rate limiter (token bucket at Dhan's Data API limit, AIMD
+  backoff on 429) with priority lanes: gap-fill ahead of deep backfill
+- Resumable intraday backfill via per-chunk checkpoints
 """
 import os
 import sys
-import time
 import logging
 import requests
 import threading
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
-from typing import Optional, Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Optional, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from sqlalchemy import create_engine, text
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
-from queue import Queue
+
+from dhan_trading.config import DATA_DIR
+from dhan_trading.data_manager.bulk_writer import BulkWriter, DAILY_OHLCV, MINUTE_OHLCV, write_frame
+from dhan_trading.data_manager.request_scheduler import (
+    AdaptiveRateLimiter, ChunkCheckpoints, chunk_window,
+    PRIORITY_BACKFILL, PRIORITY_GAP_FILL, PRIORITY_NORMAL,
+)
 
 load_dotenv()
 
@@ -51,20 +61,69 @@ class DownloadProgress:
     status: str = "idle"  # idle, running, paused, completed, error
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
     
-    def increment_completed(self, candles: int = 0):
-        """Thread-safe increment of completed count."""
+    def increment_completed(self, candles: int = 0) -> int:
+        """Thread-safe increment of completed count; returns stocks finished so far."""
         with self._lock:
             self.completed_stocks += 1
             self.total_candles += candles
+            return self.completed_stocks + self.failed_stocks
     
-    def increment_failed(self):
-        """Thread-safe increment of failed count."""
+    def increment_failed(self, candles: int = 0) -> int:
+        """Thread-safe increment of failed count; returns stocks finished so far."""
         with self._lock:
             self.failed_stocks += 1
+            self.total_candles += candles
+            return self.completed_stocks + self.failed_stocks
+
+
+class SymbolWrites:
+    """
+    Frames one symbol's download hands to the writer, reported once committed.
+    
+    on_done(rows, error) runs exactly once, after the download has finished
+    (close()) and every tracked frame has been written or has failed, on
+    whichever thread settles last. rows counts committed rows only; error is
+    the first download or write error, or None.
+    """
+    
+    def __init__(self, on_done: Callable[[int, Optional[Exception]], None]):
+        self._on_done = on_done
+        self._lock = threading.Lock()
+        self._pending = 1  # the download itself, settled by close()
+        self.rows = 0
+        self.error: Optional[Exception] = None
+    
+    def track(self, rows: int, on_written=None):
+        """(on_written, on_failed) callbacks settling one frame of `rows` rows."""
+        with self._lock:
+            self._pending += 1
+        
+        def written():
+            try:
+                if on_written is not None:
+                    on_written()
+            finally:
+                self._settle(rows)
+        
+        return written, partial(self._settle, 0)
+    
+    def close(self, error: Optional[Exception] = None):
+        """Mark the download finished (error if it raised)."""
+        self._settle(0, error)
+    
+    def _settle(self, rows: int, error: Optional[Exception] = None):
+        with self._lock:
+            self.rows += rows
+            if self.error is None:
+                self.error = error
+            self._pending -= 1
+            done = self._pending == 0
+        if done:
+            self._on_done(self.rows, self.error)
 
 
 class DhanHistoricalAPI:
-    """Dhan Historical Data API Client with thread-safe rate limiting."""
+    """Dhan Historical Data API Client with shared adaptive rate limiting."""
     
     BASE_URL = "https://api.dhan.co/v2"
     
@@ -77,10 +136,10 @@ class DhanHistoricalAPI:
         'IDX_I': 'IDX_I',  # Indices
     }
     
-    # Class-level rate limiting (shared across all instances)
-    _rate_lock = threading.Lock()
-    _last_request_time = 0
-    _request_delay = 0.25  # 250ms = 4 requests/sec (safe limit)
+    # Class-level limiter shared by all instances and threads.
+    # Dhan Data APIs allow 5 requests/second.
+    limiter = AdaptiveRateLimiter(rate=float(os.getenv('DHAN_DATA_API_RATE', '5')))
+    MAX_RETRIES = 5
     
     def __init__(self):
         """Initialize API client."""
@@ -105,13 +164,24 @@ class DhanHistoricalAPI:
             })
         return self._local.session
     
-    def _rate_limit(self):
-        """Thread-safe rate limiting."""
-        with DhanHistoricalAPI._rate_lock:
-            elapsed = time.time() - DhanHistoricalAPI._last_request_time
-            if elapsed < DhanHistoricalAPI._request_delay:
-                time.sleep(DhanHistoricalAPI._request_delay - elapsed)
-            DhanHistoricalAPI._last_request_time = time.time()
+    def _post(self, url: str, payload: dict, priority: int) -> requests.Response:
+        """
+        POST through the shared limiter, retrying on HTTP 429.
+        
+        A 429 cuts the shared rate and pauses every caller for the cooldown;
+        the request is then queued again. The last response is returned if
+        retries run out.
+        """
+        for attempt in range(self.MAX_RETRIES):
+            self.limiter.acquire(priority)
+            response = self.session.post(url, json=payload, timeout=30)
+            if response.status_code != 429:
+                self.limiter.succeeded()
+                return response
+            cooldown = self.limiter.throttled()
+            logger.warning(f"Rate limited - backing off {cooldown:.1f}s "
+                           f"(rate now {self.limiter.rate:.2f}/s, attempt {attempt + 1})")
+        return response
     
     def get_historical_data(
         self,
@@ -120,7 +190,8 @@ class DhanHistoricalAPI:
         instrument: str,
         from_date: str,
         to_date: str,
-        interval: str = "day"
+        interval: str = "day",
+        priority: int = PRIORITY_NORMAL
     ) -> Optional[pd.DataFrame]:
         """
         Fetch historical OHLCV data.
@@ -132,12 +203,12 @@ class DhanHistoricalAPI:
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
             interval: 1m, 5m, 15m, 25m, 60m, day
+            priority: Scheduling lane (PRIORITY_GAP_FILL / _NORMAL / _BACKFILL)
         
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
+            (empty if the API had no candles for the range), None on errors
         """
-        self._rate_limit()
-        
         url = f"{self.BASE_URL}/charts/historical"
         
         payload = {
@@ -150,7 +221,7 @@ class DhanHistoricalAPI:
         }
         
         try:
-            response = self.session.post(url, json=payload, timeout=30)
+            response = self._post(url, payload, priority)
             
             if response.status_code == 200:
                 data = response.json()
@@ -169,17 +240,13 @@ class DhanHistoricalAPI:
                     if not df.empty:
                         # Convert timestamp to datetime
                         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-                        return df
+                    return df
                     
-                return None
+                return pd.DataFrame()
                 
             elif response.status_code == 401:
                 logger.error("Authentication failed - check access token")
                 raise ValueError("Invalid access token")
-            elif response.status_code == 429:
-                logger.warning("Rate limited - waiting 60s")
-                time.sleep(60)
-                return self.get_historical_data(security_id, exchange_segment, instrument, from_date, to_date, interval)
             else:
                 logger.warning(f"API returned {response.status_code}: {response.text[:200]}")
                 return None
@@ -198,7 +265,8 @@ class DhanHistoricalAPI:
         instrument: str,
         from_date: str,
         to_date: str,
-        interval: str = "1"  # 1 minute
+        interval: str = "1",  # 1 minute
+        priority: int = PRIORITY_NORMAL
     ) -> Optional[pd.DataFrame]:
         """
         Fetch intraday OHLCV data.
@@ -210,12 +278,12 @@ class DhanHistoricalAPI:
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
             interval: 1, 5, 15, 25, 60 (minutes)
+            priority: Scheduling lane (PRIORITY_GAP_FILL / _NORMAL / _BACKFILL)
         
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
+            (empty if the API had no candles for the range), None on errors
         """
-        self._rate_limit()
-        
         url = f"{self.BASE_URL}/charts/intraday"
         
         payload = {
@@ -228,7 +296,7 @@ class DhanHistoricalAPI:
         }
         
         try:
-            response = self.session.post(url, json=payload, timeout=30)
+            response = self._post(url, payload, priority)
             
             if response.status_code == 200:
                 data = response.json()
@@ -245,9 +313,9 @@ class DhanHistoricalAPI:
                     
                     if not df.empty:
                         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-                        return df
+                    return df
                 
-                return None
+                return pd.DataFrame()
             else:
                 logger.warning(f"Intraday API returned {response.status_code}: {response.text[:200]}")
                 return None
@@ -265,6 +333,12 @@ class HistoricalDownloader:
         self.api = DhanHistoricalAPI()
         self.engine = self._get_engine()
         self.progress = DownloadProgress()
+        # Set while a download_all_* run is writing through the bulk writer
+        self._writer: Optional[BulkWriter] = None
+        # Completed intraday backfill windows (resume point across runs)
+        self.checkpoints = ChunkCheckpoints(DATA_DIR / 'intraday_checkpoints.jsonl')
+        # SymbolWrites of the download running on each thread
+        self._local = threading.local()
     
     def _get_engine(self):
         """Create database engine."""
@@ -275,6 +349,65 @@ class HistoricalDownloader:
         db = os.getenv("MYSQL_DB", "dhan_trading")
         return create_engine(f"mysql+pymysql://{user}:{pw}@{host}:{port}/{db}")
     
+    @contextmanager
+    def bulk_writes(self, log_cb=None, **writer_kwargs):
+        """
+        Route upserts through a background BulkWriter for the duration of the block.
+        
+        Everything submitted is written before the block exits.
+        """
+        if self._writer is not None:
+            yield self._writer
+            return
+        
+        writer = BulkWriter(self.engine, **writer_kwargs)
+        self._writer = writer.start()
+        try:
+            yield writer
+        finally:
+            self._writer = None
+            writer.close()
+            if log_cb:
+                log_cb(f"   Rows written: {writer.rows_written:,}" +
+                       (f", failed: {writer.rows_failed:,}" if writer.rows_failed else ""))
+    
+    @contextmanager
+    def symbol_writes(self, on_done: Callable[[int, Optional[Exception]], None]):
+        """
+        Track the frames this thread writes inside the block as one symbol.
+        
+        on_done(rows, error) reports the symbol once they are committed (see
+        SymbolWrites). An exception raised in the block is reported through
+        on_done rather than propagated.
+        """
+        writes = SymbolWrites(on_done)
+        self._local.writes = writes
+        error = None
+        try:
+            yield writes
+        except Exception as e:
+            error = e
+        finally:
+            self._local.writes = None
+            writes.close(error)
+    
+    def _write(self, table, df: pd.DataFrame, on_written=None):
+        """Queue df to the running bulk writer, or upsert it right away."""
+        writes = getattr(self._local, 'writes', None)
+        on_failed = None
+        if writes is not None:
+            on_written, on_failed = writes.track(len(df), on_written)
+        
+        if self._writer is not None:
+            self._writer.submit(table, df, on_written, on_failed)
+            return
+        try:
+            write_frame(self.engine, table, df, on_written=on_written)
+        except Exception as e:
+            if on_failed is not None:
+                on_failed(e)
+            raise
+    
     def get_stocks_to_download(self) -> pd.DataFrame:
         """Get list of stocks that need historical data download."""
         query = """
@@ -458,32 +591,12 @@ class HistoricalDownloader:
                 total_saved += len(df_insert)
             
             current_start = current_end + timedelta(days=1)
-            time.sleep(0.1)  # Small delay between chunks
         
         return total_saved
     
     def _upsert_daily_data(self, df: pd.DataFrame):
         """Insert or update daily OHLCV data."""
-        with self.engine.begin() as conn:
-            for _, row in df.iterrows():
-                conn.execute(text("""
-                    INSERT INTO dhan_daily_ohlcv (symbol, trade_date, open_price, high_price, low_price, close_price, volume)
-                    VALUES (:symbol, :trade_date, :open_price, :high_price, :low_price, :close_price, :volume)
-                    ON DUPLICATE KEY UPDATE
-                        open_price = VALUES(open_price),
-                        high_price = VALUES(high_price),
-                        low_price = VALUES(low_price),
-                        close_price = VALUES(close_price),
-                        volume = VALUES(volume)
-                """), {
-                    'symbol': row['symbol'],
-                    'trade_date': row['trade_date'],
-                    'open_price': float(row['open_price']) if pd.notna(row['open_price']) else None,
-                    'high_price': float(row['high_price']) if pd.notna(row['high_price']) else None,
-                    'low_price': float(row['low_price']) if pd.notna(row['low_price']) else None,
-                    'close_price': float(row['close_price']) if pd.notna(row['close_price']) else None,
-                    'volume': int(row['volume']) if pd.notna(row['volume']) else None,
-                })
+        self._write(DAILY_OHLCV, df)
     
     def download_all_daily(self, years: int = 20, max_workers: int = 3, log_cb=None):
         """
@@ -511,41 +624,42 @@ class HistoricalDownloader:
         self.progress.failed_stocks = 0
         self.progress.status = "running"
         
-        for idx, row in stocks.iterrows():
-            symbol = row['symbol']
-            security_id = int(row['security_id'])
-            # Use default NSE_EQ and EQUITY for all stocks
-            exchange_segment = 'NSE_EQ'
-            instrument = 'EQUITY'
-            
-            self.progress.current_symbol = symbol
-            
-            try:
-                saved = self.download_daily_data(
-                    symbol=symbol,
-                    security_id=security_id,
-                    exchange_segment=exchange_segment,
-                    instrument=instrument,
-                    years=years,
-                    log_cb=log_cb
-                )
-                
-                self.progress.total_candles += saved
-                self.progress.completed_stocks += 1
-                
+        def report(symbol, saved, error):
+            """Runs once the symbol's rows are committed (or failed)."""
+            if error is not None:
+                finished = self.progress.increment_failed(saved)
+                log_cb(f"✗ {symbol}: {error}")
+            else:
+                finished = self.progress.increment_completed(saved)
                 if saved > 0:
                     log_cb(f"✓ {symbol}: {saved} daily records")
                 else:
                     log_cb(f"○ {symbol}: no new data")
-                
-            except Exception as e:
-                self.progress.failed_stocks += 1
-                log_cb(f"✗ {symbol}: {e}")
-            
+
             # Progress update
-            if self.progress.completed_stocks % 10 == 0:
-                pct = self.progress.completed_stocks / self.progress.total_stocks * 100
-                log_cb(f"Progress: {self.progress.completed_stocks}/{self.progress.total_stocks} ({pct:.1f}%)")
+            if finished % 10 == 0:
+                pct = finished / self.progress.total_stocks * 100
+                log_cb(f"Progress: {finished}/{self.progress.total_stocks} ({pct:.1f}%)")
+
+        with self.bulk_writes(log_cb):
+            for idx, row in stocks.iterrows():
+                symbol = row['symbol']
+                security_id = int(row['security_id'])
+                # Use default NSE_EQ and EQUITY for all stocks
+                exchange_segment = 'NSE_EQ'
+                instrument = 'EQUITY'
+
+                self.progress.current_symbol = symbol
+
+                with self.symbol_writes(partial(report, symbol)):
+                    self.download_daily_data(
+                        symbol=symbol,
+                        security_id=security_id,
+                        exchange_segment=exchange_segment,
+                        instrument=instrument,
+                        years=years,
+                        log_cb=log_cb
+                    )
         
         self.progress.status = "completed"
         log_cb(f"\n✅ Daily download complete!")
@@ -613,7 +727,8 @@ class HistoricalDownloader:
         end_date = datetime.now()
         earliest_date = end_date - timedelta(days=years * 365)
         
-        # Part 1: Download new data (from last_date to now) if we have existing data
+        # Part 1: Download new data (from last_date to now) if we have existing data.
+        # This is the gap-fill lane, served ahead of any queued backfill.
         if last_date and last_date.date() < end_date.date():
             new_start = last_date + timedelta(days=1)
             
@@ -628,110 +743,86 @@ class HistoricalDownloader:
                     instrument=instrument,
                     from_date=current_start.strftime('%Y-%m-%d'),
                     to_date=current_end.strftime('%Y-%m-%d'),
-                    interval="1"
+                    interval="1",
+                    priority=PRIORITY_GAP_FILL
                 )
                 
                 if df is not None and not df.empty:
-                    df['symbol'] = symbol
-                    df['security_id'] = security_id
-                    df.rename(columns={
-                        'timestamp': 'trade_datetime',
-                        'open': 'open_price',
-                        'high': 'high_price',
-                        'low': 'low_price',
-                        'close': 'close_price'
-                    }, inplace=True)
-                    
-                    self._upsert_intraday_data(df)
+                    self._upsert_intraday_data(self._prepare_intraday(df, symbol, security_id))
                     total_saved += len(df)
                 
                 current_start = current_end + timedelta(days=1)
-                time.sleep(0.1)  # Small delay between chunks
         
         # Part 2: Download historical data (going back from first_date or from now if no data)
         if first_date:
             # We already have some data, go backwards from our earliest point
-            historical_end = first_date - timedelta(days=1)
+            historical_end = (first_date - timedelta(days=1)).date()
         else:
             # No data yet, start from today and go back
-            historical_end = end_date
-        
-        # Download backwards in chunks until we reach earliest_date
-        current_end = historical_end
-        while current_end.date() > earliest_date.date():
-            current_start = max(current_end - timedelta(days=chunk_days - 1), earliest_date)
+            historical_end = end_date.date()
+        earliest = earliest_date.date()
+        
+        # Go backwards through fixed calendar windows so completed windows are
+        # recognised on the next run. Each window is checkpointed with the
+        # range requested for it once its rows are committed, and only skipped
+        # when that range covers this run's request (a larger 'years' reaches
+        # further into a window clamped before); an empty window means we are
+        # before the listing date.
+        window_start, window_end = chunk_window(historical_end, chunk_days)
+        while window_end >= earliest:
+            request_from = max(window_start, earliest)
+            request_to = min(window_end, historical_end)
+            saved = self.checkpoints.get(symbol, '1m', window_start, request_from, request_to)
             
-            df = self.api.get_intraday_data(
-                security_id=security_id,
-                exchange_segment=exchange_segment,
-                instrument=instrument,
-                from_date=current_start.strftime('%Y-%m-%d'),
-                to_date=current_end.strftime('%Y-%m-%d'),
-                interval="1"
-            )
-            
-            if df is not None and not df.empty:
-                df['symbol'] = symbol
-                df['security_id'] = security_id
-                df.rename(columns={
-                    'timestamp': 'trade_datetime',
-                    'open': 'open_price',
-                    'high': 'high_price',
-                    'low': 'low_price',
-                    'close': 'close_price'
-                }, inplace=True)
+            if saved is None:
+                df = self.api.get_intraday_data(
+                    security_id=security_id,
+                    exchange_segment=exchange_segment,
+                    instrument=instrument,
+                    from_date=request_from.strftime('%Y-%m-%d'),
+                    to_date=request_to.strftime('%Y-%m-%d'),
+                    interval="1",
+                    priority=PRIORITY_BACKFILL
+                )
+                if df is None:
+                    # Request failed; leave the window for the next run
+                    break
                 
-                self._upsert_intraday_data(df)
-                total_saved += len(df)
-            else:
+                saved = len(df)
+                mark = lambda start=window_start, rows=saved, lo=request_from, hi=request_to: (
+                    self.checkpoints.mark(symbol, '1m', start, rows, lo, hi))
+                if saved:
+                    self._upsert_intraday_data(self._prepare_intraday(df, symbol, security_id), on_written=mark)
+                    total_saved += saved
+                else:
+                    mark()
+            
+            if not saved:
                 # No more historical data available, stop going back
                 break
             
-            current_end = current_start - timedelta(days=1)
-            time.sleep(0.1)  # Small delay between chunks
+            window_start, window_end = chunk_window(window_start - timedelta(days=1), chunk_days)
         
         return total_saved
     
-    def _upsert_intraday_data(self, df: pd.DataFrame):
-        """Upsert intraday data to database."""
+    @staticmethod
+    def _prepare_intraday(df: pd.DataFrame, symbol: str, security_id: int) -> pd.DataFrame:
+        """API candles -> dhan_minute_ohlcv columns."""
+        df['symbol'] = symbol
+        df['security_id'] = security_id
+        return df.rename(columns={
+            'timestamp': 'trade_datetime',
+            'open': 'open_price',
+            'high': 'high_price',
+            'low': 'low_price',
+            'close': 'close_price'
+        })
+    
+    def _upsert_intraday_data(self, df: pd.DataFrame, on_written=None):
+        """Upsert intraday data to database (on_written runs once it is committed)."""
         if df.empty:
             return
-        
-        with self.engine.begin() as conn:
-            # Create temp table
-            conn.execute(text("DROP TEMPORARY TABLE IF EXISTS tmp_intraday"))
-            conn.execute(text("""
-                CREATE TEMPORARY TABLE tmp_intraday (
-                    symbol VARCHAR(50),
-                    security_id BIGINT,
-                    trade_datetime DATETIME,
-                    open_price DECIMAL(15,4),
-                    high_price DECIMAL(15,4),
-                    low_price DECIMAL(15,4),
-                    close_price DECIMAL(15,4),
-                    volume BIGINT
-                )
-            """))
-            
-            # Bulk insert to temp table
-            df_insert = df[['symbol', 'security_id', 'trade_datetime', 
-                           'open_price', 'high_price', 'low_price', 'close_price', 'volume']].copy()
-            df_insert.to_sql('tmp_intraday', conn, if_exists='append', index=False, method='multi', chunksize=5000)
-            
-            # Upsert to main table
-            conn.execute(text("""
-                INSERT INTO dhan_minute_ohlcv (symbol, security_id, trade_datetime, 
-                    open_price, high_price, low_price, close_price, volume)
-                SELECT symbol, security_id, trade_datetime,
-                    open_price, high_price, low_price, close_price, volume
-                FROM tmp_intraday
-                ON DUPLICATE KEY UPDATE
-                    open_price = VALUES(open_price),
-                    high_price = VALUES(high_price),
-                    low_price = VALUES(low_price),
-                    close_price = VALUES(close_price),
-                    volume = VALUES(volume)
-            """))
+        self._write(MINUTE_OHLCV, df, on_written)
     
     def download_all_intraday(self, days: int = 90, max_workers: int = 4, log_cb=None):
         """
@@ -762,44 +853,40 @@ class HistoricalDownloader:
         # Convert to list of tuples for processing
         stock_list = [(row['symbol'], int(row['security_id'])) for _, row in stocks.iterrows()]
         
+        def report(symbol, saved, error):
+            """Runs once the symbol's rows are committed (or failed)."""
+            if error is not None:
+                finished = self.progress.increment_failed(saved)
+                log_cb(f"[FAIL] {symbol}: {error}")
+            else:
+                finished = self.progress.increment_completed(saved)
+                if saved > 0:
+                    log_cb(f"[OK] {symbol}: {saved:,} 1-min records")
+                else:
+                    log_cb(f"[SKIP] {symbol}: no new data")
+
+            # Progress update every 10 stocks
+            if finished % 10 == 0:
+                pct = finished / self.progress.total_stocks * 100
+                log_cb(f"Progress: {finished}/{self.progress.total_stocks} ({pct:.1f}%) - {self.progress.total_candles:,} total records")
+        
         def download_stock(args):
             """Worker function to download a single stock."""
             symbol, security_id = args
-            try:
-                saved = self.download_intraday_fast(
+            with self.symbol_writes(partial(report, symbol)):
+                self.download_intraday_fast(
                     symbol=symbol,
                     security_id=security_id,
                     days=days,
                     log_cb=None  # Suppress per-stock logging in parallel mode
                 )
-                return (symbol, saved, None)
-            except Exception as e:
-                return (symbol, 0, str(e))
-        
-        # Process stocks in parallel
-        completed = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            futures = {executor.submit(download_stock, stock): stock for stock in stock_list}
-            
-            for future in as_completed(futures):
-                symbol, saved, error = future.result()
-                completed += 1
-                
-                if error:
-                    self.progress.increment_failed()
-                    log_cb(f"[FAIL] {symbol}: {error}")
-                else:
-                    self.progress.increment_completed(saved)
-                    if saved > 0:
-                        log_cb(f"[OK] {symbol}: {saved:,} 1-min records")
-                    else:
-                        log_cb(f"[SKIP] {symbol}: no new data")
-                
-                # Progress update every 10 stocks
-                if completed % 10 == 0:
-                    pct = completed / self.progress.total_stocks * 100
-                    log_cb(f"Progress: {completed}/{self.progress.total_stocks} ({pct:.1f}%) - {self.progress.total_candles:,} total records")
+        
+        # Process stocks in parallel; each stock is reported from the writer
+        # once its rows are committed
+        with self.bulk_writes(log_cb):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for stock in stock_list:
+                    executor.submit(download_stock, stock)
         
         self.progress.status = "completed"
         log_cb(f"\n[DONE] Intraday download complete!")
@@ -865,38 +952,33 @@ class HistoricalDownloader:
             instrument=instrument,
             from_date=start_date.strftime('%Y-%m-%d'),
             to_date=end_date.strftime('%Y-%m-%d'),
-            interval="1"
+            interval="1",
+            priority=PRIORITY_GAP_FILL
         )
         
         if df is None or df.empty:
             return 0
         
         # Prepare data
-        df['symbol'] = symbol
-        df['security_id'] = security_id
-        df.rename(columns={
-            'timestamp': 'trade_datetime',
-            'open': 'open_price',
-            'high': 'high_price',
-            'low': 'low_price',
-            'close': 'close_price'
-        }, inplace=True)
+        df = self._prepare_intraday(df, symbol, security_id)
         
         # Upsert to database (handles duplicates)
         self._upsert_intraday_data(df)
         return len(df)
     
-    def download_all_intraday_full(self, years: int = 5, chunk_days: int = 90, max_workers: int = 4, log_cb=None):
+    def download_all_intraday_full(self, years: int = 5, chunk_days: int = 90, max_workers: int = 8, log_cb=None):
         """
         Download 1-minute intraday data for all stocks using parallel threads.
         
         Dhan API supports up to 5 years of intraday data, fetched in 90-day chunks.
-        Uses multi-threading to download multiple stocks in parallel.
+        Uses multi-threading to download multiple stocks in parallel. Requests are
+        paced only by the shared rate limiter, so keep enough workers in flight to
+        cover request latency at the allowed rate.
         
         Args:
             years: Number of years of data (max 5 per Dhan API)
             chunk_days: Days per API request (max 90 per Dhan API)
-            max_workers: Number of parallel download threads (default 4)
+            max_workers: Number of parallel download threads (default 8)
             log_cb: Logging callback
         """
         if log_cb is None:
@@ -916,46 +998,44 @@ class HistoricalDownloader:
         # Convert to list of tuples for processing
         stock_list = [(row['symbol'], int(row['security_id'])) for _, row in stocks.iterrows()]
         
+        def report(symbol, saved, error):
+            """Runs once the symbol's rows are committed (or failed)."""
+            if error is not None:
+                finished = self.progress.increment_failed(saved)
+                log_cb(f"[FAIL] {symbol}: {error}")
+            else:
+                finished = self.progress.increment_completed(saved)
+                if saved > 0:
+                    log_cb(f"[OK] {symbol}: {saved:,} 1-min records")
+                else:
+                    log_cb(f"[SKIP] {symbol}: no new data")
+
+            # Progress update every 10 stocks
+            if finished % 10 == 0:
+                pct = finished / self.progress.total_stocks * 100
+                log_cb(f"Progress: {finished}/{self.progress.total_stocks} ({pct:.1f}%) - {self.progress.total_candles:,} total records")
+        
         def download_stock(args):
             """Worker function to download a single stock."""
             symbol, security_id = args
-            try:
-                saved = self.download_intraday_data(
+            with self.symbol_writes(partial(report, symbol)):
+                self.download_intraday_data(
                     symbol=symbol,
                     security_id=security_id,
                     years=years,
                     chunk_days=chunk_days,
                     log_cb=None  # Suppress per-stock logging in parallel mode
                 )
-                return (symbol, saved, None)
-            except Exception as e:
-                return (symbol, 0, str(e))
-        
-        # Process stocks in parallel
-        completed = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            futures = {executor.submit(download_stock, stock): stock for stock in stock_list}
-            
-            for future in as_completed(futures):
-                symbol, saved, error = future.result()
-                completed += 1
-                
-                if error:
-                    self.progress.increment_failed()
-                    log_cb(f"[FAIL] {symbol}: {error}")
-                else:
-                    self.progress.increment_completed(saved)
-                    if saved > 0:
-                        log_cb(f"[OK] {symbol}: {saved:,} 1-min records")
-                    else:
-                        log_cb(f"[SKIP] {symbol}: no new data")
-                
-                # Progress update every 10 stocks
-                if completed % 10 == 0:
-                    pct = completed / self.progress.total_stocks * 100
-                    log_cb(f"Progress: {completed}/{self.progress.total_stocks} ({pct:.1f}%) - {self.progress.total_candles:,} total records")
         
+        # Process stocks in parallel; each stock is reported from the writer
+        # once its rows are committed
+        with self.bulk_writes(log_cb):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for stock in stock_list:
+                    executor.submit(download_stock, stock)
+        
+        # Drop checkpoint lines superseded during this run
+        self.checkpoints.compact()
         self.progress.status = "completed"
         log_cb(f"\n[DONE] Intraday download complete!")
         log_cb(f"   Stocks: {self.progress.completed_stocks} completed, {self.progress.failed_stocks} failed")
@@ -977,38 +1057,41 @@ class HistoricalDownloader:
         self.progress = DownloadProgress()
         self.progress.total_stocks = len(stocks)
         
-        for idx, row in stocks.iterrows():
-            symbol = row['symbol']
-            security_id = int(row['security_id'])
-            
-            self.progress.current_symbol = symbol
-            
-            try:
-                saved = self.download_intraday_data(
-                    symbol=symbol,
-                    security_id=security_id,
-                    years=years,
-                    chunk_days=chunk_days,
-                    log_cb=log_cb
-                )
-                
-                self.progress.total_candles += saved
-                self.progress.completed_stocks += 1
-                
+        def report(symbol, saved, error):
+            """Runs once the symbol's rows are committed (or failed)."""
+            if error is not None:
+                finished = self.progress.increment_failed(saved)
+                log_cb(f"[FAIL] {symbol}: {error}")
+            else:
+                finished = self.progress.increment_completed(saved)
                 if saved > 0:
                     log_cb(f"[OK] {symbol}: {saved} 1-min records")
                 else:
                     log_cb(f"[SKIP] {symbol}: no new data")
-                
-            except Exception as e:
-                self.progress.failed_stocks += 1
-                log_cb(f"[FAIL] {symbol}: {e}")
-            
+
             # Progress update
-            if self.progress.completed_stocks % 10 == 0:
-                pct = self.progress.completed_stocks / self.progress.total_stocks * 100
-                log_cb(f"Progress: {self.progress.completed_stocks}/{self.progress.total_stocks} ({pct:.1f}%)")
+            if finished % 10 == 0:
+                pct = finished / self.progress.total_stocks * 100
+                log_cb(f"Progress: {finished}/{self.progress.total_stocks} ({pct:.1f}%)")
+
+        with self.bulk_writes(log_cb):
+            for idx, row in stocks.iterrows():
+                symbol = row['symbol']
+                security_id = int(row['security_id'])
+
+                self.progress.current_symbol = symbol
+
+                with self.symbol_writes(partial(report, symbol)):
+                    self.download_intraday_data(
+                        symbol=symbol,
+                        security_id=security_id,
+                        years=years,
+                        chunk_days=chunk_days,
+                        log_cb=log_cb
+                    )
         
+        # Drop checkpoint lines superseded during this run
+        self.checkpoints.compact()
         self.progress.status = "completed"
         log_cb(f"\n[DONE] Intraday download complete!")
         log_cb(f"   Stocks: {self.progress.completed_stocks} completed, {self.progress.failed_stocks} failed")
@@ -0,0 +1,214 @@
+"""
+Request Scheduling for Dhan Data APIs
+=====================================
+Shared pacing for the historical downloader threads.
+
+- AdaptiveRateLimiter: token bucket at Dhan's published Data API limit,
+  with AIMD control: every HTTP 429 halves the rate and pauses all callers
+  for an exponentially growing cooldown, every success adds the rate back
+  a little at a time. Waiting callers are served by priority, so today's
+  gap-fill requests go ahead of deep backfill.
+- ChunkCheckpoints: completed download chunks, appended to a JSON-lines
+  file so an interrupted backfill resumes without re-requesting chunks
+  (including ones that came back empty). Superseded entries are dropped by
+  compacting the file on load and after a backfill.
+"""
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Priority lanes (lower is served first)
+PRIORITY_GAP_FILL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKFILL = 2
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe priority token bucket with AIMD rate control."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: float = 0.5,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            rate: Requests per second allowed (also the ceiling after backoff)
+            burst: Bucket size (default: one second of requests)
+            min_rate: Floor for the rate after repeated throttling
+            increase: Requests/second added back per successful request
+            decrease: Factor applied to the rate on a 429
+            initial_backoff: First cooldown after a 429 (seconds)
+            max_backoff: Cooldown cap (seconds)
+            clock: Monotonic time source
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._backoff = initial_backoff
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = PRIORITY_NORMAL):
+        """Block until a request may be sent; lower priority values go first."""
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    if self._waiters[0] == ticket:
+                        if now >= self._paused_until and self._tokens >= 1:
+                            heapq.heappop(self._waiters)
+                            self._tokens -= 1
+                            self._cond.notify_all()
+                            return
+                        wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def succeeded(self):
+        """Additive increase after a successful request."""
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self._backoff = self.initial_backoff
+
+    def throttled(self) -> float:
+        """
+        Multiplicative decrease after an HTTP 429.
+
+        Throttles reported during an active cooldown (requests that were
+        already in flight) do not cut the rate again. Returns the cooldown.
+        """
+        with self._cond:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = 0.0
+            self._paused_until = now + self._backoff
+            cooldown = self._backoff
+            self._backoff = min(self.max_backoff, self._backoff * 2)
+            self._cond.notify_all()
+            return cooldown
+
+
+def chunk_window(day: date, chunk_days: int) -> Tuple[date, date]:
+    """Fixed calendar window of chunk_days containing day (stable across runs)."""
+    start = date.fromordinal(day.toordinal() - day.toordinal() % chunk_days)
+    return start, start + timedelta(days=chunk_days - 1)
+
+
+class ChunkCheckpoints:
+    """
+    Rows saved per (symbol, kind, window) chunk, persisted as JSON lines.
+
+    A chunk may be marked with the from/to range that was actually
+    requested (a window clamped to the backfill horizon covers only part
+    of its calendar window); get() with a range then only reports the
+    chunk as completed when the recorded range covers it.
+
+    mark() appends, so re-marked chunks leave superseded lines behind;
+    compact() rewrites the file with the latest entry per chunk and runs on
+    load whenever the file holds anything else.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._done: Dict[Tuple[str, str, str], Tuple[int, Optional[str], Optional[str]]] = {}
+        if self.path.exists():
+            lines = self.path.read_text(encoding='utf-8').splitlines()
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted run
+                key = (entry['symbol'], entry['kind'], entry['start'])
+                self._done[key] = (entry['rows'], entry.get('from'), entry.get('to'))
+            if len(lines) != len(self._done):
+                self.compact()
+
+    def get(self, symbol: str, kind: str, start: date,
+            from_date: Optional[date] = None, to_date: Optional[date] = None) -> Optional[int]:
+        """
+        Rows saved for the chunk starting at start, or None if not completed.
+
+        With from_date/to_date the chunk only counts when its recorded
+        range covers them; chunks marked without a range never do.
+        """
+        done = self._done.get((symbol, kind, start.isoformat()))
+        if done is None:
+            return None
+        rows, covered_from, covered_to = done
+        if from_date is not None and (covered_from is None or covered_from > from_date.isoformat()):
+            return None
+        if to_date is not None and (covered_to is None or covered_to < to_date.isoformat()):
+            return None
+        return rows
+
+    def mark(self, symbol: str, kind: str, start: date, rows: int,
+             from_date: Optional[date] = None, to_date: Optional[date] = None):
+        """Record a completed chunk and the range that was requested for it."""
+        key = (symbol, kind, start.isoformat())
+        entry = {'symbol': symbol, 'kind': kind, 'start': key[2], 'rows': rows}
+        if from_date is not None:
+            entry['from'] = from_date.isoformat()
+        if to_date is not None:
+            entry['to'] = to_date.isoformat()
+        with self._lock:
+            self._done[key] = (rows, entry.get('from'), entry.get('to'))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def compact(self):
+        """Rewrite the file with only the latest entry per chunk."""
+        with self._lock:
+            lines = []
+            for (symbol, kind, start), (rows, covered_from, covered_to) in self._done.items():
+                entry = {'symbol': symbol, 'kind': kind, 'start': start, 'rows': rows}
+                if covered_from is not None:
+                    entry['from'] = covered_from
+                if covered_to is not None:
+                    entry['to'] = covered_to
+                lines.append(json.dumps(entry) + '\n')
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(tmp, self.path)
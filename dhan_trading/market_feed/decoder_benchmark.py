@@ -0,0 +1,287 @@
+"""
+Packet Decoder Benchmark
+========================
+Measures DhanFeedService._handle_message throughput (packets/sec), decode
+through publish, over recorded or synthetic websocket frames:
+
+- legacy: every packet sliced out and decoded field by field
+- struct: every packet decoded with precompiled structs
+- batch:  the service as shipped (quote-only frames decoded in one NumPy
+          pass and published as rows)
+
+All variants publish through RedisPublisher into an in-memory stand-in
+client and must publish identical output.
+
+Record live frames by starting the feed with DHAN_FEED_RECORD_PATH set;
+each frame is stored as a 4-byte little-endian length followed by the
+raw frame bytes.
+
+Usage:
+    python -m dhan_trading.market_feed.decoder_benchmark
+    python -m dhan_trading.market_feed.decoder_benchmark --frames feed.bin
+    python -m dhan_trading.market_feed.decoder_benchmark --packets-per-frame 50
+    python -m dhan_trading.market_feed.decoder_benchmark --full-ratio 0.2
+"""
+import os
+import sys
+import time
+import struct
+import random
+import argparse
+import logging
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from dhan_trading.market_feed.feed_config import FeedConfig, FeedResponseCode
+from dhan_trading.market_feed.feed_service import BinaryParser, DhanFeedService
+from dhan_trading.market_feed.redis_publisher import DepthData, QuoteData, decode_payload
+
+
+def load_recorded_frames(path: str) -> List[bytes]:
+    """Read length-prefixed frames written by DhanFeedService."""
+    frames = []
+    with open(path, 'rb') as f:
+        while True:
+            prefix = f.read(4)
+            if len(prefix) < 4:
+                break
+            length, = struct.unpack('<I', prefix)
+            frame = f.read(length)
+            if len(frame) < length:
+                break
+            frames.append(frame)
+    return frames
+
+
+def make_quote_packet(security_id: int, ltp: float) -> bytes:
+    """Build one 50-byte quote packet."""
+    header = struct.pack('<BHBI', FeedResponseCode.QUOTE_PACKET, 50, 2, security_id)
+    body = struct.pack('<fHIfIIIffff', ltp, 75, int(time.time()), ltp, 100000,
+                       5000, 6000, ltp * 0.99, ltp * 0.98, ltp * 1.01, ltp * 0.97)
+    return header + body
+
+
+def make_full_packet(security_id: int, ltp: float) -> bytes:
+    """Build one 162-byte full packet."""
+    header = struct.pack('<BHBI', FeedResponseCode.FULL_PACKET, 162, 2, security_id)
+    body = struct.pack('<fHIfIIIIIIffff', ltp, 75, int(time.time()), ltp, 100000,
+                       5000, 6000, 70000, 71000, 69000, ltp * 0.99, ltp * 0.98, ltp * 1.01, ltp * 0.97)
+    depth = b''.join(
+        struct.pack('<IIHHff', 100 * (i + 1), 120 * (i + 1), i + 1, i + 2, ltp - i * 0.05, ltp + i * 0.05)
+        for i in range(5)
+    )
+    return header + body + depth
+
+
+def make_synthetic_frames(num_frames: int, packets_per_frame: int, full_ratio: float = 0.2) -> List[bytes]:
+    """Frames mixing quote and full packets, similar to an expiry-day burst."""
+    rng = random.Random(42)
+    frames = []
+    for _ in range(num_frames):
+        packets = []
+        for _ in range(packets_per_frame):
+            security_id = rng.randint(30000, 90000)
+            ltp = rng.uniform(10, 500)
+            if rng.random() < full_ratio:
+                packets.append(make_full_packet(security_id, ltp))
+            else:
+                packets.append(make_quote_packet(security_id, ltp))
+        frames.append(b''.join(packets))
+    return frames
+
+
+def _legacy_fields(data: bytes, layout) -> list:
+    """Previous decoder style: slice + struct.unpack per field."""
+    return [struct.unpack('<' + fmt, data[start:start + struct.calcsize(fmt)])[0]
+            for start, fmt in layout]
+
+
+_LEGACY_QUOTE = ((8, 'f'), (12, 'H'), (14, 'I'), (18, 'f'), (22, 'I'), (26, 'I'),
+                 (30, 'I'), (34, 'f'), (38, 'f'), (42, 'f'), (46, 'f'))
+_LEGACY_FULL = ((8, 'f'), (12, 'H'), (14, 'I'), (18, 'f'), (22, 'I'), (26, 'I'), (30, 'I'),
+                (34, 'I'), (38, 'I'), (42, 'I'), (46, 'f'), (50, 'f'), (54, 'f'), (58, 'f'))
+
+
+def legacy_parse_quote(data: bytes) -> QuoteData:
+    """Previous slice-per-field quote decoder."""
+    security_id = struct.unpack('<I', data[4:8])[0]
+    (ltp, ltq, ltt, atp, volume, total_sell_qty, total_buy_qty,
+     day_open, day_close, day_high, day_low) = _legacy_fields(data, _LEGACY_QUOTE)
+    return QuoteData(
+        security_id=security_id, exchange_segment=data[3],
+        ltp=round(ltp, 4), ltq=ltq, ltt=ltt, atp=round(atp, 4), volume=volume,
+        total_sell_qty=total_sell_qty, total_buy_qty=total_buy_qty,
+        day_open=round(day_open, 4), day_close=round(day_close, 4),
+        day_high=round(day_high, 4), day_low=round(day_low, 4),
+        received_at=time.time()
+    )
+
+
+def legacy_parse_full_packet(data: bytes) -> DepthData:
+    """Previous slice-per-field full packet decoder."""
+    security_id = struct.unpack('<I', data[4:8])[0]
+    (ltp, ltq, ltt, atp, volume, total_sell_qty, total_buy_qty, oi, oi_high, oi_low,
+     day_open, day_close, day_high, day_low) = _legacy_fields(data, _LEGACY_FULL)
+    levels = [_legacy_fields(data, ((o, 'I'), (o + 4, 'I'), (o + 12, 'f'), (o + 16, 'f')))
+              for o in range(62, 162, 20)]
+    return DepthData(
+        security_id=security_id, exchange_segment=data[3],
+        ltp=round(ltp, 4), ltq=ltq, ltt=ltt, atp=round(atp, 4), volume=volume,
+        total_sell_qty=total_sell_qty, total_buy_qty=total_buy_qty,
+        open_interest=oi, oi_high=oi_high, oi_low=oi_low,
+        day_open=round(day_open, 4), day_close=round(day_close, 4),
+        day_high=round(day_high, 4), day_low=round(day_low, 4),
+        bid_prices=[round(level[2], 4) for level in levels],
+        bid_qtys=[level[0] for level in levels],
+        ask_prices=[round(level[3], 4) for level in levels],
+        ask_qtys=[level[1] for level in levels],
+        received_at=time.time()
+    )
+
+
+class LegacyFeedService(DhanFeedService):
+    """Every packet sliced out of the frame and decoded field by field."""
+    
+    def _handle_message(self, data: bytes):
+        for code, offset, size in BinaryParser.split_frame(data):
+            packet = data[offset:offset + size]
+            if code == FeedResponseCode.QUOTE_PACKET:
+                self._handle_quote(legacy_parse_quote(packet))
+            elif code == FeedResponseCode.FULL_PACKET:
+                self._stats['quotes_received'] += 1
+                self.redis.publish_depth(legacy_parse_full_packet(packet))
+        self.redis.flush()
+
+
+class StructFeedService(DhanFeedService):
+    """Every packet decoded with precompiled structs (no batch path)."""
+    
+    def _handle_message(self, data: bytes):
+        view = memoryview(data)
+        for code, offset, _ in BinaryParser.split_frame(data):
+            self._handle_packet(view, code, offset)
+        self.redis.flush()
+
+
+VARIANTS = {
+    'legacy': LegacyFeedService,
+    'struct': StructFeedService,
+    'batch': DhanFeedService,
+}
+
+
+class CaptureRedis:
+    """Stand-in Redis client recording what a publisher sends."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def pipeline(self, transaction=False):
+        return self
+    
+    def publish(self, channel, payload):
+        self.calls.append(('publish', channel, payload))
+        return 0
+    
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.calls.append(('xadd', stream, fields))
+    
+    def execute(self):
+        return [0]
+
+
+def make_service(variant: str, encoding: str = 'msgpack') -> DhanFeedService:
+    """Feed service whose publisher writes into a CaptureRedis."""
+    config = FeedConfig(DHAN_ACCESS_TOKEN='benchmark', DHAN_CLIENT_ID='benchmark')
+    config.REDIS_ENCODING = encoding
+    config.PUBLISH_FLUSH_MS = 60_000
+    service = VARIANTS[variant](config)
+    service.redis._client = CaptureRedis()
+    service.redis._connected = True
+    return service
+
+
+def published_output(calls: list) -> list:
+    """Published payloads and stream entries with received_at removed."""
+    output = []
+    for kind, name, payload in calls:
+        if kind == 'xadd':
+            entry = {k: v for k, v in payload.items() if k != 'received_at'}
+            if 'data' in entry:  # Depth entries hold the JSON payload
+                entry['data'] = decode_payload(entry['data'])
+                entry['data'].pop('received_at', None)
+            output.append((name, entry))
+            continue
+        decoded = decode_payload(payload)
+        if isinstance(decoded, dict):
+            decoded.pop('received_at', None)
+        else:
+            decoded = [row[:-1] for row in decoded]
+        output.append((name, decoded))
+    return output
+
+
+def run(frames: List[bytes], repeat: int = 3, encoding: str = 'msgpack') -> dict:
+    """
+    Time DhanFeedService._handle_message over all frames for each variant.
+    
+    Every variant publishes through the same RedisPublisher into a
+    CaptureRedis; the published output must be identical across variants.
+    
+    Returns:
+        packets/sec per variant
+    """
+    packets = sum(len(BinaryParser.split_frame(frame)) for frame in frames)
+    oi_cache = {security_id: security_id * 10 for security_id in range(30000, 90000, 3)}
+    
+    results = {}
+    reference = None
+    for name in VARIANTS:
+        best = float('inf')
+        for _ in range(repeat):
+            service = make_service(name, encoding)
+            service._oi_cache.update(oi_cache)
+            start = time.perf_counter()
+            for frame in frames:
+                service._handle_message(frame)
+            best = min(best, time.perf_counter() - start)
+        
+        output = published_output(service.redis._client.calls)
+        if reference is None:
+            reference = output
+        elif output != reference:
+            raise AssertionError(f"{name} published different output than {next(iter(VARIANTS))}")
+        results[name] = packets / best if best > 0 else 0.0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Dhan packet decoding")
+    parser.add_argument("--frames", type=str, help="Recorded frames file (DHAN_FEED_RECORD_PATH)")
+    parser.add_argument("--num-frames", type=int, default=2000, help="Synthetic frames to generate")
+    parser.add_argument("--packets-per-frame", type=int, default=20, help="Packets per synthetic frame")
+    parser.add_argument("--full-ratio", type=float, default=0.0,
+                        help="Share of full packets in synthetic frames (mixed frames skip the batch path)")
+    parser.add_argument("--encoding", choices=["msgpack", "json"], default="msgpack", help="Quote encoding")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = load_recorded_frames(args.frames)
+        source = args.frames
+    else:
+        frames = make_synthetic_frames(args.num_frames, args.packets_per_frame, args.full_ratio)
+        source = f"synthetic ({args.num_frames} x {args.packets_per_frame} packets)"
+
+    # Feed/publisher progress logging is not what is measured
+    logging.getLogger('dhan_trading.market_feed').setLevel(logging.WARNING)
+    results = run(frames, args.repeat, args.encoding)
+    print(f"Frames: {len(frames)} from {source}")
+    for name, rate in results.items():
+        speedup = rate / results['legacy'] if results['legacy'] else 0
+        print(f"  {name:<8} {rate:>14,.0f} packets/sec  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
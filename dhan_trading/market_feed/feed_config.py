@@ -37,6 +37,11 @@ class FeedConfig:
     REDIS_DB: int = field(default_factory=lambda: int(os.getenv("REDIS_DB", "0")))
     REDIS_PASSWORD: Optional[str] = field(default_factory=lambda: os.getenv("REDIS_PASSWORD"))
     
+    # Quote publishing: "msgpack" (compact, batched) or "json" (one message per quote)
+    REDIS_ENCODING: str = field(default_factory=lambda: os.getenv("REDIS_ENCODING", "msgpack"))
+    PUBLISH_BATCH_SIZE: int = 500
+    PUBLISH_FLUSH_MS: int = 5
+    
     # Queue names
     TICK_QUEUE: str = "dhan:ticks"
     QUOTE_QUEUE: str = "dhan:quotes"
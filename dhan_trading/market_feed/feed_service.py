@@ -18,8 +18,11 @@ import time
 from datetime import datetime, time as dt_time
 from typing import Optional, List, Dict, Callable, Any
 from dataclasses import dataclass
+from itertools import repeat
 import threading
 
+import numpy as np
+
 try:
     import websockets
     from websockets.client import WebSocketClientProtocol
@@ -43,15 +46,94 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Precompiled little-endian layouts (offsets relative to packet start)
+_HEADER = struct.Struct('<BHBI')                    # 0-7
+_TICKER_BODY = struct.Struct('<fI')                 # 8-15
+_QUOTE_BODY = struct.Struct('<fHIfIIIffff')         # 8-49
+_OI_BODY = struct.Struct('<I')                      # 8-11
+_PREV_CLOSE_BODY = struct.Struct('<fI')             # 8-15
+_FULL_BODY = struct.Struct('<fHIfIIIIIIffff')       # 8-61
+_DEPTH_BODY = struct.Struct('<' + 'II4xff' * 5)     # 62-161
+_DISCONNECT_BODY = struct.Struct('<H')              # 8-9
+_FRAME_LENGTH = struct.Struct('<I')                 # Recorded frame prefix
+
+# Fixed packet sizes by response code
+PACKET_SIZES = {
+    FeedResponseCode.INDEX_PACKET: 16,
+    FeedResponseCode.TICKER_PACKET: 16,
+    FeedResponseCode.QUOTE_PACKET: 50,
+    FeedResponseCode.OI_PACKET: 12,
+    FeedResponseCode.PREV_CLOSE_PACKET: 16,
+    FeedResponseCode.MARKET_STATUS_PACKET: 8,
+    FeedResponseCode.FULL_PACKET: 162,
+    FeedResponseCode.DISCONNECT: 10,
+}
+
+# Quote-only frames with at least this many packets take the batch path;
+# a lone packet is cheaper through the struct decoder, where NumPy's
+# per-call overhead outweighs the savings (see decoder_benchmark.py)
+BATCH_DECODE_MIN_PACKETS = 2
+
+# NumPy record layouts for batch decoding (packed, little-endian)
+_HEADER_FIELDS = [
+    ('response_code', 'u1'),
+    ('msg_length', '<u2'),
+    ('exchange_segment', 'u1'),
+    ('security_id', '<u4'),
+]
+
+TICKER_DTYPE = np.dtype(_HEADER_FIELDS + [('ltp', '<f4'), ('ltt', '<u4')])
+
+QUOTE_DTYPE = np.dtype(_HEADER_FIELDS + [
+    ('ltp', '<f4'), ('ltq', '<u2'), ('ltt', '<u4'), ('atp', '<f4'),
+    ('volume', '<u4'), ('total_sell_qty', '<u4'), ('total_buy_qty', '<u4'),
+    ('day_open', '<f4'), ('day_close', '<f4'), ('day_high', '<f4'), ('day_low', '<f4'),
+])
+
+OI_DTYPE = np.dtype(_HEADER_FIELDS + [('open_interest', '<u4')])
+
+PREV_CLOSE_DTYPE = np.dtype(_HEADER_FIELDS + [('prev_close', '<f4'), ('prev_oi', '<u4')])
+
+DEPTH_LEVEL_DTYPE = np.dtype([
+    ('bid_qty', '<u4'), ('ask_qty', '<u4'),
+    ('bid_orders', '<u2'), ('ask_orders', '<u2'),
+    ('bid_price', '<f4'), ('ask_price', '<f4'),
+])
+
+FULL_DTYPE = np.dtype(_HEADER_FIELDS + [
+    ('ltp', '<f4'), ('ltq', '<u2'), ('ltt', '<u4'), ('atp', '<f4'),
+    ('volume', '<u4'), ('total_sell_qty', '<u4'), ('total_buy_qty', '<u4'),
+    ('open_interest', '<u4'), ('oi_high', '<u4'), ('oi_low', '<u4'),
+    ('day_open', '<f4'), ('day_close', '<f4'), ('day_high', '<f4'), ('day_low', '<f4'),
+    ('depth', DEPTH_LEVEL_DTYPE, (5,)),
+])
+
+# QUOTE_DTYPE columns by kind, for quote_rows_from_array
+_QUOTE_PRICE_FIELDS = ('ltp', 'atp', 'day_open', 'day_close', 'day_high', 'day_low')
+_QUOTE_INT_FIELDS = ('security_id', 'exchange_segment', 'ltq', 'ltt', 'volume',
+                     'total_sell_qty', 'total_buy_qty')
+
+PACKET_DTYPES = {
+    FeedResponseCode.TICKER_PACKET: TICKER_DTYPE,
+    FeedResponseCode.QUOTE_PACKET: QUOTE_DTYPE,
+    FeedResponseCode.OI_PACKET: OI_DTYPE,
+    FeedResponseCode.PREV_CLOSE_PACKET: PREV_CLOSE_DTYPE,
+    FeedResponseCode.FULL_PACKET: FULL_DTYPE,
+}
+
+
 class BinaryParser:
     """
     Parse binary packets from Dhan WebSocket.
     
-    All data is Little Endian.
+    All data is Little Endian. Every parse_* method decodes its fields
+    with one precompiled struct.Struct.unpack_from call straight from the
+    buffer (bytes or memoryview) at the given offset, so packets inside a
+    larger frame are never sliced or copied.
     """
     
     @staticmethod
-    def parse_header(data: bytes) -> Dict:
+    def parse_header(data: bytes, offset: int = 0) -> Dict:
         """
         Parse 8-byte response header.
         
@@ -61,13 +143,10 @@ class BinaryParser:
             3: Exchange segment (1 byte)
             4-7: Security ID (int32)
         """
-        if len(data) < 8:
+        if len(data) < offset + 8:
             return {}
         
-        response_code = data[0]
-        msg_length = struct.unpack('<H', data[1:3])[0]
-        exchange_segment = data[3]
-        security_id = struct.unpack('<I', data[4:8])[0]
+        response_code, msg_length, exchange_segment, security_id = _HEADER.unpack_from(data, offset)
         
         return {
             'response_code': response_code,
@@ -77,7 +156,7 @@ class BinaryParser:
         }
     
     @staticmethod
-    def parse_ticker(data: bytes) -> Optional[TickData]:
+    def parse_ticker(data: bytes, offset: int = 0) -> Optional[TickData]:
         """
         Parse ticker packet (LTP + LTT).
         
@@ -86,26 +165,25 @@ class BinaryParser:
             8-11: LTP (float32)
             12-15: LTT (int32 EPOCH)
         """
-        if len(data) < 16:
+        if len(data) < offset + 16:
             return None
         
-        header = BinaryParser.parse_header(data)
-        if header.get('response_code') != FeedResponseCode.TICKER_PACKET:
+        code, _, segment, security_id = _HEADER.unpack_from(data, offset)
+        if code != FeedResponseCode.TICKER_PACKET:
             return None
         
-        ltp = struct.unpack('<f', data[8:12])[0]
-        ltt = struct.unpack('<I', data[12:16])[0]
+        ltp, ltt = _TICKER_BODY.unpack_from(data, offset + 8)
         
         return TickData(
-            security_id=header['security_id'],
-            exchange_segment=header['exchange_segment'],
+            security_id=security_id,
+            exchange_segment=segment,
             ltp=round(ltp, 4),
             ltt=ltt,
             received_at=time.time()
         )
     
     @staticmethod
-    def parse_quote(data: bytes) -> Optional[QuoteData]:
+    def parse_quote(data: bytes, offset: int = 0) -> Optional[QuoteData]:
         """
         Parse quote packet.
         
@@ -123,28 +201,19 @@ class BinaryParser:
             42-45: Day High (float32)
             46-49: Day Low (float32)
         """
-        if len(data) < 50:
+        if len(data) < offset + 50:
             return None
         
-        header = BinaryParser.parse_header(data)
-        if header.get('response_code') != FeedResponseCode.QUOTE_PACKET:
+        code, _, segment, security_id = _HEADER.unpack_from(data, offset)
+        if code != FeedResponseCode.QUOTE_PACKET:
             return None
         
-        ltp = struct.unpack('<f', data[8:12])[0]
-        ltq = struct.unpack('<H', data[12:14])[0]
-        ltt = struct.unpack('<I', data[14:18])[0]
-        atp = struct.unpack('<f', data[18:22])[0]
-        volume = struct.unpack('<I', data[22:26])[0]
-        total_sell_qty = struct.unpack('<I', data[26:30])[0]
-        total_buy_qty = struct.unpack('<I', data[30:34])[0]
-        day_open = struct.unpack('<f', data[34:38])[0]
-        day_close = struct.unpack('<f', data[38:42])[0]
-        day_high = struct.unpack('<f', data[42:46])[0]
-        day_low = struct.unpack('<f', data[46:50])[0]
+        (ltp, ltq, ltt, atp, volume, total_sell_qty, total_buy_qty,
+         day_open, day_close, day_high, day_low) = _QUOTE_BODY.unpack_from(data, offset + 8)
         
         return QuoteData(
-            security_id=header['security_id'],
-            exchange_segment=header['exchange_segment'],
+            security_id=security_id,
+            exchange_segment=segment,
             ltp=round(ltp, 4),
             ltq=ltq,
             ltt=ltt,
@@ -160,7 +229,7 @@ class BinaryParser:
         )
     
     @staticmethod
-    def parse_oi(data: bytes) -> Optional[Dict]:
+    def parse_oi(data: bytes, offset: int = 0) -> Optional[Dict]:
         """
         Parse OI packet.
         
@@ -168,23 +237,23 @@ class BinaryParser:
             0-7: Header
             8-11: OI (int32)
         """
-        if len(data) < 12:
+        if len(data) < offset + 12:
             return None
         
-        header = BinaryParser.parse_header(data)
-        if header.get('response_code') != FeedResponseCode.OI_PACKET:
+        code, _, segment, security_id = _HEADER.unpack_from(data, offset)
+        if code != FeedResponseCode.OI_PACKET:
             return None
         
-        oi = struct.unpack('<I', data[8:12])[0]
+        oi, = _OI_BODY.unpack_from(data, offset + 8)
         
         return {
-            'security_id': header['security_id'],
-            'exchange_segment': header['exchange_segment'],
+            'security_id': security_id,
+            'exchange_segment': segment,
             'open_interest': oi
         }
     
     @staticmethod
-    def parse_prev_close(data: bytes) -> Optional[Dict]:
+    def parse_prev_close(data: bytes, offset: int = 0) -> Optional[Dict]:
         """
         Parse previous close packet.
         
@@ -193,25 +262,24 @@ class BinaryParser:
             8-11: Prev Close (float32)
             12-15: Prev OI (int32)
         """
-        if len(data) < 16:
+        if len(data) < offset + 16:
             return None
         
-        header = BinaryParser.parse_header(data)
-        if header.get('response_code') != FeedResponseCode.PREV_CLOSE_PACKET:
+        code, _, segment, security_id = _HEADER.unpack_from(data, offset)
+        if code != FeedResponseCode.PREV_CLOSE_PACKET:
             return None
         
-        prev_close = struct.unpack('<f', data[8:12])[0]
-        prev_oi = struct.unpack('<I', data[12:16])[0]
+        prev_close, prev_oi = _PREV_CLOSE_BODY.unpack_from(data, offset + 8)
         
         return {
-            'security_id': header['security_id'],
-            'exchange_segment': header['exchange_segment'],
+            'security_id': security_id,
+            'exchange_segment': segment,
             'prev_close': round(prev_close, 4),
             'prev_oi': prev_oi
         }
     
     @staticmethod
-    def parse_full_packet(data: bytes) -> Optional[DepthData]:
+    def parse_full_packet(data: bytes, offset: int = 0) -> Optional[DepthData]:
         """
         Parse full packet with market depth.
         
@@ -233,49 +301,22 @@ class BinaryParser:
             58-61: Day Low (float32)
             62-161: Market Depth (5 x 20 bytes)
         """
-        if len(data) < 162:
+        if len(data) < offset + 162:
             return None
         
-        header = BinaryParser.parse_header(data)
-        if header.get('response_code') != FeedResponseCode.FULL_PACKET:
+        code, _, segment, security_id = _HEADER.unpack_from(data, offset)
+        if code != FeedResponseCode.FULL_PACKET:
             return None
         
-        ltp = struct.unpack('<f', data[8:12])[0]
-        ltq = struct.unpack('<H', data[12:14])[0]
-        ltt = struct.unpack('<I', data[14:18])[0]
-        atp = struct.unpack('<f', data[18:22])[0]
-        volume = struct.unpack('<I', data[22:26])[0]
-        total_sell_qty = struct.unpack('<I', data[26:30])[0]
-        total_buy_qty = struct.unpack('<I', data[30:34])[0]
-        oi = struct.unpack('<I', data[34:38])[0]
-        oi_high = struct.unpack('<I', data[38:42])[0]
-        oi_low = struct.unpack('<I', data[42:46])[0]
-        day_open = struct.unpack('<f', data[46:50])[0]
-        day_close = struct.unpack('<f', data[50:54])[0]
-        day_high = struct.unpack('<f', data[54:58])[0]
-        day_low = struct.unpack('<f', data[58:62])[0]
-        
-        # Parse market depth (5 levels)
-        bid_prices = []
-        bid_qtys = []
-        ask_prices = []
-        ask_qtys = []
-        
-        for i in range(5):
-            offset = 62 + (i * 20)
-            bid_qty = struct.unpack('<I', data[offset:offset+4])[0]
-            ask_qty = struct.unpack('<I', data[offset+4:offset+8])[0]
-            bid_price = struct.unpack('<f', data[offset+12:offset+16])[0]
-            ask_price = struct.unpack('<f', data[offset+16:offset+20])[0]
-            
-            bid_prices.append(round(bid_price, 4))
-            bid_qtys.append(bid_qty)
-            ask_prices.append(round(ask_price, 4))
-            ask_qtys.append(ask_qty)
+        (ltp, ltq, ltt, atp, volume, total_sell_qty, total_buy_qty,
+         oi, oi_high, oi_low, day_open, day_close, day_high, day_low) = _FULL_BODY.unpack_from(data, offset + 8)
+        
+        # Market depth (5 levels): bid_qty, ask_qty, bid_price, ask_price per level
+        depth = _DEPTH_BODY.unpack_from(data, offset + 62)
         
         return DepthData(
-            security_id=header['security_id'],
-            exchange_segment=header['exchange_segment'],
+            security_id=security_id,
+            exchange_segment=segment,
             ltp=round(ltp, 4),
             ltq=ltq,
             ltt=ltt,
@@ -290,28 +331,148 @@ class BinaryParser:
             day_close=round(day_close, 4),
             day_high=round(day_high, 4),
             day_low=round(day_low, 4),
-            bid_prices=bid_prices,
-            bid_qtys=bid_qtys,
-            ask_prices=ask_prices,
-            ask_qtys=ask_qtys,
+            bid_prices=[round(p, 4) for p in depth[2::4]],
+            bid_qtys=list(depth[0::4]),
+            ask_prices=[round(p, 4) for p in depth[3::4]],
+            ask_qtys=list(depth[1::4]),
             received_at=time.time()
         )
     
     @staticmethod
-    def parse_disconnect(data: bytes) -> Optional[Dict]:
+    def parse_disconnect(data: bytes, offset: int = 0) -> Optional[Dict]:
         """Parse disconnect packet."""
-        if len(data) < 10:
+        if len(data) < offset + 10:
             return None
         
-        header = BinaryParser.parse_header(data)
-        if header.get('response_code') != FeedResponseCode.DISCONNECT:
+        if data[offset] != FeedResponseCode.DISCONNECT:
             return None
         
-        disconnect_code = struct.unpack('<H', data[8:10])[0]
+        disconnect_code, = _DISCONNECT_BODY.unpack_from(data, offset + 8)
         
         return {
             'disconnect_code': disconnect_code
         }
+    
+    @staticmethod
+    def split_frame(frame: bytes) -> List[tuple]:
+        """
+        Locate the packets inside a websocket frame.
+        
+        Packet sizes come from PACKET_SIZES, falling back to the header's
+        message length for unknown codes. A truncated trailing packet is
+        dropped.
+        
+        Returns:
+            List of (response_code, offset, size).
+        """
+        packets = []
+        total = len(frame)
+        offset = 0
+        while offset + 8 <= total:
+            code, msg_length, _, _ = _HEADER.unpack_from(frame, offset)
+            size = PACKET_SIZES.get(code, msg_length)
+            if size < 8 or offset + size > total:
+                break
+            packets.append((code, offset, size))
+            offset += size
+        return packets
+    
+    @staticmethod
+    def quote_records(frame: bytes, min_packets: int = 1) -> Optional[np.ndarray]:
+        """
+        View a frame made only of quote packets as a QUOTE_DTYPE array.
+        
+        Quote packets have a fixed size, so the frame is quote-only when
+        its length is a multiple of 50 and every 50th byte is the quote
+        response code; no per-packet walk is needed.
+        
+        Returns:
+            The zero-copy record array, or None if the frame holds fewer
+            than min_packets packets or anything other than quotes.
+        """
+        size = QUOTE_DTYPE.itemsize
+        count, remainder = divmod(len(frame), size)
+        if remainder or count < max(min_packets, 1):
+            return None
+        
+        if bytes(frame[::size]).count(FeedResponseCode.QUOTE_PACKET) != count:
+            return None
+        return np.frombuffer(frame, dtype=QUOTE_DTYPE)
+    
+    @staticmethod
+    def decode_frame(frame: bytes) -> Dict[int, np.ndarray]:
+        """
+        Decode every packet in a frame into NumPy structured arrays.
+        
+        A frame holding only one packet type is viewed in place with
+        np.frombuffer (zero-copy). Mixed frames gather each type's
+        packets with a single fancy-index per type.
+        
+        Returns:
+            Dict mapping response code to a structured array using the
+            matching *_DTYPE (codes without a dtype are skipped).
+        """
+        if len(frame) < 8:
+            return {}
+        
+        buf = np.frombuffer(frame, dtype=np.uint8)
+        code = int(buf[0])
+        dtype = PACKET_DTYPES.get(code)
+        
+        # Fast path: homogeneous frame
+        if dtype is not None and len(buf) % dtype.itemsize == 0:
+            if (buf[::dtype.itemsize] == code).all():
+                return {code: np.frombuffer(frame, dtype=dtype)}
+        
+        by_code: Dict[int, List[int]] = {}
+        for code, offset, _ in BinaryParser.split_frame(frame):
+            if code in PACKET_DTYPES:
+                by_code.setdefault(code, []).append(offset)
+        
+        decoded = {}
+        for code, offsets in by_code.items():
+            dtype = PACKET_DTYPES[code]
+            index = np.asarray(offsets)[:, None] + np.arange(dtype.itemsize)
+            decoded[code] = buf[index].view(dtype).reshape(-1)
+        return decoded
+    
+    @staticmethod
+    def quote_rows_from_array(records: np.ndarray,
+                              oi_cache: Optional[Dict[int, int]] = None,
+                              prev_close_cache: Optional[Dict[int, float]] = None) -> List[tuple]:
+        """
+        Build positional QuoteData rows (QUOTE_FIELDS order) from a
+        QUOTE_DTYPE array, column by column.
+        
+        Values equal parse_quote's: a float32 times 1e4 is exact in
+        float64, so rint(x * 1e4) / 1e4 (what np.round does) gives the
+        same results as round(x, 4). The six price columns are rounded
+        as one 2D block. open_interest and prev_close come from the
+        caches when given.
+        """
+        now = time.time()
+        prices = np.empty((len(_QUOTE_PRICE_FIELDS), len(records)))
+        for i, name in enumerate(_QUOTE_PRICE_FIELDS):
+            prices[i] = records[name]
+        prices *= 1e4
+        np.rint(prices, out=prices)
+        prices /= 1e4
+        ltp, atp, day_open, day_close, day_high, day_low = prices.tolist()
+        
+        (security_ids, segments, ltq, ltt, volume,
+         total_sell_qty, total_buy_qty) = [records[name].tolist() for name in _QUOTE_INT_FIELDS]
+        open_interest = [oi_cache.get(s) for s in security_ids] if oi_cache else repeat(None)
+        prev_close = [prev_close_cache.get(s) for s in security_ids] if prev_close_cache else repeat(None)
+        
+        return list(zip(
+            security_ids, segments, ltp, ltq, ltt, atp, volume, total_sell_qty, total_buy_qty,
+            day_open, day_close, day_high, day_low, open_interest, prev_close, repeat(now),
+        ))
+    
+    @staticmethod
+    def quotes_from_array(records: np.ndarray) -> List[QuoteData]:
+        """Build QuoteData objects from a QUOTE_DTYPE array."""
+        return [QuoteData(*row) for row in BinaryParser.quote_rows_from_array(records)]
 
 
 class DhanFeedService:
@@ -356,6 +517,10 @@ class DhanFeedService:
         # OI and prev close cache
         self._oi_cache: Dict[int, int] = {}
         self._prev_close_cache: Dict[int, float] = {}
+        
+        # Optional raw frame recording for replay/benchmarks (see decoder_benchmark.py)
+        record_path = os.getenv("DHAN_FEED_RECORD_PATH")
+        self._recorder = open(record_path, "ab") if record_path else None
     
     def set_callbacks(self, 
                      on_tick: Optional[Callable] = None,
@@ -405,6 +570,10 @@ class DhanFeedService:
             await self.ws.close()
             self.ws = None
         
+        if self._recorder:
+            self._recorder.close()
+            self._recorder = None
+        
         self.redis.disconnect()
         logger.info("Disconnected from Dhan WebSocket")
     
@@ -498,79 +667,121 @@ class DhanFeedService:
         return True
     
     def _handle_message(self, data: bytes):
-        """Handle incoming binary message."""
+        """Handle an incoming binary frame holding one or more packets."""
         if len(data) < 8:
             logger.debug(f"Received short message: {len(data)} bytes")
             return
         
-        # Parse header to determine packet type
-        response_code = data[0]
+        if self._recorder:
+            self._recorder.write(_FRAME_LENGTH.pack(len(data)))
+            self._recorder.write(data)
         
         try:
-            if response_code == FeedResponseCode.TICKER_PACKET:
-                tick = BinaryParser.parse_ticker(data)
-                if tick:
-                    self._stats['ticks_received'] += 1
-                    self._stats['last_tick_time'] = datetime.now()
-                    self.redis.publish_tick(tick)
-                    if self._on_tick:
-                        self._on_tick(tick)
-            
-            elif response_code == FeedResponseCode.QUOTE_PACKET:
-                quote = BinaryParser.parse_quote(data)
-                if quote:
-                    # Add OI if cached
-                    if quote.security_id in self._oi_cache:
-                        quote.open_interest = self._oi_cache[quote.security_id]
-                    
-                    # Add prev_close if cached
-                    if quote.security_id in self._prev_close_cache:
-                        quote.prev_close = self._prev_close_cache[quote.security_id]
-                    
-                    self._stats['quotes_received'] += 1
-                    self._stats['last_tick_time'] = datetime.now()
-                    self.redis.publish_quote(quote)
-                    
-                    # Log every 10th quote
-                    if self._stats['quotes_received'] % 10 == 1:
-                        logger.info(f"Quote #{self._stats['quotes_received']}: ID={quote.security_id} LTP={quote.ltp} Vol={quote.volume}")
-                    
-                    if self._on_quote:
-                        self._on_quote(quote)
-            
-            elif response_code == FeedResponseCode.OI_PACKET:
-                oi_data = BinaryParser.parse_oi(data)
-                if oi_data:
-                    self._oi_cache[oi_data['security_id']] = oi_data['open_interest']
-            
-            elif response_code == FeedResponseCode.PREV_CLOSE_PACKET:
-                prev_data = BinaryParser.parse_prev_close(data)
-                if prev_data:
-                    self._prev_close_cache[prev_data['security_id']] = prev_data['prev_close']
-            
-            elif response_code == FeedResponseCode.FULL_PACKET:
-                depth = BinaryParser.parse_full_packet(data)
-                if depth:
-                    self._stats['quotes_received'] += 1
-                    self.redis.publish_depth(depth)
-            
-            elif response_code == FeedResponseCode.DISCONNECT:
-                disc = BinaryParser.parse_disconnect(data)
-                logger.warning(f"Disconnect packet received: {disc}")
-                if self._on_disconnect:
-                    self._on_disconnect(disc)
-            
-            elif response_code == FeedResponseCode.INDEX_PACKET:
-                # Index packet - similar to ticker
-                pass
-            
-            elif response_code == FeedResponseCode.MARKET_STATUS_PACKET:
-                # Market status
-                pass
+            # Quote bursts: view the whole frame as one NumPy record array
+            # and publish it as rows
+            records = BinaryParser.quote_records(data, BATCH_DECODE_MIN_PACKETS)
+            if records is not None:
+                self._handle_quote_rows(BinaryParser.quote_rows_from_array(
+                    records, self._oi_cache, self._prev_close_cache
+                ))
+            else:
+                view = memoryview(data)
+                for code, offset, _ in BinaryParser.split_frame(data):
+                    self._handle_packet(view, code, offset)
             
         except Exception as e:
             self._stats['errors'] += 1
             logger.error(f"Error handling message: {e}")
+        
+        # One Redis round-trip per frame
+        self.redis.flush()
+    
+    def _handle_quote(self, quote: QuoteData):
+        """Enrich a decoded quote from the OI/prev close caches and publish it."""
+        # Add OI if cached
+        if quote.security_id in self._oi_cache:
+            quote.open_interest = self._oi_cache[quote.security_id]
+        
+        # Add prev_close if cached
+        if quote.security_id in self._prev_close_cache:
+            quote.prev_close = self._prev_close_cache[quote.security_id]
+        
+        self._stats['quotes_received'] += 1
+        self._stats['last_tick_time'] = datetime.now()
+        self.redis.publish_quote(quote)
+        
+        # Log every 10th quote
+        if self._stats['quotes_received'] % 10 == 1:
+            logger.info(f"Quote #{self._stats['quotes_received']}: ID={quote.security_id} LTP={quote.ltp} Vol={quote.volume}")
+        
+        if self._on_quote:
+            self._on_quote(quote)
+    
+    def _handle_quote_rows(self, rows: List[tuple]):
+        """
+        Publish batch-decoded quote rows (already enriched from the caches).
+        
+        QuoteData objects are only built when an on_quote callback is set.
+        """
+        first = self._stats['quotes_received']
+        self._stats['quotes_received'] += len(rows)
+        self._stats['last_tick_time'] = datetime.now()
+        self.redis.publish_quote_rows(rows)
+        
+        # Log every 10th quote
+        for i in range(-first % 10, len(rows), 10):
+            row = rows[i]
+            logger.info(f"Quote #{first + i + 1}: ID={row[0]} LTP={row[2]} Vol={row[6]}")
+        
+        if self._on_quote:
+            for row in rows:
+                self._on_quote(QuoteData(*row))
+    
+    def _handle_packet(self, data: memoryview, response_code: int, offset: int):
+        """Decode and dispatch one packet located at offset within a frame."""
+        if response_code == FeedResponseCode.TICKER_PACKET:
+            tick = BinaryParser.parse_ticker(data, offset)
+            if tick:
+                self._stats['ticks_received'] += 1
+                self._stats['last_tick_time'] = datetime.now()
+                self.redis.publish_tick(tick)
+                if self._on_tick:
+                    self._on_tick(tick)
+        
+        elif response_code == FeedResponseCode.QUOTE_PACKET:
+            quote = BinaryParser.parse_quote(data, offset)
+            if quote:
+                self._handle_quote(quote)
+        
+        elif response_code == FeedResponseCode.OI_PACKET:
+            oi_data = BinaryParser.parse_oi(data, offset)
+            if oi_data:
+                self._oi_cache[oi_data['security_id']] = oi_data['open_interest']
+        
+        elif response_code == FeedResponseCode.PREV_CLOSE_PACKET:
+            prev_data = BinaryParser.parse_prev_close(data, offset)
+            if prev_data:
+                self._prev_close_cache[prev_data['security_id']] = prev_data['prev_close']
+        
+        elif response_code == FeedResponseCode.FULL_PACKET:
+            depth = BinaryParser.parse_full_packet(data, offset)
+            if depth:
+                self._stats['quotes_received'] += 1
+                self.redis.publish_depth(depth)
+        
+        elif response_code == FeedResponseCode.DISCONNECT:
+            disc = BinaryParser.parse_disconnect(data, offset)
+            logger.warning(f"Disconnect packet received: {disc}")
+            if self._on_disconnect:
+                self._on_disconnect(disc)
+        
+        elif response_code == FeedResponseCode.INDEX_PACKET:
+            # Index packet - similar to ticker
+            pass
+        
+        elif response_code == FeedResponseCode.MARKET_STATUS_PACKET:
+            # Market status
+            pass
     
     async def _receive_loop(self):
         """Main loop to receive WebSocket messages."""
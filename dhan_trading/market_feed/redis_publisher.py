@@ -16,14 +16,26 @@ Streams:
 - dhan:ticks:stream
 - dhan:quotes:stream
 - dhan:depth:stream
+
+Quote encoding:
+- msgpack (default): quotes are buffered as positional rows (QUOTE_FIELDS
+  order; the batch decoder queues rows directly, without QuoteData
+  objects) and each flush publishes ONE
+  message holding a list of positional rows (QUOTE_FIELDS order), with the
+  PUBLISH and every XADD sent in a single pipeline round-trip.
+- json: one JSON object per quote (legacy format), still pipelined.
+
+Use QuoteData.from_payload() to decode either format on the subscriber side.
 """
 import os
 import sys
 import json
+import time
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, asdict
+from operator import attrgetter
+from typing import Optional, Dict, Any, List, Union
+from dataclasses import dataclass, asdict, fields
 
 try:
     import redis
@@ -31,6 +43,11 @@ except ImportError:
     redis = None
     print("WARNING: redis package not installed. Run: pip install redis")
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from dhan_trading.market_feed.feed_config import FeedConfig
@@ -102,13 +119,37 @@ class QuoteData:
     def to_json(self) -> str:
         return json.dumps(self.to_dict())
     
+    def to_row(self) -> tuple:
+        """Positional values in QUOTE_FIELDS order (msgpack wire format)."""
+        return _quote_row(self)
+    
     @classmethod
-    def from_dict(cls, data: Dict) -> 'QuoteData':
+    def from_dict(cls, data: Union[Dict, list, tuple]) -> 'QuoteData':
+        """
+        Build from a field dict, a raw stream entry (str/bytes values)
+        or a positional msgpack row.
+        """
+        if isinstance(data, (list, tuple)):
+            return cls(*data)
+        if any(isinstance(v, (str, bytes)) for v in data.values()):
+            return cls(**_coerce_stream_fields(data))
         return cls(**data)
     
     @classmethod
-    def from_json(cls, data: str) -> 'QuoteData':
-        return cls(**json.loads(data))
+    def from_json(cls, data: Union[str, bytes]) -> 'QuoteData':
+        """Decode a single-quote payload (JSON object or msgpack row)."""
+        payload = decode_payload(data)
+        if isinstance(payload, list) and payload and isinstance(payload[0], (list, tuple)):
+            raise ValueError("Payload holds a quote batch; use QuoteData.from_payload()")
+        return cls.from_dict(payload)
+    
+    @classmethod
+    def from_payload(cls, data: Union[str, bytes]) -> List['QuoteData']:
+        """Decode any pub/sub quote payload (single or batch, JSON or msgpack)."""
+        payload = decode_payload(data)
+        if isinstance(payload, list) and payload and isinstance(payload[0], (list, tuple)):
+            return [cls(*row) for row in payload]
+        return [cls.from_dict(payload)]
 
 
 @dataclass
@@ -151,11 +192,96 @@ class DepthData:
         return cls(**json.loads(data))
 
 
+QUOTE_FIELDS = tuple(f.name for f in fields(QuoteData))
+_quote_row = attrgetter(*QUOTE_FIELDS)
+
+_QUOTE_INT_FIELDS = {'security_id', 'exchange_segment', 'ltq', 'ltt', 'volume',
+                     'total_sell_qty', 'total_buy_qty', 'open_interest'}
+_QUOTE_FLOAT_FIELDS = {'ltp', 'atp', 'day_open', 'day_close', 'day_high', 'day_low',
+                       'prev_close', 'received_at'}
+
+
+def _coerce_stream_fields(data: Dict) -> Dict:
+    """Convert a Redis stream entry (str/bytes keys and values) to QuoteData kwargs."""
+    out = {}
+    for key, value in data.items():
+        key = key.decode('utf-8') if isinstance(key, bytes) else key
+        if key not in QUOTE_FIELDS:
+            continue
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        if isinstance(value, str):
+            if key in _QUOTE_INT_FIELDS:
+                value = int(float(value)) if value else 0
+            elif key in _QUOTE_FLOAT_FIELDS:
+                value = float(value) if value else 0.0
+        out[key] = value
+    return out
+
+
+def encode_quotes(quotes: List[QuoteData]) -> bytes:
+    """Pack quotes as a msgpack list of positional rows."""
+    return encode_quote_rows([_quote_row(q) for q in quotes])
+
+
+def encode_quote_rows(rows: List[tuple]) -> bytes:
+    """Pack positional rows (QUOTE_FIELDS order) as a msgpack list."""
+    if msgpack is None:
+        raise ImportError("msgpack package required: pip install msgpack")
+    return msgpack.packb(rows, use_bin_type=True)
+
+
+def decode_payload(data: Union[str, bytes]) -> Any:
+    """
+    Decode a pub/sub payload published in either encoding.
+    
+    JSON payloads always start with '{' or '['; msgpack quote payloads
+    start with an array header, so the first byte tells them apart.
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    if data[:1] in (b'{', b'['):
+        return json.loads(data)
+    if msgpack is None:
+        raise ImportError("msgpack package required: pip install msgpack")
+    return msgpack.unpackb(data, raw=False)
+
+
+# Stream entry fields (no prev_close), in entry order
+_STREAM_FIELDS = ('security_id', 'exchange_segment', 'ltp', 'ltq', 'ltt', 'atp', 'volume',
+                  'total_sell_qty', 'total_buy_qty', 'day_open', 'day_close', 'day_high',
+                  'day_low', 'open_interest', 'received_at')
+
+
+def _quote_stream_entries(rows: List[tuple]) -> List[Dict[str, Union[int, float]]]:
+    """
+    Flat fields for the quote stream (no nested objects), one dict per row.
+    
+    Values stay int/float: redis-py writes them with repr(), which is
+    the same text str() gave. The dict display with constant keys is
+    about twice as fast as dict(zip(_STREAM_FIELDS, ...)) per row.
+    """
+    return [
+        {'security_id': security_id, 'exchange_segment': segment, 'ltp': ltp, 'ltq': ltq,
+         'ltt': ltt, 'atp': atp, 'volume': volume, 'total_sell_qty': total_sell_qty,
+         'total_buy_qty': total_buy_qty, 'day_open': day_open, 'day_close': day_close,
+         'day_high': day_high, 'day_low': day_low, 'open_interest': open_interest or 0,
+         'received_at': received_at}
+        for (security_id, segment, ltp, ltq, ltt, atp, volume, total_sell_qty, total_buy_qty,
+             day_open, day_close, day_high, day_low, open_interest, _, received_at) in rows
+    ]
+
+
 class RedisPublisher:
     """
     Publishes market data to Redis.
     
     Uses both Pub/Sub (for real-time) and Streams (for persistence).
+    
+    Quotes are buffered and written in one pipeline per flush. A flush
+    happens when PUBLISH_BATCH_SIZE quotes are pending, when the oldest
+    pending quote is older than PUBLISH_FLUSH_MS, or when flush() is
+    called (the feed service flushes after every websocket frame).
     """
     
     def __init__(self, config: Optional[FeedConfig] = None):
@@ -172,11 +298,21 @@ class RedisPublisher:
         self._client: Optional[redis.Redis] = None
         self._connected = False
         
+        self._use_msgpack = self.config.REDIS_ENCODING == "msgpack"
+        if self._use_msgpack and msgpack is None:
+            logger.warning("msgpack not installed, publishing quotes as JSON")
+            self._use_msgpack = False
+        
+        # Pending quote rows (QUOTE_FIELDS order) for the next pipeline flush
+        self._pending: List[tuple] = []
+        self._pending_since = 0.0
+        
         # Stats
         self._stats = {
             'ticks_published': 0,
             'quotes_published': 0,
             'depth_published': 0,
+            'batches_published': 0,
             'errors': 0,
             'last_publish_time': None
         }
@@ -204,6 +340,7 @@ class RedisPublisher:
     def disconnect(self):
         """Disconnect from Redis."""
         if self._client:
+            self.flush()
             self._client.close()
             self._connected = False
             logger.info("Disconnected from Redis")
@@ -247,63 +384,110 @@ class RedisPublisher:
     
     def publish_quote(self, quote: QuoteData) -> bool:
         """
-        Publish quote data.
+        Queue quote data for the next pipelined flush.
         
         Args:
             quote: QuoteData object
         
         Returns:
-            True if published successfully
+            True if queued (or flushed) successfully
+        """
+        if not self._connected:
+            return False
+        
+        quote.received_at = time.time()
+        return self.publish_quote_rows([_quote_row(quote)])
+    
+    def publish_quote_rows(self, rows: List[tuple]) -> bool:
+        """
+        Queue positional quote rows (QUOTE_FIELDS order) for the next flush.
+        
+        Rows are published as given, received_at included; this is how
+        batch-decoded frames are published without building QuoteData
+        objects.
+        
+        Returns:
+            True if queued (or flushed) successfully
+        """
+        if not self._connected:
+            return False
+        
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.extend(rows)
+        
+        if (len(self._pending) >= self.config.PUBLISH_BATCH_SIZE or
+                (time.monotonic() - self._pending_since) * 1000 >= self.config.PUBLISH_FLUSH_MS):
+            return self.flush()
+        return True
+    
+    def publish_quotes(self, quotes: List[QuoteData]) -> bool:
+        """Publish several quotes (e.g. one websocket frame) in one round-trip."""
+        if not self._connected:
+            return False
+        
+        now = time.time()
+        for quote in quotes:
+            quote.received_at = now
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.extend(map(_quote_row, quotes))
+        return self.flush()
+    
+    def flush(self) -> bool:
+        """
+        Send all pending quotes in a single pipeline.
+        
+        Pub/Sub gets one msgpack batch message (or one JSON message per
+        quote); the stream gets one flat entry per quote.
+        
+        Returns:
+            True if published successfully (or nothing was pending)
         """
+        if not self._pending:
+            return True
         if not self._connected:
             return False
         
+        batch, self._pending = self._pending, []
+        
         try:
-            quote.received_at = datetime.now().timestamp()
-            data = quote.to_json()
+            pipe = self._client.pipeline(transaction=False)
             
             # Pub/Sub - real-time
-            num_subscribers = self._client.publish(CHANNEL_QUOTES, data)
+            if self._use_msgpack:
+                pipe.publish(CHANNEL_QUOTES, encode_quote_rows(batch))
+            else:
+                for row in batch:
+                    pipe.publish(CHANNEL_QUOTES, json.dumps(dict(zip(QUOTE_FIELDS, row))))
             
             # Stream - persistent
-            # Convert to flat dict for Redis Stream (no nested objects)
-            stream_data = {
-                'security_id': str(quote.security_id),
-                'exchange_segment': str(quote.exchange_segment),
-                'ltp': str(quote.ltp),
-                'ltq': str(quote.ltq),
-                'ltt': str(quote.ltt),
-                'atp': str(quote.atp),
-                'volume': str(quote.volume),
-                'total_sell_qty': str(quote.total_sell_qty),
-                'total_buy_qty': str(quote.total_buy_qty),
-                'day_open': str(quote.day_open),
-                'day_close': str(quote.day_close),
-                'day_high': str(quote.day_high),
-                'day_low': str(quote.day_low),
-                'open_interest': str(quote.open_interest or 0),
-                'received_at': str(quote.received_at)
-            }
+            for entry in _quote_stream_entries(batch):
+                pipe.xadd(
+                    STREAM_QUOTES,
+                    entry,
+                    maxlen=STREAM_MAX_LEN,
+                    approximate=True
+                )
             
-            self._client.xadd(
-                STREAM_QUOTES,
-                stream_data,
-                maxlen=STREAM_MAX_LEN,
-                approximate=True
-            )
+            results = pipe.execute()
+            num_subscribers = results[0] if results else 0
             
-            self._stats['quotes_published'] += 1
+            before = self._stats['quotes_published']
+            self._stats['quotes_published'] += len(batch)
+            self._stats['batches_published'] += 1
             self._stats['last_publish_time'] = datetime.now()
             
             # Log periodically
-            if self._stats['quotes_published'] % 100 == 0:
-                logger.info(f"Published {self._stats['quotes_published']} quotes, "
+            if self._stats['quotes_published'] // 1000 != before // 1000:
+                logger.info(f"Published {self._stats['quotes_published']} quotes in "
+                           f"{self._stats['batches_published']} batches, "
                            f"{num_subscribers} subscribers")
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to publish quote: {e}")
+            logger.error(f"Failed to publish {len(batch)} quotes: {e}")
             self._stats['errors'] += 1
             return False
     
@@ -348,6 +532,8 @@ class RedisPublisher:
         """Get publisher statistics."""
         return {
             **self._stats,
+            'pending_quotes': len(self._pending),
+            'encoding': 'msgpack' if self._use_msgpack else 'json',
             'connected': self._connected
         }
     
@@ -392,6 +578,7 @@ if __name__ == "__main__":
             )
             
             publisher.publish_quote(quote)
+            publisher.flush()
             print(f"Published quote {i+1}: LTP={quote.ltp}")
             time.sleep(0.5)
         
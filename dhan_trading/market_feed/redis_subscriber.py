@@ -70,6 +70,7 @@ class RedisSubscriber(ABC):
         
         self.config = config or FeedConfig()
         self._client: Optional[redis.Redis] = None
+        self._pubsub_client: Optional[redis.Redis] = None  # Raw bytes (msgpack payloads)
         self._pubsub: Optional[redis.client.PubSub] = None
         self._connected = False
         self._running = False
@@ -98,6 +99,13 @@ class RedisSubscriber(ABC):
                 socket_timeout=5,
                 socket_connect_timeout=5
             )
+            self._pubsub_client = redis.Redis(
+                host=self.config.REDIS_HOST,
+                port=self.config.REDIS_PORT,
+                decode_responses=False,
+                socket_timeout=5,
+                socket_connect_timeout=5
+            )
             # Test connection
             self._client.ping()
             self._connected = True
@@ -121,6 +129,8 @@ class RedisSubscriber(ABC):
         
         if self._client:
             self._client.close()
+        if self._pubsub_client:
+            self._pubsub_client.close()
         
         self._connected = False
         logger.info("Subscriber disconnected from Redis")
@@ -140,7 +150,7 @@ class RedisSubscriber(ABC):
                 return False
         
         try:
-            self._pubsub = self._client.pubsub()
+            self._pubsub = self._pubsub_client.pubsub()
             self._pubsub.subscribe(*channels)
             self._channels = channels
             logger.info(f"Subscribed to channels: {channels}")
@@ -155,6 +165,8 @@ class RedisSubscriber(ABC):
             return
         
         channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode('utf-8')
         data = message['data']
         
         self._stats['messages_received'] += 1
@@ -167,9 +179,10 @@ class RedisSubscriber(ABC):
                 self.on_tick(tick)
                 
             elif channel == CHANNEL_QUOTES:
-                quote = QuoteData.from_json(data)
-                self._stats['quotes_received'] += 1
-                self.on_quote(quote)
+                # One message may carry a whole batch of quotes
+                for quote in QuoteData.from_payload(data):
+                    self._stats['quotes_received'] += 1
+                    self.on_quote(quote)
                 
             elif channel == CHANNEL_DEPTH:
                 depth = DepthData.from_json(data)
@@ -19,7 +19,6 @@ import sys
 import os
 import time
 import redis
-import json
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from typing import Dict, List, Optional, Tuple
@@ -48,6 +47,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from dotenv import load_dotenv
 load_dotenv()
 
+from dhan_trading.market_feed.redis_publisher import QuoteData
+
 
 # Configure PyQtGraph
 pg.setConfigOptions(antialias=True, background='k', foreground='w')
@@ -119,16 +120,17 @@ class RedisQuoteReader(QThread):
             self.connection_status.emit(True, "Connected to Redis")
             
             # Subscribe to quotes channel
-            self._pubsub = self._client.pubsub()
+            # Raw-bytes client: quotes may arrive as msgpack batches
+            self._pubsub = redis.Redis(host='localhost', port=6379).pubsub()
             self._pubsub.subscribe('dhan:quotes')
             
             while self._running:
                 message = self._pubsub.get_message(timeout=0.1)
                 if message and message['type'] == 'message':
                     try:
-                        data = json.loads(message['data'])
-                        self.quote_received.emit(data)
-                    except json.JSONDecodeError:
+                        for quote in QuoteData.from_payload(message['data']):
+                            self.quote_received.emit(quote.to_dict())
+                    except (ValueError, TypeError):
                         pass
                         
         except redis.ConnectionError as e:
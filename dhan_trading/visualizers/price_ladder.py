@@ -0,0 +1,261 @@
+"""
+Price Ladder
+============
+Array-backed volume-at-price ladder for volume profiles.
+
+Volume is stored in NumPy arrays indexed by tick bucket
+(``round(price / tick_size)``), so adding a trade is one array write.
+The Point of Control is tracked as trades arrive; the Value Area is
+computed exactly, over the occupied levels only, when it is next read
+(e.g. on a display refresh) rather than on every trade.
+
+Kept free of Qt imports so it can be used (and tested) headless.
+
+Usage:
+    ladder = PriceLadder(tick_size=10.0)
+    ladder.add(24510.5, 150, side=1)
+    ladder.poc_price, ladder.value_area_low, ladder.value_area_high
+"""
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+VALUE_AREA_PCT = 0.7
+
+
+class PriceLadder:
+    """
+    Volume at price (total, buy, sell) for one instrument.
+
+    Bucket k holds trades priced in [(k - 0.5), (k + 0.5)) * tick_size and
+    is reported at price k * tick_size. POC and Value Area are stored as
+    bucket indices.
+
+    The Value Area follows the usual rule: start at the POC and keep
+    adding the larger neighbouring (non-empty) level until it holds 70%
+    of the volume. Trades only mark it stale; reading value_area_low or
+    value_area_high re-walks it from the POC (no sorting), so it always
+    matches a full recomputation.
+    """
+
+    def __init__(self, tick_size: float, value_area_pct: float = VALUE_AREA_PCT,
+                 capacity: int = 256):
+        self.tick_size = tick_size
+        self.value_area_pct = value_area_pct
+
+        self._base = 0  # Bucket index of slot 0
+        self._total = np.zeros(capacity, dtype=np.int64)
+        self._buy = np.zeros(capacity, dtype=np.int64)
+        self._sell = np.zeros(capacity, dtype=np.int64)
+
+        self.volume = 0
+        self.levels = 0
+        self._lowest: Optional[int] = None   # Lowest non-empty bucket
+        self._highest: Optional[int] = None  # Highest non-empty bucket
+        self._poc: Optional[int] = None
+        self._va_low: Optional[int] = None
+        self._va_high: Optional[int] = None
+        self._va_stale = False
+
+    # ------------------------------------------------------------------
+    # Prices and storage
+    # ------------------------------------------------------------------
+
+    def bucket(self, price: float) -> int:
+        """Tick bucket index for a price."""
+        return round(price / self.tick_size)
+
+    def price(self, bucket: Optional[int]) -> float:
+        """Price reported for a bucket (0.0 if None)."""
+        return bucket * self.tick_size if bucket is not None else 0.0
+
+    def _ensure(self, low: int, high: int):
+        """Grow the arrays so buckets low..high fit."""
+        capacity = len(self._total)
+        if low >= self._base and high < self._base + capacity:
+            return
+
+        new_low = min(low, self._base) if self.levels else low
+        new_high = max(high, self._base + capacity - 1) if self.levels else high
+        new_capacity = max(capacity * 2, new_high - new_low + 1)
+        # Leave headroom on both sides for a market drifting either way
+        new_base = new_low - (new_capacity - (new_high - new_low + 1)) // 2
+        shift = self._base - new_base
+
+        for name in ('_total', '_buy', '_sell'):
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=np.int64)
+            if self.levels:
+                grown[shift:shift + capacity] = old
+            setattr(self, name, grown)
+        self._base = new_base
+
+    def _slot(self, bucket: int) -> int:
+        return bucket - self._base
+
+    def volume_at(self, bucket: int) -> int:
+        slot = self._slot(bucket)
+        if 0 <= slot < len(self._total):
+            return int(self._total[slot])
+        return 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, price: float, volume: int, side: int):
+        """
+        Add traded volume at a price.
+
+        Args:
+            price: Trade price (bucketed by tick_size).
+            volume: Volume delta (ignored if <= 0).
+            side: >= 0 attributes to buy, < 0 to sell.
+        """
+        if volume <= 0:
+            return
+
+        k = self.bucket(price)
+        self._ensure(k, k)
+        slot = k - self._base
+
+        if self._total[slot] == 0:
+            self.levels += 1
+            self._lowest = k if self._lowest is None else min(self._lowest, k)
+            self._highest = k if self._highest is None else max(self._highest, k)
+
+        self._total[slot] += volume
+        if side >= 0:
+            self._buy[slot] += volume
+        else:
+            self._sell[slot] += volume
+        self.volume += volume
+
+        # Ties go to the lower price, as np.argmax does in add_many()
+        if self._poc is None:
+            self._poc = k
+        else:
+            poc_volume = self._total[self._poc - self._base]
+            if self._total[slot] > poc_volume or (self._total[slot] == poc_volume and k < self._poc):
+                self._poc = k
+        self._va_stale = True
+
+    def add_many(self, prices: np.ndarray, volumes: np.ndarray, sides: np.ndarray):
+        """
+        Add many trades in one vectorized pass (historical replay).
+
+        Args:
+            prices: Trade prices.
+            volumes: Volume deltas (entries <= 0 are ignored).
+            sides: >= 0 for buy, < 0 for sell.
+        """
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.asarray(volumes, dtype=np.int64)
+        sides = np.asarray(sides)
+
+        keep = volumes > 0
+        if not keep.any():
+            return
+        prices, volumes, sides = prices[keep], volumes[keep], sides[keep]
+
+        # np.rint rounds half to even, like round() in bucket()
+        buckets = np.rint(prices / self.tick_size).astype(np.int64)
+        self._ensure(int(buckets.min()), int(buckets.max()))
+        slots = buckets - self._base
+        capacity = len(self._total)
+
+        buy = sides >= 0
+        self._total += np.bincount(slots, weights=volumes, minlength=capacity).astype(np.int64)
+        self._buy += np.bincount(slots[buy], weights=volumes[buy], minlength=capacity).astype(np.int64)
+        self._sell += np.bincount(slots[~buy], weights=volumes[~buy], minlength=capacity).astype(np.int64)
+        self.volume += int(volumes.sum())
+
+        occupied = np.flatnonzero(self._total)
+        self.levels = len(occupied)
+        self._lowest = int(occupied[0]) + self._base
+        self._highest = int(occupied[-1]) + self._base
+        self._poc = int(np.argmax(self._total)) + self._base
+        self._va_stale = True
+
+    # ------------------------------------------------------------------
+    # Value Area
+    # ------------------------------------------------------------------
+
+    def _refresh_value_area(self):
+        """Walk the area out from the POC over all non-empty levels if stale."""
+        if not self._va_stale:
+            return
+        self._va_stale = False
+        self._va_low = self._va_high = self._poc
+        va_volume = self.volume_at(self._poc)
+        target = self.volume * self.value_area_pct
+        if va_volume >= target:
+            return
+
+        # Non-empty levels as plain lists: the walk is pure Python ints
+        lowest = self._lowest - self._base
+        segment = self._total[lowest:self._highest - self._base + 1]
+        occupied = np.flatnonzero(segment)
+        buckets = (occupied + self._lowest).tolist()
+        volumes = segment[occupied].tolist()
+        last = len(buckets) - 1
+
+        low = bisect_left(buckets, self._va_low)
+        high = bisect_left(buckets, self._va_high)
+
+        while va_volume < target and (low > 0 or high < last):
+            low_vol = volumes[low - 1] if low > 0 else 0
+            high_vol = volumes[high + 1] if high < last else 0
+
+            if low > 0 and (low_vol >= high_vol or high == last):
+                low -= 1
+                va_volume += low_vol
+            else:
+                high += 1
+                va_volume += high_vol
+
+        self._va_low = buckets[low]
+        self._va_high = buckets[high]
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    @property
+    def poc_price(self) -> float:
+        return self.price(self._poc)
+
+    @property
+    def poc_volume(self) -> int:
+        return self.volume_at(self._poc) if self._poc is not None else 0
+
+    @property
+    def value_area_low(self) -> float:
+        self._refresh_value_area()
+        return self.price(self._va_low)
+
+    @property
+    def value_area_high(self) -> float:
+        self._refresh_value_area()
+        return self.price(self._va_high)
+
+    def levels_descending(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Non-empty levels, highest price first: (prices, total, buy, sell)."""
+        if not self.levels:
+            empty = np.array([], dtype=np.int64)
+            return np.array([], dtype=float), empty, empty, empty
+
+        slots = np.flatnonzero(self._total)[::-1]
+        prices = (slots + self._base) * self.tick_size
+        return prices, self._total[slots], self._buy[slots], self._sell[slots]
+
+    def to_dict(self, which: str = 'total') -> Dict[float, int]:
+        """Price -> volume for 'total', 'buy' or 'sell' (non-zero levels only)."""
+        values = {'total': self._total, 'buy': self._buy, 'sell': self._sell}[which]
+        slots = np.flatnonzero(values)
+        return {
+            float(k) * self.tick_size: int(v)
+            for k, v in zip((slots + self._base).tolist(), values[slots].tolist())
+        }
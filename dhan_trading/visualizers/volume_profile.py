@@ -28,6 +28,8 @@ from urllib.parse import quote_plus
 import threading
 import time
 
+import numpy as np
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QComboBox, QGroupBox, QFrame, QSplitter,
@@ -46,6 +48,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from dhan_trading.market_feed.redis_subscriber import RedisSubscriber, CHANNEL_QUOTES
 from dhan_trading.market_feed.redis_publisher import QuoteData
 from dhan_trading.market_feed.instrument_selector import InstrumentSelector
+from dhan_trading.visualizers.price_ladder import PriceLadder
 from dhan_trading.db_setup import get_engine, DHAN_DB_NAME
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -63,11 +66,6 @@ class VolumeProfileData:
     security_id: int
     symbol: str = ""
     
-    # Price -> Volume mapping (total, buy, sell)
-    volume_at_price: Dict[float, int] = field(default_factory=dict)
-    buy_volume_at_price: Dict[float, int] = field(default_factory=dict)
-    sell_volume_at_price: Dict[float, int] = field(default_factory=dict)
-    
     # Stats
     total_volume: int = 0
     total_buy_volume: int = 0
@@ -99,6 +97,60 @@ class VolumeProfileData:
     historical_loaded: bool = False
     historical_quote_count: int = 0
     
+    # Volume at price (created on first trade with the current tick_size)
+    _ladder: Optional[PriceLadder] = field(default=None, repr=False)
+    
+    @property
+    def ladder(self) -> PriceLadder:
+        if self._ladder is None:
+            self._ladder = PriceLadder(self.tick_size)
+        return self._ladder
+    
+    @property
+    def price_levels(self) -> int:
+        """Number of price levels with volume."""
+        return self._ladder.levels if self._ladder else 0
+    
+    @property
+    def volume_at_price(self) -> Dict[float, int]:
+        """Price -> total volume (snapshot)."""
+        return self._ladder.to_dict('total') if self._ladder else {}
+    
+    @property
+    def buy_volume_at_price(self) -> Dict[float, int]:
+        """Price -> buy volume (snapshot)."""
+        return self._ladder.to_dict('buy') if self._ladder else {}
+    
+    @property
+    def sell_volume_at_price(self) -> Dict[float, int]:
+        """Price -> sell volume (snapshot)."""
+        return self._ladder.to_dict('sell') if self._ladder else {}
+    
+    def _update_price_stats(self, price: float):
+        """Track open/high/low for a new quote."""
+        # Set open price (first quote)
+        if self.open_price == 0.0:
+            self.open_price = price
+        
+        # Update high/low
+        self.high_price = max(self.high_price, price)
+        if self.low_price == float('inf'):
+            self.low_price = price
+        else:
+            self.low_price = min(self.low_price, price)
+    
+    def _add_volume(self, price: float, volume_delta: int, tick_direction: int):
+        """Add volume at price, attributed to buy or sell by tick direction."""
+        self.ladder.add(price, volume_delta, tick_direction)
+        
+        # Attribute to buy or sell based on tick direction
+        if tick_direction >= 0:  # Uptick or zero-tick with buy bias
+            self.total_buy_volume += volume_delta
+        else:  # Downtick
+            self.total_sell_volume += volume_delta
+        
+        self._update_poc()
+    
     def add_historical_quote(self, ltp: float, volume: int, prev_volume: int = 0):
         """
         Add a historical quote to build initial profile.
@@ -112,16 +164,7 @@ class VolumeProfileData:
             volume: Cumulative volume at this quote
             prev_volume: Previous cumulative volume (to calculate delta)
         """
-        # Set open price (first quote)
-        if self.open_price == 0.0:
-            self.open_price = ltp
-        
-        # Update high/low
-        self.high_price = max(self.high_price, ltp)
-        if self.low_price == float('inf'):
-            self.low_price = ltp
-        else:
-            self.low_price = min(self.low_price, ltp)
+        self._update_price_stats(ltp)
         
         # Determine tick direction for buy/sell attribution
         tick_direction = self._get_tick_direction(ltp)
@@ -129,26 +172,59 @@ class VolumeProfileData:
         self.previous_price = self.last_price
         self.last_price = ltp
         
-        # Bucket the price
-        bucketed_price = self._bucket_price(ltp)
-        
         # Calculate volume delta
         if volume > prev_volume:
-            volume_delta = volume - prev_volume
-            self.volume_at_price[bucketed_price] = self.volume_at_price.get(bucketed_price, 0) + volume_delta
-            
-            # Attribute to buy or sell based on tick direction
-            if tick_direction >= 0:  # Uptick or zero-tick with buy bias
-                self.buy_volume_at_price[bucketed_price] = self.buy_volume_at_price.get(bucketed_price, 0) + volume_delta
-                self.total_buy_volume += volume_delta
-            else:  # Downtick
-                self.sell_volume_at_price[bucketed_price] = self.sell_volume_at_price.get(bucketed_price, 0) + volume_delta
-                self.total_sell_volume += volume_delta
+            self._add_volume(ltp, volume - prev_volume, tick_direction)
         
         # Track total volume (last cumulative value)
         self.total_volume = max(self.total_volume, volume)
         self.historical_quote_count += 1
     
+    def add_historical_quotes(self, ltps: np.ndarray, volumes: np.ndarray):
+        """
+        Build the profile from a session of historical quotes in one pass.
+        
+        Same attribution as calling add_historical_quote() per row with
+        prev_volume set to the previous row's volume.
+        
+        Args:
+            ltps: Last traded prices in time order
+            volumes: Cumulative volumes in time order
+        """
+        ltps = np.asarray(ltps, dtype=float)
+        volumes = np.asarray(volumes, dtype=np.int64)
+        if len(ltps) == 0:
+            return
+        
+        self._update_price_stats(float(ltps[0]))
+        self.high_price = max(self.high_price, float(ltps.max()))
+        self.low_price = min(self.low_price, float(ltps.min()))
+        
+        # Tick rule: sign of each price change, zero-ticks carry the last direction
+        directions = np.sign(np.diff(ltps, prepend=self.last_price)).astype(np.int64)
+        if self.last_price == 0.0:
+            directions[0] = 1
+        elif directions[0] == 0:
+            directions[0] = self.last_tick_direction or 1
+        carry = np.maximum.accumulate(np.where(directions != 0, np.arange(len(directions)), 0))
+        directions = directions[carry]
+        
+        # Volume deltas against the previous row (first row against 0)
+        deltas = np.diff(volumes, prepend=0)
+        traded = deltas > 0
+        buys = traded & (directions >= 0)
+        
+        self.ladder.add_many(ltps[traded], deltas[traded], directions[traded])
+        self.total_buy_volume += int(deltas[buys].sum())
+        self.total_sell_volume += int(deltas[traded & ~buys].sum())
+        self._update_poc()
+        
+        self.previous_price = float(ltps[-2]) if len(ltps) > 1 else self.last_price
+        self.last_price = float(ltps[-1])
+        self.last_tick_direction = int(directions[-1])
+        self.total_volume = max(self.total_volume, int(volumes.max()))
+        self.historical_quote_count += len(ltps)
+    
     def _get_tick_direction(self, current_price: float) -> int:
         """
         Determine tick direction using tick rule.
@@ -175,8 +251,9 @@ class VolumeProfileData:
         """Called after all historical quotes are loaded."""
         self.historical_loaded = True
         self._update_poc()
+        self.refresh_value_area()
         logger.info(f"Historical load complete for {self.symbol}: {self.historical_quote_count} quotes, "
-                   f"{len(self.volume_at_price)} price levels, volume={self.total_volume:,}")
+                   f"{self.price_levels} price levels, volume={self.total_volume:,}")
     
     def add_quote(self, quote: QuoteData):
         """Add a real-time quote to the volume profile with tick-based buy/sell attribution."""
@@ -186,16 +263,7 @@ class VolumeProfileData:
         # Increment update counter
         self.update_count += 1
         
-        # Set open price (first quote)
-        if self.open_price == 0.0:
-            self.open_price = price
-        
-        # Update high/low
-        self.high_price = max(self.high_price, price)
-        if self.low_price == float('inf'):
-            self.low_price = price
-        else:
-            self.low_price = min(self.low_price, price)
+        self._update_price_stats(price)
         
         # Determine tick direction for buy/sell attribution
         tick_direction = self._get_tick_direction(price)
@@ -203,81 +271,27 @@ class VolumeProfileData:
         self.previous_price = self.last_price
         self.last_price = price
         
-        # Bucket the price
-        bucketed_price = self._bucket_price(price)
-        
         # Calculate volume delta (difference from last total)
         # Note: volume in quote is cumulative, we want incremental
         if volume > self.total_volume:
-            volume_delta = volume - self.total_volume
-            self.volume_at_price[bucketed_price] = self.volume_at_price.get(bucketed_price, 0) + volume_delta
-            
-            # Attribute to buy or sell based on tick direction
-            if tick_direction >= 0:  # Uptick or zero-tick with buy bias
-                self.buy_volume_at_price[bucketed_price] = self.buy_volume_at_price.get(bucketed_price, 0) + volume_delta
-                self.total_buy_volume += volume_delta
-            else:  # Downtick
-                self.sell_volume_at_price[bucketed_price] = self.sell_volume_at_price.get(bucketed_price, 0) + volume_delta
-                self.total_sell_volume += volume_delta
-            
+            self._add_volume(price, volume - self.total_volume, tick_direction)
             self.total_volume = volume
-        
-        # Update POC
-        self._update_poc()
-    
-    def _bucket_price(self, price: float) -> float:
-        """Bucket price to nearest tick size."""
-        return round(price / self.tick_size) * self.tick_size
     
     def _update_poc(self):
-        """Update Point of Control."""
-        if not self.volume_at_price:
+        """Copy Point of Control from the ladder (O(1), every trade)."""
+        if not self.price_levels:
             return
         
-        # Find price with max volume
-        self.poc_price = max(self.volume_at_price.keys(), key=lambda p: self.volume_at_price[p])
-        self.poc_volume = self.volume_at_price[self.poc_price]
-        
-        # Calculate Value Area (70% of volume)
-        self._calculate_value_area()
+        self.poc_price = self._ladder.poc_price
+        self.poc_volume = self._ladder.poc_volume
     
-    def _calculate_value_area(self):
-        """Calculate Value Area (70% of total volume)."""
-        if not self.volume_at_price or self.total_volume == 0:
+    def refresh_value_area(self):
+        """Copy the exact Value Area from the ladder (walks its levels; call before display)."""
+        if not self.price_levels:
             return
         
-        target_volume = self.total_volume * 0.7
-        
-        # Start from POC and expand
-        prices = sorted(self.volume_at_price.keys())
-        if not prices:
-            return
-        
-        poc_idx = prices.index(self.poc_price) if self.poc_price in prices else len(prices) // 2
-        
-        va_volume = self.volume_at_price.get(self.poc_price, 0)
-        low_idx = poc_idx
-        high_idx = poc_idx
-        
-        while va_volume < target_volume and (low_idx > 0 or high_idx < len(prices) - 1):
-            # Check which direction to expand
-            low_vol = self.volume_at_price.get(prices[low_idx - 1], 0) if low_idx > 0 else 0
-            high_vol = self.volume_at_price.get(prices[high_idx + 1], 0) if high_idx < len(prices) - 1 else 0
-            
-            if low_vol >= high_vol and low_idx > 0:
-                low_idx -= 1
-                va_volume += low_vol
-            elif high_idx < len(prices) - 1:
-                high_idx += 1
-                va_volume += high_vol
-            elif low_idx > 0:
-                low_idx -= 1
-                va_volume += low_vol
-            else:
-                break
-        
-        self.value_area_low = prices[low_idx]
-        self.value_area_high = prices[high_idx]
+        self.value_area_low = self._ladder.value_area_low
+        self.value_area_high = self._ladder.value_area_high
     
     def get_profile_bars(self) -> List[Tuple[float, int, float, int, int, int]]:
         """
@@ -285,29 +299,18 @@ class VolumeProfileData:
         side: 1 = buy dominant (green), -1 = sell dominant (red), 0 = neutral
         Returns sorted by price descending (high to low).
         """
-        if not self.volume_at_price:
+        if not self.price_levels:
             return []
         
-        max_vol = max(self.volume_at_price.values()) if self.volume_at_price else 1
+        prices, volumes, buys, sells = self._ladder.levels_descending()
+        max_vol = int(volumes.max())
+        pcts = volumes / max_vol if max_vol > 0 else np.zeros(len(volumes))
         
-        bars = []
-        for price in sorted(self.volume_at_price.keys(), reverse=True):
-            vol = self.volume_at_price[price]
-            pct = vol / max_vol if max_vol > 0 else 0
-            buy_vol = self.buy_volume_at_price.get(price, 0)
-            sell_vol = self.sell_volume_at_price.get(price, 0)
-            
-            # Determine dominant side
-            if buy_vol > sell_vol:
-                side = 1  # Buy dominant - GREEN
-            elif sell_vol > buy_vol:
-                side = -1  # Sell dominant - RED
-            else:
-                side = 0  # Neutral
-            
-            bars.append((price, vol, pct, buy_vol, sell_vol, side))
+        # Dominant side: 1 = buy (GREEN), -1 = sell (RED), 0 = neutral
+        sides = np.sign(buys - sells)
         
-        return bars
+        return list(zip(prices.tolist(), volumes.tolist(), pcts.tolist(),
+                        buys.tolist(), sells.tolist(), sides.tolist()))
 
 
 class VolumeProfileWidget(QWidget):
@@ -347,7 +350,7 @@ class VolumeProfileWidget(QWidget):
         # Background
         painter.fillRect(self.rect(), QColor("#FAFAFA"))
         
-        if not self.profile_data or not self.profile_data.volume_at_price:
+        if not self.profile_data or not self.profile_data.price_levels:
             painter.setPen(QPen(self.text_color))
             painter.setFont(QFont("Segoe UI", 12))
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Waiting for data...")
@@ -752,14 +755,11 @@ class VolumeProfileVisualizer(QMainWindow):
                 if rows:
                     logger.info(f"Loading {len(rows)} historical quotes for {profile.symbol}")
                     
-                    prev_volume = 0
-                    for row in rows:
-                        ltp = float(row[0])
-                        volume = int(row[1]) if row[1] else 0
-                        
-                        profile.add_historical_quote(ltp, volume, prev_volume)
-                        prev_volume = volume
+                    ltps = np.array([float(row[0]) for row in rows])
+                    volumes = np.array([int(row[1]) if row[1] else 0 for row in rows], dtype=np.int64)
                     
+                    # One vectorized pass instead of a Python loop per quote
+                    profile.add_historical_quotes(ltps, volumes)
                     profile.finalize_historical_load()
                 else:
                     logger.info(f"No historical data for {profile.symbol} on {target_date}")
@@ -1232,11 +1232,12 @@ class VolumeProfileVisualizer(QMainWindow):
             self.status_bar.showMessage("📥 Reloading historical data...")
             QApplication.processEvents()
             
-            today = date.today()
-            market_open = datetime.combine(today, MARKET_OPEN_TIME)
+            target_date = self._get_target_trading_date()
+            market_open = datetime.combine(target_date, MARKET_OPEN_TIME)
             self._load_historical_for_instrument(
                 self.current_instrument, 
                 self.profiles[self.current_instrument],
+                target_date,
                 market_open
             )
             
@@ -1246,6 +1247,7 @@ class VolumeProfileVisualizer(QMainWindow):
         """Update the display."""
         if self.current_instrument and self.current_instrument in self.profiles:
             profile = self.profiles[self.current_instrument]
+            profile.refresh_value_area()
             
             # Update profile widget
             self.profile_widget.set_profile(profile)
@@ -1260,7 +1262,7 @@ class VolumeProfileVisualizer(QMainWindow):
             self.volume_label.setText(f"Volume: {profile.total_volume:,}")
             
             # Update status bar with historical and real-time info
-            price_levels = len(profile.volume_at_price)
+            price_levels = profile.price_levels
             hist_info = f"Hist: {profile.historical_quote_count:,}" if profile.historical_loaded else "Loading..."
             buy_pct = (profile.total_buy_volume / profile.total_volume * 100) if profile.total_volume > 0 else 0
             sell_pct = (profile.total_sell_volume / profile.total_volume * 100) if profile.total_volume > 0 else 0
@@ -16,6 +16,170 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class RollingSMABreadth:
+    """
+    Streaming % above SMA state over a time x symbol grid.
+    
+    Keeps the last max(periods) + 1 closes of every symbol in a preallocated
+    ring buffer together with a running sum and count of valid closes per
+    symbol and period, so appending a 5-minute bar costs O(symbols * periods)
+    instead of re-rolling the whole session. A missing close (NaN) makes the
+    SMA invalid until it leaves the window, the same as pandas
+    rolling(min_periods=period) over the reindexed matrix.
+    
+    The latest row can be rewound and replayed, which is how a still-forming
+    bar that was revised by the next fetch is handled.
+    """
+    
+    def __init__(self, periods: List[int]):
+        self.periods = list(periods)
+        self.capacity = max(self.periods) + 1
+        self.symbols: List[str] = []
+        self.timestamps: Optional[pd.Index] = None
+        self._ring = np.empty((self.capacity, 0))
+        self._sums = np.empty((len(self.periods), 0))
+        self._valid = np.empty((len(self.periods), 0), dtype=np.int64)
+        # Per-row breadth: count_above / total_valid per period + total_stocks
+        self._counts = np.empty((0, 2 * len(self.periods) + 1), dtype=np.int64)
+        self._rows = 0
+    
+    def __len__(self) -> int:
+        return self._rows
+    
+    def seed(self, timestamps: pd.Index, symbols: List[str], close_matrix: np.ndarray,
+             counts: np.ndarray):
+        """
+        Load state from a full calculation.
+        
+        Args:
+            timestamps: Sorted row index of close_matrix
+            symbols: Column labels of close_matrix
+            close_matrix: Closes, rows = timestamps, cols = symbols (NaN = no bar)
+            counts: Per-row breadth counts in the layout of _counts
+        """
+        n_rows, n_symbols = close_matrix.shape
+        self.symbols = list(symbols)
+        self.timestamps = timestamps
+        
+        self._ring = np.full((self.capacity, n_symbols), np.nan)
+        start = max(0, n_rows - self.capacity)
+        for t in range(start, n_rows):
+            self._ring[t % self.capacity] = close_matrix[t]
+        
+        self._sums = np.zeros((len(self.periods), n_symbols))
+        self._valid = np.zeros((len(self.periods), n_symbols), dtype=np.int64)
+        for k, period in enumerate(self.periods):
+            window = close_matrix[max(0, n_rows - period):]
+            self._sums[k] = np.nansum(window, axis=0)
+            self._valid[k] = (~np.isnan(window)).sum(axis=0)
+        
+        self._counts = np.array(counts, dtype=np.int64)
+        self._rows = n_rows
+    
+    def _append(self, closes: np.ndarray) -> np.ndarray:
+        """Push one row of closes; returns its breadth counts."""
+        t = self._rows
+        present = ~np.isnan(closes)
+        values = np.where(present, closes, 0.0)
+        
+        n_periods = len(self.periods)
+        row = np.empty(2 * n_periods + 1, dtype=np.int64)
+        for k, period in enumerate(self.periods):
+            self._sums[k] += values
+            self._valid[k] += present
+            if t >= period:
+                old = self._ring[(t - period) % self.capacity]
+                old_present = ~np.isnan(old)
+                self._sums[k] -= np.where(old_present, old, 0.0)
+                self._valid[k] -= old_present
+            
+            valid = self._valid[k] == period
+            above = valid & (closes > self._sums[k] / period)
+            row[k] = above.sum()
+            row[n_periods + k] = valid.sum()
+        row[-1] = present.sum()
+        
+        self._ring[t % self.capacity] = closes
+        self._rows = t + 1
+        return row
+    
+    def _pop(self):
+        """Rewind the latest row."""
+        t = self._rows - 1
+        slot = t % self.capacity
+        closes = self._ring[slot]
+        present = ~np.isnan(closes)
+        values = np.where(present, closes, 0.0)
+        
+        for k, period in enumerate(self.periods):
+            self._sums[k] -= values
+            self._valid[k] -= present
+            if t >= period:
+                old = self._ring[(t - period) % self.capacity]
+                old_present = ~np.isnan(old)
+                self._sums[k] += np.where(old_present, old, 0.0)
+                self._valid[k] += old_present
+        
+        self._ring[slot] = np.nan
+        self._rows = t
+    
+    def update(self, stock_data: Dict[str, pd.DataFrame]) -> bool:
+        """
+        Advance the state to the end of stock_data.
+        
+        stock_data is the full merged history; only each symbol's bars from
+        the latest committed timestamp onwards are read. Returns False when the
+        data cannot be continued incrementally (no state yet, or the symbol
+        set changed) and a full calculation is needed.
+        """
+        if not self._rows:
+            return False
+        symbols = [symbol for symbol, df in stock_data.items() if not df.empty]
+        if symbols != self.symbols:
+            return False
+        
+        last_ts = self.timestamps[-1]
+        tails = []
+        for symbol in symbols:
+            df = stock_data[symbol]
+            tails.append(df['close'].iloc[df.index.searchsorted(last_ts):])
+        
+        new_index = tails[0].index.append([tail.index for tail in tails[1:]]).unique().sort_values()
+        
+        closes = np.full((len(new_index), len(symbols)), np.nan)
+        for j, tail in enumerate(tails):
+            if len(tail):
+                closes[:, j] = tail.reindex(new_index).to_numpy(dtype=float)
+        
+        # The latest bar may have been revised (or dropped) since it was
+        # committed, so it is always rewound and replayed from the new data
+        self._pop()
+        rows = [self._append(row) for row in closes]
+        
+        kept = self._rows - len(rows)
+        self._counts = np.concatenate([self._counts[:kept], np.array(rows, dtype=np.int64).reshape(-1, self._counts.shape[1])])
+        self.timestamps = self.timestamps[:kept].append(new_index)
+        return True
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Breadth DataFrame in the layout of calculate_breadth_fast."""
+        n_periods = len(self.periods)
+        results = {'datetime': self.timestamps}
+        for k, period in enumerate(self.periods):
+            above_count = self._counts[:, k]
+            total_count = self._counts[:, n_periods + k]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pct = np.where(total_count > 0, above_count / total_count * 100, 0)
+            results[f'count_above_sma_{period}'] = above_count.astype(int)
+            results[f'total_valid_sma_{period}'] = total_count.astype(int)
+            results[f'pct_above_sma_{period}'] = pct
+        results['total_stocks'] = self._counts[:, -1].astype(int)
+        
+        breadth_df = pd.DataFrame(results)
+        breadth_df.set_index('datetime', inplace=True)
+        return breadth_df
+
+
 class IntradaySMACalculator:
     """
     High-performance SMA breadth calculator.
@@ -27,6 +191,7 @@ class IntradaySMACalculator:
     """
     
     SMA_PERIODS = [10, 20, 50, 200]
+    INDEX_SMA_PERIODS = [10, 20, 50]  # Only short SMAs for index overlay
     
     def __init__(self):
         """Initialize the calculator."""
@@ -34,6 +199,8 @@ class IntradaySMACalculator:
         self._stock_smas: Dict[str, pd.DataFrame] = {}
         self._index_smas: Optional[pd.DataFrame] = None
         self._breadth_data: Optional[pd.DataFrame] = None
+        # Rolling state carried between incremental updates
+        self._breadth_state = RollingSMABreadth(self.SMA_PERIODS)
         
     def calculate_smas(self, df: pd.DataFrame, periods: List[int] = None) -> pd.DataFrame:
         """
@@ -68,7 +235,30 @@ class IntradaySMACalculator:
         if index_df.empty:
             return pd.DataFrame()
         
-        result = self.calculate_smas(index_df, [10, 20, 50])  # Only short SMAs for index overlay
+        result = self.calculate_smas(index_df, self.INDEX_SMA_PERIODS)
+        self._index_smas = result
+        return result
+    
+    def _extend_index_smas(self, index_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Extend cached index SMAs with the bars appended to index_df.
+        
+        Only the rows from the last cached bar onwards (plus the window they
+        need) are rolled; falls back to a full calculation when index_df is
+        not a continuation of the cached data.
+        """
+        cached = self._index_smas
+        if cached is None or cached.empty or index_df.empty or index_df.index[0] != cached.index[0]:
+            return self.calculate_index_smas(index_df)
+        
+        # The last cached bar is recalculated in case it was revised
+        pos = len(cached) - 1
+        if pos >= len(index_df) or index_df.index[pos] != cached.index[pos]:
+            return self.calculate_index_smas(index_df)
+        
+        start = max(0, pos - max(self.INDEX_SMA_PERIODS) + 1)
+        tail = self.calculate_smas(index_df.iloc[start:], self.INDEX_SMA_PERIODS).iloc[pos - start:]
+        result = pd.concat([cached.iloc[:pos], tail])
         self._index_smas = result
         return result
     
@@ -198,10 +388,7 @@ class IntradaySMACalculator:
         if not all_indices:
             return pd.DataFrame()
         
-        common_index = all_indices[0]
-        for idx in all_indices[1:]:
-            common_index = common_index.union(idx)
-        common_index = common_index.sort_values()
+        common_index = all_indices[0].append(all_indices[1:]).unique().sort_values()
         
         # Build matrices: rows = timestamps, cols = stocks
         n_times = len(common_index)
@@ -256,6 +443,20 @@ class IntradaySMACalculator:
         breadth_df = pd.DataFrame(results)
         breadth_df.set_index('datetime', inplace=True)
         
+        # Seed the rolling state so later updates only process new bars
+        present = [j for j, df in enumerate(stock_data.values()) if not df.empty]
+        counts = np.column_stack(
+            [results[f'count_above_sma_{p}'] for p in self.SMA_PERIODS]
+            + [results[f'total_valid_sma_{p}'] for p in self.SMA_PERIODS]
+            + [results['total_stocks']]
+        )
+        self._breadth_state.seed(
+            common_index,
+            [symbol for symbol, df in stock_data.items() if not df.empty],
+            close_matrix[:, present],
+            counts,
+        )
+        
         self._breadth_data = breadth_df
         logger.info(f"Fast breadth calculation: {len(breadth_df)} timestamps, {n_stocks} stocks")
         
@@ -266,7 +467,11 @@ class IntradaySMACalculator:
                            stock_data: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Perform incremental update of SMAs and breadth using existing data plus new bars.
-        More efficient than full recalculation - reuses existing SMA values where possible.
+        
+        Only bars from the last processed timestamp onwards are read: the
+        breadth rolling sums advance in O(symbols * periods) per new bar and
+        the index SMAs are rolled over the new rows only. Falls back to a full
+        calculation when there is no prior state or the symbol set changed.
         
         Args:
             index_df: Full index DataFrame (merged old + new)
@@ -275,11 +480,13 @@ class IntradaySMACalculator:
         Returns:
             Tuple of (index_with_smas, breadth_df)
         """
-        # Recalculate index SMAs
-        index_with_smas = self.calculate_index_smas(index_df) if not index_df.empty else pd.DataFrame()
+        index_with_smas = self._extend_index_smas(index_df) if not index_df.empty else pd.DataFrame()
         
-        # Recalculate breadth using the fast method
-        breadth_df = self.calculate_breadth_fast(stock_data)
+        if self._breadth_state.update(stock_data):
+            breadth_df = self._breadth_state.to_frame()
+            self._breadth_data = breadth_df
+        else:
+            breadth_df = self.calculate_breadth_fast(stock_data)
         
         return index_with_smas, breadth_df
 
@@ -333,6 +540,7 @@ class IntradaySMACalculator:
         self._stock_smas = {}
         self._index_smas = None
         self._breadth_data = None
+        self._breadth_state = RollingSMABreadth(self.SMA_PERIODS)
 
 
 # Quick test
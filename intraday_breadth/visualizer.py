@@ -233,8 +233,9 @@ class DataLoaderThread(QThread):
             # Return existing cached data
             cached_index, cached_stocks = self.fetcher.get_cached_data()
             if cached_index is not None:
-                index_with_smas = self.calculator.calculate_index_smas(cached_index)
-                breadth_df = self.calculator.calculate_breadth_fast(cached_stocks)
+                index_with_smas, breadth_df = self.calculator.update_incremental(
+                    cached_index, cached_stocks
+                )
                 self.finished.emit(index_with_smas, cached_stocks, breadth_df)
             return
         
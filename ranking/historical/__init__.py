@@ -6,5 +6,6 @@ This is a one-time operation, not part of the daily wizard.
 """
 
 from .historical_rankings_builder import HistoricalRankingsBuilder
+from .sliding_rankings import SlidingRankingsEngine
 
-__all__ = ["HistoricalRankingsBuilder"]
+__all__ = ["HistoricalRankingsBuilder", "SlidingRankingsEngine"]
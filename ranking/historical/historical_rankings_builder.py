@@ -14,6 +14,7 @@ Features:
 - Progress tracking with ETA
 - Configurable batch size and parallel processing
 - Save to stock_rankings_history table
+- Sliding mode: load history once and advance one shared window
 
 Usage:
     from ranking.historical import HistoricalRankingsBuilder
@@ -23,6 +24,9 @@ Usage:
     
     # Or with specific date range
     builder.build(start_date="2022-01-01", end_date="2024-12-31")
+    
+    # Legacy per-date mode (re-queries 400 days for every date)
+    builder.build(years=3, sliding=False)
 """
 
 import os
@@ -46,6 +50,8 @@ from ranking.services.momentum_score_service import MomentumScoreService
 from ranking.services.trend_template_service import TrendTemplateService
 from ranking.services.technical_score_service import TechnicalScoreService
 from ranking.services.composite_score_service import CompositeScoreService
+from ranking.services.price_panel import PricePanel
+from ranking.historical.sliding_rankings import SlidingRankingsEngine, LOOKBACK_DAYS
 
 # Setup logging
 logging.basicConfig(
@@ -267,7 +273,7 @@ class HistoricalRankingsBuilder:
             df = pd.DataFrame(rankings)
             
             # Calculate composite score
-            df = self.composite_service.calculate(df)
+            df = self.composite_service.calculate_frame(df)
             
             # Calculate ranks
             total = len(df)
@@ -460,14 +466,15 @@ class HistoricalRankingsBuilder:
     def save_rankings_to_history(
         self,
         rankings_df: pd.DataFrame,
-        ranking_date: date
+        ranking_date: Optional[date] = None
     ) -> int:
         """
         Save rankings to history table.
         
         Args:
             rankings_df: DataFrame with rankings.
-            ranking_date: Date of rankings.
+            ranking_date: Date of rankings. None keeps the frame's own
+                ranking_date column, so several dates can be saved at once.
             
         Returns:
             Number of records saved.
@@ -477,7 +484,8 @@ class HistoricalRankingsBuilder:
         
         # Prepare data
         df = rankings_df.copy()
-        df["ranking_date"] = ranking_date
+        if ranking_date is not None:
+            df["ranking_date"] = ranking_date
         
         # Select columns for history table
         history_cols = [
@@ -528,7 +536,9 @@ class HistoricalRankingsBuilder:
         end_date: Optional[str] = None,
         skip_existing: bool = True,
         progress_callback: Optional[Callable] = None,
-        min_stocks: int = 50
+        min_stocks: int = 50,
+        sliding: bool = True,
+        save_every: int = 20
     ) -> Dict[str, Any]:
         """
         Build historical rankings.
@@ -540,6 +550,9 @@ class HistoricalRankingsBuilder:
             skip_existing: Skip dates already in history.
             progress_callback: Optional callback(progress: BuildProgress).
             min_stocks: Minimum stocks required for valid ranking.
+            sliding: Load the full history once and slide one window
+                across dates. False re-queries 400 days per date.
+            save_every: In sliding mode, dates buffered per history insert.
             
         Returns:
             Dict with build statistics.
@@ -592,6 +605,37 @@ class HistoricalRankingsBuilder:
             }
         
         # Process each date
+        if sliding:
+            failed_dates = self._build_sliding(
+                dates_to_process, min_stocks, progress_callback, save_every
+            )
+        else:
+            failed_dates = self._build_per_date(
+                dates_to_process, min_stocks, progress_callback
+            )
+        
+        # Summary
+        summary = {
+            "success": True,
+            "total_dates": len(trading_dates),
+            "skipped": len(existing_dates),
+            "processed": self.progress.completed_dates,
+            "failed": self.progress.failed_dates,
+            "elapsed_seconds": self.progress.elapsed_seconds,
+            "failed_dates": failed_dates[:10],  # First 10 failures
+        }
+        
+        logger.info(f"Build complete: {summary}")
+        
+        return summary
+    
+    def _build_per_date(
+        self,
+        dates_to_process: List[date],
+        min_stocks: int,
+        progress_callback: Optional[Callable]
+    ) -> List[tuple]:
+        """Calculate and save each date independently."""
         failed_dates = []
         
         for calc_date in tqdm(dates_to_process, desc="Building rankings"):
@@ -616,20 +660,61 @@ class HistoricalRankingsBuilder:
             if progress_callback:
                 progress_callback(self.progress)
         
-        # Summary
-        summary = {
-            "success": True,
-            "total_dates": len(trading_dates),
-            "skipped": len(existing_dates),
-            "processed": self.progress.completed_dates,
-            "failed": self.progress.failed_dates,
-            "elapsed_seconds": self.progress.elapsed_seconds,
-            "failed_dates": failed_dates[:10],  # First 10 failures
-        }
+        return failed_dates
+    
+    def _build_sliding(
+        self,
+        dates_to_process: List[date],
+        min_stocks: int,
+        progress_callback: Optional[Callable],
+        save_every: int
+    ) -> List[tuple]:
+        """Load history once and emit one snapshot per date from a shared window."""
+        failed_dates = []
         
-        logger.info(f"Build complete: {summary}")
+        history_start = dates_to_process[0] - timedelta(days=LOOKBACK_DAYS)
+        logger.info(f"Loading price history from {history_start} to {dates_to_process[-1]}")
+        price_df = self._get_historical_price_data(history_start, dates_to_process[-1])
+        if price_df.empty:
+            return [(d, "No price data") for d in dates_to_process]
+        
+        engine = SlidingRankingsEngine(
+            PricePanel.from_frame(price_df[["symbol", "date", "close"]]),
+            composite_service=self.composite_service,
+        )
+        del price_df
+        
+        pending = []
+        
+        def flush():
+            if pending:
+                self.save_rankings_to_history(pd.concat(pending, ignore_index=True))
+                pending.clear()
+        
+        for calc_date, result in tqdm(
+            engine.iter_snapshots(dates_to_process, min_stocks),
+            total=len(dates_to_process), desc="Building rankings"
+        ):
+            if self.stop_requested:
+                logger.info("Build stopped by user")
+                break
+            
+            self.progress.current_date = calc_date
+            
+            if result["success"]:
+                pending.append(result["rankings"])
+                if len(pending) >= save_every:
+                    flush()
+                self.progress.completed_dates += 1
+            else:
+                failed_dates.append((calc_date, result.get("error", "Unknown")))
+                self.progress.failed_dates += 1
+            
+            if progress_callback:
+                progress_callback(self.progress)
         
-        return summary
+        flush()
+        return failed_dates
     
     def stop(self):
         """Request stop of build process."""
@@ -645,6 +730,8 @@ def main():
     parser.add_argument("--start", type=str, help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end", type=str, help="End date (YYYY-MM-DD)")
     parser.add_argument("--no-skip", action="store_true", help="Don't skip existing dates")
+    parser.add_argument("--per-date", action="store_true",
+                        help="Re-query history for every date instead of sliding one window")
     
     args = parser.parse_args()
     
@@ -664,7 +751,8 @@ def main():
         start_date=args.start,
         end_date=args.end,
         skip_existing=not args.no_skip,
-        progress_callback=progress_cb
+        progress_callback=progress_cb,
+        sliding=not args.per_date
     )
     
     print("\n" + "=" * 60)
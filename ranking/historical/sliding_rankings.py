@@ -0,0 +1,244 @@
+"""
+Sliding Rankings Engine
+
+Incremental historical rankings backfill over one shared price history.
+
+HistoricalRankingsBuilder.calculate_rankings_for_date re-queries ~400 days
+of quotes for every date, pivots them and computes RS Rating by looping
+every column of the pivot for every symbol. This engine loads the full
+history once into a PricePanel, precomputes per-symbol rolling state
+(observation-indexed closes, prefix sums for running SMAs and a rolling
+52-week high), and then advances date by date. Each step reads returns at
+fixed lags and SMAs with O(symbols) array lookups, so emitting one
+snapshot costs the same on day 1 as on day 750.
+
+Scores use the same formulas as the per-date builder and the parallel
+RankingWorker.
+
+Usage:
+    engine = SlidingRankingsEngine(PricePanel.from_frame(price_df))
+    for calc_date, result in engine.iter_snapshots(dates):
+        if result["success"]:
+            save(result["rankings"])
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ranking.services.composite_score_service import CompositeScoreService
+from ranking.services.price_panel import PricePanel
+
+
+# Matches the 400 calendar day query window of the per-date builder
+LOOKBACK_DAYS = 400
+
+MOMENTUM_WEIGHTS = {5: 0.05, 21: 0.15, 63: 0.30, 126: 0.30, 252: 0.20}
+
+
+class SlidingRankingsEngine:
+    """
+    Emit one ranking snapshot per date from a single price panel.
+
+    State is indexed by each symbol's observation count, so the value
+    k bars back and the mean of the last n bars are plain lookups into
+    precomputed arrays.
+    """
+
+    def __init__(
+        self,
+        panel: PricePanel,
+        composite_service: Optional[CompositeScoreService] = None,
+        min_history: int = 50,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            panel: Close-price panel covering the backfill range plus
+                ~400 days of lookback.
+            composite_service: Composite scorer (default weights if None).
+            min_history: Minimum bars a symbol needs to be ranked.
+        """
+        self.panel = panel
+        self.composite_service = composite_service or CompositeScoreService()
+        self.min_history = min_history
+
+        valid = panel.valid
+        self._valid = valid
+        self._counts = np.cumsum(valid, axis=0, dtype=np.int64)
+        self._last_rows = panel.last_valid_rows()
+        self._cols = np.arange(panel.num_symbols)
+
+        # Observation-indexed closes: packed[k, j] is symbol j's k-th bar
+        max_obs = int(self._counts[-1].max()) if len(self._counts) else 0
+        packed = np.full((max_obs + 1, panel.num_symbols), np.nan)
+        rows, cols = np.nonzero(valid)
+        packed[self._counts[rows, cols] - 1, cols] = panel.close[rows, cols]
+        self._packed = packed
+
+        # Running sums for O(1) SMAs: prefix[k] = sum of the first k bars
+        prefix = np.zeros((max_obs + 2, panel.num_symbols))
+        np.cumsum(np.nan_to_num(packed), axis=0, out=prefix[1:])
+        self._prefix = prefix
+
+        # Rolling 252-bar high (all bars when history is shorter)
+        self._high_252 = (
+            pd.DataFrame(packed).rolling(252, min_periods=1).max().to_numpy()
+        )
+
+    def _lag(self, counts: np.ndarray, k) -> np.ndarray:
+        """Close k bars before each symbol's latest bar (NaN if too short)."""
+        pos = counts - 1 - k
+        out = self._packed[np.maximum(pos, 0), self._cols]
+        return np.where(pos >= 0, out, np.nan)
+
+    def _sma(self, counts: np.ndarray, period: int, offset: int = 0) -> np.ndarray:
+        """Mean of the period bars ending offset bars before the latest."""
+        end = counts - offset
+        start = end - period
+        ok = start >= 0
+        total = self._prefix[np.maximum(end, 0), self._cols] - self._prefix[np.maximum(start, 0), self._cols]
+        return np.where(ok, total / period, np.nan)
+
+    def _rs_ratings(
+        self,
+        row: int,
+        counts: np.ndarray,
+        current: np.ndarray,
+        ranked: np.ndarray,
+    ) -> np.ndarray:
+        """RS Rating: percentile of each symbol's return among the window universe."""
+        ratings = np.full(self.panel.num_symbols, 50.0)
+        lookbacks = np.minimum(252, counts - 1)
+
+        # Universe: every symbol with a bar inside the lookback window
+        last_rows = self._last_rows[row]
+        cutoff = self.panel.dates[row] - np.timedelta64(LOOKBACK_DAYS, "D")
+        in_window = (last_rows >= 0) & (self.panel.dates[np.maximum(last_rows, 0)] >= cutoff)
+
+        targets = ranked & (lookbacks >= 20)
+        for lookback in np.unique(lookbacks[targets]):
+            past = self._lag(counts, lookback)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = (current / past - 1) * 100
+
+            universe = in_window & (counts > lookback) & (past > 0)
+            if not universe.any():
+                continue
+            sorted_returns = np.sort(returns[universe])
+
+            members = targets & (lookbacks == lookback) & (past > 0)
+            below = np.searchsorted(sorted_returns, returns[members], side="left")
+            percentile = below / len(sorted_returns) * 99 + 1
+            ratings[members] = np.round(np.clip(percentile, 1, 99), 0)
+
+        return ratings
+
+    def _momentum(self, counts: np.ndarray, current: np.ndarray) -> np.ndarray:
+        total_score = np.zeros(self.panel.num_symbols)
+        total_weight = np.zeros(self.panel.num_symbols)
+        for days, weight in MOMENTUM_WEIGHTS.items():
+            past = self._lag(counts, days)
+            ok = (counts > days) & (past > 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ret = (current / past - 1) * 100
+            normalized = np.clip((ret + 50) * (100 / 150), 0, 100)
+            total_score += np.where(ok, normalized * weight, 0)
+            total_weight += np.where(ok, weight, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total_weight > 0, np.round(total_score / total_weight, 1), 0.0)
+
+    def _trend_and_technical(
+        self, counts: np.ndarray, current: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        sma_50 = self._sma(counts, 50)
+        sma_150 = self._sma(counts, 150)
+        sma_200 = self._sma(counts, 200)
+        sma_200_past = np.where(counts >= 220, self._sma(counts, 200, offset=20), sma_200)
+        high_52w = self._high_252[np.maximum(counts - 1, 0), self._cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_from_high = (current / high_52w - 1) * 100
+
+        conditions = [
+            current > sma_150,
+            current > sma_200,
+            sma_150 > sma_200,
+            sma_200 > sma_200_past,
+            sma_50 > sma_150,
+            sma_50 > sma_200,
+            current > sma_50,
+            pct_from_high >= -25,
+        ]
+        enough = counts >= 200
+        trend = np.where(enough, np.sum(conditions, axis=0), 0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            technical = np.where(
+                current > sma_50, 25 + np.minimum(25, (current / sma_50 - 1) * 100), 0
+            )
+        technical += np.where(current > sma_150, 20, 0)
+        technical += np.where(current > sma_200, 15, 0)
+        technical += np.where((sma_50 > sma_150) & (sma_150 > sma_200), 15, 0)
+        technical = np.where(enough, np.round(np.clip(technical, 0, 100), 1), 0.0)
+
+        return trend.astype(int), technical
+
+    def snapshot(self, calc_date: date, min_stocks: int = 50) -> Dict[str, Any]:
+        """
+        Calculate rankings for one date.
+
+        Returns:
+            Dict in the same shape as
+            HistoricalRankingsBuilder.calculate_rankings_for_date.
+        """
+        row = self.panel.row_for(calc_date)
+        if row < 0 or self.panel.dates[row] != np.datetime64(pd.Timestamp(calc_date), "ns"):
+            return {"success": False, "error": "No price data", "count": 0}
+
+        on_date = self._valid[row]
+        symbols_on_date = int(on_date.sum())
+        if symbols_on_date < min_stocks:
+            return {
+                "success": False,
+                "error": f"Only {symbols_on_date} stocks on date",
+                "count": symbols_on_date,
+            }
+
+        counts = self._counts[row]
+        ranked = on_date & (counts >= self.min_history)
+        if not ranked.any():
+            return {"success": False, "error": "No valid rankings", "count": 0}
+
+        current = self._lag(counts, 0)
+        rs_rating = self._rs_ratings(row, counts, current, ranked)
+        momentum = self._momentum(counts, current)
+        trend, technical = self._trend_and_technical(counts, current)
+
+        df = pd.DataFrame({
+            "symbol": np.asarray(self.panel.symbols, dtype=object)[ranked],
+            "rs_rating": rs_rating[ranked],
+            "momentum_score": momentum[ranked],
+            "trend_template_score": trend[ranked],
+            "technical_score": technical[ranked],
+        })
+        df = self.composite_service.calculate_frame(df)
+
+        total = len(df)
+        df["composite_rank"] = df["composite_score"].rank(ascending=False, method="min").astype(int)
+        df["composite_percentile"] = (df["composite_rank"] / total * 100).round(2)
+        df["total_stocks_ranked"] = total
+        df["ranking_date"] = calc_date
+
+        return {"success": True, "rankings": df, "count": total}
+
+    def iter_snapshots(
+        self,
+        dates: Iterable[date],
+        min_stocks: int = 50,
+    ) -> Iterator[Tuple[date, Dict[str, Any]]]:
+        """Advance through dates in order, yielding (date, result) per date."""
+        for calc_date in sorted(dates):
+            yield calc_date, self.snapshot(calc_date, min_stocks)
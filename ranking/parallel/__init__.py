@@ -8,6 +8,7 @@ Components:
 - RedisManager: Connection pooling and queue operations
 - RankingWorker: Worker process that calculates rankings
 - ParallelRankingsDispatcher: Job creation and progress monitoring
+- LocalPriceCache: Memory-mapped price panel shared by workers on a host
 
 Architecture:
     [Dispatcher] --creates jobs--> [Redis Queue] <--pulls jobs-- [Worker 1]
@@ -27,6 +28,7 @@ Usage:
 
 from .redis_manager import RedisManager, RedisConfig, check_redis_available
 from .job_models import RankingJob, JobType, JobStatus, BatchProgress, WorkerInfo
+from .price_cache import LocalPriceCache
 from .worker import RankingWorker
 from .dispatcher import ParallelRankingsDispatcher
 
@@ -42,6 +44,7 @@ __all__ = [
     "BatchProgress",
     "WorkerInfo",
     # Worker
+    "LocalPriceCache",
     "RankingWorker",
     # Dispatcher
     "ParallelRankingsDispatcher",
@@ -28,6 +28,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from ranking.parallel.redis_manager import RedisManager, check_redis_available
 from ranking.parallel.job_models import RankingJob, JobType, BatchProgress
 from ranking.db.schema import get_ranking_engine
+from ranking.parallel.price_cache import LocalPriceCache
+from ranking.historical.sliding_rankings import LOOKBACK_DAYS
 
 # Setup logging
 logging.basicConfig(
@@ -42,7 +44,7 @@ class ParallelRankingsDispatcher:
     Dispatches ranking jobs to parallel workers.
     
     Responsibilities:
-    - Create jobs for each date to process
+    - Create jobs for contiguous date ranges (or single dates)
     - Enqueue jobs to Redis
     - Monitor progress
     - Aggregate results
@@ -111,28 +113,50 @@ class ParallelRankingsDispatcher:
     def create_jobs(
         self,
         dates: List[date],
-        batch_id: str
+        batch_id: str,
+        dates_per_job: int = 1,
+        data_version: str = ""
     ) -> List[str]:
         """
         Create and enqueue jobs for dates.
         
+        With dates_per_job > 1, dates are split into contiguous runs of
+        trading dates and each run becomes one BATCH_DATES job. All range
+        jobs share one history_start so workers on a host read the same
+        local price cache entry.
+        
         Args:
-            dates: List of dates to process.
+            dates: List of dates to process (sorted).
             batch_id: Batch identifier.
+            dates_per_job: Maximum trading dates per job.
+            data_version: Quotes data version used to key the price cache.
             
         Returns:
             List of job IDs.
         """
         jobs = []
         
-        for calc_date in dates:
-            job = RankingJob(
-                job_type=JobType.CALCULATE_DATE,
-                calculation_date=calc_date,
-                symbols=[],  # All symbols
-                batch_id=batch_id,
-            )
-            jobs.append(job.to_dict())
+        if dates_per_job <= 1:
+            for calc_date in dates:
+                job = RankingJob(
+                    job_type=JobType.CALCULATE_DATE,
+                    calculation_date=calc_date,
+                    symbols=[],  # All symbols
+                    batch_id=batch_id,
+                )
+                jobs.append(job.to_dict())
+        else:
+            history_start = dates[0] - timedelta(days=LOOKBACK_DAYS)
+            for start, end in self.shard_date_ranges(dates, dates_per_job):
+                job = RankingJob(
+                    job_type=JobType.BATCH_DATES,
+                    calculation_date=start,
+                    end_date=end,
+                    history_start=history_start,
+                    data_version=data_version,
+                    batch_id=batch_id,
+                )
+                jobs.append(job.to_dict())
         
         # Enqueue all jobs in batch
         job_ids = self.redis.enqueue_jobs_batch(jobs)
@@ -141,6 +165,35 @@ class ParallelRankingsDispatcher:
         
         return job_ids
     
+    def shard_date_ranges(
+        self,
+        dates: List[date],
+        dates_per_job: int
+    ) -> List[tuple]:
+        """
+        Split dates into (start, end) ranges of at most dates_per_job dates.
+        
+        A range never spans a trading date that is not in dates (e.g. one
+        already calculated), so workers recompute nothing.
+        """
+        if not dates:
+            return []
+        
+        all_trading = self.get_trading_dates(dates[0], dates[-1])
+        position = {d: i for i, d in enumerate(all_trading)}
+        
+        ranges = []
+        run = [dates[0]]
+        for d in dates[1:]:
+            contiguous = position.get(d, -1) == position.get(run[-1], -2) + 1
+            if contiguous and len(run) < dates_per_job:
+                run.append(d)
+            else:
+                ranges.append((run[0], run[-1]))
+                run = [d]
+        ranges.append((run[0], run[-1]))
+        return ranges
+    
     def build_historical_rankings(
         self,
         years: int = 3,
@@ -149,7 +202,8 @@ class ParallelRankingsDispatcher:
         skip_existing: bool = True,
         progress_callback: Optional[Callable] = None,
         wait_for_completion: bool = True,
-        poll_interval: float = 2.0
+        poll_interval: float = 2.0,
+        dates_per_job: int = 20
     ) -> Dict[str, Any]:
         """
         Build historical rankings using parallel workers.
@@ -162,6 +216,8 @@ class ParallelRankingsDispatcher:
             progress_callback: Optional callback(BatchProgress).
             wait_for_completion: Wait for all jobs to complete.
             poll_interval: Seconds between progress checks.
+            dates_per_job: Trading dates per job. 1 creates one job per
+                date that queries its own 400-day window.
             
         Returns:
             Result summary.
@@ -216,20 +272,23 @@ class ParallelRankingsDispatcher:
         
         logger.info(f"Processing {len(dates_to_process)} dates")
         
+        # Clear any old jobs
+        self.redis.clear_queue()
+        
+        # Create jobs
+        data_version = ""
+        if dates_per_job > 1:
+            data_version = LocalPriceCache(self.engine).get_data_version()
+        job_ids = self.create_jobs(dates_to_process, self.batch_id, dates_per_job, data_version)
+        
         # Initialize progress
         self.progress = BatchProgress(
             batch_id=self.batch_id,
-            total_jobs=len(dates_to_process),
-            pending_jobs=len(dates_to_process),
+            total_jobs=len(job_ids),
+            pending_jobs=len(job_ids),
             start_time=datetime.now()
         )
         
-        # Clear any old jobs
-        self.redis.clear_queue()
-        
-        # Create jobs
-        job_ids = self.create_jobs(dates_to_process, self.batch_id)
-        
         # Update Redis progress
         self.redis.update_progress(self.progress.to_dict())
         
@@ -261,6 +320,7 @@ class ParallelRankingsDispatcher:
             self.progress.processing_jobs = stats["processing"]
             self.progress.completed_jobs = stats["completed"]
             self.progress.failed_jobs = stats["failed"]
+            self.progress.apply_timings(self.redis.get_job_timings())
             
             # Check for progress stall (no workers?)
             if self.progress.completed_jobs == last_completed and self.progress.pending_jobs > 0:
@@ -294,6 +354,11 @@ class ParallelRankingsDispatcher:
             "failed": self.progress.failed_jobs,
             "elapsed_seconds": self.progress.elapsed_seconds,
             "jobs_per_second": self.progress.jobs_per_second,
+            "load_seconds": round(self.progress.load_seconds, 2),
+            "compute_seconds": round(self.progress.compute_seconds, 2),
+            "save_seconds": round(self.progress.save_seconds, 2),
+            "db_rows_loaded": self.progress.db_rows_loaded,
+            "cache_hits": self.progress.cache_hits,
             "stopped": self.stop_requested
         }
     
@@ -309,6 +374,7 @@ class ParallelRankingsDispatcher:
         self.progress.processing_jobs = stats["processing"]
         self.progress.completed_jobs = stats["completed"]
         self.progress.failed_jobs = stats["failed"]
+        self.progress.apply_timings(self.redis.get_job_timings())
         
         return self.progress
     
@@ -332,6 +398,8 @@ def main():
     parser.add_argument("--end", type=str, help="End date (YYYY-MM-DD)")
     parser.add_argument("--no-skip", action="store_true", help="Don't skip existing")
     parser.add_argument("--no-wait", action="store_true", help="Don't wait for completion")
+    parser.add_argument("--dates-per-job", type=int, default=20,
+                        help="Trading dates per job (1 = one job per date)")
     
     args = parser.parse_args()
     
@@ -365,6 +433,7 @@ def main():
         print(f"\rProgress: {p.completed_jobs}/{p.total_jobs} "
               f"({p.progress_pct:.1f}%) | "
               f"Rate: {p.jobs_per_second:.2f}/s | "
+              f"Load/Compute: {p.avg_load_seconds:.2f}s/{p.avg_compute_seconds:.2f}s | "
               f"ETA: {p.eta_seconds:.0f}s     ", end="")
     
     result = dispatcher.build_historical_rankings(
@@ -373,7 +442,8 @@ def main():
         end_date=args.end,
         skip_existing=not args.no_skip,
         progress_callback=progress_cb,
-        wait_for_completion=not args.no_wait
+        wait_for_completion=not args.no_wait,
+        dates_per_job=args.dates_per_job
     )
     
     print("\n" + "=" * 60)
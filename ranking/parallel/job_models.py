@@ -15,7 +15,7 @@ class JobType(Enum):
     """Types of ranking jobs."""
     CALCULATE_DATE = "calculate_date"      # Calculate rankings for a specific date
     CALCULATE_SYMBOLS = "calculate_symbols"  # Calculate rankings for specific symbols on a date
-    BATCH_DATES = "batch_dates"            # Process multiple dates
+    BATCH_DATES = "batch_dates"            # Process a contiguous date range
 
 
 class JobStatus(Enum):
@@ -32,13 +32,17 @@ class RankingJob:
     """
     A job for ranking calculation.
     
-    Can be for a single date with all symbols, or specific symbols on a date.
+    Can be for a single date with all symbols, specific symbols on a date,
+    or (BATCH_DATES) every trading date from calculation_date to end_date.
     """
     job_type: JobType
     calculation_date: date
     symbols: List[str] = field(default_factory=list)  # Empty = all symbols
     batch_id: str = ""  # For grouping related jobs
     priority: int = 0   # Higher = more urgent
+    end_date: Optional[date] = None      # Last date of a BATCH_DATES range
+    history_start: Optional[date] = None  # First date of the shared price cache
+    data_version: str = ""                # Quotes version keying the price cache
     
     # Metadata (set by queue)
     job_id: str = ""
@@ -60,6 +64,9 @@ class RankingJob:
             "symbols": self.symbols,
             "batch_id": self.batch_id,
             "priority": self.priority,
+            "end_date": self.end_date.isoformat() if self.end_date else "",
+            "history_start": self.history_start.isoformat() if self.history_start else "",
+            "data_version": self.data_version,
             "job_id": self.job_id,
             "created_at": self.created_at.isoformat() if self.created_at else "",
             "started_at": self.started_at.isoformat() if self.started_at else "",
@@ -100,6 +107,9 @@ class RankingJob:
             symbols=data.get("symbols", []) if isinstance(data.get("symbols"), list) else [],
             batch_id=data.get("batch_id", ""),
             priority=int(data.get("priority", 0)),
+            end_date=parse_date(data.get("end_date")),
+            history_start=parse_date(data.get("history_start")),
+            data_version=str(data.get("data_version", "")),
             job_id=data.get("job_id", ""),
             created_at=parse_datetime(data.get("created_at")),
             started_at=parse_datetime(data.get("started_at")),
@@ -109,6 +119,11 @@ class RankingJob:
             result=data.get("result") if data.get("result") and data.get("result") != 'None' else None,
             error=str(data.get("error", "")),
         )
+    
+    @property
+    def is_range(self) -> bool:
+        """True for a BATCH_DATES job covering a date range."""
+        return self.job_type == JobType.BATCH_DATES and self.end_date is not None
 
 
 @dataclass
@@ -123,6 +138,14 @@ class BatchProgress:
     total_symbols_processed: int = 0
     start_time: Optional[datetime] = None
     
+    # Per-job timing totals reported by workers
+    load_seconds: float = 0.0
+    compute_seconds: float = 0.0
+    save_seconds: float = 0.0
+    db_rows_loaded: int = 0
+    cache_hits: int = 0
+    timed_jobs: int = 0
+    
     @property
     def progress_pct(self) -> float:
         if self.total_jobs == 0:
@@ -148,6 +171,29 @@ class BatchProgress:
         remaining = self.pending_jobs + self.processing_jobs
         return remaining / self.jobs_per_second
     
+    @property
+    def avg_load_seconds(self) -> float:
+        """Mean price-load time per job (DB or local cache)."""
+        if self.timed_jobs == 0:
+            return 0
+        return self.load_seconds / self.timed_jobs
+    
+    @property
+    def avg_compute_seconds(self) -> float:
+        """Mean ranking compute time per job."""
+        if self.timed_jobs == 0:
+            return 0
+        return self.compute_seconds / self.timed_jobs
+    
+    def apply_timings(self, timings: Dict[str, float]):
+        """Update timing totals from RedisManager.get_job_timings()."""
+        self.load_seconds = float(timings.get("load_seconds", 0))
+        self.compute_seconds = float(timings.get("compute_seconds", 0))
+        self.save_seconds = float(timings.get("save_seconds", 0))
+        self.db_rows_loaded = int(timings.get("db_rows_loaded", 0))
+        self.cache_hits = int(timings.get("cache_hits", 0))
+        self.timed_jobs = int(timings.get("timed_jobs", 0))
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "batch_id": self.batch_id,
@@ -161,6 +207,13 @@ class BatchProgress:
             "elapsed_seconds": self.elapsed_seconds,
             "jobs_per_second": self.jobs_per_second,
             "eta_seconds": self.eta_seconds,
+            "load_seconds": self.load_seconds,
+            "compute_seconds": self.compute_seconds,
+            "save_seconds": self.save_seconds,
+            "avg_load_seconds": self.avg_load_seconds,
+            "avg_compute_seconds": self.avg_compute_seconds,
+            "db_rows_loaded": self.db_rows_loaded,
+            "cache_hits": self.cache_hits,
             "start_time": self.start_time.isoformat() if self.start_time else None,
         }
 
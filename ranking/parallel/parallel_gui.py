@@ -145,6 +145,9 @@ class ParallelRankingsGUI:
             ("Failed:", "failed_var", "0"),
             ("Rate:", "rate_var", "0 jobs/sec"),
             ("ETA:", "eta_var", "-"),
+            ("Avg Load:", "load_var", "-"),
+            ("Avg Compute:", "compute_var", "-"),
+            ("DB Rows:", "rows_var", "0"),
         ]
         
         for i, (label, var_name, default) in enumerate(labels):
@@ -495,6 +498,11 @@ Tips:
             self.eta_var.set("-")
         
         self.throughput_var.set(f"{p.jobs_per_second:.2f} jobs/second")
+        
+        if p.timed_jobs:
+            self.load_var.set(f"{p.avg_load_seconds:.2f}s/job")
+            self.compute_var.set(f"{p.avg_compute_seconds:.2f}s/job")
+        self.rows_var.set(f"{p.db_rows_loaded:,}")
     
     def _build_complete(self, result):
         """Handle build completion."""
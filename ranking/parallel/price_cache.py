@@ -0,0 +1,230 @@
+"""
+Local Price Cache
+
+Memory-mapped close-price panel shared by every worker process on a host.
+
+Without it each ranking job pulls its own ~400 days of
+yfinance_daily_quotes from MySQL, so a 3-year backfill reads the same
+rows hundreds of times. The first worker to need a given slice of
+history builds it once from the database and writes it as .npy files;
+every other job on the host maps the same files read-only.
+
+Cache entries are keyed by the data version of yfinance_daily_quotes
+(latest date and row count) plus the history start, so new quotes
+invalidate old entries automatically. After building an entry, the
+builder prunes entries of older data versions so the cache directory
+does not grow with every new day of quotes.
+
+Layout:
+    <cache_dir>/<key>/close.npy     float64 [dates x symbols]
+    <cache_dir>/<key>/dates.npy     datetime64[ns] [dates]
+    <cache_dir>/<key>/symbols.json  list of symbols
+    <cache_dir>/<key>/version.txt   data version the entry was built from
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+from datetime import date
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from ranking.services.price_panel import PricePanel
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "ranking_price_cache")
+
+
+class LocalPriceCache:
+    """
+    Per-host, memory-mapped price panel cache.
+
+    Thread/process safe: builds are guarded by a lock file and published
+    with an atomic rename, so readers never see a partial entry.
+    """
+
+    def __init__(
+        self,
+        engine,
+        cache_dir: Optional[str] = None,
+        lock_timeout: float = 600.0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            engine: SQLAlchemy engine for the quotes database.
+            cache_dir: Cache directory. Defaults to RANKING_CACHE_DIR or
+                a folder in the system temp dir.
+            lock_timeout: Seconds after which a build lock is considered stale.
+        """
+        self.engine = engine
+        self.cache_dir = cache_dir or os.getenv("RANKING_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.lock_timeout = lock_timeout
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Panels already mapped in this process, by key
+        self._mapped = {}
+
+    def get_data_version(self) -> str:
+        """Version string that changes whenever quotes are added."""
+        sql = "SELECT MAX(date), COUNT(*) FROM yfinance_daily_quotes"
+        with self.engine.connect() as conn:
+            max_date, row_count = conn.execute(text(sql)).fetchone()
+        return f"{max_date}:{row_count}"
+
+    def cache_key(self, history_start: date, version: str) -> str:
+        raw = f"{history_start.isoformat()}|{version}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def get_panel(
+        self,
+        history_start: date,
+        version: Optional[str] = None,
+    ) -> Tuple[PricePanel, dict]:
+        """
+        Get the close panel from history_start to the latest quote.
+
+        Args:
+            history_start: First date of the cached history.
+            version: Data version stamped on the job by the dispatcher.
+                Queried from the database if not given.
+
+        Returns:
+            (panel, info) where info has cache_hit and db_rows_loaded.
+        """
+        version = version or self.get_data_version()
+        key = self.cache_key(history_start, version)
+
+        if key in self._mapped:
+            return self._mapped[key], {"cache_hit": True, "db_rows_loaded": 0}
+
+        entry = os.path.join(self.cache_dir, key)
+        rows_loaded = 0
+        cache_hit = os.path.isdir(entry)
+
+        if not cache_hit:
+            rows_loaded = self._build_locked(entry, history_start, version)
+            cache_hit = rows_loaded == 0
+            if not cache_hit:
+                # Entries for other history starts of this version stay
+                self.prune(keep_key=key, keep_version=version)
+
+        panel = self._map(entry)
+        self._mapped = {key: panel}  # Keep only the current version mapped
+        return panel, {"cache_hit": cache_hit, "db_rows_loaded": rows_loaded}
+
+    def _map(self, entry: str) -> PricePanel:
+        with open(os.path.join(entry, "symbols.json")) as f:
+            symbols = json.load(f)
+        return PricePanel(
+            dates=np.load(os.path.join(entry, "dates.npy")),
+            symbols=symbols,
+            close=np.load(os.path.join(entry, "close.npy"), mmap_mode="r"),
+        )
+
+    def _build_locked(self, entry: str, history_start: date, version: str) -> int:
+        """Build the entry unless another process does it first. Returns rows read."""
+        lock_path = entry + ".lock"
+
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                break
+            except FileExistsError:
+                if os.path.isdir(entry):
+                    return 0
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.lock_timeout:
+                        logger.warning(f"Removing stale cache lock {lock_path}")
+                        os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.5)
+
+        try:
+            if os.path.isdir(entry):
+                return 0
+            return self._build(entry, history_start, version)
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+
+    def _build(self, entry: str, history_start: date, version: str) -> int:
+        sql = """
+        SELECT symbol, date, close
+        FROM yfinance_daily_quotes
+        WHERE date >= :start
+        ORDER BY date
+        """
+        with self.engine.connect() as conn:
+            df = pd.read_sql(text(sql), conn, params={"start": history_start})
+
+        panel = PricePanel.from_frame(df)
+
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".build-")
+        try:
+            np.save(os.path.join(tmp, "close.npy"), panel.close)
+            np.save(os.path.join(tmp, "dates.npy"), panel.dates)
+            with open(os.path.join(tmp, "symbols.json"), "w") as f:
+                json.dump(panel.symbols, f)
+            with open(os.path.join(tmp, "version.txt"), "w") as f:
+                f.write(version)
+            os.replace(tmp, entry)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        logger.info(f"Built price cache {os.path.basename(entry)}: "
+                    f"{len(panel.dates)} dates x {panel.num_symbols} symbols from {len(df)} rows")
+        return len(df)
+
+    def _entry_version(self, path: str) -> Optional[str]:
+        try:
+            with open(os.path.join(path, "version.txt")) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def prune(self, keep_key: Optional[str] = None, keep_version: Optional[str] = None) -> int:
+        """
+        Delete cache entries other than keep_key.
+
+        Args:
+            keep_key: Entry to keep.
+            keep_version: Also keep entries built from this data version.
+
+        Returns:
+            Number of entries deleted.
+        """
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name == keep_key or name.startswith(".") or not os.path.isdir(path):
+                continue
+            if keep_version is not None and self._entry_version(path) == keep_version:
+                continue
+            # Rename first so no reader sees a half-deleted entry; an entry
+            # still mapped elsewhere (Windows) can't be renamed and stays
+            doomed = os.path.join(self.cache_dir, f".prune-{name}")
+            try:
+                os.replace(path, doomed)
+            except OSError:
+                continue
+            shutil.rmtree(doomed, ignore_errors=True)
+            removed += 1
+        if removed:
+            logger.info(f"Pruned {removed} old price cache entries")
+        return removed
@@ -37,6 +37,7 @@ class RedisConfig:
         self.results_key = f"{self.prefix}jobs:results"
         self.failed_key = f"{self.prefix}jobs:failed"
         self.progress_key = f"{self.prefix}progress"
+        self.timings_key = f"{self.prefix}jobs:timings"
         self.workers_key = f"{self.prefix}workers"
         self.events_channel = f"{self.prefix}events"
 
@@ -209,9 +210,31 @@ class RedisManager:
         # Add to results list
         client.lpush(self.config.results_key, job_id)
         
+        # Accumulate load/compute timings for BatchProgress
+        self._record_timings(client, result)
+        
         # Publish event
         self.publish_event("job_completed", {"job_id": job_id, **result})
     
+    def _record_timings(self, client: redis.Redis, result: Dict[str, Any]):
+        """Add a job's timing fields to the batch timing totals."""
+        if "load_seconds" not in result:
+            return
+        
+        pipe = client.pipeline()
+        for key in ("load_seconds", "compute_seconds", "save_seconds"):
+            pipe.hincrbyfloat(self.config.timings_key, key, float(result.get(key, 0)))
+        pipe.hincrby(self.config.timings_key, "db_rows_loaded", int(result.get("db_rows_loaded", 0)))
+        pipe.hincrby(self.config.timings_key, "cache_hits", 1 if result.get("cache_hit") else 0)
+        pipe.hincrby(self.config.timings_key, "timed_jobs", 1)
+        pipe.execute()
+    
+    def get_job_timings(self) -> Dict[str, float]:
+        """Get accumulated per-job load/compute/save timings."""
+        client = self.get_client()
+        data = client.hgetall(self.config.timings_key)
+        return {k: float(v) for k, v in data.items()}
+    
     def fail_job(self, job_id: str, error: str):
         """Mark job as failed."""
         client = self.get_client()
@@ -258,6 +281,7 @@ class RedisManager:
         pipe.delete(self.config.processing_key)
         pipe.delete(self.config.results_key)
         pipe.delete(self.config.failed_key)
+        pipe.delete(self.config.timings_key)
         pipe.execute()
     
     # -------------------------------------------------------------------------
@@ -44,6 +44,8 @@ from ranking.services.momentum_score_service import MomentumScoreService
 from ranking.services.trend_template_service import TrendTemplateService
 from ranking.services.technical_score_service import TechnicalScoreService
 from ranking.services.composite_score_service import CompositeScoreService
+from ranking.historical.sliding_rankings import SlidingRankingsEngine, LOOKBACK_DAYS
+from ranking.parallel.price_cache import LocalPriceCache
 
 # Setup logging
 logging.basicConfig(
@@ -59,17 +61,21 @@ class RankingWorker:
     
     Each worker:
     - Pulls jobs from the queue
-    - Calculates rankings for the specified date/symbols
+    - Calculates rankings for the specified date/symbols or date range
     - Saves results to database
     - Reports completion back to queue
+    
+    Date-range jobs read prices from a LocalPriceCache shared by all
+    workers on the host instead of querying MySQL per date.
     """
     
-    def __init__(self, worker_id: str = None):
+    def __init__(self, worker_id: str = None, cache_dir: Optional[str] = None):
         """
         Initialize worker.
         
         Args:
             worker_id: Unique worker identifier. Auto-generated if not provided.
+            cache_dir: Local price cache directory (see LocalPriceCache).
         """
         self.worker_id = worker_id or f"worker-{uuid.uuid4().hex[:8]}"
         self.hostname = socket.gethostname()
@@ -88,6 +94,11 @@ class RankingWorker:
         self.technical_service = TechnicalScoreService()
         self.composite_service = CompositeScoreService()
         
+        # Shared price cache and the engine built over it
+        self.price_cache = LocalPriceCache(self.engine, cache_dir=cache_dir)
+        self._engine_panel = None
+        self._sliding_engine: Optional[SlidingRankingsEngine] = None
+        
         # Worker state
         self.running = False
         self.current_job: Optional[RankingJob] = None
@@ -161,7 +172,10 @@ class RankingWorker:
                     continue
                 
                 self.current_job = job
-                logger.info(f"Processing job {job.job_id}: {job.calculation_date} ({len(job.symbols) or 'all'} symbols)")
+                if job.is_range:
+                    logger.info(f"Processing job {job.job_id}: {job.calculation_date} to {job.end_date}")
+                else:
+                    logger.info(f"Processing job {job.job_id}: {job.calculation_date} ({len(job.symbols) or 'all'} symbols)")
                 
                 # Process the job
                 try:
@@ -193,11 +207,17 @@ class RankingWorker:
         Returns:
             Result dictionary.
         """
+        if job.is_range:
+            return self._process_range_job(job)
+        
         calc_date = job.calculation_date
         symbols = job.symbols or None  # None means all symbols
         
         # Get price data
+        load_start = time.perf_counter()
         price_data = self._get_price_data(calc_date, symbols)
+        load_seconds = time.perf_counter() - load_start
+        compute_start = time.perf_counter()
         
         if price_data.empty:
             return {
@@ -281,7 +301,10 @@ class RankingWorker:
         df["total_stocks_ranked"] = total
         df["ranking_date"] = calc_date
         
+        compute_seconds = time.perf_counter() - compute_start
+        
         # Save to history table
+        save_start = time.perf_counter()
         saved = self._save_rankings(df, calc_date)
         
         return {
@@ -289,7 +312,66 @@ class RankingWorker:
             "symbols_ranked": len(df),
             "symbols_saved": saved,
             "calculation_date": str(calc_date),
-            "top_5": df.nsmallest(5, "composite_rank")["symbol"].tolist()
+            "top_5": df.nsmallest(5, "composite_rank")["symbol"].tolist(),
+            "load_seconds": round(load_seconds, 3),
+            "compute_seconds": round(compute_seconds, 3),
+            "save_seconds": round(time.perf_counter() - save_start, 3),
+            "db_rows_loaded": len(price_data),
+            "cache_hit": False,
+        }
+    
+    def _process_range_job(self, job: RankingJob) -> Dict[str, Any]:
+        """
+        Process a BATCH_DATES job over the shared local price cache.
+        
+        Args:
+            job: Job covering calculation_date..end_date.
+            
+        Returns:
+            Result dictionary with per-stage timings.
+        """
+        start_date, end_date = job.calculation_date, job.end_date
+        history_start = job.history_start or (start_date - timedelta(days=LOOKBACK_DAYS))
+        
+        load_start = time.perf_counter()
+        panel, cache_info = self.price_cache.get_panel(history_start, job.data_version or None)
+        load_seconds = time.perf_counter() - load_start
+        
+        compute_start = time.perf_counter()
+        if self._engine_panel is not panel:
+            self._sliding_engine = SlidingRankingsEngine(panel, self.composite_service)
+            self._engine_panel = panel
+        
+        dates = pd.DatetimeIndex(panel.dates)
+        in_range = dates[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))]
+        
+        frames = []
+        failed = []
+        for calc_date, result in self._sliding_engine.iter_snapshots(in_range.date, min_stocks=10):
+            if result["success"]:
+                frames.append(result["rankings"])
+            else:
+                failed.append(str(calc_date))
+        compute_seconds = time.perf_counter() - compute_start
+        
+        save_start = time.perf_counter()
+        saved = self._save_rankings(pd.concat(frames, ignore_index=True), None) if frames else 0
+        save_seconds = time.perf_counter() - save_start
+        
+        return {
+            "success": bool(frames),
+            "error": "" if frames else "No valid rankings calculated",
+            "symbols_ranked": sum(len(f) for f in frames),
+            "symbols_saved": saved,
+            "calculation_date": str(start_date),
+            "end_date": str(end_date),
+            "dates_ranked": len(frames),
+            "dates_failed": failed[:10],
+            "load_seconds": round(load_seconds, 3),
+            "compute_seconds": round(compute_seconds, 3),
+            "save_seconds": round(save_seconds, 3),
+            "db_rows_loaded": cache_info["db_rows_loaded"],
+            "cache_hit": cache_info["cache_hit"],
         }
     
     def _get_price_data(
@@ -477,8 +559,8 @@ class RankingWorker:
         
         return round(min(100, max(0, score)), 1)
     
-    def _save_rankings(self, df: pd.DataFrame, ranking_date: date) -> int:
-        """Save rankings to history table."""
+    def _save_rankings(self, df: pd.DataFrame, ranking_date: Optional[date]) -> int:
+        """Save rankings to history table (ranking_date None keeps the frame's dates)."""
         if df.empty:
             return 0
         
@@ -527,6 +609,7 @@ def main():
     """Main entry point for worker."""
     parser = argparse.ArgumentParser(description="Ranking Worker")
     parser.add_argument("--id", type=str, default=None, help="Worker ID")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Local price cache directory")
     args = parser.parse_args()
     
     # Check Redis
@@ -537,7 +620,7 @@ def main():
         sys.exit(1)
     
     # Create and start worker
-    worker = RankingWorker(worker_id=args.id)
+    worker = RankingWorker(worker_id=args.id, cache_dir=args.cache_dir)
     
     # Handle shutdown signals
     def signal_handler(signum, frame):
@@ -12,6 +12,7 @@ from .trend_template_service import TrendTemplateService, TrendTemplateResult, T
 from .technical_score_service import TechnicalScoreService, TechnicalResult
 from .composite_score_service import CompositeScoreService, CompositeResult
 from .ranking_orchestrator import RankingOrchestrator, RankingResult
+from .price_panel import PricePanel
 
 __all__ = [
     # Base
@@ -32,4 +33,6 @@ __all__ = [
     "CompositeResult",
     "RankingOrchestrator",
     "RankingResult",
+    # Columnar data
+    "PricePanel",
 ]
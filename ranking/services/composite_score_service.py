@@ -12,6 +12,7 @@ Default Weights:
 
 from dataclasses import dataclass
 from typing import Dict, Optional, Any
+import pandas as pd
 
 
 @dataclass
@@ -112,6 +113,26 @@ class CompositeScoreService:
         
         return results
     
+    def calculate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized composite score over a DataFrame.
+        
+        Expects rs_rating, momentum_score, trend_template_score and
+        technical_score columns; returns a copy with composite_score added.
+        """
+        df = df.copy()
+        norm_rs = df["rs_rating"].clip(0, 100)
+        norm_trend = df["trend_template_score"] / 8 * 100
+        
+        df["composite_score"] = (
+            norm_rs * self.weights["rs_rating"] +
+            df["momentum_score"] * self.weights["momentum"] +
+            norm_trend * self.weights["trend_template"] +
+            df["technical_score"] * self.weights["technical"]
+        ).round(2)
+        
+        return df
+    
     def combine_calculator_results(
         self, rs_results: Dict[str, Any], momentum_results: Dict[str, Any],
         trend_results: Dict[str, Any], technical_results: Dict[str, Any]
@@ -14,8 +14,11 @@ Formula:
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Dict, Optional
+import numpy as np
 import pandas as pd
 
+from .price_panel import PricePanel, rank_descending
+
 
 @dataclass
 class MomentumResult:
@@ -143,3 +146,62 @@ class MomentumScoreService:
             results[symbol].percentile = round((total - rank + 1) / total * 100, 1)
         
         return results
+    
+    def calculate_panel(
+        self, panel: PricePanel, calculation_date: date
+    ) -> Dict[str, MomentumResult]:
+        """
+        Vectorized calculate_batch over a PricePanel.
+        
+        All five timeframe returns come from one right-aligned close
+        window instead of five copy/sort passes per symbol.
+        """
+        results = {}
+        if panel.num_symbols == 0:
+            return results
+        
+        max_days = max(self.TIMEFRAME_DAYS.values())
+        window, counts = panel.tail(calculation_date, max_days + 1)
+        total_counts = panel.observation_counts()
+        cols = np.arange(panel.num_symbols)
+        length = window.shape[0]
+        
+        end_price = window[-1]
+        returns = {}
+        for tf, days in self.TIMEFRAME_DAYS.items():
+            # Start is days bars back, or the first bar if history is shorter
+            start_row = np.where(counts > days, length - days - 1, length - np.minimum(counts, length))
+            start_price = window[np.clip(start_row, 0, length - 1), cols]
+            ok = (total_counts >= days) & (counts >= 2) & (start_price > 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ret = (end_price - start_price) / start_price * 100
+            returns[tf] = np.where(ok, ret, 0.0)
+        
+        raw_scores = sum(returns[tf] * self.weights[tf] for tf in self.weights)
+        
+        min_score, max_score = raw_scores.min(), raw_scores.max()
+        score_range = max_score - min_score
+        if score_range == 0:
+            momentum_scores = np.full(panel.num_symbols, 50.0)
+        else:
+            momentum_scores = np.round((raw_scores - min_score) / score_range * 100, 2)
+        
+        ranks = rank_descending(momentum_scores)
+        total = panel.num_symbols
+        
+        for j, symbol in enumerate(panel.symbols):
+            rank = int(ranks[j])
+            results[symbol] = MomentumResult(
+                symbol=symbol,
+                momentum_score=float(momentum_scores[j]),
+                rank=rank,
+                percentile=round((total - rank + 1) / total * 100, 1),
+                return_1w=round(float(returns["1w"][j]), 2),
+                return_1m=round(float(returns["1m"][j]), 2),
+                return_3m=round(float(returns["3m"][j]), 2),
+                return_6m=round(float(returns["6m"][j]), 2),
+                return_12m=round(float(returns["12m"][j]), 2),
+                raw_score=float(raw_scores[j]),
+            )
+        
+        return results
@@ -0,0 +1,174 @@
+"""
+Price Panel
+
+Columnar date x symbol price matrices shared by all rating calculators.
+
+The per-symbol calculators each copy, re-parse and re-sort every symbol's
+DataFrame. A PricePanel is built once per run from the long
+(symbol, date, close, ...) frame and each calculator then computes its
+returns, SMAs and trend checks as whole-matrix NumPy operations.
+
+Observations are counted per symbol (rows with a non-null close), so
+"the last 50 closes" means the same thing as ``df["close"].iloc[-50:]``
+in the per-symbol path even when symbols have gaps or different
+listing dates.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class PricePanel:
+    """
+    Date x symbol price matrices.
+
+    Attributes:
+        dates: Sorted trading dates (datetime64[ns]), one per row.
+        symbols: Symbols, one per column.
+        close: Close matrix (NaN where a symbol has no row).
+        high: High matrix, or None if not loaded.
+        low: Low matrix, or None if not loaded.
+    """
+    dates: np.ndarray
+    symbols: List[str]
+    close: np.ndarray
+    high: Optional[np.ndarray] = None
+    low: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, min_days: int = 0) -> "PricePanel":
+        """
+        Build a panel from a long frame with symbol, date and close columns.
+
+        Args:
+            df: Long frame (one row per symbol per date).
+            min_days: Drop symbols with fewer rows than this.
+        """
+        if df.empty:
+            return cls(np.array([], dtype="datetime64[ns]"), [], np.empty((0, 0)))
+
+        df = df.copy()
+        df["date"] = pd.to_datetime(df["date"])
+        if min_days:
+            counts = df.groupby("symbol")["date"].transform("size")
+            df = df[counts >= min_days]
+
+        fields = [col for col in ("close", "high", "low") if col in df.columns]
+        df = df.drop_duplicates(["date", "symbol"], keep="last")
+        wide = df.set_index(["date", "symbol"])[fields].unstack("symbol").sort_index()
+        close = wide["close"]
+
+        def _field(col: str) -> Optional[np.ndarray]:
+            if col not in fields:
+                return None
+            return wide[col].reindex(columns=close.columns).to_numpy(dtype=float)
+
+        return cls(
+            dates=close.index.values,
+            symbols=[str(s) for s in close.columns],
+            close=close.to_numpy(dtype=float),
+            high=_field("high"),
+            low=_field("low"),
+        )
+
+    @classmethod
+    def from_price_data(cls, data: Dict[str, pd.DataFrame]) -> "PricePanel":
+        """Build a panel from the per-symbol dict used by calculate_batch."""
+        frames = []
+        for symbol, df in data.items():
+            frame = df.copy()
+            frame["symbol"] = symbol
+            frames.append(frame)
+        if not frames:
+            return cls.from_frame(pd.DataFrame())
+        return cls.from_frame(pd.concat(frames, ignore_index=True))
+
+    @property
+    def num_symbols(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean matrix of observed (non-null close) cells."""
+        return ~np.isnan(self.close)
+
+    def row_for(self, calculation_date: date) -> int:
+        """Index of the last row on or before calculation_date (-1 if none)."""
+        ts = np.datetime64(pd.Timestamp(calculation_date), "ns")
+        return int(np.searchsorted(self.dates, ts, side="right")) - 1
+
+    def last_valid_rows(self) -> np.ndarray:
+        """Per-cell index of the latest observed row at or above it (-1 if none)."""
+        rows = np.arange(len(self.dates))[:, None]
+        idx = np.where(self.valid, rows, -1)
+        return np.maximum.accumulate(idx, axis=0) if len(idx) else idx
+
+    def observation_counts(self, row: Optional[int] = None) -> np.ndarray:
+        """Observed rows per symbol, over all rows or up to and including row."""
+        valid = self.valid if row is None else self.valid[: row + 1]
+        return valid.sum(axis=0)
+
+    def tail(
+        self,
+        calculation_date: date,
+        length: int,
+        field: str = "close",
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Right-aligned window of each symbol's last observations.
+
+        Row ``length - 1`` holds every symbol's last observation on or
+        before calculation_date, row ``length - 2`` the one before, and so
+        on. Symbols with fewer observations are NaN-padded at the top.
+
+        Args:
+            calculation_date: As-of date.
+            length: Number of observations to keep per symbol.
+            field: "close", "high" or "low".
+
+        Returns:
+            (window matrix of shape length x symbols, observation counts).
+        """
+        values = getattr(self, field)
+        if values is None:
+            raise ValueError(f"Panel has no {field} data")
+
+        out = np.full((length, self.num_symbols), np.nan)
+        row = self.row_for(calculation_date)
+        if row < 0:
+            return out, np.zeros(self.num_symbols, dtype=int)
+
+        valid = self.valid[: row + 1]
+        cumulative = np.cumsum(valid, axis=0)
+        counts = cumulative[-1]
+
+        rows, cols = np.nonzero(valid)
+        offset = length - 1 - (counts[cols] - cumulative[rows, cols])
+        keep = offset >= 0
+        out[offset[keep], cols[keep]] = values[rows[keep], cols[keep]]
+        return out, counts
+
+
+def rank_descending(scores: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Rank scores with a single stable argsort (1 = highest).
+
+    Ties keep column order, matching ``sorted(..., reverse=True)`` over
+    the same symbols. Entries outside mask get rank 0.
+    """
+    ranks = np.zeros(len(scores), dtype=int)
+    idx = np.arange(len(scores)) if mask is None else np.flatnonzero(mask)
+    if len(idx) == 0:
+        return ranks
+    order = idx[np.argsort(-scores[idx], kind="stable")]
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+
+def window_mean(window: np.ndarray, period: int) -> np.ndarray:
+    """Mean of the last period rows of a right-aligned tail window."""
+    return window[-period:].mean(axis=0)
@@ -18,6 +18,7 @@ from .momentum_score_service import MomentumScoreService
 from .trend_template_service import TrendTemplateService
 from .technical_score_service import TechnicalScoreService
 from .composite_score_service import CompositeScoreService
+from .price_panel import PricePanel
 from ..db.schema import get_ranking_engine, create_ranking_tables
 from ..db.ranking_repository import RankingRepository
 
@@ -73,12 +74,8 @@ class RankingOrchestrator:
         if self.event_callback:
             self.event_callback(channel, message)
     
-    def load_price_data(
-        self,
-        symbols: Optional[List[str]] = None,
-        min_days: int = 300,
-    ) -> Dict[str, pd.DataFrame]:
-        """Load price data from yfinance_daily_quotes."""
+    def _query_price_frame(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Query long-format price rows from yfinance_daily_quotes."""
         if symbols:
             placeholders = ",".join([f":s{i}" for i in range(len(symbols))])
             sql = f"""
@@ -97,7 +94,15 @@ class RankingOrchestrator:
             params = {}
         
         with self.engine.connect() as conn:
-            df = pd.read_sql(text(sql), conn, params=params)
+            return pd.read_sql(text(sql), conn, params=params)
+    
+    def load_price_data(
+        self,
+        symbols: Optional[List[str]] = None,
+        min_days: int = 300,
+    ) -> Dict[str, pd.DataFrame]:
+        """Load price data from yfinance_daily_quotes."""
+        df = self._query_price_frame(symbols)
         
         if df.empty:
             return {}
@@ -109,6 +114,14 @@ class RankingOrchestrator:
         
         return data
     
+    def load_price_panel(
+        self,
+        symbols: Optional[List[str]] = None,
+        min_days: int = 300,
+    ) -> PricePanel:
+        """Load price data from yfinance_daily_quotes as a date x symbol panel."""
+        return PricePanel.from_frame(self._query_price_frame(symbols), min_days=min_days)
+    
     def calculate_rankings(
         self,
         symbols: Optional[List[str]] = None,
@@ -116,8 +129,21 @@ class RankingOrchestrator:
         save_to_db: bool = True,
         save_history: bool = True,
         progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        use_panel: bool = True,
     ) -> Dict[str, RankingResult]:
-        """Calculate rankings for all stocks."""
+        """
+        Calculate rankings for all stocks.
+        
+        Args:
+            symbols: Symbols to rank (None = all).
+            calculation_date: As-of date (default today).
+            save_to_db: Persist rankings.
+            save_history: Also write a history snapshot.
+            progress_callback: Optional callback(stage, done, total).
+            use_panel: Compute every score over one date x symbol panel.
+                False runs the per-symbol calculate_batch path, kept
+                for parity checks.
+        """
         calc_date = calculation_date or date.today()
         start_time = datetime.now()
         
@@ -130,13 +156,17 @@ class RankingOrchestrator:
         if progress_callback:
             progress_callback("Loading data", 0, 100)
         
-        price_data = self.load_price_data(symbols)
+        if use_panel:
+            price_data = self.load_price_panel(symbols)
+            all_symbols = list(price_data.symbols)
+        else:
+            price_data = self.load_price_data(symbols)
+            all_symbols = list(price_data.keys())
         
-        if not price_data:
+        if not all_symbols:
             self._emit_event("ranking:error", {"error": "No price data available"})
             return {}
         
-        all_symbols = list(price_data.keys())
         total = len(all_symbols)
         
         if progress_callback:
@@ -145,25 +175,25 @@ class RankingOrchestrator:
         # Run all calculators
         if progress_callback:
             progress_callback("RS Rating", 0, total)
-        rs_results = self.rs_calculator.calculate_batch(price_data, calc_date)
+        rs_results = self._run_calculator(self.rs_calculator, price_data, calc_date)
         if progress_callback:
             progress_callback("RS Rating", total, total)
         
         if progress_callback:
             progress_callback("Momentum", 0, total)
-        momentum_results = self.momentum_calculator.calculate_batch(price_data, calc_date)
+        momentum_results = self._run_calculator(self.momentum_calculator, price_data, calc_date)
         if progress_callback:
             progress_callback("Momentum", total, total)
         
         if progress_callback:
             progress_callback("Trend Template", 0, total)
-        trend_results = self.trend_calculator.calculate_batch(price_data, calc_date)
+        trend_results = self._run_calculator(self.trend_calculator, price_data, calc_date)
         if progress_callback:
             progress_callback("Trend Template", total, total)
         
         if progress_callback:
             progress_callback("Technical", 0, total)
-        technical_results = self.technical_calculator.calculate_batch(price_data, calc_date)
+        technical_results = self._run_calculator(self.technical_calculator, price_data, calc_date)
         if progress_callback:
             progress_callback("Technical", total, total)
         
@@ -272,6 +302,12 @@ class RankingOrchestrator:
         
         return results
     
+    def _run_calculator(self, calculator, price_data, calc_date: date) -> Dict[str, Any]:
+        """Dispatch to calculate_panel or calculate_batch depending on the data shape."""
+        if isinstance(price_data, PricePanel):
+            return calculator.calculate_panel(price_data, calc_date)
+        return calculator.calculate_batch(price_data, calc_date)
+    
     def get_top_stocks(
         self,
         n: int = 50,
@@ -8,8 +8,11 @@ RS Rating is a percentile ranking (1-99) where 99 = top 1% performer.
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
+from .price_panel import PricePanel, rank_descending
+
 
 @dataclass
 class RSResult:
@@ -121,3 +124,63 @@ class RSRatingService:
             results[symbol].rs_rating = round(percentile, 0)
         
         return results
+    
+    def calculate_panel(
+        self,
+        panel: PricePanel,
+        calculation_date: date,
+        lookback_months: int = 12,
+    ) -> Dict[str, RSResult]:
+        """
+        Vectorized calculate_batch over a PricePanel.
+        
+        Produces the same returns, ranks and ratings as the per-symbol
+        path without copying or re-sorting any per-symbol frame.
+        """
+        results = {}
+        if panel.num_symbols == 0:
+            return results
+        
+        row = panel.row_for(calculation_date)
+        last_rows = panel.last_valid_rows()
+        cols = np.arange(panel.num_symbols)
+        
+        end_rows = last_rows[row] if row >= 0 else np.full(panel.num_symbols, -1)
+        has_end = end_rows >= 0
+        safe_end = np.where(has_end, end_rows, 0)
+        end_price = panel.close[safe_end, cols]
+        
+        # Start price: last close on or before end_date - lookback
+        start_dates = panel.dates[safe_end] - np.timedelta64(lookback_months * 30, "D")
+        start_rows = np.searchsorted(panel.dates, start_dates, side="right") - 1
+        start_valid = np.where(start_rows >= 0, last_rows[np.maximum(start_rows, 0), cols], -1)
+        
+        # Fallback mirrors calculate_return: the last close of the full history
+        overall_last = last_rows[-1]
+        start_idx = np.where(start_valid >= 0, start_valid, overall_last)
+        start_price = panel.close[np.maximum(start_idx, 0), cols]
+        
+        ok = has_end & (start_idx >= 0) & (start_price > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.round((end_price - start_price) / start_price * 100, 2)
+        
+        ranks = rank_descending(returns, ok)
+        total = int(ok.sum())
+        
+        for j, symbol in enumerate(panel.symbols):
+            if not ok[j]:
+                results[symbol] = RSResult(
+                    symbol=symbol, return_12m=0, rs_rating=0, rank=0,
+                    success=False, error="Insufficient data for 12M return"
+                )
+                continue
+            rank = int(ranks[j])
+            percentile = ((total - rank + 1) / total) * 98 + 1
+            results[symbol] = RSResult(
+                symbol=symbol,
+                return_12m=float(returns[j]),
+                rs_rating=round(percentile, 0),
+                rank=rank,
+            )
+        
+        return results
@@ -15,8 +15,11 @@ Total: 0-100 scale
 from dataclasses import dataclass
 from datetime import date
 from typing import Dict, Optional
+import numpy as np
 import pandas as pd
 
+from .price_panel import PricePanel, rank_descending, window_mean
+
 
 @dataclass
 class TechnicalResult:
@@ -78,6 +81,36 @@ class TechnicalScoreService:
         
         return round(score, 2), round(pct_above, 2)
     
+    def score_price_vs_sma_array(
+        self, price: np.ndarray, sma: np.ndarray, max_points: float = 25, optimal_pct: float = 10
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized score_price_vs_sma over arrays of prices and SMAs."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_above = (price - sma) / sma * 100
+        
+        score = np.select(
+            [
+                pct_above <= optimal_pct,
+                pct_above <= 20,
+            ],
+            [
+                max_points * (0.5 + 0.5 * (pct_above / optimal_pct)),
+                max_points,
+            ],
+            default=max_points * (1 - np.minimum((pct_above - 20) / 20, 0.5)),
+        )
+        below = np.where(
+            pct_above >= -10,
+            max_points * (0.5 + pct_above / 20),
+            np.maximum(0, max_points * (0.25 + pct_above / 40)),
+        )
+        score = np.where(pct_above >= 0, score, below)
+        
+        invalid = ~(sma > 0)
+        score = np.where(invalid, 0, score)
+        pct_above = np.where(invalid, 0, pct_above)
+        return np.round(score, 2), np.round(pct_above, 2)
+    
     def score_sma_alignment(
         self, sma_50: float, sma_150: float, sma_200: float, max_points: float = 25
     ) -> float:
@@ -164,3 +197,61 @@ class TechnicalScoreService:
             results[symbol].percentile = round((total - rank + 1) / total * 100, 1)
         
         return results
+    
+    def calculate_panel(
+        self, panel: PricePanel, calculation_date: date
+    ) -> Dict[str, TechnicalResult]:
+        """Vectorized calculate_batch over a PricePanel."""
+        results = {}
+        if panel.num_symbols == 0:
+            return results
+        
+        window, counts = panel.tail(calculation_date, 200)
+        total_counts = panel.observation_counts()
+        
+        price = window[-1]
+        sma_50 = window_mean(window, 50)
+        sma_150 = window_mean(window, 150)
+        sma_200 = window_mean(window, 200)
+        
+        score_50, pct_50 = self.score_price_vs_sma_array(price, sma_50)
+        score_150, pct_150 = self.score_price_vs_sma_array(price, sma_150)
+        score_200, pct_200 = self.score_price_vs_sma_array(price, sma_200)
+        score_align = np.round(
+            (sma_50 > sma_150) * 25 * 0.4
+            + (sma_150 > sma_200) * 25 * 0.4
+            + (sma_50 > sma_200) * 25 * 0.2,
+            2,
+        )
+        total_scores = np.round(score_50 + score_150 + score_200 + score_align, 2)
+        
+        ok = (total_counts >= 200) & (counts >= 200)
+        ranks = rank_descending(total_scores, ok)
+        total = int(ok.sum())
+        
+        for j, symbol in enumerate(panel.symbols):
+            if total_counts[j] < 200:
+                results[symbol] = TechnicalResult(
+                    symbol=symbol, technical_score=0, success=False,
+                    error="Insufficient data (need 200 days)"
+                )
+                continue
+            if counts[j] < 200:
+                results[symbol] = TechnicalResult(
+                    symbol=symbol, technical_score=0, success=False,
+                    error="Insufficient data after date filter"
+                )
+                continue
+            rank = int(ranks[j])
+            results[symbol] = TechnicalResult(
+                symbol=symbol, technical_score=float(total_scores[j]),
+                rank=rank, percentile=round((total - rank + 1) / total * 100, 1),
+                score_vs_50sma=float(score_50[j]), score_vs_150sma=float(score_150[j]),
+                score_vs_200sma=float(score_200[j]), score_alignment=float(score_align[j]),
+                price=round(float(price[j]), 2), sma_50=round(float(sma_50[j]), 2),
+                sma_150=round(float(sma_150[j]), 2), sma_200=round(float(sma_200[j]), 2),
+                pct_above_50sma=float(pct_50[j]), pct_above_150sma=float(pct_150[j]),
+                pct_above_200sma=float(pct_200[j]),
+            )
+        
+        return results
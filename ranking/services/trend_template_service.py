@@ -16,8 +16,11 @@ Checks Mark Minervini's 8 Trend Template conditions:
 from dataclasses import dataclass, field
 from datetime import date
 from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
+from .price_panel import PricePanel, rank_descending, window_mean
+
 
 @dataclass
 class TrendCondition:
@@ -150,3 +153,83 @@ class TrendTemplateService:
             results[symbol].rank = rank
         
         return results
+    
+    def calculate_panel(
+        self, panel: PricePanel, calculation_date: date
+    ) -> Dict[str, TrendTemplateResult]:
+        """
+        Vectorized calculate_batch over a PricePanel.
+        
+        All eight conditions are evaluated as array comparisons over
+        one right-aligned 252-bar window.
+        """
+        results = {}
+        if panel.num_symbols == 0:
+            return results
+        
+        window, counts = panel.tail(calculation_date, 252)
+        total_counts = panel.observation_counts()
+        high_window = panel.tail(calculation_date, 252, "high")[0] if panel.high is not None else window
+        low_window = panel.tail(calculation_date, 252, "low")[0] if panel.low is not None else window
+        
+        price = window[-1]
+        sma_50 = window_mean(window, 50)
+        sma_150 = window_mean(window, 150)
+        sma_200 = window_mean(window, 200)
+        past_sma_200 = window[-230:-30].mean(axis=0)
+        with np.errstate(all="ignore"):
+            high_52w = np.nanmax(high_window, axis=0)
+            low_52w = np.nanmin(low_window, axis=0)
+            pct_from_high = (price - high_52w) / high_52w * 100
+            pct_from_low = (price - low_52w) / low_52w * 100
+        
+        checks = [
+            ("price_above_150sma", price > sma_150, "Price above 150-day SMA", price, sma_150),
+            ("price_above_200sma", price > sma_200, "Price above 200-day SMA", price, sma_200),
+            ("150sma_above_200sma", sma_150 > sma_200, "150-day SMA above 200-day SMA", sma_150, sma_200),
+            ("200sma_trending_up", sma_200 > past_sma_200, "200-day SMA trending up", None, None),
+            ("50sma_above_150sma", sma_50 > sma_150, "50-day SMA above 150-day SMA", sma_50, sma_150),
+            ("50sma_above_200sma", sma_50 > sma_200, "50-day SMA above 200-day SMA", sma_50, sma_200),
+            ("price_above_50sma", price > sma_50, "Price above 50-day SMA", price, sma_50),
+            ("price_position", (pct_from_high >= -25) & (pct_from_low >= 30),
+             "Within 25% of 52w high and 30%+ above 52w low", pct_from_high, None),
+        ]
+        scores = np.sum([passed for _, passed, _, _, _ in checks], axis=0)
+        
+        ok = (total_counts >= 252) & (counts >= 252)
+        ranks = rank_descending(scores.astype(float), ok)
+        
+        for j, symbol in enumerate(panel.symbols):
+            if total_counts[j] < 252:
+                results[symbol] = TrendTemplateResult(
+                    symbol=symbol, score=0, success=False,
+                    error="Insufficient data (need 252 days)"
+                )
+                continue
+            if counts[j] < 252:
+                results[symbol] = TrendTemplateResult(
+                    symbol=symbol, score=0, success=False,
+                    error="Insufficient data after date filter"
+                )
+                continue
+            
+            conditions = []
+            for name, passed, description, actual, threshold in checks:
+                conditions.append(TrendCondition(
+                    name, bool(passed[j]), description,
+                    float(actual[j]) if actual is not None else None,
+                    float(threshold[j]) if threshold is not None else None,
+                ))
+            conditions[-1].threshold = -25
+            
+            results[symbol] = TrendTemplateResult(
+                symbol=symbol, score=int(scores[j]), conditions=conditions,
+                price=round(float(price[j]), 2), sma_50=round(float(sma_50[j]), 2),
+                sma_150=round(float(sma_150[j]), 2), sma_200=round(float(sma_200[j]), 2),
+                high_52w=round(float(high_52w[j]), 2), low_52w=round(float(low_52w[j]), 2),
+                pct_from_high=round(float(pct_from_high[j]), 2),
+                pct_from_low=round(float(pct_from_low[j]), 2),
+                rank=int(ranks[j]),
+            )
+        
+        return results
@@ -4,18 +4,30 @@ Real-Time Advance-Decline Calculator
 
 Calculates intraday advance/decline breadth metrics from real-time price data.
 Maintains in-memory cache of stock statuses.
+
+Advance/decline/unchanged counts are kept as running counters and the
+gainer/loser/volume leaderboards as sorted lists, both adjusted from each
+symbol's old and new status on update, so reads never rescan the universe.
 """
 
+from bisect import bisect_left, insort
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+ADVANCE = 'ADVANCE'
+DECLINE = 'DECLINE'
+UNCHANGED = 'UNCHANGED'
+
 
 class StockStatus:
     """Represents the current status of a single stock"""
     
+    __slots__ = ('symbol', 'ltp', 'prev_close', 'timestamp', 'volume',
+                 'change', 'change_pct', 'status')
+    
     def __init__(self, symbol: str, ltp: float, prev_close: float, 
                  timestamp: datetime, volume: int = 0):
         self.symbol = symbol
@@ -30,17 +42,51 @@ class StockStatus:
         
         # Determine status
         if self.change > 0:
-            self.status = 'ADVANCE'
+            self.status = ADVANCE
         elif self.change < 0:
-            self.status = 'DECLINE'
+            self.status = DECLINE
         else:
-            self.status = 'UNCHANGED'
+            self.status = UNCHANGED
     
     def __repr__(self):
         return (f"StockStatus({self.symbol}, ltp={self.ltp:.2f}, "
                 f"prev={self.prev_close:.2f}, status={self.status})")
 
 
+class Leaderboard:
+    """Symbols kept sorted by a key, updated one entry at a time"""
+    
+    __slots__ = ('_entries', '_keys')
+    
+    def __init__(self):
+        self._entries: List[Tuple[float, str]] = []  # (sort key, symbol), ascending
+        self._keys: Dict[str, float] = {}
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def set(self, symbol: str, key: float):
+        old = self._keys.get(symbol)
+        if old == key:
+            return
+        if old is not None:
+            self.discard(symbol)
+        self._keys[symbol] = key
+        insort(self._entries, (key, symbol))
+    
+    def discard(self, symbol: str):
+        key = self._keys.pop(symbol, None)
+        if key is not None:
+            del self._entries[bisect_left(self._entries, (key, symbol))]
+    
+    def first(self, n: int) -> List[str]:
+        return [symbol for _, symbol in self._entries[:n]]
+    
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+
+
 class IntradayAdvDeclCalculator:
     """Calculate real-time advance-decline metrics"""
     
@@ -49,6 +95,12 @@ class IntradayAdvDeclCalculator:
         self.stocks = {}  # symbol -> StockStatus
         self.last_update = None
         self.update_count = 0
+        
+        # Running status counts and leaderboards, maintained by update_stock
+        self._counts = {ADVANCE: 0, DECLINE: 0, UNCHANGED: 0}
+        self._gainers = Leaderboard()  # ADVANCE only, by -change_pct
+        self._losers = Leaderboard()   # DECLINE only, by change_pct
+        self._active = Leaderboard()   # All, by -volume
     
     def update_stock(self, symbol: str, ltp: float, prev_close: float, 
                      timestamp: datetime, volume: int = 0) -> StockStatus:
@@ -66,7 +118,9 @@ class IntradayAdvDeclCalculator:
             StockStatus object
         """
         status = StockStatus(symbol, ltp, prev_close, timestamp, volume)
+        previous = self.stocks.get(symbol)
         self.stocks[symbol] = status
+        self._track(previous, status)
         self.last_update = datetime.now()
         self.update_count += 1
         
@@ -103,6 +157,25 @@ class IntradayAdvDeclCalculator:
         
         return updated
     
+    def _track(self, previous: Optional[StockStatus], status: StockStatus):
+        """Move a symbol's contribution to the counters and leaderboards"""
+        symbol = status.symbol
+        if previous is not None:
+            self._counts[previous.status] -= 1
+        self._counts[status.status] += 1
+        
+        if status.status == ADVANCE:
+            self._gainers.set(symbol, -status.change_pct)
+        elif previous is not None and previous.status == ADVANCE:
+            self._gainers.discard(symbol)
+        
+        if status.status == DECLINE:
+            self._losers.set(symbol, status.change_pct)
+        elif previous is not None and previous.status == DECLINE:
+            self._losers.discard(symbol)
+        
+        self._active.set(symbol, -(status.volume or 0))
+    
     def calculate_breadth(self) -> Dict:
         """
         Calculate advance-decline breadth metrics
@@ -126,10 +199,10 @@ class IntradayAdvDeclCalculator:
                 'market_sentiment': 'NEUTRAL'
             }
         
-        # Count statuses
-        advances = sum(1 for s in self.stocks.values() if s.status == 'ADVANCE')
-        declines = sum(1 for s in self.stocks.values() if s.status == 'DECLINE')
-        unchanged = sum(1 for s in self.stocks.values() if s.status == 'UNCHANGED')
+        # Running counts
+        advances = self._counts[ADVANCE]
+        declines = self._counts[DECLINE]
+        unchanged = self._counts[UNCHANGED]
         total = len(self.stocks)
         
         # Calculate percentages
@@ -205,8 +278,7 @@ class IntradayAdvDeclCalculator:
         Returns:
             List of StockStatus objects
         """
-        gainers = [s for s in self.stocks.values() if s.status == 'ADVANCE']
-        return sorted(gainers, key=lambda s: s.change_pct, reverse=True)[:n]
+        return [self.stocks[symbol] for symbol in self._gainers.first(n)]
     
     def get_top_losers(self, n: int = 10) -> List[StockStatus]:
         """
@@ -218,8 +290,7 @@ class IntradayAdvDeclCalculator:
         Returns:
             List of StockStatus objects
         """
-        losers = [s for s in self.stocks.values() if s.status == 'DECLINE']
-        return sorted(losers, key=lambda s: s.change_pct)[:n]
+        return [self.stocks[symbol] for symbol in self._losers.first(n)]
     
     def get_most_active(self, n: int = 10) -> List[StockStatus]:
         """
@@ -231,11 +302,15 @@ class IntradayAdvDeclCalculator:
         Returns:
             List of StockStatus objects
         """
-        return sorted(self.stocks.values(), key=lambda s: s.volume, reverse=True)[:n]
+        return [self.stocks[symbol] for symbol in self._active.first(n)]
     
     def clear_cache(self):
         """Clear all cached stock data"""
         self.stocks.clear()
+        self._counts = {ADVANCE: 0, DECLINE: 0, UNCHANGED: 0}
+        self._gainers.clear()
+        self._losers.clear()
+        self._active.clear()
         logger.info("Cache cleared")
     
     def get_cache_info(self) -> Dict:
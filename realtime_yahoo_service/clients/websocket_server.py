@@ -3,18 +3,189 @@ WebSocket Server - Bridge Redis events to WebSocket clients
 """
 
 import asyncio
+import itertools
 import json
 import logging
-from typing import Dict, Set, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Set, Optional
 from datetime import datetime
 import websockets
 from websockets.server import WebSocketServerProtocol
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 from subscribers.base_subscriber import BaseSubscriber
+from events.event_models import CandleBatchEvent
 
 
 logger = logging.getLogger(__name__)
 
+# Field identifying the latest-value slot of a message per channel
+# (market.trend carries a full snapshot, so the channel alone is the slot)
+COALESCE_FIELDS = {
+    'market.candle': 'symbol',
+    'market.breadth': 'index_name',
+    'market.status': 'publisher_id',
+    'market.trend': None,
+}
+
+FRAME_FORMATS = ('json', 'msgpack')
+
+
+class ClientRegistry(dict):
+    """
+    Connected clients: websocket -> subscribed channels.
+    
+    Also keeps a channel -> websockets reverse index so a broadcast finds
+    its subscribers without scanning every client. Change subscriptions
+    with subscribe()/unsubscribe() to keep the index current.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.by_channel: Dict[str, Set[WebSocketServerProtocol]] = {}
+    
+    def __setitem__(self, websocket, channels: Iterable[str]):
+        if websocket in self:
+            self._unindex(websocket)
+        channels = set(channels)
+        super().__setitem__(websocket, channels)
+        for channel in channels:
+            self.by_channel.setdefault(channel, set()).add(websocket)
+    
+    def __delitem__(self, websocket):
+        self._unindex(websocket)
+        super().__delitem__(websocket)
+    
+    def pop(self, websocket, *default):
+        if websocket in self:
+            self._unindex(websocket)
+        return super().pop(websocket, *default)
+    
+    def clear(self):
+        super().clear()
+        self.by_channel.clear()
+    
+    def subscribe(self, websocket, channel: str):
+        self[websocket].add(channel)
+        self.by_channel.setdefault(channel, set()).add(websocket)
+    
+    def unsubscribe(self, websocket, channel: str):
+        self[websocket].discard(channel)
+        self._discard(channel, websocket)
+    
+    def subscribers(self, channel: str) -> Set[WebSocketServerProtocol]:
+        return self.by_channel.get(channel, set())
+    
+    def _unindex(self, websocket):
+        for channel in dict.__getitem__(self, websocket):
+            self._discard(channel, websocket)
+    
+    def _discard(self, channel: str, websocket):
+        clients = self.by_channel.get(channel)
+        if clients is not None:
+            clients.discard(websocket)
+            if not clients:
+                del self.by_channel[channel]
+
+
+class ClientOutbox:
+    """
+    Bounded outbound queue and writer task for one client.
+    
+    Broadcasts only enqueue, so a slow client never delays the others.
+    A message with a coalescing key replaces a still-pending message with
+    the same key in place (latest value wins): a client that falls behind
+    gets the newest state per symbol rather than a growing backlog. When
+    the queue is full the oldest pending message is dropped.
+    """
+    
+    def __init__(self, websocket: WebSocketServerProtocol, max_queue: int = 1000, frame_format: str = 'json'):
+        """
+        Args:
+            websocket: Client connection
+            max_queue: Pending messages kept for the client
+            frame_format: 'json' (text frames) or 'msgpack' (binary frames)
+        """
+        self.websocket = websocket
+        self.max_queue = max(1, max_queue)
+        self.frame_format = frame_format
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.closed = False
+        self._pending: OrderedDict = OrderedDict()
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def put(self, frame, key: Optional[Hashable] = None):
+        """Queue an encoded frame, coalescing on key"""
+        if self.closed:
+            return
+        
+        if key is None:
+            key = next(self._seq)
+        elif key in self._pending:
+            self._pending[key] = frame
+            self.coalesced += 1
+            return
+        
+        if len(self._pending) >= self.max_queue:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = frame
+        
+        self._idle.clear()
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def join(self):
+        """Wait until every queued frame has been sent (or the client closed)"""
+        await self._idle.wait()
+    
+    async def close(self):
+        """Stop the writer and discard pending frames"""
+        self.closed = True
+        self._pending.clear()
+        self._idle.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            _, frame = self._pending.popitem(last=False)
+            try:
+                await self.websocket.send(frame)
+                self.sent += 1
+            except websockets.exceptions.ConnectionClosed:
+                # Client disconnected, will be cleaned up by its handler
+                self.closed = True
+                self._pending.clear()
+                self._idle.set()
+                return
+            except Exception as e:
+                logger.error(f"Error sending to client: {e}")
+
 
 class WebSocketServer(BaseSubscriber):
     """
@@ -27,6 +198,14 @@ class WebSocketServer(BaseSubscriber):
     - Authentication support (optional)
     - Automatic reconnection handling
     - Message broadcasting to subscribed clients
+    - Candle batches (market.candle.batch) forwarded as one message, and
+      expanded per symbol for clients subscribed to market.candle
+    - Channel -> client index; bounded per-client queues with a writer task
+      each, so a slow client cannot block the others
+    - Latest-value coalescing per symbol for clients that fall behind
+    - JSON text frames or msgpack binary frames per client
+      ({"type": "set_format", "format": "msgpack"}), optional
+      permessage-deflate
     """
     
     def __init__(
@@ -39,6 +218,9 @@ class WebSocketServer(BaseSubscriber):
         channels: Optional[list] = None,
         heartbeat_interval: float = 30.0,
         auth_token: Optional[str] = None,
+        max_queue: int = 1000,
+        frame_format: str = 'json',
+        compression: Optional[str] = 'deflate',
         **kwargs
     ):
         """
@@ -53,8 +235,16 @@ class WebSocketServer(BaseSubscriber):
             channels: Default channels to subscribe to (default: ['market.candle', 'market.breadth', 'market.trend', 'market.status'])
             heartbeat_interval: Seconds between heartbeat pings
             auth_token: Optional authentication token
+            max_queue: Pending messages kept per client before the oldest is dropped
+            frame_format: Default frame format for new clients ('json' or 'msgpack')
+            compression: 'deflate' for permessage-deflate, None to disable
             **kwargs: Additional arguments for BaseSubscriber
         """
+        if frame_format not in FRAME_FORMATS:
+            raise ValueError(f"Unknown frame format: {frame_format}")
+        if frame_format == 'msgpack' and msgpack is None:
+            raise ImportError("msgpack is not installed. Install with: pip install msgpack")
+        
         default_channels = channels or [
             'market.candle',
             'market.breadth', 
@@ -62,22 +252,35 @@ class WebSocketServer(BaseSubscriber):
             'market.status'
         ]
         
+        # Candles may arrive as batches; receive them for market.candle clients too
+        broker_channels = list(default_channels)
+        if 'market.candle' in broker_channels and 'market.candle.batch' not in broker_channels:
+            broker_channels.append('market.candle.batch')
+        
         super().__init__(
             subscriber_id=subscriber_id,
             broker=broker,
             serializer=serializer,
-            channels=default_channels,
+            channels=broker_channels,
             **kwargs
         )
         
+        self._default_channels = list(default_channels)
+        
         self._host = host
         self._port = port
         self._heartbeat_interval = heartbeat_interval
         self._auth_token = auth_token
+        self._max_queue = max_queue
+        self._frame_format = frame_format
+        self._compression = compression
         
         # Connected clients and their subscriptions
-        # {websocket: set(channels)}
-        self._clients: Dict[WebSocketServerProtocol, Set[str]] = {}
+        # {websocket: set(channels)}, indexed by channel
+        self._clients = ClientRegistry()
+        
+        # Outbound queue and writer per client
+        self._outboxes: Dict[WebSocketServerProtocol, ClientOutbox] = {}
         
         # WebSocket server instance
         self._ws_server = None
@@ -101,6 +304,7 @@ class WebSocketServer(BaseSubscriber):
             self._port,
             ping_interval=20,
             ping_timeout=10,
+            compression=self._compression,
         )
         
         # Start heartbeat task
@@ -118,6 +322,11 @@ class WebSocketServer(BaseSubscriber):
             except asyncio.CancelledError:
                 pass
         
+        # Stop client writers
+        outboxes = list(self._outboxes.values())
+        self._outboxes.clear()
+        await asyncio.gather(*(outbox.close() for outbox in outboxes), return_exceptions=True)
+        
         # Close all client connections
         if self._clients:
             close_tasks = [ws.close() for ws in self._clients.keys()]
@@ -141,6 +350,13 @@ class WebSocketServer(BaseSubscriber):
             data: Serialized message data (bytes) or already deserialized dict
         """
         try:
+            if isinstance(data, CandleBatchEvent):
+                # Already decoded by BaseSubscriber
+                await self._broadcast_candle_batch(data)
+                self._stats['total_processed'] += 1
+                self._stats['messages_broadcast'] = self._stats.get('messages_broadcast', 0) + 1
+                return
+            
             # Deserialize message (handle both bytes and already-deserialized dict)
             if isinstance(data, bytes):
                 message = self.serializer.deserialize(data)
@@ -159,7 +375,7 @@ class WebSocketServer(BaseSubscriber):
             }
             
             # Broadcast to subscribed clients
-            await self._broadcast(channel, ws_message)
+            await self._broadcast(channel, ws_message, self._coalesce_key(channel, message))
             
             self._stats['total_processed'] += 1
             self._stats['messages_broadcast'] = self._stats.get('messages_broadcast', 0) + 1
@@ -199,13 +415,14 @@ class WebSocketServer(BaseSubscriber):
                 }))
             
             # Initialize client with default channels
-            self._clients[websocket] = set(self.channels)
+            self._clients[websocket] = set(self._default_channels)
+            self._outbox(websocket)
             
             # Send welcome message
             await websocket.send(json.dumps({
                 'type': 'welcome',
                 'server_id': self.subscriber_id,
-                'subscribed_channels': list(self.channels),
+                'subscribed_channels': list(self._default_channels),
                 'timestamp': datetime.utcnow().isoformat()
             }))
             
@@ -219,8 +436,10 @@ class WebSocketServer(BaseSubscriber):
             logger.error(f"Error handling client {client_id}: {e}")
         finally:
             # Remove client
-            if websocket in self._clients:
-                del self._clients[websocket]
+            self._clients.pop(websocket, None)
+            outbox = self._outboxes.pop(websocket, None)
+            if outbox is not None:
+                await outbox.close()
             
             self._stats['total_disconnections'] = self._stats.get('total_disconnections', 0) + 1
     
@@ -240,7 +459,7 @@ class WebSocketServer(BaseSubscriber):
                 # Subscribe to channel
                 channel = data.get('channel')
                 if channel and websocket in self._clients:
-                    self._clients[websocket].add(channel)
+                    self._clients.subscribe(websocket, channel)
                     await websocket.send(json.dumps({
                         'type': 'subscribed',
                         'channel': channel,
@@ -252,7 +471,7 @@ class WebSocketServer(BaseSubscriber):
                 # Unsubscribe from channel
                 channel = data.get('channel')
                 if channel and websocket in self._clients:
-                    self._clients[websocket].discard(channel)
+                    self._clients.unsubscribe(websocket, channel)
                     await websocket.send(json.dumps({
                         'type': 'unsubscribed',
                         'channel': channel,
@@ -267,6 +486,22 @@ class WebSocketServer(BaseSubscriber):
                     'timestamp': datetime.utcnow().isoformat()
                 }))
             
+            elif msg_type == 'set_format':
+                # Switch between JSON text and msgpack binary frames
+                frame_format = data.get('format')
+                if frame_format not in FRAME_FORMATS or (frame_format == 'msgpack' and msgpack is None):
+                    await websocket.send(json.dumps({
+                        'type': 'error',
+                        'message': f'Unsupported format: {frame_format}'
+                    }))
+                elif websocket in self._clients:
+                    self._outbox(websocket).frame_format = frame_format
+                    await websocket.send(json.dumps({
+                        'type': 'format',
+                        'format': frame_format,
+                        'timestamp': datetime.utcnow().isoformat()
+                    }))
+            
             elif msg_type == 'get_channels':
                 # Return list of subscribed channels
                 if websocket in self._clients:
@@ -291,40 +526,90 @@ class WebSocketServer(BaseSubscriber):
         except Exception as e:
             logger.error(f"Error handling client message: {e}")
     
-    async def _broadcast(self, channel: str, message: dict):
+    async def _broadcast(self, channel: str, message: dict, key: Optional[Hashable] = None):
         """
-        Broadcast message to all clients subscribed to the channel.
+        Queue a message for all clients subscribed to the channel.
         
         Args:
             channel: Channel name
             message: Message to broadcast
+            key: Coalescing key (a pending message with the same key is replaced)
         """
-        if not self._clients:
+        subscribed_clients = self._clients.subscribers(channel)
+        if not subscribed_clients:
             return
         
-        # Find subscribed clients
-        subscribed_clients = [
-            ws for ws, channels in self._clients.items()
-            if channel in channels
-        ]
+        self._enqueue(subscribed_clients, message, key)
+        logger.debug(f"Queued broadcast for {len(subscribed_clients)} clients on {channel}")
+    
+    def _enqueue(self, clients: Iterable[WebSocketServerProtocol], message: dict, key: Optional[Hashable] = None):
+        """Encode a message once per frame format and queue it for each client"""
+        frames = {}
+        for websocket in clients:
+            outbox = self._outbox(websocket)
+            frame = frames.get(outbox.frame_format)
+            if frame is None:
+                frame = frames[outbox.frame_format] = self._encode_frame(message, outbox.frame_format)
+            outbox.put(frame, key)
+    
+    def _outbox(self, websocket: WebSocketServerProtocol) -> ClientOutbox:
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            outbox = self._outboxes[websocket] = ClientOutbox(
+                websocket, max_queue=self._max_queue, frame_format=self._frame_format
+            )
+        return outbox
+    
+    @staticmethod
+    def _encode_frame(message: dict, frame_format: str):
+        if frame_format == 'msgpack':
+            return msgpack.packb(message, default=str, use_bin_type=True)
+        return json.dumps(message)
+    
+    @staticmethod
+    def _coalesce_key(channel: str, data: Any) -> Optional[Hashable]:
+        """Latest-value slot of a message, or None if every message must be delivered"""
+        if channel not in COALESCE_FIELDS:
+            return None
+        field = COALESCE_FIELDS[channel]
+        if field is None:
+            return (channel,)
+        if isinstance(data, dict) and data.get(field) is not None:
+            return (channel, data[field])
+        return None
+    
+    async def flush(self):
+        """Wait until every client's queue has been sent"""
+        await asyncio.gather(*(outbox.join() for outbox in list(self._outboxes.values())))
+    
+    async def _broadcast_candle_batch(self, batch: CandleBatchEvent):
+        """
+        Broadcast a candle batch.
         
-        if not subscribed_clients:
-            return
+        Clients subscribed to market.candle.batch get the columnar batch as
+        one message; clients subscribed to market.candle get one message
+        per symbol, built only if any such client is connected.
         
-        # Serialize message once
-        json_message = json.dumps(message)
+        Args:
+            batch: Decoded CandleBatchEvent
+        """
+        timestamp = datetime.utcnow().isoformat()
         
-        # Send to all subscribed clients
-        send_tasks = [
-            self._send_to_client(ws, json_message)
-            for ws in subscribed_clients
-        ]
+        await self._broadcast('market.candle.batch', {
+            'channel': 'market.candle.batch',
+            'data': batch.model_dump(),
+            'timestamp': timestamp
+        })
         
-        results = await asyncio.gather(*send_tasks, return_exceptions=True)
+        if not self._clients.subscribers('market.candle'):
+            return
         
-        # Count successful sends
-        successful = sum(1 for r in results if r is True)
-        logger.debug(f"Broadcast to {successful}/{len(subscribed_clients)} clients on {channel}")
+        for event in batch.to_events():
+            await self._broadcast('market.candle', {
+                'channel': 'market.candle',
+                'data': event.model_dump(),
+                'timestamp': timestamp
+            }, ('market.candle', event.symbol))
     
     async def _send_to_client(self, websocket: WebSocketServerProtocol, message: str) -> bool:
         """
@@ -356,18 +641,14 @@ class WebSocketServer(BaseSubscriber):
                 if not self._clients:
                     continue
                 
-                heartbeat_msg = json.dumps({
+                heartbeat_msg = {
                     'type': 'heartbeat',
                     'timestamp': datetime.utcnow().isoformat(),
                     'active_clients': len(self._clients)
-                })
-                
-                send_tasks = [
-                    self._send_to_client(ws, heartbeat_msg)
-                    for ws in self._clients.keys()
-                ]
+                }
                 
-                await asyncio.gather(*send_tasks, return_exceptions=True)
+                # Queued like data, so a backed-up client holds one heartbeat
+                self._enqueue(list(self._clients), heartbeat_msg, ('heartbeat',))
                 
                 logger.debug(f"Heartbeat sent to {len(self._clients)} clients")
                 
@@ -383,6 +664,9 @@ class WebSocketServer(BaseSubscriber):
             'active_clients': len(self._clients),
             'messages_broadcast': self._stats.get('messages_broadcast', 0),
             'total_disconnections': self._stats.get('total_disconnections', 0),
+            'messages_coalesced': sum(o.coalesced for o in self._outboxes.values()),
+            'messages_dropped': sum(o.dropped for o in self._outboxes.values()),
+            'max_client_backlog': max((len(o) for o in self._outboxes.values()), default=0),
             'host': self._host,
             'port': self._port,
         })
@@ -6,8 +6,10 @@ Dead Letter Queue for handling failed message processing.
 """
 
 from .dlq_manager import DLQManager, DLQMessage
+from .segment_log import SegmentLog
 
 __all__ = [
     'DLQManager',
     'DLQMessage',
+    'SegmentLog',
 ]
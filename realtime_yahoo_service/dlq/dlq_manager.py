@@ -3,6 +3,10 @@ Dead Letter Queue Manager
 ==========================
 
 Manages failed message processing with retry logic and persistence.
+
+Messages are persisted in an append-only SegmentLog: adding, updating
+or removing a message appends one record, and startup replays only the
+(compacted) segments instead of parsing one JSON file per message.
 """
 
 import asyncio
@@ -14,6 +18,8 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from .segment_log import SegmentLog
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +59,15 @@ class DLQMessage:
         data['payload'] = bytes.fromhex(data['payload'])  # Convert hex to bytes
         return cls(**data)
     
+    def to_record(self) -> list:
+        """Convert to a positional record for the segment log (raw payload bytes)"""
+        return [getattr(self, name) for name in RECORD_FIELDS]
+    
+    @classmethod
+    def from_record(cls, record: list) -> 'DLQMessage':
+        """Create from a segment log record"""
+        return cls(**dict(zip(RECORD_FIELDS, record)))
+    
     def is_retryable(self) -> bool:
         """Check if message can be retried"""
         return self.retry_count < self.max_retries
@@ -63,12 +78,19 @@ class DLQMessage:
         return age_days > retention_days
 
 
+RECORD_FIELDS = (
+    'id', 'channel', 'payload', 'error_message', 'error_type',
+    'original_timestamp', 'failure_timestamp', 'retry_count',
+    'max_retries', 'subscriber_id',
+)
+
+
 class DLQManager:
     """
     Dead Letter Queue Manager for handling failed messages
     
     Features:
-    - Persist failed messages to disk
+    - Persist failed messages to an append-only segment log
     - Automatic retry with exponential backoff
     - Manual replay capability
     - Age-based cleanup
@@ -83,6 +105,8 @@ class DLQManager:
         retention_days: int = 7,
         enable_auto_retry: bool = True,
         auto_retry_interval: float = 300.0,  # 5 minutes
+        segment_max_bytes: int = 16 * 1024 * 1024,
+        fsync: bool = False,
     ):
         """
         Initialize DLQ manager
@@ -94,6 +118,8 @@ class DLQManager:
             retention_days: Days to retain messages before cleanup
             enable_auto_retry: Enable automatic retry background task
             auto_retry_interval: Interval between auto-retry attempts (seconds)
+            segment_max_bytes: Size at which the log rolls to a new segment
+            fsync: fsync the log after every write
         """
         self.storage_path = Path(storage_path)
         self.max_retries = max_retries
@@ -123,6 +149,13 @@ class DLQManager:
         # Ensure storage directory exists
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
+        # Persistent message log
+        self._log = SegmentLog(
+            storage_path,
+            segment_max_bytes=segment_max_bytes,
+            fsync=fsync,
+        )
+        
         logger.info(
             f"DLQManager initialized: storage={storage_path}, "
             f"max_retries={max_retries}, retention={retention_days}d"
@@ -162,8 +195,9 @@ class DLQManager:
             except asyncio.CancelledError:
                 pass
         
-        # Save messages to disk
-        await self._save_messages()
+        # Flush the log (every change is already on disk)
+        self._log.maybe_compact()
+        self._log.close()
         
         logger.info("DLQ manager stopped")
     
@@ -248,7 +282,7 @@ class DLQManager:
             
             # Success - remove from DLQ
             del self._messages[message_id]
-            await self._delete_message_file(message_id)
+            await self._delete_message(message_id)
             
             self._stats['total_successes'] += 1
             
@@ -339,6 +373,7 @@ class DLQManager:
             'total_discarded': self._stats['total_discarded'],
             'failures_by_channel': dict(self._stats['failures_by_channel']),
             'failures_by_subscriber': dict(self._stats['failures_by_subscriber']),
+            'storage': self._log.get_stats(),
         }
     
     # ========================================================================
@@ -379,59 +414,59 @@ class DLQManager:
                 # Remove old messages
                 for msg_id in to_discard:
                     del self._messages[msg_id]
-                    await self._delete_message_file(msg_id)
+                    await self._delete_message(msg_id)
                     self._stats['total_discarded'] += 1
                 
                 if to_discard:
                     logger.info(f"Cleaned up {len(to_discard)} old messages")
+                
+                self._log.maybe_compact()
         
         except asyncio.CancelledError:
             logger.info("Cleanup loop cancelled")
     
     async def _save_message(self, msg: DLQMessage) -> None:
-        """Save a single message to disk"""
-        file_path = self.storage_path / f"{msg.id}.json"
-        
+        """Append the message's current state to the log"""
         try:
-            with open(file_path, 'w') as f:
-                json.dump(msg.to_dict(), f, indent=2)
+            self._log.put(msg.id, msg.to_record())
         except Exception as e:
             logger.error(f"Failed to save DLQ message {msg.id}: {e}")
     
-    async def _save_messages(self) -> None:
-        """Save all messages to disk"""
-        for msg in self._messages.values():
-            await self._save_message(msg)
-        
-        logger.info(f"Saved {len(self._messages)} DLQ messages to disk")
-    
     async def _load_messages(self) -> None:
-        """Load messages from disk"""
+        """Load messages from the log (and migrate legacy JSON files)"""
         try:
-            json_files = list(self.storage_path.glob("*.json"))
+            records = self._log.load()
             
-            for file_path in json_files:
+            for message_id, record in records.items():
                 try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                    
-                    msg = DLQMessage.from_dict(data)
-                    self._messages[msg.id] = msg
-                
+                    self._messages[message_id] = DLQMessage.from_record(record)
                 except Exception as e:
-                    logger.error(f"Failed to load DLQ message from {file_path}: {e}")
+                    logger.error(f"Failed to load DLQ message {message_id}: {e}")
+            
+            self._migrate_json_files()
             
             logger.info(f"Loaded {len(self._messages)} DLQ messages from disk")
         
         except Exception as e:
             logger.error(f"Failed to load DLQ messages: {e}")
     
-    async def _delete_message_file(self, message_id: str) -> None:
-        """Delete a message file from disk"""
-        file_path = self.storage_path / f"{message_id}.json"
-        
-        try:
-            if file_path.exists():
+    def _migrate_json_files(self) -> None:
+        """Move messages stored as one JSON file each into the log"""
+        for file_path in self.storage_path.glob("*.json"):
+            try:
+                with open(file_path, 'r') as f:
+                    msg = DLQMessage.from_dict(json.load(f))
+                
+                self._messages[msg.id] = msg
+                self._log.put(msg.id, msg.to_record())
                 file_path.unlink()
+            
+            except Exception as e:
+                logger.error(f"Failed to migrate DLQ message from {file_path}: {e}")
+    
+    async def _delete_message(self, message_id: str) -> None:
+        """Append a delete for the message to the log"""
+        try:
+            self._log.delete(message_id)
         except Exception as e:
-            logger.error(f"Failed to delete DLQ message file {message_id}: {e}")
+            logger.error(f"Failed to delete DLQ message {message_id}: {e}")
@@ -0,0 +1,310 @@
+"""
+Segment Log
+===========
+
+Append-only, segmented record log used to persist the DLQ.
+
+Every change is one length-prefixed msgpack record appended to the
+active segment file, so writes cost the same no matter how many
+messages are queued. Deletes are tombstone records. An in-memory index
+maps each live key to its record's (segment, offset, length); once dead
+records outweigh live ones the live records are copied into a fresh
+segment and the old segments are removed, which keeps recovery time
+proportional to the live data.
+
+Record layout:
+    <uint32 length><uint32 crc32> msgpack([op, key, value])
+
+Files:
+    <storage_path>/segment-000001.log, segment-000002.log, ...
+"""
+
+import logging
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+
+HEADER = struct.Struct('<II')  # Body length, crc32 of body
+
+OP_DELETE = 0
+OP_PUT = 1
+
+
+class SegmentLog:
+    """
+    Append-only key/value log split into size-capped segment files
+
+    Features:
+    - O(1) appends and tombstone deletes
+    - In-memory offset index of live records
+    - Compaction when dead records outweigh live ones
+    - Torn/corrupt tail records are truncated on recovery
+    """
+
+    SEGMENT_PREFIX = 'segment-'
+    SEGMENT_SUFFIX = '.log'
+
+    def __init__(
+        self,
+        storage_path: str,
+        segment_max_bytes: int = 16 * 1024 * 1024,
+        compact_min_bytes: int = 1024 * 1024,
+        fsync: bool = False,
+    ):
+        """
+        Initialize segment log
+
+        Args:
+            storage_path: Directory holding the segment files
+            segment_max_bytes: Roll to a new segment past this size
+            compact_min_bytes: Don't compact until this many dead bytes
+            fsync: fsync after every append (flush to the OS otherwise)
+        """
+        self.storage_path = Path(storage_path)
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_min_bytes = compact_min_bytes
+        self.fsync = fsync
+
+        # key -> (segment id, record offset, record length incl. header)
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._segments: Dict[int, Path] = {}
+        self._active_id = 0
+        self._active_file = None
+        self._active_size = 0
+
+        self._live_bytes = 0
+        self._total_bytes = 0
+        self._compactions = 0
+
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Replay all segments, rebuild the index and open the active segment
+
+        Returns:
+            Dictionary of live key -> value
+        """
+        self.close()
+        self._index.clear()
+        self._segments = {
+            seg_id: path for seg_id, path in sorted(self._list_segments())
+        }
+        self._live_bytes = 0
+        self._total_bytes = 0
+
+        values: Dict[str, Any] = {}
+        for seg_id, path in self._segments.items():
+            for offset, length, op, key, value in self._scan_segment(path):
+                self._total_bytes += length
+                self._drop(key)
+                if op == OP_PUT:
+                    self._index[key] = (seg_id, offset, length)
+                    self._live_bytes += length
+                    values[key] = value
+                else:
+                    values.pop(key, None)
+
+        self._active_id = max(self._segments, default=0)
+        if self._active_id == 0:
+            self._roll()
+        else:
+            self._open_active()
+
+        return values
+
+    def put(self, key: str, value: Any) -> None:
+        """Append a new version of key"""
+        self._drop(key)
+        seg_id, offset, length = self._append(OP_PUT, key, value)
+        self._index[key] = (seg_id, offset, length)
+        self._live_bytes += length
+
+    def delete(self, key: str) -> None:
+        """Append a tombstone for key (no-op if key is not live)"""
+        if key not in self._index:
+            return
+        self._drop(key)
+        self._append(OP_DELETE, key, None)
+        self.maybe_compact()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Read the live value for key from disk"""
+        location = self._index.get(key)
+        if location is None:
+            return None
+        _, _, value = self._read_record(*location)
+        return value
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def maybe_compact(self) -> bool:
+        """Compact if dead records outweigh live ones. Returns True if compacted."""
+        dead = self._total_bytes - self._live_bytes
+        if dead >= self.compact_min_bytes and dead > self._live_bytes:
+            self.compact()
+            return True
+        return False
+
+    def compact(self) -> None:
+        """Copy live records into a new segment and remove the old ones"""
+        if self._active_file is None:
+            return
+
+        old_segments = dict(self._segments)
+        self._roll()
+
+        new_index = {}
+        readers = {}
+        try:
+            # Copy in log order so each old segment is read front to back
+            for key, (seg_id, offset, length) in sorted(self._index.items(), key=lambda kv: kv[1]):
+                reader = readers.get(seg_id)
+                if reader is None:
+                    reader = readers[seg_id] = open(old_segments[seg_id], 'rb')
+                reader.seek(offset)
+                new_index[key] = self._append_raw(reader.read(length), sync=False)
+        finally:
+            for reader in readers.values():
+                reader.close()
+        self._sync()
+
+        for path in old_segments.values():
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.error(f"Failed to remove compacted segment {path}: {e}")
+        for seg_id in old_segments:
+            self._segments.pop(seg_id, None)
+
+        self._index = new_index
+        self._total_bytes = self._live_bytes = sum(length for _, _, length in new_index.values())
+        self._compactions += 1
+
+        logger.info(
+            f"Compacted DLQ log: {len(new_index)} live records, "
+            f"{len(old_segments)} segments removed"
+        )
+
+    def close(self) -> None:
+        """Flush and close the active segment"""
+        if self._active_file is not None:
+            self._sync()
+            self._active_file.close()
+            self._active_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'segments': len(self._segments),
+            'live_records': len(self._index),
+            'live_bytes': self._live_bytes,
+            'total_bytes': self._total_bytes,
+            'compactions': self._compactions,
+        }
+
+    # ========================================================================
+    # Private Methods
+    # ========================================================================
+
+    def _list_segments(self) -> Iterator[Tuple[int, Path]]:
+        for path in self.storage_path.glob(f'{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}'):
+            number = path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if number.isdigit():
+                yield int(number), path
+
+    def _segment_path(self, seg_id: int) -> Path:
+        return self.storage_path / f'{self.SEGMENT_PREFIX}{seg_id:06d}{self.SEGMENT_SUFFIX}'
+
+    def _scan_segment(self, path: Path) -> Iterator[Tuple[int, int, int, str, Any]]:
+        """Yield (offset, length, op, key, value); truncates a torn tail"""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        offset = 0
+        end = len(data)
+        while offset < end:
+            if offset + HEADER.size > end:
+                break
+            body_len, crc = HEADER.unpack_from(data, offset)
+            body_start = offset + HEADER.size
+            body = data[body_start:body_start + body_len]
+            if len(body) < body_len or zlib.crc32(body) != crc:
+                break
+            op, key, value = msgpack.unpackb(body, raw=False)
+            length = HEADER.size + body_len
+            yield offset, length, op, key, value
+            offset += length
+
+        if offset < end:
+            logger.warning(f"Truncating {end - offset} corrupt bytes at end of {path.name}")
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+
+    def _read_record(self, seg_id: int, offset: int, length: int) -> Tuple[int, str, Any]:
+        if seg_id == self._active_id and self._active_file is not None:
+            self._active_file.flush()
+        with open(self._segments[seg_id], 'rb') as f:
+            f.seek(offset)
+            record = f.read(length)
+        return tuple(msgpack.unpackb(record[HEADER.size:], raw=False))
+
+    def _drop(self, key: str) -> None:
+        """Forget key's live record (its bytes become dead)"""
+        location = self._index.pop(key, None)
+        if location is not None:
+            self._live_bytes -= location[2]
+
+    def _append(self, op: int, key: str, value: Any) -> Tuple[int, int, int]:
+        body = msgpack.packb([op, key, value], use_bin_type=True)
+        return self._append_raw(HEADER.pack(len(body), zlib.crc32(body)) + body)
+
+    def _append_raw(self, record: bytes, sync: bool = True) -> Tuple[int, int, int]:
+        if self._active_file is None:
+            self._open_active()
+        if self._active_size and self._active_size + len(record) > self.segment_max_bytes:
+            self._roll()
+
+        offset = self._active_size
+        self._active_file.write(record)
+        self._active_size += len(record)
+        self._total_bytes += len(record)
+        if sync:
+            self._sync()
+        return self._active_id, offset, len(record)
+
+    def _sync(self) -> None:
+        self._active_file.flush()
+        if self.fsync:
+            os.fsync(self._active_file.fileno())
+
+    def _open_active(self) -> None:
+        path = self._segment_path(self._active_id)
+        self._segments[self._active_id] = path
+        self._active_file = open(path, 'ab')
+        self._active_size = self._active_file.tell()
+
+    def _roll(self) -> None:
+        """Close the active segment and start the next one"""
+        if self._active_file is not None:
+            self._sync()
+            self._active_file.close()
+        self._active_id = max(self._segments, default=self._active_id) + 1
+        self._open_active()
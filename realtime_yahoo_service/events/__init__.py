@@ -7,6 +7,7 @@ Event models and Protocol Buffer schemas for real-time market events.
 
 from .event_models import (
     CandleDataEvent,
+    CandleBatchEvent,
     MarketBreadthEvent,
     FetchStatusEvent,
     FetchStatusType,
@@ -14,6 +15,7 @@ from .event_models import (
 
 __all__ = [
     'CandleDataEvent',
+    'CandleBatchEvent',
     'MarketBreadthEvent',
     'FetchStatusEvent',
     'FetchStatusType',
@@ -7,12 +7,12 @@ Pydantic models for real-time market events with Protocol Buffer conversion.
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Optional
+from typing import ClassVar, Optional
 from enum import Enum
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
-from .schemas.v1 import candle_data_pb2, market_breadth_pb2, fetch_status_pb2
+from .schemas.v1 import candle_batch_pb2, candle_data_pb2, market_breadth_pb2, fetch_status_pb2
 
 
 # ============================================================================
@@ -113,6 +113,144 @@ class CandleDataEvent(BaseModel):
         )
 
 
+# ============================================================================
+# Candle Batch Event
+# ============================================================================
+
+class CandleBatchEvent(BaseModel):
+    """
+    Real-time OHLCV candles for many symbols, stored as columns
+    
+    Element i of every column belongs to symbols[i]. One batch replaces a
+    CandleDataEvent per symbol on the bus, so subscribers decode and
+    validate once per fetch batch instead of once per symbol.
+    """
+    
+    schema_version: int = Field(default=1, description="Schema version for backward compatibility")
+    symbols: list[str] = Field(default_factory=list, description="Stock symbols")
+    trade_dates: list[str] = Field(default_factory=list, description="Trade dates in ISO 8601 format (YYYY-MM-DD)")
+    timestamps: list[int] = Field(default_factory=list, description="Unix epoch timestamps when data was fetched")
+    prev_close: list[float] = Field(default_factory=list, description="Previous close prices")
+    open_price: list[float] = Field(default_factory=list, description="Opening prices")
+    high_price: list[float] = Field(default_factory=list, description="High prices")
+    low_price: list[float] = Field(default_factory=list, description="Low prices")
+    close_price: list[float] = Field(default_factory=list, description="Closing prices")
+    volume: list[int] = Field(default_factory=list, description="Trading volumes")
+    data_source: str = Field(default="yahoo_finance", description="Data source identifier")
+    series: Optional[str] = Field(None, description="Market series shared by the batch (e.g., 'EQ')")
+    exchange: Optional[str] = Field(None, description="Exchange shared by the batch (e.g., 'NSE')")
+    
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        'symbols', 'trade_dates', 'timestamps', 'prev_close', 'open_price',
+        'high_price', 'low_price', 'close_price', 'volume',
+    )
+    
+    @model_validator(mode='after')
+    def validate_column_lengths(self) -> "CandleBatchEvent":
+        """Validate all columns have one entry per symbol"""
+        size = len(self.symbols)
+        for name in self.COLUMNS[1:]:
+            if len(getattr(self, name)) != size:
+                raise ValueError(
+                    f"Column {name} has {len(getattr(self, name))} entries, expected {size}"
+                )
+        return self
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    @classmethod
+    def from_events(cls, events: list[CandleDataEvent]) -> "CandleBatchEvent":
+        """Build a batch from single-symbol events (batch fields taken from the first)"""
+        first = events[0] if events else None
+        return cls(
+            symbols=[e.symbol for e in events],
+            trade_dates=[e.trade_date for e in events],
+            timestamps=[e.timestamp for e in events],
+            prev_close=[e.prev_close for e in events],
+            open_price=[e.open_price for e in events],
+            high_price=[e.high_price for e in events],
+            low_price=[e.low_price for e in events],
+            close_price=[e.close_price for e in events],
+            volume=[e.volume for e in events],
+            data_source=first.data_source if first else "yahoo_finance",
+            series=first.series if first else None,
+            exchange=first.exchange if first else None,
+        )
+    
+    def to_events(self) -> list[CandleDataEvent]:
+        """
+        Expand into single-symbol events
+        
+        The batch was validated as a whole, so the rows are built with
+        model_construct and skip per-event validation.
+        """
+        return [
+            CandleDataEvent.model_construct(
+                schema_version=self.schema_version,
+                symbol=symbol,
+                trade_date=trade_date,
+                timestamp=timestamp,
+                prev_close=prev_close,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price,
+                volume=volume,
+                delivery_qty=None,
+                delivery_per=None,
+                data_source=self.data_source,
+                series=self.series,
+                exchange=self.exchange,
+            )
+            for symbol, trade_date, timestamp, prev_close, open_price, high_price,
+                low_price, close_price, volume in zip(*(getattr(self, c) for c in self.COLUMNS))
+        ]
+    
+    def to_proto(self) -> candle_batch_pb2.CandleBatch:
+        """Convert to Protocol Buffer message"""
+        msg = candle_batch_pb2.CandleBatch(
+            schema_version=self.schema_version,
+            symbols=self.symbols,
+            trade_dates=self.trade_dates,
+            timestamps=self.timestamps,
+            prev_close=self.prev_close,
+            open_price=self.open_price,
+            high_price=self.high_price,
+            low_price=self.low_price,
+            close_price=self.close_price,
+            volume=self.volume,
+            data_source=self.data_source,
+        )
+        
+        # Optional fields
+        if self.series is not None:
+            msg.series = self.series
+        if self.exchange is not None:
+            msg.exchange = self.exchange
+        
+        return msg
+    
+    @classmethod
+    def from_proto(cls, msg: candle_batch_pb2.CandleBatch) -> "CandleBatchEvent":
+        """Create from Protocol Buffer message"""
+        return cls(
+            schema_version=msg.schema_version,
+            symbols=list(msg.symbols),
+            trade_dates=list(msg.trade_dates),
+            timestamps=list(msg.timestamps),
+            prev_close=list(msg.prev_close),
+            open_price=list(msg.open_price),
+            high_price=list(msg.high_price),
+            low_price=list(msg.low_price),
+            close_price=list(msg.close_price),
+            volume=list(msg.volume),
+            data_source=msg.data_source,
+            series=msg.series if msg.HasField("series") else None,
+            exchange=msg.exchange if msg.HasField("exchange") else None,
+        )
+
+
 # ============================================================================
 # Market Breadth Event
 # ============================================================================
@@ -303,6 +441,7 @@ class TrendAnalysisEvent(BaseModel):
 
 __all__ = [
     'CandleDataEvent',
+    'CandleBatchEvent',
     'MarketBreadthEvent',
     'FetchStatusEvent',
     'FetchStatusType',
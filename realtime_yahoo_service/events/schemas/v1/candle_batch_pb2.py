@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: events/schemas/v1/candle_batch.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'events/schemas/v1/candle_batch.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n$events/schemas/v1/candle_batch.proto\x12 realtime_yahoo_service.events.v1\"\xac\x02\n\x0b\x43\x61ndleBatch\x12\x16\n\x0eschema_version\x18\x01 \x01(\x05\x12\x0f\n\x07symbols\x18\x02 \x03(\t\x12\x13\n\x0btrade_dates\x18\x03 \x03(\t\x12\x12\n\ntimestamps\x18\x04 \x03(\x03\x12\x12\n\nprev_close\x18\x05 \x03(\x01\x12\x12\n\nopen_price\x18\x06 \x03(\x01\x12\x12\n\nhigh_price\x18\x07 \x03(\x01\x12\x11\n\tlow_price\x18\x08 \x03(\x01\x12\x13\n\x0b\x63lose_price\x18\t \x03(\x01\x12\x0e\n\x06volume\x18\n \x03(\x03\x12\x13\n\x0b\x64\x61ta_source\x18\x0b \x01(\t\x12\x13\n\x06series\x18\x0c \x01(\tH\x00\x88\x01\x01\x12\x15\n\x08\x65xchange\x18\r \x01(\tH\x01\x88\x01\x01\x42\t\n\x07_seriesB\x0b\n\t_exchangeb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'events.schemas.v1.candle_batch_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CANDLEBATCH']._serialized_start=75
+  _globals['_CANDLEBATCH']._serialized_end=375
+# @@protoc_insertion_point(module_scope)
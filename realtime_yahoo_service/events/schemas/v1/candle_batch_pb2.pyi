@@ -0,0 +1,37 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from collections.abc import Iterable as _Iterable
+from typing import ClassVar as _ClassVar, Optional as _Optional
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class CandleBatch(_message.Message):
+    __slots__ = ("schema_version", "symbols", "trade_dates", "timestamps", "prev_close", "open_price", "high_price", "low_price", "close_price", "volume", "data_source", "series", "exchange")
+    SCHEMA_VERSION_FIELD_NUMBER: _ClassVar[int]
+    SYMBOLS_FIELD_NUMBER: _ClassVar[int]
+    TRADE_DATES_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMPS_FIELD_NUMBER: _ClassVar[int]
+    PREV_CLOSE_FIELD_NUMBER: _ClassVar[int]
+    OPEN_PRICE_FIELD_NUMBER: _ClassVar[int]
+    HIGH_PRICE_FIELD_NUMBER: _ClassVar[int]
+    LOW_PRICE_FIELD_NUMBER: _ClassVar[int]
+    CLOSE_PRICE_FIELD_NUMBER: _ClassVar[int]
+    VOLUME_FIELD_NUMBER: _ClassVar[int]
+    DATA_SOURCE_FIELD_NUMBER: _ClassVar[int]
+    SERIES_FIELD_NUMBER: _ClassVar[int]
+    EXCHANGE_FIELD_NUMBER: _ClassVar[int]
+    schema_version: int
+    symbols: _containers.RepeatedScalarFieldContainer[str]
+    trade_dates: _containers.RepeatedScalarFieldContainer[str]
+    timestamps: _containers.RepeatedScalarFieldContainer[int]
+    prev_close: _containers.RepeatedScalarFieldContainer[float]
+    open_price: _containers.RepeatedScalarFieldContainer[float]
+    high_price: _containers.RepeatedScalarFieldContainer[float]
+    low_price: _containers.RepeatedScalarFieldContainer[float]
+    close_price: _containers.RepeatedScalarFieldContainer[float]
+    volume: _containers.RepeatedScalarFieldContainer[int]
+    data_source: str
+    series: str
+    exchange: str
+    def __init__(self, schema_version: _Optional[int] = ..., symbols: _Optional[_Iterable[str]] = ..., trade_dates: _Optional[_Iterable[str]] = ..., timestamps: _Optional[_Iterable[int]] = ..., prev_close: _Optional[_Iterable[float]] = ..., open_price: _Optional[_Iterable[float]] = ..., high_price: _Optional[_Iterable[float]] = ..., low_price: _Optional[_Iterable[float]] = ..., close_price: _Optional[_Iterable[float]] = ..., volume: _Optional[_Iterable[int]] = ..., data_source: _Optional[str] = ..., series: _Optional[str] = ..., exchange: _Optional[str] = ...) -> None: ...
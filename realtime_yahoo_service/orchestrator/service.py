@@ -166,6 +166,10 @@ class OrchestratorService:
                     publish_interval=pub_config.get('publish_interval', 5.0),
                     data_interval=pub_config.get('data_interval', '1m'),
                     period=pub_config.get('period', '1d'),
+                    max_concurrent_batches=pub_config.get('max_concurrent_batches', 4),
+                    fetch_rate_limit=pub_config.get('fetch_rate_limit'),
+                    fetch_rate_limit_period=pub_config.get('fetch_rate_limit_period'),
+                    candle_batches=pub_config.get('candle_batches', True),
                 )
                 
                 self.publishers[pub_id] = publisher
@@ -241,6 +245,9 @@ class OrchestratorService:
                         port=sub_config.get('port', 8765),
                         heartbeat_interval=sub_config.get('heartbeat_interval', 30),
                         auth_token=sub_config.get('auth_token'),
+                        max_queue=sub_config.get('max_queue', 1000),
+                        frame_format=sub_config.get('frame_format', 'json'),
+                        compression=sub_config.get('compression', 'deflate'),
                         dlq_manager=self.dlq_manager,
                     )
                 
@@ -9,6 +9,7 @@ from .base_publisher import (
     IPublisher,
     BasePublisher,
     RateLimiter,
+    LatencyHistogram,
     PublisherError,
 )
 from .yahoo_publisher import YahooFinancePublisher
@@ -17,6 +18,7 @@ __all__ = [
     'IPublisher',
     'BasePublisher',
     'RateLimiter',
+    'LatencyHistogram',
     'PublisherError',
     'YahooFinancePublisher',
 ]
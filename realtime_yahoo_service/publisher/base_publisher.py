@@ -9,7 +9,8 @@ import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, Any, Dict
+from bisect import bisect_left
+from typing import Optional, Any, Dict, Sequence
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -131,6 +132,91 @@ class RateLimiter:
             self.rate,
             self.tokens + elapsed * self.refill_rate
         )
+    
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the allowed rate (same period), keeping accrued tokens
+        
+        Args:
+            rate: New number of requests allowed per period
+        """
+        self.tokens = min(rate, self.get_available_tokens())
+        self.last_update = time.time()
+        self.rate = rate
+        self.refill_rate = rate / self.per_seconds
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+    
+    Records durations into cumulative-style buckets (upper bounds in ms)
+    so percentiles can be reported without keeping every sample.
+    """
+    
+    DEFAULT_BOUNDS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+    
+    def __init__(self, bounds_ms: Sequence[float] = DEFAULT_BOUNDS_MS):
+        """
+        Initialize histogram
+        
+        Args:
+            bounds_ms: Sorted bucket upper bounds in milliseconds
+                (an overflow bucket is added above the last bound)
+        """
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+    
+    def record(self, seconds: float) -> None:
+        """Record one duration in seconds"""
+        ms = seconds * 1000
+        self.counts[bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Estimate a percentile (upper bound of the bucket holding it)
+        
+        Args:
+            pct: Percentile in 0-100
+        
+        Returns:
+            Latency in ms, or None if nothing recorded
+        """
+        if not self.count:
+            return None
+        
+        rank = pct / 100 * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                bound = self.bounds_ms[idx] if idx < len(self.bounds_ms) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary and bucket counts as a plain dictionary"""
+        buckets = {f'<={bound}ms': n for bound, n in zip(self.bounds_ms, self.counts)}
+        buckets[f'>{self.bounds_ms[-1]}ms'] = self.counts[-1]
+        
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else None,
+            'min_ms': round(self.min_ms, 2) if self.min_ms is not None else None,
+            'max_ms': round(self.max_ms, 2) if self.max_ms is not None else None,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets': buckets,
+        }
 
 
 class BasePublisher(IPublisher):
@@ -245,26 +331,25 @@ class BasePublisher(IPublisher):
         self._health_status['status'] = 'stopped'
         logger.info(f"Publisher stopped: {self.publisher_id}")
     
-    async def publish_event(self, event: Any) -> None:
+    async def publish_event(self, event: Any, rate_limited: bool = True) -> None:
         """
         Publish a single event
         
         Args:
             event: Event to publish
+            rate_limited: Take a token from rate_limiter first; pass False
+                when the caller already holds one for a group of events
         """
         if not self._running:
             raise PublisherError("Publisher not running")
         
         try:
             # Rate limiting
-            await self.rate_limiter.acquire()
+            if rate_limited:
+                await self.rate_limiter.acquire()
             
             # Serialize event
-            if hasattr(event, 'model_dump'):
-                # Pydantic model
-                data = self.serializer.serialize(event.model_dump())
-            else:
-                data = self.serializer.serialize(event)
+            data = self._encode_event(event)
             
             # Determine channel from event type
             channel = self._get_channel_for_event(event)
@@ -388,6 +473,23 @@ class BasePublisher(IPublisher):
         """
         raise NotImplementedError("Subclass must implement _fetch_and_publish()")
     
+    def _encode_event(self, event: Any) -> bytes:
+        """
+        Serialize an event for the broker
+        
+        Override for event types with their own wire encoding.
+        
+        Args:
+            event: Event object
+        
+        Returns:
+            Serialized bytes
+        """
+        if hasattr(event, 'model_dump'):
+            # Pydantic model
+            return self.serializer.serialize(event.model_dump())
+        return self.serializer.serialize(event)
+    
     def _get_channel_for_event(self, event: Any) -> str:
         """
         Determine channel name from event type (override in subclass)
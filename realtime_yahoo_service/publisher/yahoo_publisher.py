@@ -7,15 +7,16 @@ Publisher that fetches market data from Yahoo Finance and publishes events.
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from decimal import Decimal
 
 import yfinance as yf
 import pandas as pd
 
-from .base_publisher import BasePublisher, PublisherError
-from events.event_models import CandleDataEvent, FetchStatusEvent
+from .base_publisher import BasePublisher, PublisherError, RateLimiter, LatencyHistogram
+from events.event_models import CandleBatchEvent, CandleDataEvent, FetchStatusEvent
+from serialization.candle_batch import encode_candle_batch
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,16 @@ class YahooFinancePublisher(BasePublisher):
     
     Features:
     - Batch fetching with configurable batch size
-    - Rate limiting (20 requests per minute default)
+    - Concurrent batch fetches (bounded in-flight batches), with publishing
+      of finished batches overlapping the fetches still running
+    - Token-bucket control per upstream: Yahoo batch requests and broker
+      publishes are limited separately; the broker limit is taken once per
+      fetched batch, whichever way its candles are published
+    - Adaptive fetch rate: halved when a batch comes back empty/failed
+      (throttling), raised again by one request per success
+    - Per-batch fetch/publish latency histograms in get_stats()
+    - One columnar CandleBatchEvent per fetched batch (market.candle.batch),
+      or a CandleDataEvent per symbol (market.candle) with candle_batches=False
     - Error handling and retry logic
     - Health status reporting via FetchStatusEvent
     - Support for 500+ symbols
@@ -44,6 +54,10 @@ class YahooFinancePublisher(BasePublisher):
         publish_interval: float = 5.0,
         data_interval: str = '1m',
         period: str = '1d',
+        max_concurrent_batches: int = 4,
+        fetch_rate_limit: Optional[int] = None,
+        fetch_rate_limit_period: Optional[float] = None,
+        candle_batches: bool = True,
     ):
         """
         Initialize Yahoo Finance publisher
@@ -54,11 +68,19 @@ class YahooFinancePublisher(BasePublisher):
             serializer: Message serializer
             symbols: List of stock symbols to fetch
             batch_size: Number of symbols per batch (default: 50)
-            rate_limit: Maximum requests per period (default: 20)
+            rate_limit: Maximum broker publishes (candle batches and status
+                events) per period (default: 20)
             rate_limit_period: Rate limit period in seconds (default: 60)
             publish_interval: Interval between fetch cycles (default: 5s)
             data_interval: Yahoo Finance data interval (1m, 5m, 15m, etc.)
             period: Yahoo Finance period (1d, 5d, 1mo, etc.)
+            max_concurrent_batches: Batches fetched concurrently (default: 4)
+            fetch_rate_limit: Maximum Yahoo batch requests per period
+                (default: rate_limit)
+            fetch_rate_limit_period: Fetch rate period in seconds
+                (default: rate_limit_period)
+            candle_batches: Publish one CandleBatchEvent per fetched batch
+                instead of a CandleDataEvent per symbol (default: True)
         """
         super().__init__(
             publisher_id=publisher_id,
@@ -73,6 +95,22 @@ class YahooFinancePublisher(BasePublisher):
         self.batch_size = batch_size
         self.data_interval = data_interval
         self.period = period
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.candle_batches = candle_batches
+        
+        # Yahoo upstream token bucket (adaptive); self.rate_limiter gates the broker
+        self.max_fetch_rate = fetch_rate_limit or rate_limit
+        self.fetch_rate_limiter = RateLimiter(
+            self.max_fetch_rate,
+            fetch_rate_limit_period or rate_limit_period,
+        )
+        
+        # Per-batch latency histograms
+        self._latency = {
+            'fetch': LatencyHistogram(),
+            'publish': LatencyHistogram(),
+            'batch': LatencyHistogram(),
+        }
         
         # Fetch statistics
         self._fetch_stats = {
@@ -82,12 +120,13 @@ class YahooFinancePublisher(BasePublisher):
             'symbols_failed': 0,
             'last_fetch_time': None,
             'last_fetch_duration': None,
+            'throttled_batches': 0,
         }
         
         logger.info(
             f"YahooFinancePublisher initialized: id={publisher_id}, "
             f"symbols={len(symbols)}, batch_size={batch_size}, "
-            f"interval={data_interval}"
+            f"concurrency={self.max_concurrent_batches}, interval={data_interval}"
         )
     
     async def _fetch_and_publish(self) -> None:
@@ -96,11 +135,16 @@ class YahooFinancePublisher(BasePublisher):
         
         This method:
         1. Splits symbols into batches
-        2. Fetches data for each batch
-        3. Publishes CandleDataEvent for each symbol
+        2. Fetches up to max_concurrent_batches batches at a time
+        3. Publishes each batch's candles as it arrives (one CandleBatchEvent,
+           or a CandleDataEvent per symbol)
         4. Publishes FetchStatusEvent with overall status
+        
+        Cycle time is roughly the slowest batch (plus rate limiting)
+        rather than the sum of all batches.
         """
-        fetch_start = asyncio.get_event_loop().time()
+        loop = asyncio.get_event_loop()
+        fetch_start = loop.time()
         symbols_success = 0
         symbols_failed = 0
         errors = []
@@ -117,42 +161,26 @@ class YahooFinancePublisher(BasePublisher):
                 f"in {len(batches)} batches"
             )
             
-            # Process each batch
-            for batch_idx, batch in enumerate(batches):
-                try:
-                    # Fetch batch (runs in thread pool to avoid blocking)
-                    batch_data = await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        self._fetch_batch,
-                        batch
-                    )
-                    
-                    # Publish events for successful fetches
-                    for symbol, data in batch_data.items():
-                        if data is not None:
-                            try:
-                                await self._publish_candle_data(symbol, data)
-                                symbols_success += 1
-                            except Exception as e:
-                                logger.error(f"Failed to publish {symbol}: {e}")
-                                symbols_failed += 1
-                                errors.append(f"{symbol}: {str(e)}")
-                        else:
-                            symbols_failed += 1
-                            errors.append(f"{symbol}: No data returned")
-                    
-                    logger.debug(
-                        f"Batch {batch_idx + 1}/{len(batches)} complete: "
-                        f"{len(batch)} symbols"
-                    )
-                
-                except Exception as e:
-                    logger.error(f"Batch {batch_idx} fetch failed: {e}")
+            in_flight = asyncio.Semaphore(self.max_concurrent_batches)
+            results = await asyncio.gather(
+                *(self._process_batch(idx, batch, len(batches), in_flight)
+                  for idx, batch in enumerate(batches)),
+                return_exceptions=True,
+            )
+            
+            for batch_idx, (batch, result) in enumerate(zip(batches, results)):
+                if isinstance(result, BaseException):
+                    logger.error(f"Batch {batch_idx} fetch failed: {result}")
                     symbols_failed += len(batch)
-                    errors.append(f"Batch {batch_idx}: {str(e)}")
+                    errors.append(f"Batch {batch_idx}: {str(result)}")
+                else:
+                    success, failed, batch_errors = result
+                    symbols_success += success
+                    symbols_failed += failed
+                    errors.extend(batch_errors)
             
             # Update fetch statistics
-            fetch_duration = asyncio.get_event_loop().time() - fetch_start
+            fetch_duration = loop.time() - fetch_start
             self._fetch_stats['total_fetches'] += 1
             self._fetch_stats['symbols_fetched'] += symbols_success
             self._fetch_stats['symbols_failed'] += symbols_failed
@@ -176,6 +204,167 @@ class YahooFinancePublisher(BasePublisher):
             self._fetch_stats['total_fetch_errors'] += 1
             raise PublisherError(f"Fetch cycle failed: {e}") from e
     
+    async def _process_batch(
+        self,
+        batch_idx: int,
+        batch: List[str],
+        total_batches: int,
+        in_flight: asyncio.Semaphore,
+    ) -> Tuple[int, int, List[str]]:
+        """
+        Fetch one batch and publish its candles
+        
+        The in-flight slot is released as soon as the fetch returns, so
+        the next batch's fetch runs while this one publishes. The batch
+        latency covers the whole batch, waits for the slot and the rate
+        limiters included.
+        
+        Returns:
+            (symbols published, symbols failed, error messages)
+        """
+        loop = asyncio.get_event_loop()
+        batch_start = loop.time()
+        
+        async with in_flight:
+            await self.fetch_rate_limiter.acquire()
+            fetch_start = loop.time()
+            
+            # Fetch batch (runs in thread pool to avoid blocking)
+            batch_data = await loop.run_in_executor(
+                None,
+                self._fetch_batch,
+                batch
+            )
+            self._latency['fetch'].record(loop.time() - fetch_start)
+        
+        self._adapt_fetch_rate(batch_data)
+        
+        publish_start = loop.time()
+        
+        # One broker token per fetched batch, however its candles are published
+        await self.rate_limiter.acquire()
+        if self.candle_batches:
+            success, failed, errors = await self._publish_candle_batch(batch_data)
+        else:
+            success, failed, errors = await self._publish_candle_events(batch_data)
+        
+        now = loop.time()
+        self._latency['publish'].record(now - publish_start)
+        self._latency['batch'].record(now - batch_start)
+        
+        logger.debug(
+            f"Batch {batch_idx + 1}/{total_batches} complete: "
+            f"{len(batch)} symbols"
+        )
+        
+        return success, failed, errors
+    
+    async def _publish_candle_events(
+        self,
+        batch_data: Dict[str, Optional[pd.DataFrame]],
+    ) -> Tuple[int, int, List[str]]:
+        """
+        Publish a CandleDataEvent per symbol of a fetched batch
+        
+        The caller holds the batch's broker token, so the events skip
+        the per-event rate limiter.
+        
+        Returns:
+            (symbols published, symbols failed, error messages)
+        """
+        success = 0
+        failed = 0
+        errors = []
+        
+        for symbol, data in batch_data.items():
+            if data is not None:
+                try:
+                    await self._publish_candle_data(symbol, data, rate_limited=False)
+                    success += 1
+                except Exception as e:
+                    logger.error(f"Failed to publish {symbol}: {e}")
+                    failed += 1
+                    errors.append(f"{symbol}: {str(e)}")
+            else:
+                failed += 1
+                errors.append(f"{symbol}: No data returned")
+        
+        return success, failed, errors
+    
+    async def _publish_candle_batch(
+        self,
+        batch_data: Dict[str, Optional[pd.DataFrame]],
+    ) -> Tuple[int, int, List[str]]:
+        """
+        Publish a fetched batch as one CandleBatchEvent
+        
+        The caller holds the batch's broker token.
+        
+        Symbols without usable data are reported as failed; if the
+        publish itself fails, every symbol of the batch is.
+        
+        Returns:
+            (symbols published, symbols failed, error messages)
+        """
+        columns = {name: [] for name in CandleBatchEvent.COLUMNS}
+        failed = 0
+        errors = []
+        
+        for symbol, data in batch_data.items():
+            if data is None:
+                failed += 1
+                errors.append(f"{symbol}: No data returned")
+                continue
+            try:
+                candle = self._latest_candle(symbol, data)
+            except Exception as e:
+                logger.error(f"Failed to extract candle for {symbol}: {e}")
+                failed += 1
+                errors.append(f"{symbol}: {str(e)}")
+                continue
+            if candle is None:
+                continue
+            columns['symbols'].append(symbol)
+            columns['trade_dates'].append(candle['trade_date'])
+            columns['timestamps'].append(candle['timestamp'])
+            for name in ('prev_close', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'):
+                columns[name].append(candle[name])
+        
+        if not columns['symbols']:
+            return 0, failed, errors
+        
+        event = CandleBatchEvent(series='EQ', **columns)
+        try:
+            await self.publish_event(event, rate_limited=False)
+        except Exception as e:
+            logger.error(f"Failed to publish candle batch of {len(event)} symbols: {e}")
+            errors.append(f"Batch of {len(event)} symbols: {str(e)}")
+            return 0, failed + len(event), errors
+        
+        logger.debug(f"Published candle batch: {len(event)} symbols")
+        return len(event), failed, errors
+    
+    def _adapt_fetch_rate(self, batch_data: Dict[str, Optional[pd.DataFrame]]) -> None:
+        """
+        Adjust the Yahoo request rate from a batch outcome
+        
+        A batch with no data at all is treated as throttling and halves
+        the rate; any data raises it by one request, up to the configured
+        maximum.
+        """
+        limiter = self.fetch_rate_limiter
+        
+        if batch_data and all(data is None for data in batch_data.values()):
+            self._fetch_stats['throttled_batches'] += 1
+            new_rate = max(1, limiter.rate / 2)
+            if new_rate < limiter.rate:
+                logger.warning(f"Yahoo batch returned no data, fetch rate -> {new_rate:g}")
+        else:
+            new_rate = min(self.max_fetch_rate, limiter.rate + 1)
+        
+        if new_rate != limiter.rate:
+            limiter.set_rate(new_rate)
+    
     def _fetch_batch(self, symbols: List[str]) -> Dict[str, Optional[pd.DataFrame]]:
         """
         Fetch data for a batch of symbols using yfinance
@@ -236,7 +425,8 @@ class YahooFinancePublisher(BasePublisher):
     async def _publish_candle_data(
         self,
         symbol: str,
-        data: pd.DataFrame
+        data: pd.DataFrame,
+        rate_limited: bool = True
     ) -> None:
         """
         Publish candle data event for a symbol
@@ -244,74 +434,25 @@ class YahooFinancePublisher(BasePublisher):
         Args:
             symbol: Stock symbol
             data: DataFrame with OHLCV data
+            rate_limited: Take a broker token for this event
         """
         try:
-            # Get the latest row
-            if data.empty:
-                return
-            
-            latest = data.iloc[-1]
-            timestamp = data.index[-1]
-            
-            # Convert to datetime with timezone
-            if isinstance(timestamp, pd.Timestamp):
-                if timestamp.tzinfo is None:
-                    timestamp = timestamp.tz_localize('UTC')
-                else:
-                    timestamp = timestamp.tz_convert('UTC')
-                timestamp_dt = timestamp.to_pydatetime()
-            else:
-                timestamp_dt = timestamp
-            
-            # Extract trade date and unix timestamp
-            trade_date = timestamp_dt.date().isoformat()
-            unix_timestamp = int(timestamp_dt.timestamp())
-            
-            # Extract OHLCV values with safe conversion
-            # Provide defaults for None values to avoid validation errors
-            open_price = self._safe_float(latest.get('Open'))
-            high_price = self._safe_float(latest.get('High'))
-            low_price = self._safe_float(latest.get('Low'))
-            close_price = self._safe_float(latest.get('Close'))
-            volume = self._safe_int(latest.get('Volume'))
-            
-            # Skip if all critical values are None (no data available)
-            if all(v is None for v in [open_price, high_price, low_price, close_price]):
-                logger.warning(f"No price data available for {symbol}, skipping")
+            candle = self._latest_candle(symbol, data)
+            if candle is None:
                 return
             
-            # Use close as fallback for missing values
-            if close_price is None:
-                close_price = open_price or high_price or low_price or 0.0
-            if open_price is None:
-                open_price = close_price
-            if high_price is None:
-                high_price = max(open_price, close_price)
-            if low_price is None:
-                low_price = min(open_price, close_price)
-            if volume is None:
-                volume = 0
-            
             event = CandleDataEvent(
-                symbol=symbol,
-                trade_date=trade_date,
-                timestamp=unix_timestamp,
-                open_price=open_price,
-                high_price=high_price,
-                low_price=low_price,
-                close_price=close_price,
-                volume=volume,
-                prev_close=close_price,  # Use current close as prev_close
+                **candle,
                 series='EQ',  # Default to equity series
                 delivery_qty=None,  # Not available from Yahoo Finance
                 delivery_per=None,  # Not available from Yahoo Finance
             )
             
             # Publish event
-            await self.publish_event(event)
+            await self.publish_event(event, rate_limited=rate_limited)
             
             logger.debug(
-                f"Published candle data: {symbol} @ {trade_date}, "
+                f"Published candle data: {symbol} @ {event.trade_date}, "
                 f"close={event.close_price}"
             )
         
@@ -319,6 +460,75 @@ class YahooFinancePublisher(BasePublisher):
             logger.error(f"Failed to create candle event for {symbol}: {e}")
             raise
     
+    def _latest_candle(self, symbol: str, data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Candle fields from the latest row of a symbol's DataFrame
+        
+        Args:
+            symbol: Stock symbol
+            data: DataFrame with OHLCV data
+        
+        Returns:
+            CandleDataEvent field values, or None if there is no price data
+        """
+        # Get the latest row
+        if data.empty:
+            return None
+        
+        latest = data.iloc[-1]
+        timestamp = data.index[-1]
+        
+        # Convert to datetime with timezone
+        if isinstance(timestamp, pd.Timestamp):
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.tz_localize('UTC')
+            else:
+                timestamp = timestamp.tz_convert('UTC')
+            timestamp_dt = timestamp.to_pydatetime()
+        else:
+            timestamp_dt = timestamp
+        
+        # Extract trade date and unix timestamp
+        trade_date = timestamp_dt.date().isoformat()
+        unix_timestamp = int(timestamp_dt.timestamp())
+        
+        # Extract OHLCV values with safe conversion
+        # Provide defaults for None values to avoid validation errors
+        open_price = self._safe_float(latest.get('Open'))
+        high_price = self._safe_float(latest.get('High'))
+        low_price = self._safe_float(latest.get('Low'))
+        close_price = self._safe_float(latest.get('Close'))
+        volume = self._safe_int(latest.get('Volume'))
+        
+        # Skip if all critical values are None (no data available)
+        if all(v is None for v in [open_price, high_price, low_price, close_price]):
+            logger.warning(f"No price data available for {symbol}, skipping")
+            return None
+        
+        # Use close as fallback for missing values
+        if close_price is None:
+            close_price = open_price or high_price or low_price or 0.0
+        if open_price is None:
+            open_price = close_price
+        if high_price is None:
+            high_price = max(open_price, close_price)
+        if low_price is None:
+            low_price = min(open_price, close_price)
+        if volume is None:
+            volume = 0
+        
+        return {
+            'symbol': symbol,
+            'trade_date': trade_date,
+            'timestamp': unix_timestamp,
+            'open_price': open_price,
+            'high_price': high_price,
+            'low_price': low_price,
+            'close_price': close_price,
+            'volume': volume,
+            'prev_close': close_price,  # Use current close as prev_close
+        }
+    
     async def _publish_fetch_status(
         self,
         success_count: int,
@@ -391,6 +601,12 @@ class YahooFinancePublisher(BasePublisher):
         except (ValueError, TypeError):
             return None
     
+    def _encode_event(self, event: Any) -> bytes:
+        """Serialize an event, using the columnar codec for candle batches"""
+        if isinstance(event, CandleBatchEvent):
+            return encode_candle_batch(event, self.serializer)
+        return super()._encode_event(event)
+    
     def _get_channel_for_event(self, event: Any) -> str:
         """
         Determine channel name from event type
@@ -401,7 +617,9 @@ class YahooFinancePublisher(BasePublisher):
         Returns:
             Channel name
         """
-        if isinstance(event, CandleDataEvent):
+        if isinstance(event, CandleBatchEvent):
+            return 'market.candle.batch'
+        elif isinstance(event, CandleDataEvent):
             return 'market.candle'
         elif isinstance(event, FetchStatusEvent):
             return 'market.status'
@@ -415,6 +633,11 @@ class YahooFinancePublisher(BasePublisher):
             'total_symbols': len(self.symbols),
             'batch_size': self.batch_size,
             'data_interval': self.data_interval,
+            'max_concurrent_batches': self.max_concurrent_batches,
+            'fetch_rate_limit': round(self.fetch_rate_limiter.rate, 2),
             'fetch_stats': self._fetch_stats.copy(),
+            'latency_histograms': {
+                name: histogram.snapshot() for name, histogram in self._latency.items()
+            },
         })
         return stats
@@ -5,6 +5,7 @@ from .json_serializer import JSONSerializer
 from .msgpack_serializer import MessagePackSerializer
 from .protobuf_serializer import ProtobufSerializer
 from .serializer_factory import SerializerFactory
+from .candle_batch import encode_candle_batch, decode_candle_batch
 
 __all__ = [
     'IMessageSerializer',
@@ -12,4 +13,6 @@ __all__ = [
     'MessagePackSerializer',
     'ProtobufSerializer',
     'SerializerFactory',
+    'encode_candle_batch',
+    'decode_candle_batch',
 ]
@@ -0,0 +1,110 @@
+"""
+Candle Batch Codec
+==================
+
+Wire encodings for CandleBatchEvent, chosen by the bus serializer format:
+
+- protobuf: CandleBatch message (packed repeated fields)
+- msgpack: map whose numeric columns are little-endian binary arrays
+  (float64 prices, int64 timestamps/volumes), decoded with numpy
+- json (and any other format): the serializer applied to model_dump()
+
+One message carries a whole fetch batch, so encoding and decoding cost is
+paid per batch rather than per symbol.
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from events.event_models import CandleBatchEvent
+from events.schemas.v1 import candle_batch_pb2
+from .base_serializer import IMessageSerializer, SerializationError, DeserializationError
+
+logger = logging.getLogger(__name__)
+
+# Numeric columns and their binary layout in the msgpack encoding
+_BINARY_COLUMNS = {
+    'timestamps': '<i8',
+    'prev_close': '<f8',
+    'open_price': '<f8',
+    'high_price': '<f8',
+    'low_price': '<f8',
+    'close_price': '<f8',
+    'volume': '<i8',
+}
+
+
+def encode_candle_batch(batch: CandleBatchEvent, serializer: IMessageSerializer) -> bytes:
+    """
+    Encode a candle batch for the bus
+
+    Args:
+        batch: Batch to encode
+        serializer: Bus serializer (selects the wire format)
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        SerializationError: If encoding fails
+    """
+    format_name = serializer.get_format_name()
+    try:
+        if format_name == 'protobuf':
+            return batch.to_proto().SerializeToString()
+
+        if format_name == 'msgpack':
+            payload = batch.model_dump(exclude=set(_BINARY_COLUMNS))
+            for name, dtype in _BINARY_COLUMNS.items():
+                payload[name] = np.asarray(getattr(batch, name), dtype=dtype).tobytes()
+            return serializer.serialize(payload)
+
+        return serializer.serialize(batch.model_dump())
+
+    except SerializationError:
+        raise
+    except Exception as e:
+        logger.error(f"Candle batch encoding failed: {e}")
+        raise SerializationError(f"Failed to encode candle batch: {e}") from e
+
+
+def decode_candle_batch(data: Any, serializer: IMessageSerializer) -> CandleBatchEvent:
+    """
+    Decode a candle batch from the bus
+
+    Args:
+        data: Encoded bytes, or an already-decoded batch/dict
+            (in-memory broker)
+        serializer: Bus serializer (selects the wire format)
+
+    Returns:
+        CandleBatchEvent
+
+    Raises:
+        DeserializationError: If decoding fails
+    """
+    if isinstance(data, CandleBatchEvent):
+        return data
+
+    try:
+        if isinstance(data, dict):
+            payload = dict(data)
+        elif serializer.get_format_name() == 'protobuf':
+            return CandleBatchEvent.from_proto(candle_batch_pb2.CandleBatch.FromString(data))
+        else:
+            payload = serializer.deserialize(data)
+
+        for name, dtype in _BINARY_COLUMNS.items():
+            column = payload.get(name)
+            if isinstance(column, (bytes, bytearray, memoryview)):
+                payload[name] = np.frombuffer(column, dtype=dtype).tolist()
+
+        return CandleBatchEvent.model_validate(payload)
+
+    except DeserializationError:
+        raise
+    except Exception as e:
+        logger.error(f"Candle batch decoding failed: {e}")
+        raise DeserializationError(f"Failed to decode candle batch: {e}") from e
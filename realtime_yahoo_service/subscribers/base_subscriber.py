@@ -16,6 +16,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSessio
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
+from serialization.candle_batch import decode_candle_batch
+
 logger = logging.getLogger(__name__)
 
 
@@ -316,7 +318,7 @@ class BaseSubscriber(ISubscriber):
             
             # Deserialize message
             try:
-                message_data = self.serializer.deserialize(data)
+                message_data = self._deserialize(channel, data)
             except Exception as e:
                 logger.error(f"Failed to deserialize message from {channel}: {e}")
                 self._record_error(f"Deserialization error: {e}")
@@ -367,6 +369,22 @@ class BaseSubscriber(ISubscriber):
             logger.error(f"Unexpected error in message handler: {e}")
             self._record_error(f"Handler error: {e}")
     
+    def _deserialize(self, channel: str, data: bytes) -> Any:
+        """
+        Decode a message for on_message
+        
+        Candle batches (market.candle.batch) are decoded with the columnar
+        codec into a CandleBatchEvent; everything else goes through the
+        serializer.
+        
+        Args:
+            channel: Channel name
+            data: Serialized message data
+        """
+        if channel == 'market.candle.batch':
+            return decode_candle_batch(data, self.serializer)
+        return self.serializer.deserialize(data)
+    
     @asynccontextmanager
     async def get_db_session(self):
         """
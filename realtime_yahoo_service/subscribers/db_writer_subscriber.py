@@ -13,7 +13,7 @@ from sqlalchemy import text
 from sqlalchemy.dialects.mysql import insert
 
 from .base_subscriber import BaseSubscriber, SubscriberError
-from events.event_models import CandleDataEvent
+from events.event_models import CandleBatchEvent, CandleDataEvent
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +23,9 @@ class DBWriterSubscriber(BaseSubscriber):
     Subscriber that writes candle data to database
     
     Features:
-    - Writes CandleDataEvent to nse_equity_bhavcopy_full table
+    - Writes CandleDataEvent / CandleBatchEvent to nse_equity_bhavcopy_full table
     - Upsert logic (INSERT ... ON DUPLICATE KEY UPDATE)
-    - Batch commit for performance
+    - Batch commit for performance (one executemany per batch)
     - Error handling with DLQ fallback
     """
     
@@ -55,14 +55,14 @@ class DBWriterSubscriber(BaseSubscriber):
             subscriber_id=subscriber_id,
             broker=broker,
             serializer=serializer,
-            channels=['market.candle'],  # Subscribe to candle data
+            channels=['market.candle', 'market.candle.batch'],  # Subscribe to candle data
             db_url=db_url,
             **kwargs
         )
         
         self.table_name = table_name
         self.batch_size = batch_size
-        self._batch = []
+        self._batch = []  # Pending upsert parameter dicts
         self._write_stats = {
             'total_written': 0,
             'total_upserted': 0,
@@ -83,11 +83,31 @@ class DBWriterSubscriber(BaseSubscriber):
             data: Deserialized message data
         """
         try:
-            # Parse as CandleDataEvent
-            event = CandleDataEvent(**data)
-            
-            # Add to batch
-            self._batch.append(event)
+            if isinstance(data, CandleBatchEvent):
+                # Columnar batch: build records straight from the columns
+                self._batch.extend(
+                    {
+                        'symbol': symbol,
+                        'series': data.series,
+                        'trade_date': trade_date,
+                        'prev_close': prev_close,
+                        'open_price': open_price,
+                        'high_price': high_price,
+                        'low_price': low_price,
+                        'close_price': close_price,
+                        'volume': volume,
+                        'deliv_qty': None,
+                        'deliv_per': None,
+                        'timestamp': timestamp,
+                        'data_source': data.data_source,
+                    }
+                    for symbol, trade_date, timestamp, prev_close, open_price, high_price,
+                        low_price, close_price, volume
+                    in zip(*(getattr(data, c) for c in CandleBatchEvent.COLUMNS))
+                )
+            else:
+                # Parse as CandleDataEvent
+                self._batch.append(self._record(CandleDataEvent(**data)))
             
             # Write batch if full
             if len(self._batch) >= self.batch_size:
@@ -104,26 +124,6 @@ class DBWriterSubscriber(BaseSubscriber):
         
         try:
             async with self.get_db_session() as session:
-                # Prepare records
-                records = []
-                for event in self._batch:
-                    record = {
-                        'symbol': event.symbol,
-                        'series': event.series,
-                        'trade_date': event.trade_date,
-                        'prev_close': event.prev_close,
-                        'open_price': event.open_price,
-                        'high_price': event.high_price,
-                        'low_price': event.low_price,
-                        'close_price': event.close_price,
-                        'volume': event.volume,
-                        'deliv_qty': event.delivery_qty,
-                        'deliv_per': event.delivery_per,
-                        'timestamp': event.timestamp,
-                        'data_source': event.data_source,
-                    }
-                    records.append(record)
-                
                 # Upsert logic - MySQL specific
                 stmt = text(f"""
                     INSERT INTO {self.table_name} 
@@ -145,9 +145,8 @@ class DBWriterSubscriber(BaseSubscriber):
                     data_source = VALUES(data_source)
                 """)
                 
-                # Execute batch
-                for record in records:
-                    await session.execute(stmt, record)
+                # Execute batch (a parameter list runs as one executemany)
+                await session.execute(stmt, self._batch)
                 
                 # Commit handled by context manager
                 
@@ -158,8 +157,8 @@ class DBWriterSubscriber(BaseSubscriber):
                 
                 logger.info(f"Wrote batch: {batch_count} records to {self.table_name}")
                 
-                # Clear batch
-                self._batch.clear()
+                # Start a new batch (the written list stays with the statement)
+                self._batch = []
         
         except Exception as e:
             logger.error(f"Failed to write batch: {e}")
@@ -167,6 +166,25 @@ class DBWriterSubscriber(BaseSubscriber):
             self._batch.clear()
             raise SubscriberError(f"Batch write failed: {e}") from e
     
+    @staticmethod
+    def _record(event: CandleDataEvent) -> Dict[str, Any]:
+        """Upsert parameters for a single candle event"""
+        return {
+            'symbol': event.symbol,
+            'series': event.series,
+            'trade_date': event.trade_date,
+            'prev_close': event.prev_close,
+            'open_price': event.open_price,
+            'high_price': event.high_price,
+            'low_price': event.low_price,
+            'close_price': event.close_price,
+            'volume': event.volume,
+            'deliv_qty': event.delivery_qty,
+            'deliv_per': event.delivery_per,
+            'timestamp': event.timestamp,
+            'data_source': event.data_source,
+        }
+    
     async def stop(self) -> None:
         """Stop subscriber and flush remaining batch"""
         # Write remaining batch
@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 from collections import defaultdict
 
 from .base_subscriber import BaseSubscriber, SubscriberError
-from events.event_models import CandleDataEvent, MarketBreadthEvent
+from events.event_models import CandleBatchEvent, CandleDataEvent, MarketBreadthEvent
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +51,7 @@ class MarketBreadthSubscriber(BaseSubscriber):
             subscriber_id=subscriber_id,
             broker=broker,
             serializer=serializer,
-            channels=['market.candle'],
+            channels=['market.candle', 'market.candle.batch'],
             **kwargs
         )
         
@@ -76,6 +76,18 @@ class MarketBreadthSubscriber(BaseSubscriber):
             data: Deserialized message data
         """
         try:
+            if isinstance(data, CandleBatchEvent):
+                # Update the whole batch from its columns
+                self._symbol_prices.update(
+                    (symbol, {'prev_close': prev_close, 'close': close})
+                    for symbol, prev_close, close in zip(data.symbols, data.prev_close, data.close_price)
+                )
+                if not self._trade_date and data.trade_dates:
+                    self._trade_date = data.trade_dates[0]
+                
+                logger.debug(f"Updated breadth data for {len(data)} symbols")
+                return
+            
             event = CandleDataEvent(**data)
             
             # Update symbol prices
@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 
 from .base_subscriber import BaseSubscriber, SubscriberError
-from events.event_models import CandleDataEvent, FetchStatusEvent
+from events.event_models import CandleBatchEvent, CandleDataEvent, FetchStatusEvent
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +46,7 @@ class StateTrackerSubscriber(BaseSubscriber):
             subscriber_id=subscriber_id,
             broker=broker,
             serializer=serializer,
-            channels=['market.candle', 'market.status'],
+            channels=['market.candle', 'market.candle.batch', 'market.status'],
             **kwargs
         )
         
@@ -67,6 +67,8 @@ class StateTrackerSubscriber(BaseSubscriber):
         try:
             if channel == 'market.candle':
                 await self._handle_candle_data(data)
+            elif channel == 'market.candle.batch':
+                await self._handle_candle_batch(data)
             elif channel == 'market.status':
                 await self._handle_status(data)
         
@@ -83,6 +85,12 @@ class StateTrackerSubscriber(BaseSubscriber):
         
         logger.debug(f"Updated state for {event.symbol}: close={event.close_price}")
     
+    async def _handle_candle_batch(self, batch: CandleBatchEvent) -> None:
+        """Handle candle batch event"""
+        self._symbol_state.update((event.symbol, event) for event in batch.to_events())
+        
+        logger.debug(f"Updated state for {len(batch)} symbols")
+    
     async def _handle_status(self, data: Dict[str, Any]) -> None:
         """Handle fetch status event"""
         event = FetchStatusEvent(**data)
@@ -4,22 +4,167 @@ Trend Analyzer Subscriber - Computes technical indicators and trend analysis
 
 import asyncio
 import logging
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List
 from datetime import datetime, timezone
-from collections import deque
+
+import numpy as np
 
 from .base_subscriber import BaseSubscriber
-from events.event_models import CandleDataEvent, TrendAnalysisEvent
+from events.event_models import CandleBatchEvent, CandleDataEvent, TrendAnalysisEvent
 
 
 logger = logging.getLogger(__name__)
 
+# Candles averaged at each end of the window for trend strength
+MOMENTUM_CANDLES = 5
+
+# Trend strength beyond which a symbol is BULLISH / BEARISH
+TREND_THRESHOLD = 0.05
+
+
+class RollingTrendStore:
+    """
+    Rolling close-price state for many symbols in flat numpy arrays.
+    
+    Rows are symbols. Each row holds a ring of the symbol's last window_size
+    closes, the number of candles seen, and one running sum per SMA period,
+    so a candle is an O(1) update (the close leaving each SMA window is read
+    from the ring) and all symbols are analyzed with array operations.
+    """
+    
+    def __init__(self, window_size: int, sma_periods: List[int], capacity: int = 256):
+        """
+        Args:
+            window_size: Closes kept per symbol
+            sma_periods: SMA periods (periods longer than the window are never available)
+            capacity: Initial number of symbol rows (doubled as needed)
+        """
+        self.window_size = max(1, window_size)
+        self.sma_periods = [p for p in sma_periods if 0 < p <= self.window_size]
+        self.symbols: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._closes = np.zeros((capacity, self.window_size))
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        self._sums = np.zeros((capacity, len(self.sma_periods)))
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+    
+    def candle_count(self, symbol: str) -> int:
+        """Candles in the symbol's window (0 if never seen)"""
+        row = self._rows.get(symbol)
+        return 0 if row is None else int(min(self._counts[row], self.window_size))
+    
+    def _row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == len(self._counts):
+                self._grow()
+            self._rows[symbol] = row
+            self.symbols.append(symbol)
+        return row
+    
+    def _grow(self):
+        capacity = 2 * len(self._counts)
+        for name in ('_closes', '_counts', '_sums'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+    
+    def push(self, symbol: str, close: float):
+        """Add one candle close for a symbol"""
+        row = self._row(symbol)
+        ring = self._closes[row]
+        sums = self._sums[row]
+        count = int(self._counts[row])
+        
+        for j, period in enumerate(self.sma_periods):
+            sums[j] += close
+            if count >= period:
+                sums[j] -= ring[(count - period) % self.window_size]
+        
+        ring[count % self.window_size] = close
+        self._counts[row] = count + 1
+    
+    def push_many(self, symbols: Iterable[str], closes: Iterable[float]):
+        """Add one candle close for each of several symbols (vectorized)"""
+        symbols = list(symbols)
+        rows = np.fromiter((self._row(symbol) for symbol in symbols), dtype=np.int64, count=len(symbols))
+        closes = np.asarray(closes, dtype=float)
+        
+        if len(np.unique(rows)) != len(rows):
+            # Repeated symbols must be applied in order
+            for symbol, close in zip(symbols, closes.tolist()):
+                self.push(symbol, close)
+            return
+        
+        counts = self._counts[rows]
+        for j, period in enumerate(self.sma_periods):
+            leaving = np.where(
+                counts >= period,
+                self._closes[rows, (counts - period) % self.window_size],
+                0.0,
+            )
+            self._sums[rows, j] += closes - leaving
+        
+        self._closes[rows, counts % self.window_size] = closes
+        self._counts[rows] = counts + 1
+    
+    def analyze(self, symbols: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Trend state of the given tracked symbols (default: all)
+        
+        Returns:
+            Arrays per row: rows, candles (in window), latest, strength,
+            direction (1 bullish, -1 bearish, 0 neutral) and smas
+            (row x period, NaN until a period has enough candles)
+        """
+        if symbols is None:
+            rows = np.arange(len(self.symbols))
+        else:
+            rows = np.array([self._rows[symbol] for symbol in symbols], dtype=np.int64)
+        width = self.window_size
+        counts = self._counts[rows]
+        candles = np.minimum(counts, width)
+        
+        # Mean of the first and of the last MOMENTUM_CANDLES closes in the window
+        offsets = np.arange(MOMENTUM_CANDLES)
+        used = offsets < candles[:, None]
+        taken = np.maximum(np.minimum(candles, MOMENTUM_CANDLES), 1)
+        recent = self._closes[rows[:, None], (counts[:, None] - 1 - offsets) % width]
+        older = self._closes[rows[:, None], (counts[:, None] - candles[:, None] + offsets) % width]
+        recent_avg = np.where(used, recent, 0.0).sum(axis=1) / taken
+        older_avg = np.where(used, older, 0.0).sum(axis=1) / taken
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = np.where(older_avg != 0, (recent_avg - older_avg) / older_avg, 0.0)
+        strength = np.clip(strength, -1.0, 1.0)
+        direction = np.select([strength > TREND_THRESHOLD, strength < -TREND_THRESHOLD], [1, -1], 0)
+        
+        periods = np.asarray(self.sma_periods, dtype=np.int64)
+        smas = np.where(counts[:, None] >= periods, self._sums[rows] / np.maximum(periods, 1), np.nan)
+        
+        return {
+            'rows': rows,
+            'candles': candles,
+            'latest': self._closes[rows, (counts - 1) % width],
+            'strength': strength,
+            'direction': direction,
+            'smas': smas,
+        }
+
 
 class TrendAnalyzerSubscriber(BaseSubscriber):
     """
     Subscriber that analyzes price trends and computes technical indicators.
     
-    Maintains a rolling window of candle data for each symbol and computes:
+    Maintains a rolling window of closes for each symbol (RollingTrendStore)
+    and computes:
     - Moving averages (SMA)
     - Trend direction and strength
     - Support/resistance levels
@@ -54,7 +199,7 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
             subscriber_id=subscriber_id,
             broker=broker,
             serializer=serializer,
-            channels=['market.candle'],
+            channels=['market.candle', 'market.candle.batch'],
             **kwargs
         )
         
@@ -62,9 +207,8 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
         self._publish_interval = publish_interval
         self._sma_periods = sma_periods or [20, 50]
         
-        # Store rolling window of candles per symbol
-        # {symbol: deque([CandleDataEvent, ...])}
-        self._candle_history: Dict[str, deque] = {}
+        # Rolling closes and SMA sums for all symbols
+        self._trend = RollingTrendStore(window_size, self._sma_periods)
         
         # Background task for periodic publishing
         self._publish_task: Optional[asyncio.Task] = None
@@ -99,10 +243,12 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
             data: Serialized message data
         """
         try:
-            # Deserialize message
-            message = self.serializer.deserialize(data)
-            
-            if channel == 'market.candle':
+            if channel == 'market.candle.batch':
+                # Already decoded into a CandleBatchEvent by BaseSubscriber
+                await self._handle_candle_batch(data)
+            elif channel == 'market.candle':
+                # Deserialize message
+                message = self.serializer.deserialize(data)
                 await self._handle_candle_data(message)
             
             self._stats['total_processed'] += 1
@@ -120,23 +266,27 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
         """
         try:
             event = CandleDataEvent(**message)
-            symbol = event.symbol
-            
-            # Initialize history for new symbol
-            if symbol not in self._candle_history:
-                self._candle_history[symbol] = deque(maxlen=self._window_size)
-            
-            # Add candle to history
-            self._candle_history[symbol].append(event)
+            self._trend.push(event.symbol, event.close_price)
             
             logger.debug(
-                f"Updated candle history for {symbol}: "
-                f"{len(self._candle_history[symbol])} candles"
+                f"Updated candle history for {event.symbol}: "
+                f"{self._trend.candle_count(event.symbol)} candles"
             )
             
         except Exception as e:
             logger.error(f"Error handling candle data: {e}")
     
+    async def _handle_candle_batch(self, batch: CandleBatchEvent):
+        """
+        Handle candle batch event and update history.
+        
+        Args:
+            batch: Decoded CandleBatchEvent
+        """
+        self._trend.push_many(batch.symbols, batch.close_price)
+        
+        logger.debug(f"Updated candle history for {len(batch)} symbols")
+    
     def compute_sma(self, prices: List[float], period: int) -> Optional[float]:
         """
         Compute Simple Moving Average.
@@ -187,43 +337,52 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
         Returns:
             Trend analysis dict or None if insufficient data
         """
-        if symbol not in self._candle_history:
+        if symbol not in self._trend:
             return None
         
-        candles = list(self._candle_history[symbol])
-        if len(candles) < 2:
-            return None
+        analyses = self.analyze_symbols([symbol])
+        return analyses[0] if analyses else None
+    
+    def analyze_symbols(self, symbols: Optional[List[str]] = None) -> List[dict]:
+        """
+        Perform trend analysis for many symbols at once.
         
-        prices = [c.close_price for c in candles]
-        
-        # Compute SMAs
-        smas = {}
-        for period in self._sma_periods:
-            sma = self.compute_sma(prices, period)
-            if sma is not None:
-                smas[f'sma_{period}'] = sma
-        
-        # Determine trend direction
-        trend_strength = self.compute_trend_strength(prices)
-        if trend_strength > 0.05:
-            trend_direction = 'BULLISH'
-        elif trend_strength < -0.05:
-            trend_direction = 'BEARISH'
-        else:
-            trend_direction = 'NEUTRAL'
+        Args:
+            symbols: Tracked symbols to analyze (default: all)
+            
+        Returns:
+            Trend analysis dicts for symbols with at least 2 candles
+        """
+        trend = self._trend
+        state = trend.analyze(symbols)
         
-        # Latest candle
-        latest = candles[-1]
+        keep = state['candles'] >= 2
+        if not keep.any():
+            return []
         
-        return {
-            'symbol': symbol,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'latest_price': latest.close_price,
-            'trend_direction': trend_direction,
-            'trend_strength': trend_strength,
-            'smas': smas,
-            'candle_count': len(candles),
-        }
+        timestamp = datetime.now(timezone.utc).isoformat()
+        directions = np.array(['BEARISH', 'NEUTRAL', 'BULLISH'])[state['direction'][keep] + 1]
+        sma_names = [f'sma_{period}' for period in trend.sma_periods]
+        
+        return [
+            {
+                'symbol': trend.symbols[row],
+                'timestamp': timestamp,
+                'latest_price': latest,
+                'trend_direction': direction,
+                'trend_strength': strength,
+                'smas': {name: sma for name, sma in zip(sma_names, smas) if sma == sma},
+                'candle_count': candles,
+            }
+            for row, latest, direction, strength, smas, candles in zip(
+                state['rows'][keep].tolist(),
+                state['latest'][keep].tolist(),
+                directions.tolist(),
+                state['strength'][keep].tolist(),
+                state['smas'][keep].tolist(),
+                state['candles'][keep].tolist(),
+            )
+        ]
     
     async def _periodic_publish(self):
         """Periodically publish trend analysis for all tracked symbols"""
@@ -231,15 +390,11 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
             try:
                 await asyncio.sleep(self._publish_interval)
                 
-                if not self._candle_history:
+                if not len(self._trend):
                     continue
                 
                 # Analyze all symbols
-                analyses = []
-                for symbol in list(self._candle_history.keys()):
-                    analysis = self.analyze_symbol(symbol)
-                    if analysis:
-                        analyses.append(analysis)
+                analyses = self.analyze_symbols()
                 
                 if analyses:
                     # Publish trend analysis event
@@ -267,7 +422,7 @@ class TrendAnalyzerSubscriber(BaseSubscriber):
         """Get subscriber statistics including current trends"""
         stats = super().get_stats()
         stats.update({
-            'symbols_tracked': len(self._candle_history),
+            'symbols_tracked': len(self._trend),
             'trends_published': self._stats.get('trends_published', 0),
             'window_size': self._window_size,
             'sma_periods': self._sma_periods,
@@ -11,6 +11,7 @@ from publisher.base_publisher import (
     IPublisher,
     BasePublisher,
     RateLimiter,
+    LatencyHistogram,
     PublisherError,
 )
 
@@ -86,6 +87,43 @@ class TestRateLimiter:
         # Should start with full tokens
         tokens = limiter.get_available_tokens()
         assert tokens == 10.0
+    
+    def test_set_rate(self):
+        """Test lowering the rate caps accrued tokens"""
+        limiter = RateLimiter(rate=10, per_seconds=1.0)
+        
+        limiter.set_rate(4)
+        
+        assert limiter.rate == 4
+        assert limiter.refill_rate == 4.0
+        assert limiter.get_available_tokens() <= 4.0
+
+
+class TestLatencyHistogram:
+    """Test latency histogram"""
+    
+    def test_record_and_snapshot(self):
+        """Test bucket counts and percentile estimates"""
+        histogram = LatencyHistogram(bounds_ms=(100, 500, 1000))
+        for seconds in (0.05, 0.08, 0.3, 0.4, 0.45, 2.0):
+            histogram.record(seconds)
+        
+        snapshot = histogram.snapshot()
+        
+        assert snapshot['count'] == 6
+        assert snapshot['min_ms'] == 50.0
+        assert snapshot['max_ms'] == 2000.0
+        assert snapshot['buckets'] == {'<=100ms': 2, '<=500ms': 3, '<=1000ms': 0, '>1000ms': 1}
+        assert snapshot['p50_ms'] == 500
+        assert snapshot['p99_ms'] == 2000.0
+    
+    def test_empty_snapshot(self):
+        """Test snapshot before any samples"""
+        snapshot = LatencyHistogram().snapshot()
+        
+        assert snapshot['count'] == 0
+        assert snapshot['mean_ms'] is None
+        assert snapshot['p95_ms'] is None
 
 
 class TestBasePublisher:
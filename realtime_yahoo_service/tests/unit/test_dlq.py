@@ -17,7 +17,10 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+import json
+
 from dlq.dlq_manager import DLQManager, DLQMessage
+from dlq.segment_log import SegmentLog
 
 
 class TestDLQMessage(unittest.TestCase):
@@ -379,6 +382,97 @@ class TestDLQManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(stats['failures_by_subscriber']['sub_001'], 2)
         self.assertEqual(stats['failures_by_subscriber']['sub_002'], 1)
 
+    
+    async def test_legacy_json_files_migrated(self):
+        """Test per-message JSON files from older versions are loaded into the log"""
+        await self.dlq_manager.stop()
+        
+        legacy = DLQMessage(
+            id="msg_legacy",
+            channel="test_channel",
+            payload=b"legacy",
+            error_message="error",
+            error_type="Error",
+            original_timestamp=1000.0,
+            failure_timestamp=2000.0,
+            retry_count=1,
+            max_retries=3,
+            subscriber_id="sub_001",
+        )
+        with open(Path(self.temp_dir) / "msg_legacy.json", 'w') as f:
+            json.dump(legacy.to_dict(), f)
+        
+        self.dlq_manager = DLQManager(storage_path=self.temp_dir, enable_auto_retry=False)
+        await self.dlq_manager.start()
+        
+        self.assertEqual(self.dlq_manager.get_message("msg_legacy").payload, b"legacy")
+        self.assertEqual(list(Path(self.temp_dir).glob("*.json")), [])
+
+
+class TestSegmentLog(unittest.TestCase):
+    """Tests for the append-only segment log"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_put_delete_and_recover(self):
+        """Test the latest put wins and deletes survive a restart"""
+        log = SegmentLog(self.temp_dir)
+        log.load()
+        log.put("a", [1, b"first"])
+        log.put("b", [2, b"second"])
+        log.put("a", [3, b"updated"])
+        log.delete("b")
+        self.assertEqual(log.get("a"), [3, b"updated"])
+        log.close()
+        
+        recovered = SegmentLog(self.temp_dir)
+        self.assertEqual(recovered.load(), {"a": [3, b"updated"]})
+        self.assertEqual(len(recovered), 1)
+        recovered.close()
+    
+    def test_segments_roll_and_compact(self):
+        """Test rolling to new segments and compacting dead records away"""
+        log = SegmentLog(self.temp_dir, segment_max_bytes=512, compact_min_bytes=0)
+        log.load()
+        for i in range(50):
+            log.put(f"k{i}", b"x" * 40)
+        self.assertGreater(log.get_stats()['segments'], 1)
+        
+        for i in range(40):
+            log.delete(f"k{i}")
+        
+        stats = log.get_stats()
+        self.assertGreaterEqual(stats['compactions'], 1)
+        self.assertLessEqual(stats['total_bytes'] - stats['live_bytes'], stats['live_bytes'])
+        log.close()
+        
+        recovered = SegmentLog(self.temp_dir)
+        self.assertEqual(sorted(recovered.load()), sorted(f"k{i}" for i in range(40, 50)))
+        recovered.close()
+    
+    def test_torn_tail_truncated(self):
+        """Test a partially written last record is dropped on recovery"""
+        log = SegmentLog(self.temp_dir)
+        log.load()
+        log.put("a", 1)
+        log.put("b", 2)
+        log.close()
+        
+        segment = next(Path(self.temp_dir).glob("segment-*.log"))
+        with open(segment, 'r+b') as f:
+            f.truncate(segment.stat().st_size - 3)
+        
+        recovered = SegmentLog(self.temp_dir)
+        self.assertEqual(recovered.load(), {"a": 1})
+        recovered.put("c", 3)
+        recovered.close()
+        
+        self.assertEqual(SegmentLog(self.temp_dir).load(), {"a": 1, "c": 3})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -83,7 +83,7 @@ class TestDBWriterSubscriber:
             )
         
         assert subscriber.subscriber_id == 'db-writer-test'
-        assert subscriber.channels == ['market.candle']
+        assert subscriber.channels == ['market.candle', 'market.candle.batch']
         assert subscriber.batch_size == 10
         assert len(subscriber._batch) == 0
     
@@ -510,7 +510,7 @@ class TestTrendAnalyzerSubscriber:
         assert subscriber.subscriber_id == 'trend-test'
         assert subscriber._window_size == 50
         assert subscriber._sma_periods == [20, 50]
-        assert len(subscriber._candle_history) == 0
+        assert len(subscriber._trend) == 0
         assert 'market.candle' in subscriber.channels
     
     @pytest.mark.asyncio
@@ -532,8 +532,8 @@ class TestTrendAnalyzerSubscriber:
             await subscriber.on_message('market.candle', b'test_data')
         
         # Check history
-        assert 'AAPL' in subscriber._candle_history
-        assert len(subscriber._candle_history['AAPL']) == 5
+        assert 'AAPL' in subscriber._trend
+        assert subscriber._trend.candle_count('AAPL') == 5
         
         await subscriber.stop()
     
@@ -587,6 +587,52 @@ class TestTrendAnalyzerSubscriber:
         
         await subscriber.stop()
     
+    @pytest.mark.asyncio
+    async def test_rolling_state_matches_window_recompute(self, mock_broker, mock_serializer):
+        """Array state gives the same analysis as recomputing from the window"""
+        import random
+        from collections import deque
+        from events.event_models import CandleBatchEvent
+        
+        subscriber = TrendAnalyzerSubscriber(
+            subscriber_id='trend-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+            window_size=7,
+            sma_periods=[3, 7, 10],
+        )
+        subscriber._trend = type(subscriber._trend)(7, [3, 7, 10], capacity=2)  # Exercise growth
+        
+        rng = random.Random(7)
+        symbols = [f'S{i}' for i in range(6)]
+        windows = {s: deque(maxlen=7) for s in symbols}
+        for step in range(40):
+            chosen = rng.sample(symbols, 4)
+            closes = [rng.uniform(90, 110) for _ in chosen]
+            if step % 2:
+                candles = [CandleDataEvent(**self.create_candle_data(s, c)) for s, c in zip(chosen, closes)]
+                await subscriber.on_message('market.candle.batch', CandleBatchEvent.from_events(candles))
+            else:
+                for s, c in zip(chosen, closes):
+                    mock_serializer.deserialize.return_value = self.create_candle_data(s, c)
+                    await subscriber.on_message('market.candle', b'test_data')
+            for s, c in zip(chosen, closes):
+                windows[s].append(c)
+            
+            for analysis in subscriber.analyze_symbols():
+                prices = list(windows[analysis['symbol']])
+                strength = subscriber.compute_trend_strength(prices)
+                assert analysis['candle_count'] == len(prices)
+                assert analysis['latest_price'] == prices[-1]
+                assert analysis['trend_strength'] == pytest.approx(strength)
+                expected_smas = {f'sma_{p}': subscriber.compute_sma(prices, p) for p in (3, 7, 10)}
+                assert analysis['smas'] == pytest.approx(
+                    {k: v for k, v in expected_smas.items() if v is not None})
+                assert analysis['trend_direction'] == (
+                    'BULLISH' if strength > 0.05 else 'BEARISH' if strength < -0.05 else 'NEUTRAL')
+        
+        assert len(subscriber._trend) == 6
+    
     @pytest.mark.asyncio
     async def test_get_stats(self, mock_broker, mock_serializer):
         """Test getting statistics"""
@@ -89,6 +89,7 @@ class TestWebSocketServer:
         # Broadcast to market.breadth
         message = {'type': 'data', 'value': 123}
         await server._broadcast('market.breadth', message)
+        await server.flush()
         
         # Both clients should receive
         assert client1.send.called
@@ -100,6 +101,7 @@ class TestWebSocketServer:
         
         # Broadcast to market.candle
         await server._broadcast('market.candle', message)
+        await server.flush()
         
         # Only client1 should receive
         assert client1.send.called
@@ -362,6 +364,137 @@ class TestWebSocketServer:
         assert response['type'] == 'error'
         assert 'Unknown message type' in response['message']
 
+    
+    def blocked_client(self):
+        """Client whose sends wait until release is set"""
+        release = asyncio.Event()
+        client = AsyncMock()
+        
+        async def send(frame):
+            await release.wait()
+        
+        client.send = AsyncMock(side_effect=send)
+        return client, release
+    
+    def candle_message(self, symbol, price):
+        return {'channel': 'market.candle', 'data': {'symbol': symbol, 'close_price': price}}
+    
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self, mock_broker, mock_serializer):
+        """Each client has its own writer, so a stalled client delays nobody"""
+        server = WebSocketServer(
+            subscriber_id='ws-server-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+        )
+        slow, release = self.blocked_client()
+        fast = AsyncMock()
+        server._clients[slow] = {'market.candle'}
+        server._clients[fast] = {'market.candle'}
+        
+        for i, symbol in enumerate(['AAPL', 'MSFT', 'TSLA']):
+            await server._broadcast('market.candle', self.candle_message(symbol, i), ('market.candle', symbol))
+        
+        await asyncio.wait_for(server._outboxes[fast].join(), timeout=1)
+        assert fast.send.call_count == 3
+        assert slow.send.call_count == 1  # Stuck on its first frame
+        
+        release.set()
+        await asyncio.wait_for(server.flush(), timeout=1)
+        assert slow.send.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_backlogged_client_gets_latest_value_per_symbol(self, mock_broker, mock_serializer):
+        """Pending updates for a symbol are replaced, not queued"""
+        server = WebSocketServer(
+            subscriber_id='ws-server-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+        )
+        client, release = self.blocked_client()
+        server._clients[client] = {'market.candle'}
+        
+        for price in range(5):
+            await server.on_message('market.candle', {'symbol': 'AAPL', 'close_price': price})
+            await asyncio.sleep(0)
+        await server.on_message('market.candle', {'symbol': 'MSFT', 'close_price': 7})
+        
+        release.set()
+        await asyncio.wait_for(server.flush(), timeout=1)
+        
+        sent = [json.loads(c.args[0])['data'] for c in client.send.call_args_list]
+        assert sent == [
+            {'symbol': 'AAPL', 'close_price': 0},
+            {'symbol': 'AAPL', 'close_price': 4},
+            {'symbol': 'MSFT', 'close_price': 7},
+        ]
+        assert server.get_stats()['messages_coalesced'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_queue_is_bounded(self, mock_broker, mock_serializer):
+        """Messages without a coalescing key drop the oldest when the queue is full"""
+        server = WebSocketServer(
+            subscriber_id='ws-server-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+            max_queue=2,
+        )
+        client, release = self.blocked_client()
+        server._clients[client] = {'market.candle.batch'}
+        
+        for i in range(5):
+            await server._broadcast('market.candle.batch', {'seq': i})
+            await asyncio.sleep(0)
+        assert len(server._outboxes[client]) == 2
+        
+        release.set()
+        await asyncio.wait_for(server.flush(), timeout=1)
+        assert [json.loads(c.args[0])['seq'] for c in client.send.call_args_list] == [0, 3, 4]
+        assert server.get_stats()['messages_dropped'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_channel_index_follows_subscriptions(self, mock_broker, mock_serializer):
+        """Broadcasts reach subscribers through the channel index"""
+        server = WebSocketServer(
+            subscriber_id='ws-server-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+        )
+        client = AsyncMock()
+        server._clients[client] = {'market.candle'}
+        
+        await server._handle_client_message(client, json.dumps({'type': 'subscribe', 'channel': 'market.trend'}))
+        await server._handle_client_message(client, json.dumps({'type': 'unsubscribe', 'channel': 'market.candle'}))
+        assert server._clients.subscribers('market.trend') == {client}
+        assert server._clients.subscribers('market.candle') == set()
+        
+        del server._clients[client]
+        assert server._clients.by_channel == {}
+    
+    @pytest.mark.asyncio
+    async def test_msgpack_frames(self, mock_broker, mock_serializer):
+        """Clients can switch to binary msgpack frames"""
+        import msgpack
+        
+        server = WebSocketServer(
+            subscriber_id='ws-server-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+        )
+        client = AsyncMock()
+        server._clients[client] = {'market.candle'}
+        
+        await server._handle_client_message(client, json.dumps({'type': 'set_format', 'format': 'msgpack'}))
+        assert json.loads(client.send.call_args[0][0])['format'] == 'msgpack'
+        
+        message = self.candle_message('AAPL', 150.0)
+        await server._broadcast('market.candle', message)
+        await server.flush()
+        
+        frame = client.send.call_args[0][0]
+        assert isinstance(frame, bytes)
+        assert msgpack.unpackb(frame, raw=False) == message
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
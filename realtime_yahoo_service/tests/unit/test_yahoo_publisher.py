@@ -3,6 +3,7 @@ Unit tests for Yahoo Finance publisher
 """
 
 import asyncio
+import time
 import pytest
 from unittest.mock import AsyncMock, Mock, MagicMock, patch
 from datetime import datetime, timezone
@@ -321,6 +322,92 @@ class TestYahooFinancePublisher:
             
             await yahoo_publisher.stop()
     
+    @pytest.mark.asyncio
+    async def test_batches_fetched_concurrently(self, yahoo_publisher, sample_dataframe):
+        """Cycle time tracks the slowest batch, not the sum of batches"""
+        def slow_fetch(batch):
+            time.sleep(0.2)
+            return {symbol: sample_dataframe for symbol in batch}
+        
+        yahoo_publisher._running = True  # Publish without the background loop
+        with patch.object(yahoo_publisher, '_fetch_batch', side_effect=slow_fetch):
+            started = time.perf_counter()
+            await yahoo_publisher._fetch_and_publish()
+            elapsed = time.perf_counter() - started
+        
+        # 3 batches of 0.2s each: serial would take >= 0.6s
+        assert elapsed < 0.5
+        assert yahoo_publisher._fetch_stats['symbols_fetched'] == 5
+        
+        histograms = yahoo_publisher.get_stats()['latency_histograms']
+        assert histograms['fetch']['count'] == 3
+        assert histograms['fetch']['min_ms'] >= 200
+        assert histograms['batch']['count'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_per_symbol_events_take_one_broker_token_per_batch(
+        self,
+        mock_broker,
+        mock_serializer,
+        sample_symbols,
+        sample_dataframe,
+    ):
+        """Per-symbol candle events are not limited one by one"""
+        publisher = YahooFinancePublisher(
+            publisher_id='yahoo-test',
+            broker=mock_broker,
+            serializer=mock_serializer,
+            symbols=sample_symbols,
+            batch_size=2,
+            rate_limit=4,  # 3 batches + 1 status event; 6 events would wait ~30s
+            rate_limit_period=60.0,
+            candle_batches=False,
+        )
+        publisher._running = True
+        
+        with patch.object(
+            publisher, '_fetch_batch',
+            side_effect=lambda batch: {symbol: sample_dataframe for symbol in batch},
+        ):
+            await asyncio.wait_for(publisher._fetch_and_publish(), timeout=2.0)
+        
+        assert publisher._fetch_stats['symbols_fetched'] == 5
+        assert mock_broker.publish.call_count == 6
+    
+    @pytest.mark.asyncio
+    async def test_batch_latency_includes_slot_wait(self, yahoo_publisher, sample_dataframe):
+        """Batch latency starts before waiting for an in-flight slot"""
+        def slow_fetch(batch):
+            time.sleep(0.1)
+            return {symbol: sample_dataframe for symbol in batch}
+        
+        yahoo_publisher.max_concurrent_batches = 1
+        yahoo_publisher._running = True
+        with patch.object(yahoo_publisher, '_fetch_batch', side_effect=slow_fetch):
+            await yahoo_publisher._fetch_and_publish()
+        
+        histograms = yahoo_publisher.get_stats()['latency_histograms']
+        assert histograms['fetch']['max_ms'] < 250
+        # The last of 3 serialized batches waited for the other two
+        assert histograms['batch']['max_ms'] >= 300
+    
+    @pytest.mark.asyncio
+    async def test_fetch_rate_adapts_to_throttling(self, yahoo_publisher, sample_dataframe):
+        """Empty batches halve the fetch rate, successes recover it"""
+        limiter = yahoo_publisher.fetch_rate_limiter
+        assert limiter.rate == 10
+        
+        yahoo_publisher._adapt_fetch_rate({'AAPL': None, 'GOOGL': None})
+        assert limiter.rate == 5
+        assert yahoo_publisher._fetch_stats['throttled_batches'] == 1
+        
+        yahoo_publisher._adapt_fetch_rate({'AAPL': sample_dataframe, 'GOOGL': None})
+        assert limiter.rate == 6
+        
+        for _ in range(10):
+            yahoo_publisher._adapt_fetch_rate({'AAPL': sample_dataframe})
+        assert limiter.rate == 10
+    
     @pytest.mark.asyncio
     async def test_get_stats(self, yahoo_publisher):
         """Test getting publisher statistics"""
@@ -9,7 +9,7 @@ Key Features:
 - Store historical signals in database
 - Track signal history for each stock
 - Daily incremental scanning
-- Parallel processing for performance
+- Vectorized scanning from one bulk load of yfinance_daily_ma
 
 Usage:
     # CLI - Scan for today's signals
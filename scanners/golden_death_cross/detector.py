@@ -18,7 +18,7 @@ from typing import List, Dict, Optional, Tuple, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.engine import URL
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
@@ -85,6 +85,107 @@ class CrossoverSignal:
         }
 
 
+def find_crossovers(df: pd.DataFrame, short_col: str, long_col: str) -> pd.DataFrame:
+    """
+    Find crossover bars in daily SMA data for one or many symbols.
+    
+    The side of the short SMA relative to the long SMA is the sign of their
+    difference; a bar signals when its side changes from the previous bar of
+    the same symbol (Golden: <= 0 to > 0, Death: >= 0 to < 0). Bars with a
+    missing SMA, and the bar after them, never signal.
+    
+    Args:
+        df: DataFrame with columns: symbol, date, close, short_col, long_col
+        short_col: Short SMA column
+        long_col: Long SMA column
+        
+    Returns:
+        DataFrame of crossover bars ordered by symbol and date, with columns:
+        symbol, date, close, sma_short, sma_long, signal_type,
+        previous_signal_type, previous_signal_date (the symbol's signal
+        before it in df)
+    """
+    df = df.sort_values(['symbol', 'date'], kind='mergesort')
+    symbols = df['symbol'].to_numpy()
+    short = pd.to_numeric(df[short_col], errors='coerce').to_numpy(dtype=float)
+    long_ = pd.to_numeric(df[long_col], errors='coerce').to_numpy(dtype=float)
+    
+    side = np.sign(short - long_)
+    prev_side = np.full_like(side, np.nan)
+    prev_side[1:] = side[:-1]
+    prev_side[1:][symbols[1:] != symbols[:-1]] = np.nan
+    
+    golden = (prev_side <= 0) & (side > 0)
+    death = (prev_side >= 0) & (side < 0)
+    hits = golden | death
+    
+    signals = pd.DataFrame({
+        'symbol': symbols[hits],
+        'date': pd.to_datetime(df['date'].to_numpy()[hits]).date,
+        'close': pd.to_numeric(df['close'], errors='coerce').to_numpy(dtype=float)[hits],
+        'sma_short': short[hits],
+        'sma_long': long_[hits],
+        'signal_type': np.where(golden[hits], CrossoverType.GOLDEN_CROSS.value,
+                                CrossoverType.DEATH_CROSS.value),
+    })
+    previous = signals.groupby('symbol', sort=False)[['signal_type', 'date']].shift(1)
+    signals['previous_signal_type'] = previous['signal_type']
+    signals['previous_signal_date'] = previous['date']
+    return signals
+
+
+def signals_from_frame(signals: pd.DataFrame) -> List[CrossoverSignal]:
+    """Build CrossoverSignal objects from a find_crossovers() frame."""
+    result = []
+    for symbol, signal_date, signal_type, close, sma_short, sma_long, prev_type, prev_date in zip(
+            signals['symbol'], signals['date'], signals['signal_type'], signals['close'],
+            signals['sma_short'], signals['sma_long'],
+            signals['previous_signal_type'], signals['previous_signal_date']):
+        has_previous = not pd.isna(prev_type)
+        result.append(CrossoverSignal(
+            symbol=symbol,
+            signal_date=signal_date,
+            signal_type=CrossoverType(signal_type),
+            close_price=float(close),
+            sma_50=float(sma_short),
+            sma_200=float(sma_long),
+            previous_signal_type=CrossoverType(prev_type) if has_previous else None,
+            previous_signal_date=prev_date if has_previous else None,
+            days_since_previous=(signal_date - prev_date).days if has_previous else None,
+        ))
+    return result
+
+
+def attach_previous_signals(targets: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Match each target signal with the latest history signal of the same
+    symbol dated strictly before it (an as-of join per symbol).
+    
+    Args:
+        targets: DataFrame with columns: symbol, signal_date
+        history: DataFrame with columns: symbol, signal_date, signal_type
+        
+    Returns:
+        targets, in their original order, with previous_signal_type,
+        previous_signal_date and days_since_previous columns (NaN where the
+        symbol has no earlier signal)
+    """
+    left = targets.assign(_row=np.arange(len(targets)),
+                          _on=pd.to_datetime(targets['signal_date']).astype('datetime64[ns]'))
+    right = history[['symbol', 'signal_date', 'signal_type']].rename(columns={
+        'signal_date': 'previous_signal_date',
+        'signal_type': 'previous_signal_type',
+    })
+    prev_on = pd.to_datetime(right['previous_signal_date']).astype('datetime64[ns]')
+    right = right.assign(_on=prev_on, _prev_on=prev_on)
+    
+    merged = pd.merge_asof(left.sort_values('_on'), right.sort_values('_on'),
+                           on='_on', by='symbol', allow_exact_matches=False)
+    merged['days_since_previous'] = (merged['_on'] - merged['_prev_on']).dt.days
+    merged = merged.sort_values('_row')
+    return merged.drop(columns=['_row', '_on', '_prev_on']).set_index(targets.index)
+
+
 class CrossoverDetector:
     """
     Detects Golden Cross and Death Cross signals from stock data.
@@ -92,7 +193,7 @@ class CrossoverDetector:
     Features:
     - Configurable SMA periods (default: 50/200)
     - Historical signal tracking
-    - Parallel processing for multiple stocks
+    - Vectorized scanning of all stocks from one bulk load
     - Database storage of signals
     - Incremental daily scanning
     """
@@ -194,14 +295,12 @@ class CrossoverDetector:
             symbol: Stock symbol
             
         Returns:
-            List of CrossoverSignal objects
+            List of CrossoverSignal objects, each carrying the signal before
+            it in the same frame as its previous signal
         """
         if df.empty or len(df) < 2:
             return []
         
-        # Ensure sorted by date
-        df = df.sort_values('date').copy()
-        
         # Column names based on configured periods
         sma_short_col = f'sma_{self.short_sma}'
         sma_long_col = f'sma_{self.long_sma}'
@@ -213,52 +312,7 @@ class CrossoverDetector:
                 logger.warning(f"Missing column {col} for {symbol}")
                 return []
         
-        signals = []
-        previous_signal: Optional[CrossoverSignal] = None
-        
-        for i in range(1, len(df)):
-            prev_row = df.iloc[i - 1]
-            curr_row = df.iloc[i]
-            
-            # Skip if SMAs are null
-            if (pd.isna(prev_row[sma_short_col]) or pd.isna(prev_row[sma_long_col]) or
-                pd.isna(curr_row[sma_short_col]) or pd.isna(curr_row[sma_long_col])):
-                continue
-            
-            prev_short = prev_row[sma_short_col]
-            prev_long = prev_row[sma_long_col]
-            curr_short = curr_row[sma_short_col]
-            curr_long = curr_row[sma_long_col]
-            
-            signal_type = None
-            
-            # Golden Cross: short was below or equal to long, now above
-            if prev_short <= prev_long and curr_short > curr_long:
-                signal_type = CrossoverType.GOLDEN_CROSS
-            
-            # Death Cross: short was above or equal to long, now below
-            elif prev_short >= prev_long and curr_short < curr_long:
-                signal_type = CrossoverType.DEATH_CROSS
-            
-            if signal_type:
-                signal_date = curr_row['date'].date() if hasattr(curr_row['date'], 'date') else curr_row['date']
-                
-                signal = CrossoverSignal(
-                    symbol=symbol,
-                    signal_date=signal_date,
-                    signal_type=signal_type,
-                    close_price=float(curr_row['close']),
-                    sma_50=float(curr_short),
-                    sma_200=float(curr_long),
-                    previous_signal_type=previous_signal.signal_type if previous_signal else None,
-                    previous_signal_date=previous_signal.signal_date if previous_signal else None,
-                    days_since_previous=(signal_date - previous_signal.signal_date).days if previous_signal else None
-                )
-                
-                signals.append(signal)
-                previous_signal = signal
-        
-        return signals
+        return signals_from_frame(find_crossovers(df.assign(symbol=symbol), sma_short_col, sma_long_col))
     
     def scan_symbol_yahoo(self, symbol: str,
                           start_date: Optional[date] = None,
@@ -372,35 +426,99 @@ class CrossoverDetector:
             logger.error(f"Error scanning {symbol}: {e}")
             return []
     
+    def load_ma_data(self,
+                     symbols: Optional[List[str]],
+                     start_date: date,
+                     end_date: date) -> pd.DataFrame:
+        """
+        Load daily close and SMAs from yfinance_daily_ma in a single query.
+        
+        Args:
+            symbols: Symbols to load (None for every symbol in the table)
+            start_date: First date to load
+            end_date: Last date to load
+            
+        Returns:
+            DataFrame with columns: symbol, date, close, sma_<short>, sma_<long>
+        """
+        sma_short_col = f'sma_{self.short_sma}'
+        sma_long_col = f'sma_{self.long_sma}'
+        
+        symbol_filter = "AND symbol IN :symbols" if symbols is not None else ""
+        query = text(f"""
+            SELECT symbol, date, close, {sma_short_col}, {sma_long_col}
+            FROM yfinance_daily_ma
+            WHERE date BETWEEN :start_date AND :end_date
+              AND {sma_short_col} IS NOT NULL
+              AND {sma_long_col} IS NOT NULL
+              {symbol_filter}
+            ORDER BY symbol, date
+        """)
+        params = {'start_date': start_date, 'end_date': end_date}
+        if symbols is not None:
+            query = query.bindparams(bindparam('symbols', expanding=True))
+            params['symbols'] = list(symbols)
+        
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn, params=params)
+    
     def scan_all_stocks(self,
                         symbols: Optional[List[str]] = None,
                         start_date: Optional[date] = None,
                         end_date: Optional[date] = None,
                         progress_callback=None,
-                        use_yahoo: bool = True) -> List[CrossoverSignal]:
+                        use_yahoo: bool = False) -> List[CrossoverSignal]:
         """
-        Scan all stocks for crossover signals using parallel processing.
+        Scan all stocks for crossover signals.
+        
+        By default all symbols are loaded from yfinance_daily_ma in one query
+        and scanned in a single vectorized pass. With use_yahoo, each symbol
+        is fetched from Yahoo Finance (unadjusted prices) in parallel instead.
         
         Args:
             symbols: List of symbols (default: Nifty 500)
-            start_date: Start date for scanning
-            end_date: End date for scanning
+            start_date: Start date for scanning (default: 1 year ago)
+            end_date: End date for scanning (default: today)
             progress_callback: Optional callback(current, total, symbol)
+            use_yahoo: If True, fetch fresh data from Yahoo per symbol
             
         Returns:
             List of all CrossoverSignal objects found
         """
         if symbols is None:
             symbols = self.get_nifty500_symbols()
+        if start_date is None:
+            start_date = date.today() - timedelta(days=365)
+        if end_date is None:
+            end_date = date.today()
         
-        all_signals = []
         total = len(symbols)
+        if total == 0:
+            return []
         
         logger.info(f"Scanning {total} symbols for crossovers...")
         
+        if use_yahoo:
+            all_signals = self._scan_all_yahoo(symbols, start_date, end_date, progress_callback)
+        else:
+            df = self.load_ma_data(symbols, start_date, end_date)
+            all_signals = signals_from_frame(find_crossovers(
+                df, f'sma_{self.short_sma}', f'sma_{self.long_sma}'))
+            if progress_callback:
+                progress_callback(total, total, symbols[-1])
+        
+        logger.info(f"Found {len(all_signals)} crossover signals")
+        return all_signals
+    
+    def _scan_all_yahoo(self, symbols: List[str], start_date: date, end_date: date,
+                        progress_callback=None) -> List[CrossoverSignal]:
+        """Scan symbols one Yahoo Finance download at a time over the thread pool."""
+        all_signals = []
+        total = len(symbols)
+        
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
-                executor.submit(self.scan_symbol, symbol, start_date, end_date): symbol
+                executor.submit(self.scan_symbol_yahoo, symbol, start_date, end_date): symbol
                 for symbol in symbols
             }
             
@@ -417,7 +535,6 @@ class CrossoverDetector:
                 if progress_callback:
                     progress_callback(completed, total, symbol)
         
-        logger.info(f"Found {len(all_signals)} crossover signals")
         return all_signals
     
     def scan_for_date(self, target_date: date,
@@ -470,90 +587,75 @@ class CrossoverDetector:
         # Fallback to database (uses adjusted prices - may not match TradingView)
         start_date = target_date - timedelta(days=5)  # Buffer for weekends
         
-        sma_short_col = f'sma_{self.short_sma}'
-        sma_long_col = f'sma_{self.long_sma}'
-        
-        # Batch query all symbols
-        query = text(f"""
-            SELECT symbol, date, close, {sma_short_col}, {sma_long_col}
-            FROM yfinance_daily_ma
-            WHERE date BETWEEN :start_date AND :target_date
-              AND {sma_short_col} IS NOT NULL
-              AND {sma_long_col} IS NOT NULL
-            ORDER BY symbol, date
-        """)
-        
         try:
-            with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn, params={
-                    'start_date': start_date,
-                    'target_date': target_date
-                })
-            
+            df = self.load_ma_data(None, start_date, target_date)
             if df.empty:
                 return []
             
-            for symbol, group in df.groupby('symbol'):
-                signals = self.detect_crossover(group, symbol)
-                # Filter to only signals on target_date
-                for signal in signals:
-                    if signal.signal_date == target_date:
-                        all_signals.append(signal)
-            
-            return all_signals
+            signals = find_crossovers(df, f'sma_{self.short_sma}', f'sma_{self.long_sma}')
+            return signals_from_frame(signals[signals['date'] == target_date])
             
         except Exception as e:
             logger.error(f"Error scanning for date {target_date}: {e}")
             return []
     
-    def _enrich_with_previous_signal(self, signal: CrossoverSignal) -> CrossoverSignal:
+    def _enrich_with_previous_signals(self, signals: List[CrossoverSignal]) -> List[CrossoverSignal]:
         """
-        Enrich a signal with previous signal info from the database.
-        This is used when the signal doesn't have previous signal info
-        (e.g., when scanning a single date).
+        Enrich signals with previous signal info from the database.
+        This is used when signals don't have previous signal info
+        (e.g., when scanning a single date). Stored signals of the affected
+        symbols are loaded in one query and matched in memory.
         
         Args:
-            signal: The signal to enrich
+            signals: The signals to enrich
             
         Returns:
-            The enriched signal (modified in place)
+            The signals (modified in place)
         """
-        if signal.previous_signal_type is not None:
-            # Already has previous signal info
-            return signal
+        missing = [s for s in signals if s.previous_signal_type is None]
+        if not missing:
+            return signals
         
-        # Look up the last signal for this symbol before this date
         query = text("""
-            SELECT signal_type, signal_date 
+            SELECT symbol, signal_date, signal_type
             FROM ma_crossover_signals
-            WHERE symbol = :symbol 
-              AND signal_date < :signal_date
-            ORDER BY signal_date DESC
-            LIMIT 1
-        """)
+            WHERE symbol IN :symbols
+              AND signal_date < :max_date
+        """).bindparams(bindparam('symbols', expanding=True))
         
         try:
             with self.engine.connect() as conn:
-                result = conn.execute(query, {
-                    'symbol': signal.symbol,
-                    'signal_date': signal.signal_date
-                }).fetchone()
-                
-                if result:
-                    prev_type_str = result[0]
-                    prev_date = result[1]
-                    
-                    signal.previous_signal_type = CrossoverType(prev_type_str)
-                    signal.previous_signal_date = prev_date
-                    signal.days_since_previous = (signal.signal_date - prev_date).days
+                history = pd.read_sql(query, conn, params={
+                    'symbols': sorted({s.symbol for s in missing}),
+                    'max_date': max(s.signal_date for s in missing)
+                })
         except Exception as e:
-            logger.warning(f"Could not fetch previous signal for {signal.symbol}: {e}")
+            logger.warning(f"Could not fetch previous signals: {e}")
+            return signals
+        
+        if history.empty:
+            return signals
+        
+        targets = pd.DataFrame({
+            'symbol': [s.symbol for s in missing],
+            'signal_date': [s.signal_date for s in missing],
+        })
+        previous = attach_previous_signals(targets, history)
+        
+        for signal, prev_type, prev_date, days in zip(
+                missing, previous['previous_signal_type'],
+                previous['previous_signal_date'], previous['days_since_previous']):
+            if pd.isna(prev_type):
+                continue
+            signal.previous_signal_type = CrossoverType(prev_type)
+            signal.previous_signal_date = prev_date
+            signal.days_since_previous = int(days)
         
-        return signal
+        return signals
     
     def save_signals(self, signals: List[CrossoverSignal], enrich_previous: bool = True) -> int:
         """
-        Save signals to database.
+        Save signals to database with a single batched upsert.
         
         Args:
             signals: List of CrossoverSignal objects
@@ -565,58 +667,58 @@ class CrossoverDetector:
         if not signals:
             return 0
         
-        saved = 0
+        # Enrich with previous signal info if not set
+        if enrich_previous:
+            self._enrich_with_previous_signals(signals)
+        
+        rows = [{
+            'symbol': signal.symbol,
+            'signal_date': signal.signal_date,
+            'signal_type': signal.signal_type.value,
+            'close_price': signal.close_price,
+            'sma_short': signal.sma_50,
+            'sma_long': signal.sma_200,
+            'short_period': self.short_sma,
+            'long_period': self.long_sma,
+            'previous_signal_type': signal.previous_signal_type.value if signal.previous_signal_type else None,
+            'previous_signal_date': signal.previous_signal_date,
+            'days_since_previous': signal.days_since_previous,
+            'price_1d_later': signal.price_1d_later,
+            'price_5d_later': signal.price_5d_later,
+            'price_20d_later': signal.price_20d_later,
+            'pct_change_1d': signal.pct_change_1d,
+            'pct_change_5d': signal.pct_change_5d,
+            'pct_change_20d': signal.pct_change_20d,
+        } for signal in signals]
         
-        with self.engine.begin() as conn:
-            for signal in signals:
-                try:
-                    # Enrich with previous signal info if not set
-                    if enrich_previous and signal.previous_signal_type is None:
-                        self._enrich_with_previous_signal(signal)
-                    
-                    conn.execute(text("""
-                        INSERT INTO ma_crossover_signals 
-                        (symbol, signal_date, signal_type, close_price, sma_short, sma_long,
-                         short_period, long_period, previous_signal_type, previous_signal_date,
-                         days_since_previous, price_1d_later, price_5d_later, price_20d_later,
-                         pct_change_1d, pct_change_5d, pct_change_20d)
-                        VALUES (:symbol, :signal_date, :signal_type, :close_price, :sma_short, :sma_long,
-                                :short_period, :long_period, :previous_signal_type, :previous_signal_date,
-                                :days_since_previous, :price_1d_later, :price_5d_later, :price_20d_later,
-                                :pct_change_1d, :pct_change_5d, :pct_change_20d)
-                        ON DUPLICATE KEY UPDATE
-                            close_price = VALUES(close_price),
-                            sma_short = VALUES(sma_short),
-                            sma_long = VALUES(sma_long),
-                            previous_signal_type = VALUES(previous_signal_type),
-                            previous_signal_date = VALUES(previous_signal_date),
-                            days_since_previous = VALUES(days_since_previous),
-                            updated_at = CURRENT_TIMESTAMP
-                    """), {
-                        'symbol': signal.symbol,
-                        'signal_date': signal.signal_date,
-                        'signal_type': signal.signal_type.value,
-                        'close_price': signal.close_price,
-                        'sma_short': signal.sma_50,
-                        'sma_long': signal.sma_200,
-                        'short_period': self.short_sma,
-                        'long_period': self.long_sma,
-                        'previous_signal_type': signal.previous_signal_type.value if signal.previous_signal_type else None,
-                        'previous_signal_date': signal.previous_signal_date,
-                        'days_since_previous': signal.days_since_previous,
-                        'price_1d_later': signal.price_1d_later,
-                        'price_5d_later': signal.price_5d_later,
-                        'price_20d_later': signal.price_20d_later,
-                        'pct_change_1d': signal.pct_change_1d,
-                        'pct_change_5d': signal.pct_change_5d,
-                        'pct_change_20d': signal.pct_change_20d,
-                    })
-                    saved += 1
-                except Exception as e:
-                    logger.error(f"Error saving signal for {signal.symbol}: {e}")
+        try:
+            with self.engine.begin() as conn:
+                # executemany: PyMySQL folds this into multi-row INSERTs
+                conn.execute(text("""
+                    INSERT INTO ma_crossover_signals 
+                    (symbol, signal_date, signal_type, close_price, sma_short, sma_long,
+                     short_period, long_period, previous_signal_type, previous_signal_date,
+                     days_since_previous, price_1d_later, price_5d_later, price_20d_later,
+                     pct_change_1d, pct_change_5d, pct_change_20d)
+                    VALUES (:symbol, :signal_date, :signal_type, :close_price, :sma_short, :sma_long,
+                            :short_period, :long_period, :previous_signal_type, :previous_signal_date,
+                            :days_since_previous, :price_1d_later, :price_5d_later, :price_20d_later,
+                            :pct_change_1d, :pct_change_5d, :pct_change_20d)
+                    ON DUPLICATE KEY UPDATE
+                        close_price = VALUES(close_price),
+                        sma_short = VALUES(sma_short),
+                        sma_long = VALUES(sma_long),
+                        previous_signal_type = VALUES(previous_signal_type),
+                        previous_signal_date = VALUES(previous_signal_date),
+                        days_since_previous = VALUES(days_since_previous),
+                        updated_at = CURRENT_TIMESTAMP
+                """), rows)
+        except Exception as e:
+            logger.error(f"Error saving {len(rows)} signals: {e}")
+            return 0
         
-        logger.info(f"Saved {saved} signals to database")
-        return saved
+        logger.info(f"Saved {len(rows)} signals to database")
+        return len(rows)
     
     def load_signals(self,
                      symbol: Optional[str] = None,
@@ -733,68 +835,46 @@ class CrossoverDetector:
         Returns:
             Number of records updated
         """
-        # Find all records missing previous signal info
+        # Every stored signal is a candidate previous signal
         query = text("""
-            SELECT id, symbol, signal_date, signal_type
+            SELECT id, symbol, signal_date, signal_type, previous_signal_type
             FROM ma_crossover_signals
-            WHERE previous_signal_type IS NULL
-            ORDER BY symbol, signal_date
         """)
         
-        updated = 0
-        
         with self.engine.connect() as conn:
-            records = conn.execute(query).fetchall()
+            history = pd.read_sql(query, conn)
         
-        if not records:
+        records = history[history['previous_signal_type'].isna()]
+        if records.empty:
             logger.info("No records need previous signal backfill")
             return 0
         
         logger.info(f"Backfilling previous signal info for {len(records)} records...")
         
-        with self.engine.begin() as conn:
-            for record in records:
-                record_id = record[0]
-                symbol = record[1]
-                signal_date = record[2]
-                
-                # Find the previous signal for this symbol
-                prev_query = text("""
-                    SELECT signal_type, signal_date 
-                    FROM ma_crossover_signals
-                    WHERE symbol = :symbol 
-                      AND signal_date < :signal_date
-                    ORDER BY signal_date DESC
-                    LIMIT 1
-                """)
-                
-                prev_result = conn.execute(prev_query, {
-                    'symbol': symbol,
-                    'signal_date': signal_date
-                }).fetchone()
-                
-                if prev_result:
-                    prev_type = prev_result[0]
-                    prev_date = prev_result[1]
-                    days_since = (signal_date - prev_date).days
-                    
-                    # Update the record
-                    conn.execute(text("""
-                        UPDATE ma_crossover_signals
-                        SET previous_signal_type = :prev_type,
-                            previous_signal_date = :prev_date,
-                            days_since_previous = :days_since
-                        WHERE id = :id
-                    """), {
-                        'id': record_id,
-                        'prev_type': prev_type,
-                        'prev_date': prev_date,
-                        'days_since': days_since
-                    })
-                    updated += 1
-        
-        logger.info(f"Updated {updated} records with previous signal info")
-        return updated
+        previous = attach_previous_signals(records[['id', 'symbol', 'signal_date']], history)
+        previous = previous[previous['previous_signal_type'].notna()]
+        
+        updates = [{
+            'id': int(record_id),
+            'prev_type': prev_type,
+            'prev_date': prev_date,
+            'days_since': int(days_since)
+        } for record_id, prev_type, prev_date, days_since in zip(
+            previous['id'], previous['previous_signal_type'],
+            previous['previous_signal_date'], previous['days_since_previous'])]
+        
+        if updates:
+            with self.engine.begin() as conn:
+                conn.execute(text("""
+                    UPDATE ma_crossover_signals
+                    SET previous_signal_type = :prev_type,
+                        previous_signal_date = :prev_date,
+                        days_since_previous = :days_since
+                    WHERE id = :id
+                """), updates)
+        
+        logger.info(f"Updated {len(updates)} records with previous signal info")
+        return len(updates)
     
     def get_signals_summary(self, target_date: Optional[date] = None) -> Dict:
         """
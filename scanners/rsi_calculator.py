@@ -7,13 +7,20 @@ which computes RSI per symbol in parallel and upserts into the tables:
  - nse_rsi_monthly
 
 The upsert uses a temporary table + INSERT ... ON DUPLICATE KEY UPDATE and deduplicates by (symbol, trade_date, period).
+
+Each run also saves every symbol's Wilder state (average gain/loss before
+the last bar) per frequency and period in nse_rsi_state. With
+run_rsi(..., incremental=True) only BHAV rows newer than that state are
+read, the new bars are folded into the saved averages and only the RSI
+rows that changed (new bars plus a still-open week/month) are written.
+Symbols or periods without saved state fall back to a full compute.
 """
 from __future__ import annotations
 
 import pandas as pd
 import math
 import multiprocessing
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from sqlalchemy import text
 
 try:
@@ -53,6 +60,30 @@ CREATE TABLE IF NOT EXISTS nse_rsi_monthly (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 '''
 
+STATE_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS nse_rsi_state (
+    symbol VARCHAR(20) NOT NULL,
+    freq VARCHAR(10) NOT NULL,
+    period INT NOT NULL,
+    bars INT NOT NULL,
+    last_date DATE NOT NULL,
+    last_close DOUBLE NULL,
+    prev_close DOUBLE NULL,
+    avg_gain DOUBLE NULL,
+    avg_loss DOUBLE NULL,
+    source_date DATE NOT NULL,
+    PRIMARY KEY (symbol, freq, period)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+'''
+
+FREQ_TABLES = {'daily': 'nse_rsi_daily', 'weekly': 'nse_rsi_weekly', 'monthly': 'nse_rsi_monthly'}
+
+# resample rule per frequency (daily bars are the BHAV rows themselves)
+FREQ_RULES = {'daily': None, 'weekly': 'W-FRI', 'monthly': 'ME'}
+
+STATE_COLUMNS = ['symbol', 'freq', 'period', 'bars', 'last_date', 'last_close',
+                 'prev_close', 'avg_gain', 'avg_loss', 'source_date']
+
 
 def _ensure_engine():
     if build_engine:
@@ -64,13 +95,8 @@ def _ensure_engine():
         raise RuntimeError('No engine builder available; ensure import_nifty_index.build_engine is importable')
 
 
-def compute_rsi(series: pd.Series, period: int = 9) -> pd.Series:
-    """Compute Wilder RSI using EWM smoothing (alpha=1/period).
-
-    Returns a series aligned with the input index; NaN for initial values.
-    """
-    if series is None or series.empty:
-        return pd.Series(dtype='float64')
+def _wilder_averages(series: pd.Series, period: int) -> Tuple[pd.Series, pd.Series]:
+    """Wilder average gain and loss (EWM with alpha=1/period) for a close series."""
     close = series.astype('float64')
     delta = close.diff()
     gain = delta.clip(lower=0.0).fillna(0.0)
@@ -80,6 +106,17 @@ def compute_rsi(series: pd.Series, period: int = 9) -> pd.Series:
     alpha = 1.0 / float(period)
     avg_gain = gain.ewm(alpha=alpha, adjust=False).mean()
     avg_loss = loss.ewm(alpha=alpha, adjust=False).mean()
+    return avg_gain, avg_loss
+
+
+def compute_rsi(series: pd.Series, period: int = 9) -> pd.Series:
+    """Compute Wilder RSI using EWM smoothing (alpha=1/period).
+
+    Returns a series aligned with the input index; NaN for initial values.
+    """
+    if series is None or series.empty:
+        return pd.Series(dtype='float64')
+    avg_gain, avg_loss = _wilder_averages(series, period)
 
     rs = avg_gain / avg_loss
     rsi = 100.0 - (100.0 / (1.0 + rs))
@@ -87,9 +124,95 @@ def compute_rsi(series: pd.Series, period: int = 9) -> pd.Series:
     return rsi
 
 
+def period_closes(close: pd.Series, freq: str) -> pd.Series:
+    """Closes per bar for a frequency from a daily close series indexed by date."""
+    rule = FREQ_RULES[freq]
+    if rule is None:
+        return close
+    return close.resample(rule).last().dropna()
+
+
+def wilder_state(bars: pd.Series, period: int) -> Optional[dict]:
+    """Wilder state of a bar series: averages before the last bar plus the last bar.
+
+    Keeping the last bar separate lets an incremental update replace it
+    when it is still open (current week/month) or re-imported.
+    """
+    if bars.empty:
+        return None
+    state = {'bars': len(bars), 'last_date': bars.index[-1], 'last_close': float(bars.iloc[-1]),
+             'prev_close': None, 'avg_gain': None, 'avg_loss': None}
+    if len(bars) > 1:
+        avg_gain, avg_loss = _wilder_averages(bars, period)
+        state.update(prev_close=float(bars.iloc[-2]), avg_gain=float(avg_gain.iloc[-2]),
+                     avg_loss=float(avg_loss.iloc[-2]))
+    return state
+
+
+def _ewm_step(avg: float, value: float, alpha: float) -> float:
+    # Same arithmetic as pandas ewm(adjust=False) so results match compute_rsi
+    if avg != value:
+        avg = ((1.0 - alpha) * avg + alpha * value) / ((1.0 - alpha) + alpha)
+    return avg
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else math.nan
+    return 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+
+def advance_wilder(state: dict, new_bars: pd.Series, period: int) -> Tuple[dict, List[Tuple]]:
+    """Fold new bars into a saved Wilder state.
+
+    new_bars holds bars dated on or after state['last_date']; a bar dated
+    last_date replaces the saved last bar.
+
+    Returns (new state, [(bar date, rsi)]) for the new/replaced bars with a defined RSI.
+    """
+    alpha = 1.0 / float(period)
+    seq = list(new_bars.items())
+    if not seq:
+        return state, []
+    replaces_last = seq[0][0] == state['last_date']
+    if not replaces_last:
+        seq.insert(0, (state['last_date'], state['last_close']))
+
+    # Start from the state before the saved last bar
+    count = state['bars'] - 1
+    prev_close, avg_gain, avg_loss = state['prev_close'], state['avg_gain'], state['avg_loss']
+    before = (prev_close, avg_gain, avg_loss)
+    out = []
+    for i, (bar_date, close) in enumerate(seq):
+        close = float(close)
+        before = (prev_close, avg_gain, avg_loss)
+        if count == 0:
+            avg_gain = avg_loss = 0.0
+        else:
+            delta = close - prev_close if prev_close is not None else math.nan
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = _ewm_step(avg_gain, gain, alpha)
+            avg_loss = _ewm_step(avg_loss, loss, alpha)
+        count += 1
+        prev_close = close
+
+        if i > 0 or replaces_last:
+            rsi = _rsi_value(avg_gain, avg_loss)
+            if not math.isnan(rsi):
+                out.append((bar_date, rsi))
+
+    new_state = {'bars': count, 'last_date': seq[-1][0], 'last_close': float(seq[-1][1]),
+                 'prev_close': before[0], 'avg_gain': before[1], 'avg_loss': before[2]}
+    return new_state, out
+
+
 def fetch_all_closes(conn, start: Optional[str] = None, end: Optional[str] = None, symbols: Optional[List[str]] = None) -> pd.DataFrame:
     """Fetch trade_date,symbol,close_price from BHAV table for the optional range and symbols."""
-    if symbols:
+    if symbols and not (start and end):
+        q = text("SELECT trade_date, symbol, close_price FROM nse_equity_bhavcopy_full WHERE symbol IN :syms AND series = 'EQ' AND trade_date <= COALESCE(:b, trade_date) ORDER BY symbol, trade_date")
+        rows = conn.execute(q, {"syms": tuple(symbols), "b": end}).fetchall()
+    elif symbols:
         q = text("SELECT trade_date, symbol, close_price FROM nse_equity_bhavcopy_full WHERE symbol IN :syms AND series = 'EQ' AND trade_date BETWEEN :a AND :b ORDER BY symbol, trade_date")
         rows = conn.execute(q, {"syms": tuple(symbols), "a": start, "b": end}).fetchall()
     else:
@@ -100,6 +223,10 @@ def fetch_all_closes(conn, start: Optional[str] = None, end: Optional[str] = Non
             q = text("SELECT trade_date, symbol, close_price FROM nse_equity_bhavcopy_full WHERE series = 'EQ' ORDER BY symbol, trade_date")
             rows = conn.execute(q).fetchall()
 
+    return _closes_frame(rows)
+
+
+def _closes_frame(rows) -> pd.DataFrame:
     if not rows:
         return pd.DataFrame()
     df = pd.DataFrame(rows, columns=["trade_date", "symbol", "close"])
@@ -111,6 +238,38 @@ def fetch_all_closes(conn, start: Optional[str] = None, end: Optional[str] = Non
     return df
 
 
+def fetch_closes_since_state(conn, period: int, freqs: List[str], end: Optional[str] = None, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+    """BHAV closes newer than each symbol's saved RSI state (same shape as fetch_all_closes)."""
+    sql = """
+        SELECT b.trade_date, b.symbol, b.close_price
+        FROM nse_equity_bhavcopy_full b
+        JOIN (SELECT symbol, MIN(source_date) AS source_date FROM nse_rsi_state
+              WHERE period = :p AND freq IN :freqs GROUP BY symbol) s
+          ON s.symbol = b.symbol
+        WHERE b.series = 'EQ' AND b.trade_date > s.source_date AND b.trade_date <= :b
+    """
+    params = {"p": period, "freqs": tuple(freqs), "b": end}
+    if symbols:
+        sql += " AND b.symbol IN :syms"
+        params["syms"] = tuple(symbols)
+    rows = conn.execute(text(sql + " ORDER BY b.symbol, b.trade_date"), params).fetchall()
+    return _closes_frame(rows)
+
+
+def fetch_symbols_without_state(conn, period: int, since, end: Optional[str] = None, symbols: Optional[List[str]] = None) -> List[str]:
+    """Symbols that traded after `since` but have no saved RSI state for the period."""
+    sql = """
+        SELECT DISTINCT symbol FROM nse_equity_bhavcopy_full
+        WHERE series = 'EQ' AND trade_date > :a AND trade_date <= :b
+          AND symbol NOT IN (SELECT symbol FROM nse_rsi_state WHERE period = :p)
+    """
+    params = {"a": pd.Timestamp(since).date(), "b": end, "p": period}
+    if symbols:
+        sql += " AND symbol IN :syms"
+        params["syms"] = tuple(symbols)
+    return sorted(r[0] for r in conn.execute(text(sql), params).fetchall())
+
+
 def upsert_rsi(engine, df: pd.DataFrame, table: str):
     if df.empty:
         print('No RSI rows to upsert for', table)
@@ -144,59 +303,191 @@ def upsert_rsi(engine, df: pd.DataFrame, table: str):
         print(f"Upserted {len(df)} rows into {table}")
 
 
+def load_rsi_state(conn, period: int, freqs: List[str], symbols: Optional[List[str]] = None) -> Dict[Tuple[str, str], dict]:
+    """Saved Wilder states keyed by (symbol, freq)."""
+    conn.execute(text(STATE_TABLE_SQL))
+    sql = f"SELECT {', '.join(STATE_COLUMNS)} FROM nse_rsi_state WHERE period = :p AND freq IN :freqs"
+    params = {"p": period, "freqs": tuple(freqs)}
+    if symbols:
+        sql += " AND symbol IN :syms"
+        params["syms"] = tuple(symbols)
+    states = {}
+    for row in conn.execute(text(sql), params).mappings():
+        state = dict(row)
+        state['last_date'] = pd.Timestamp(state['last_date'])
+        state['source_date'] = pd.Timestamp(state['source_date'])
+        states[(state['symbol'], state['freq'])] = state
+    return states
+
+
+def upsert_rsi_state(engine, states: List[dict], chunk_size: int = 1000):
+    """Save Wilder states (one row per symbol, freq, period)."""
+    if not states:
+        return
+    cols = ", ".join(f"`{c}`" for c in STATE_COLUMNS)
+    values = ", ".join(f":{c}" for c in STATE_COLUMNS)
+    updates = ", ".join(f"`{c}`=VALUES(`{c}`)" for c in STATE_COLUMNS[3:])
+    sql = text(f"INSERT INTO nse_rsi_state ({cols}) VALUES ({values}) ON DUPLICATE KEY UPDATE {updates}")
+    rows = []
+    for st in states:
+        row = {c: st.get(c) for c in STATE_COLUMNS}
+        row['last_date'] = pd.Timestamp(row['last_date']).date()
+        row['source_date'] = pd.Timestamp(row['source_date']).date()
+        rows.append(row)
+    with engine.begin() as conn:
+        conn.execute(text(STATE_TABLE_SQL))
+        for i in range(0, len(rows), chunk_size):
+            conn.execute(sql, rows[i:i + chunk_size])
+
+
 def _compute_symbol(sym, rows, freqs, period, cancel_token=None):
     """Top-level worker callable for parallel execution.
     rows: list of (trade_date, close)
-    returns (symbol, out_rows)
+    returns (symbol, out_rows, states) where states holds the Wilder state per freq
     """
     out_rows = {f: [] for f in freqs}
+    states = {}
     try:
         if cancel_token and cancel_token.get('cancel'):
-            return sym, out_rows
+            return sym, out_rows, states
 
         import pandas as _pd
         g = _pd.DataFrame(rows, columns=['trade_date', 'close'])
         g['trade_date'] = _pd.to_datetime(g['trade_date'])
         g = g.set_index('trade_date').sort_index()
         if g.empty:
-            return sym, out_rows
-
-        # daily
-        if 'daily' in freqs:
-            rsi_daily = compute_rsi(g['close'], period=period)
-            for dt, val in rsi_daily.dropna().items():
-                out_rows['daily'].append({'symbol': sym, 'trade_date': _pd.to_datetime(dt).date(), 'period': period, 'rsi': float(val)})
-
-        # weekly
-        if 'weekly' in freqs:
-            weekly_close = g['close'].resample('W-FRI').last().dropna()
-            if not weekly_close.empty:
-                rsi_week = compute_rsi(weekly_close, period=period)
-                for dt, val in rsi_week.dropna().items():
-                    out_rows['weekly'].append({'symbol': sym, 'trade_date': _pd.to_datetime(dt).date(), 'period': period, 'rsi': float(val)})
-
-        # monthly
-        if 'monthly' in freqs:
-            monthly_close = g['close'].resample('M').last().dropna()
-            if not monthly_close.empty:
-                rsi_mon = compute_rsi(monthly_close, period=period)
-                for dt, val in rsi_mon.dropna().items():
-                    out_rows['monthly'].append({'symbol': sym, 'trade_date': _pd.to_datetime(dt).date(), 'period': period, 'rsi': float(val)})
+            return sym, out_rows, states
+
+        for f in freqs:
+            bars = period_closes(g['close'], f)
+            if bars.empty:
+                continue
+            rsi = compute_rsi(bars, period=period)
+            for dt, val in rsi.dropna().items():
+                out_rows[f].append({'symbol': sym, 'trade_date': _pd.to_datetime(dt).date(), 'period': period, 'rsi': float(val)})
+            state = wilder_state(bars, period)
+            state.update(symbol=sym, freq=f, period=period, source_date=g.index[-1])
+            states[f] = state
 
     except Exception:
         # swallow per-symbol exceptions; caller will log via progress_cb
         pass
-    return sym, out_rows
+    return sym, out_rows, states
 
 
-def run_rsi(engine, period: int = 9, freqs: Optional[List[str]] = None, workers: int = 4, progress_cb: Optional[Callable] = None, symbols: Optional[List[str]] = None, start: Optional[str] = None, end: Optional[str] = None, limit: int = 0, cancel_token: Optional[dict] = None):
+def _update_symbol(sym, daily: pd.Series, sym_states: Dict[str, dict], period: int):
+    """Fold a symbol's new daily closes into its saved states.
+    returns (out_rows, states) like _compute_symbol
+    """
+    out_rows = {}
+    states = {}
+    for f, state in sym_states.items():
+        new = daily[daily.index > state['source_date']]
+        if new.empty:
+            continue
+        new_state, rsi_rows = advance_wilder(state, period_closes(new, f), period)
+        new_state.update(symbol=sym, freq=f, period=period, source_date=new.index[-1])
+        states[f] = new_state
+        out_rows[f] = [{'symbol': sym, 'trade_date': pd.Timestamp(dt).date(), 'period': period, 'rsi': float(val)}
+                       for dt, val in rsi_rows]
+    return out_rows, states
+
+
+def _upsert_results(engine, results_by_freq, freqs, total, progress_cb=None):
+    for f in freqs:
+        rows = results_by_freq.get(f, [])
+        if not rows:
+            if progress_cb:
+                progress_cb(0, total, f'No rows for {f}')
+            continue
+        df_res = pd.DataFrame(rows)
+        # ensure columns and dedupe
+        df_res = df_res[['symbol', 'trade_date', 'period', 'rsi']]
+        df_res = df_res.sort_values(['symbol', 'trade_date', 'period']).drop_duplicates(subset=['symbol', 'trade_date', 'period'], keep='last')
+        tbl = FREQ_TABLES[f]
+        upsert_rsi(engine, df_res, tbl)
+        if progress_cb:
+            progress_cb(total, total, f'Upserted {len(df_res)} rows into {tbl}')
+
+
+def run_rsi_incremental(engine, period: int = 9, freqs: Optional[List[str]] = None, workers: int = 4, progress_cb: Optional[Callable] = None, symbols: Optional[List[str]] = None, end: Optional[str] = None, cancel_token: Optional[dict] = None):
+    """Update RSI from saved Wilder state using only BHAV rows newer than the state.
+
+    Symbols without saved state for every requested frequency (new
+    listings, a new period) are computed in full by run_rsi.
+    """
+    if freqs is None:
+        freqs = ['daily', 'weekly', 'monthly']
+
+    with engine.begin() as conn:
+        saved = load_rsi_state(conn, period, freqs, symbols)
+    if not saved:
+        if progress_cb:
+            progress_cb(0, 0, f'No saved RSI state for period {period}; running full rebuild')
+        return run_rsi(engine, period=period, freqs=freqs, workers=workers, progress_cb=progress_cb, symbols=symbols, end=end, cancel_token=cancel_token)
+
+    until = end or pd.Timestamp.today().strftime('%Y-%m-%d')
+    with engine.connect() as conn:
+        df_new = fetch_closes_since_state(conn, period, freqs, end=until, symbols=symbols)
+        unsaved = fetch_symbols_without_state(conn, period, since=max(st['source_date'] for st in saved.values()), end=until, symbols=symbols)
+
+    if df_new.empty and not unsaved:
+        if progress_cb:
+            progress_cb(0, 0, 'RSI state is up to date (no new BHAV rows)')
+        return
+
+    states_by_symbol: Dict[str, Dict[str, dict]] = {}
+    for (sym, f), st in saved.items():
+        states_by_symbol.setdefault(sym, {})[f] = st
+
+    groups = {}
+    if not df_new.empty:
+        groups = {sym: g.set_index('trade_date')['close'] for sym, g in df_new.groupby('symbol', sort=True)}
+    total = len(groups)
+    if progress_cb:
+        progress_cb(0, total, f'Incremental RSI update for {total} symbols')
+
+    results_by_freq = {f: [] for f in freqs}
+    new_states = []
+    rebuild = list(unsaved)
+    for processed, (sym, daily) in enumerate(groups.items(), start=1):
+        if cancel_token and cancel_token.get('cancel'):
+            break
+        sym_states = states_by_symbol.get(sym, {})
+        if len(sym_states) < len(freqs):
+            rebuild.append(sym)
+            continue
+        out_rows, states = _update_symbol(sym, daily, sym_states, period)
+        for f, rows in out_rows.items():
+            results_by_freq[f].extend(rows)
+        new_states.extend(states.values())
+        if progress_cb and (processed % 250 == 0 or processed == total):
+            progress_cb(processed, total, f'Updated {processed}/{total} symbols')
+
+    _upsert_results(engine, results_by_freq, freqs, total, progress_cb)
+    upsert_rsi_state(engine, new_states)
+
+    if rebuild and not (cancel_token and cancel_token.get('cancel')):
+        if progress_cb:
+            progress_cb(total, total, f'Full RSI compute for {len(rebuild)} symbols without saved state')
+        run_rsi(engine, period=period, freqs=freqs, workers=workers, progress_cb=progress_cb, symbols=rebuild, end=end, cancel_token=cancel_token)
+
+
+def run_rsi(engine, period: int = 9, freqs: Optional[List[str]] = None, workers: int = 4, progress_cb: Optional[Callable] = None, symbols: Optional[List[str]] = None, start: Optional[str] = None, end: Optional[str] = None, limit: int = 0, cancel_token: Optional[dict] = None, incremental: bool = False):
     """Compute RSI for all symbols and upsert per frequency.
 
+    With incremental=True only rows newer than the saved Wilder state are
+    processed (see run_rsi_incremental); otherwise every symbol's full
+    history is recomputed and its state saved.
+
     progress_cb(current:int, total:int, message:str) will be called with updates.
     """
     if freqs is None:
         freqs = ['daily', 'weekly', 'monthly']
 
+    if incremental:
+        return run_rsi_incremental(engine, period=period, freqs=freqs, workers=workers, progress_cb=progress_cb, symbols=symbols, end=end, cancel_token=cancel_token)
+
     # fetch closes
     with engine.connect() as conn:
         df_all = fetch_all_closes(conn, start=start, end=end, symbols=symbols)
@@ -216,6 +507,7 @@ def run_rsi(engine, period: int = 9, freqs: Optional[List[str]] = None, workers:
         progress_cb(0, total, f'Starting RSI compute for {total} symbols')
 
     results_by_freq = {f: [] for f in freqs}
+    new_states = []
 
     # prepare per-symbol rows to pass to worker processes
     symbol_rows = []
@@ -244,10 +536,11 @@ def run_rsi(engine, period: int = 9, freqs: Optional[List[str]] = None, workers:
         for fut in as_completed(futures):
             sym = futures[fut]
             try:
-                _, out_rows = fut.result()
+                _, out_rows, states = fut.result()
                 for f in freqs:
                     if out_rows.get(f):
                         results_by_freq[f].extend(out_rows[f])
+                new_states.extend(states.values())
             except Exception as e:
                 if progress_cb:
                     progress_cb(processed, total, f'Error processing {sym}: {e}')
@@ -263,20 +556,8 @@ def run_rsi(engine, period: int = 9, freqs: Optional[List[str]] = None, workers:
             pass
 
     # convert results to DataFrames and upsert per freq
-    for f in freqs:
-        rows = results_by_freq.get(f, [])
-        if not rows:
-            if progress_cb:
-                progress_cb(0, total, f'No rows for {f}')
-            continue
-        df_res = pd.DataFrame(rows)
-        # ensure columns and dedupe
-        df_res = df_res[['symbol', 'trade_date', 'period', 'rsi']]
-        df_res = df_res.sort_values(['symbol', 'trade_date', 'period']).drop_duplicates(subset=['symbol', 'trade_date', 'period'], keep='last')
-        tbl = 'nse_rsi_daily' if f == 'daily' else ('nse_rsi_weekly' if f == 'weekly' else 'nse_rsi_monthly')
-        upsert_rsi(engine, df_res, tbl)
-        if progress_cb:
-            progress_cb(total, total, f'Upserted {len(df_res)} rows into {tbl}')
+    _upsert_results(engine, results_by_freq, freqs, total, progress_cb)
+    upsert_rsi_state(engine, new_states)
 
 
 if __name__ == '__main__':
@@ -288,6 +569,7 @@ if __name__ == '__main__':
     p.add_argument('--start')
     p.add_argument('--end')
     p.add_argument('--limit', type=int, default=0)
+    p.add_argument('--incremental', action='store_true', help='update from saved Wilder state (only new BHAV rows)')
     args = p.parse_args()
 
     eng = _ensure_engine()
@@ -295,4 +577,4 @@ if __name__ == '__main__':
     def _print_progress(c, t, m):
         print(f"{c}/{t}: {m}")
 
-    run_rsi(eng, period=args.period, freqs=[x.strip() for x in args.freqs.split(',') if x.strip()], workers=args.workers, progress_cb=_print_progress, start=args.start, end=args.end, limit=args.limit)
+    run_rsi(eng, period=args.period, freqs=[x.strip() for x in args.freqs.split(',') if x.strip()], workers=args.workers, progress_cb=_print_progress, start=args.start, end=args.end, limit=args.limit, incremental=args.incremental)
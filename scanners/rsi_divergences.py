@@ -7,12 +7,17 @@ Currently implements hidden bullish divergence scanner:
     latest.center_close > past.center_close AND latest.center_rsi < past.center_rsi
   then that's a hidden bullish divergence (price higher but RSI lower).
 
+The hidden bearish scanner is the mirror image on bearish fractals (price lower, RSI higher).
+Both share one path; optional SMA filters are resolved for all symbols up front with
+set-based queries rather than per-symbol lookups.
+
 The scanner writes signals into `nse_rsi_divergences` with details of the current and past fractal.
 """
 from datetime import datetime
-from typing import List
+from typing import Dict, List
+import numpy as np
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 try:
     from import_nifty_index import build_engine
@@ -103,332 +108,295 @@ def ensure_divergences_table(engine):
         print(f'ensure_divergences_table failed: {e}')
 
 
-def scan_hidden_bullish_divergences(engine, lookback_fractals: int = 5, progress_cb=None, limit: int = 0, sma_filters: List[int] = None) -> pd.DataFrame:
-    """Scan `nse_fractals` for hidden bullish divergences.
+DIVERGENCE_KINDS = {
+    # kind: (fractal_type, signal_type, price_cmp, rsi_cmp)
+    # price_cmp also sets which side of the SMAs the latest close must be on.
+    'bullish': ('Bullish Fractal', 'Hidden Bullish Divergence', 'gt', 'lt'),
+    'bearish': ('Bearish Fractal', 'Hidden Bearish Divergence', 'lt', 'gt'),
+}
 
-    Returns a DataFrame of signal rows (but also upserts into DB).
-    """
-    # fetch bullish fractals
+ASOF_TABLE = 'tmp_div_asof'
+
+
+def _fetch_fractals(engine, fractal_type: str) -> pd.DataFrame:
     with engine.connect() as conn:
-        q = text("SELECT symbol, fractal_date, center_close, center_rsi, fractal_high, fractal_low FROM nse_fractals WHERE fractal_type = 'Bullish Fractal' ORDER BY symbol, fractal_date DESC")
-        rows = conn.execute(q).fetchall()
+        q = text("SELECT symbol, fractal_date, center_close, center_rsi, fractal_high, fractal_low FROM nse_fractals WHERE fractal_type = :t ORDER BY symbol, fractal_date DESC")
+        rows = conn.execute(q, {"t": fractal_type}).fetchall()
     if not rows:
-        if progress_cb:
-            progress_cb(0, 0, 'No bullish fractals found')
         return pd.DataFrame()
-
     df = pd.DataFrame(rows, columns=[c for c in rows[0]._fields])
     df['fractal_date'] = pd.to_datetime(df['fractal_date'])
+    return df
 
-    syms = sorted(df['symbol'].unique())
-    if limit and limit > 0:
-        syms = syms[:limit]
 
-    total = len(syms)
-    if progress_cb:
-        progress_cb(0, total, f'Scanning {total} symbols for hidden bullish divergences')
+def _compare(a, b, op: str):
+    return a > b if op == 'gt' else a < b
 
-    signals: List[dict] = []
 
-    for idx, sym in enumerate(syms, start=1):
-        sdf = df[df['symbol'] == sym].sort_values('fractal_date', ascending=False).reset_index(drop=True)
-        if sdf.shape[0] < 2:
-            if progress_cb:
-                progress_cb(idx, total, f'Skipping {sym} (not enough bullish fractals)')
-            continue
-        # SMA filters: prefer precomputed SMAs in `moving_averages`. If missing, compute once and upsert using compute_moving_averages.
-        if sma_filters:
-            try:
-                latest_date = pd.to_datetime(sdf.loc[0, 'fractal_date']).date()
-                windows = sorted(set(int(x) for x in sma_filters))
-                sma_cols = [f'sma_{w}' for w in windows]
-
-                def _check_ma_row(ma_row, latest_close):
-                    # ma_row: pandas Series containing sma_x columns
-                    for c in sma_cols:
-                        if c not in ma_row or pd.isna(ma_row.get(c)):
-                            return False
-                        try:
-                            if not (latest_close > float(ma_row.get(c))):
-                                return False
-                        except Exception:
-                            return False
-                    return True
-
-                ok = False
-                latest_close = float(sdf.loc[0, 'center_close'])
-                # 1) try to read last available moving_averages row for symbol <= latest_date
-                try:
-                    with engine.connect() as conn:
-                        q = text(f"SELECT trade_date, {', '.join(sma_cols)} FROM moving_averages WHERE symbol = :s AND trade_date <= :d ORDER BY trade_date DESC LIMIT 1")
-                        ma_df = pd.read_sql(q, con=conn, params={"s": sym, "d": latest_date.strftime('%Y-%m-%d')}, parse_dates=['trade_date'])
-                    if not ma_df.empty:
-                        if _check_ma_row(ma_df.iloc[0], latest_close):
-                            ok = True
-                except Exception:
-                    # moving_averages table may not exist or query failed — fall through to compute
-                    ok = False
-
-                # 2) if not ok, compute SMAs once for the symbol and upsert into moving_averages using the helper
-                if not ok:
-                    import compute_moving_averages as cma
-                    # compute_for_symbol expects a Connection with moving_averages table present; run inside a transaction
-                    with engine.begin() as conn:
-                        # ensure table exists for requested windows
-                        try:
-                            cma.ensure_table(conn, windows)
-                        except Exception:
-                            pass
-                        try:
-                            cma.compute_for_symbol(conn, sym, windows)
-                        except Exception:
-                            # compute_for_symbol may fail if data missing; we'll fallback later
-                            pass
-                    # re-query moving_averages
-                    try:
-                        with engine.connect() as conn:
-                            q2 = text(f"SELECT trade_date, {', '.join(sma_cols)} FROM moving_averages WHERE symbol = :s AND trade_date <= :d ORDER BY trade_date DESC LIMIT 1")
-                            ma_df2 = pd.read_sql(q2, con=conn, params={"s": sym, "d": latest_date.strftime('%Y-%m-%d')}, parse_dates=['trade_date'])
-                        if not ma_df2.empty and _check_ma_row(ma_df2.iloc[0], latest_close):
-                            ok = True
-                    except Exception:
-                        ok = False
-                # 3) fallback: if still not ok, compute from BHAV as before (in-memory)
-                if not ok:
-                    max_window = max(windows)
-                    with engine.connect() as conn:
-                        q = text("SELECT trade_date, close_price FROM nse_equity_bhavcopy_full WHERE symbol = :s AND series = 'EQ' AND trade_date <= :d ORDER BY trade_date DESC LIMIT :n")
-                        rows = conn.execute(q, {"s": sym, "d": latest_date.strftime('%Y-%m-%d'), "n": max_window + 20}).fetchall()
-                    if not rows or len(rows) < 1:
-                        if progress_cb:
-                            progress_cb(idx, total, f'Skipping {sym} (no price history for SMA)')
-                        continue
-                    closes = pd.Series([r[1] for r in rows], dtype='float')
-                    closes = closes.iloc[::-1].reset_index(drop=True)
-                    ok2 = True
-                    for w in windows:
-                        if len(closes) < w:
-                            ok2 = False
-                            break
-                        sma_val = closes.rolling(window=w).mean().iloc[-1]
-                        if not (latest_close > float(sma_val)):
-                            ok2 = False
-                            break
-                    if not ok2:
-                        if progress_cb:
-                            progress_cb(idx, total, f'Skipping {sym} (SMA filters not satisfied)')
-                        continue
-            except Exception:
-                if progress_cb:
-                    progress_cb(idx, total, f'Skipping {sym} (SMA filter error)')
-                continue
-        # latest is index 0, compare with next up to lookback_fractals
-        latest = sdf.loc[0]
-        for j in range(1, min(1 + lookback_fractals, len(sdf))):
-            past = sdf.loc[j]
+def sma_row_mask(latest_close: pd.Series, ma_rows: pd.DataFrame, sma_cols: List[str], op: str) -> pd.Series:
+    """Vectorized SMA check against prefetched `moving_averages` rows.
+
+    `latest_close` and `ma_rows` are indexed by symbol. A symbol passes when
+    every SMA column is present and the close is on the `op` side of it;
+    symbols without a row fail.
+    """
+    ma = ma_rows.reindex(latest_close.index)
+    mask = pd.Series(True, index=latest_close.index)
+    for c in sma_cols:
+        col = pd.to_numeric(ma[c], errors='coerce') if c in ma else pd.Series(float('nan'), index=ma.index)
+        mask &= col.notna() & _compare(latest_close, col, op)
+    return mask
+
+
+def closes_pass(closes: np.ndarray, latest_close: float, windows: List[int], op: str) -> bool:
+    """SMA check computed from raw closes (oldest first) ending at the as-of date."""
+    for w in windows:
+        if len(closes) < w:
+            return False
+        if not _compare(latest_close, float(closes[-w:].mean()), op):
+            return False
+    return True
+
+
+def _load_as_of(conn, as_of: pd.Series):
+    """Stage (symbol, as_of) pairs in a temporary table on this connection."""
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {ASOF_TABLE}"))
+    conn.execute(text(
+        f"CREATE TEMPORARY TABLE {ASOF_TABLE} (symbol VARCHAR(32) NOT NULL PRIMARY KEY, "
+        "as_of DATE NOT NULL, ma_date DATE NULL) ENGINE=InnoDB"
+    ))
+    rows = [{"s": sym, "d": d.date()} for sym, d in as_of.items()]
+    conn.execute(text(f"INSERT INTO {ASOF_TABLE} (symbol, as_of) VALUES (:s, :d)"), rows)
+
+
+def fetch_latest_sma_rows(conn, sma_cols: List[str]) -> pd.DataFrame:
+    """Latest `moving_averages` row at or before each staged symbol's as-of date.
+
+    The as-of dates are resolved with one correlated MAX per symbol (a primary
+    key lookup), then all rows come back in a single join.
+    """
+    conn.execute(text(
+        f"UPDATE {ASOF_TABLE} a SET ma_date = (SELECT MAX(m.trade_date) FROM moving_averages m "
+        "WHERE m.symbol = a.symbol AND m.trade_date <= a.as_of)"
+    ))
+    cols = ', '.join(f'm.{c}' for c in sma_cols)
+    q = text(
+        f"SELECT a.symbol, m.trade_date, {cols} FROM {ASOF_TABLE} a "
+        "JOIN moving_averages m ON m.symbol = a.symbol AND m.trade_date = a.ma_date"
+    )
+    return pd.read_sql(q, con=conn, parse_dates=['trade_date']).set_index('symbol')
+
+
+def fetch_recent_closes(conn, n: int) -> Dict[str, np.ndarray]:
+    """Last `n` EQ closes (oldest first) up to each staged symbol's as-of date."""
+    # Bound the join by calendar days so only the tail of each history is read
+    days = n * 2 + 30
+    q = text(
+        f"SELECT b.symbol, b.trade_date, b.close_price FROM {ASOF_TABLE} a "
+        "JOIN nse_equity_bhavcopy_full b ON b.symbol = a.symbol AND b.series = 'EQ' "
+        "AND b.trade_date <= a.as_of AND b.trade_date > DATE_SUB(a.as_of, INTERVAL :days DAY) "
+        "ORDER BY b.symbol, b.trade_date"
+    )
+    rows = conn.execute(q, {"days": days}).fetchall()
+    if not rows:
+        return {}
+    df = pd.DataFrame(rows, columns=['symbol', 'trade_date', 'close_price'])
+    df['close_price'] = pd.to_numeric(df['close_price'], errors='coerce')
+    return {sym: g['close_price'].to_numpy(dtype=float)[-n:] for sym, g in df.groupby('symbol', sort=False)}
+
+
+def _fill_missing_smas(engine, symbols: List[str], windows: List[int]):
+    """Compute and upsert SMAs once for symbols with no `moving_averages` row."""
+    if not symbols:
+        return
+    try:
+        import compute_moving_averages as cma
+    except ImportError:
+        from analysis import compute_moving_averages as cma
+    with engine.begin() as conn:
+        try:
+            cma.ensure_table(conn, windows)
+        except Exception:
+            pass
+        for sym in symbols:
             try:
-                curr_close = float(latest['center_close']) if pd.notna(latest['center_close']) else None
-                past_close = float(past['center_close']) if pd.notna(past['center_close']) else None
-                curr_rsi = float(latest['center_rsi']) if pd.notna(latest['center_rsi']) else None
-                past_rsi = float(past['center_rsi']) if pd.notna(past['center_rsi']) else None
+                cma.compute_for_symbol(conn, sym, windows)
             except Exception:
-                continue
-            # require numeric values
-            if curr_close is None or past_close is None or curr_rsi is None or past_rsi is None:
-                continue
-            # hidden bullish divergence condition
-            if (curr_close > past_close) and (curr_rsi < past_rsi):
-                signals.append({
-                    'symbol': sym,
-                    'signal_type': 'Hidden Bullish Divergence',
-                    'signal_date': pd.to_datetime(latest['fractal_date']).date(),
-                    'curr_fractal_date': pd.to_datetime(latest['fractal_date']).date(),
-                    'curr_center_close': curr_close,
-                    'curr_fractal_high': float(latest['fractal_high']) if pd.notna(latest['fractal_high']) else None,
-                    'curr_fractal_low': float(latest['fractal_low']) if pd.notna(latest['fractal_low']) else None,
-                    'curr_center_rsi': curr_rsi,
-                    'comp_fractal_date': pd.to_datetime(past['fractal_date']).date(),
-                    'comp_center_close': past_close,
-                    'comp_fractal_high': float(past['fractal_high']) if pd.notna(past['fractal_high']) else None,
-                    'comp_fractal_low': float(past['fractal_low']) if pd.notna(past['fractal_low']) else None,
-                    'comp_center_rsi': past_rsi,
-                    'buy_above_price': float(latest['fractal_high']) if pd.notna(latest['fractal_high']) else None,
-                    'created_at': datetime.utcnow()
-                })
-        if progress_cb:
-            progress_cb(idx, total, f'Processed {sym} ({len(signals)} signals)')
+                # compute_for_symbol may fail if data missing; closes decide below
+                pass
 
-    if not signals:
-        if progress_cb:
-            progress_cb(total, total, 'No hidden bullish divergences found')
-        return pd.DataFrame()
 
-    df_signals = pd.DataFrame(signals)
-    # upsert into DB
-    upsert_divergences(engine, df_signals)
-    if progress_cb:
-        progress_cb(total, total, f'Upserted {len(df_signals)} divergence signals')
-    return df_signals
+def filter_by_sma(engine, latest: pd.DataFrame, sma_filters: List[int], op: str) -> set:
+    """Symbols whose latest fractal close is on the `op` side of every SMA.
 
+    `latest` is indexed by symbol with `fractal_date` and `center_close`.
+    Precomputed SMAs are checked first; symbols that fail or have no row are
+    re-checked against SMAs computed from raw closes. Both inputs are fetched
+    for all symbols at once on a single connection.
+    """
+    windows = sorted(set(int(x) for x in sma_filters))
+    sma_cols = [f'sma_{w}' for w in windows]
+    latest_close = pd.to_numeric(latest['center_close'], errors='coerce')
 
-def scan_hidden_bearish_divergences(engine, lookback_fractals: int = 5, progress_cb=None, limit: int = 0, sma_filters: List[int] = None) -> pd.DataFrame:
-    """Scan `nse_fractals` for hidden bearish divergences.
+    with engine.begin() as conn:
+        _load_as_of(conn, latest['fractal_date'])
+        try:
+            ma_rows = fetch_latest_sma_rows(conn, sma_cols)
+        except Exception:
+            # moving_averages table may not exist or lack the requested windows
+            ma_rows = pd.DataFrame(columns=sma_cols)
+        passed = set(latest_close.index[sma_row_mask(latest_close, ma_rows, sma_cols, op)])
+
+        if passed:
+            conn.execute(
+                text(f"DELETE FROM {ASOF_TABLE} WHERE symbol IN :syms").bindparams(bindparam('syms', expanding=True)),
+                {"syms": sorted(passed)},
+            )
+        closes = fetch_recent_closes(conn, max(windows) + 20) if len(passed) < len(latest) else {}
+        conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {ASOF_TABLE}"))
 
-    Hidden bearish: price lower (center_close < past.center_close) but RSI higher (center_rsi > past.center_rsi).
-    Returns DataFrame of signals and upserts them.
-    """
-    # fetch bullish fractals (we need bearish fractals i.e., Bearish Fractal)
-    with engine.connect() as conn:
-        q = text("SELECT symbol, fractal_date, center_close, center_rsi, fractal_high, fractal_low FROM nse_fractals WHERE fractal_type = 'Bearish Fractal' ORDER BY symbol, fractal_date DESC")
-        rows = conn.execute(q).fetchall()
-    if not rows:
+    missing = [s for s in latest.index if s not in ma_rows.index]
+    try:
+        _fill_missing_smas(engine, missing, windows)
+    except Exception as e:
+        print(f'Could not compute moving averages for {len(missing)} symbols: {e}')
+
+    for sym, series in closes.items():
+        if sym not in passed and pd.notna(latest_close.get(sym)) and closes_pass(series, float(latest_close[sym]), windows, op):
+            passed.add(sym)
+    return passed
+
+
+def divergence_signals(sym: str, sdf: pd.DataFrame, lookback_fractals: int, kind: str) -> List[dict]:
+    """Compare the latest fractal (row 0, newest first) with up to N earlier ones."""
+    _, signal_type, price_op, rsi_op = DIVERGENCE_KINDS[kind]
+    latest = sdf.iloc[0]
+    past = sdf.iloc[1:1 + lookback_fractals]
+
+    curr_close = pd.to_numeric(latest['center_close'], errors='coerce')
+    curr_rsi = pd.to_numeric(latest['center_rsi'], errors='coerce')
+    if pd.isna(curr_close) or pd.isna(curr_rsi):
+        return []
+    past_close = pd.to_numeric(past['center_close'], errors='coerce')
+    past_rsi = pd.to_numeric(past['center_rsi'], errors='coerce')
+    # NaN comparisons are False, so rows missing values drop out
+    hits = past[_compare(curr_close, past_close, price_op) & _compare(curr_rsi, past_rsi, rsi_op)]
+    if hits.empty:
+        return []
+
+    def _f(v):
+        return float(v) if pd.notna(v) else None
+
+    curr_date = pd.to_datetime(latest['fractal_date']).date()
+    base = {
+        'symbol': sym,
+        'signal_type': signal_type,
+        'signal_date': curr_date,
+        'curr_fractal_date': curr_date,
+        'curr_center_close': float(curr_close),
+        'curr_fractal_high': _f(latest['fractal_high']),
+        'curr_fractal_low': _f(latest['fractal_low']),
+        'curr_center_rsi': float(curr_rsi),
+    }
+    if kind == 'bullish':
+        base['buy_above_price'] = _f(latest['fractal_high'])
+    else:
+        base['buy_above_price'] = None
+        base['sell_below_price'] = _f(latest['fractal_low'])
+
+    signals = []
+    for _, p in hits.iterrows():
+        row = dict(base)
+        row.update({
+            'comp_fractal_date': pd.to_datetime(p['fractal_date']).date(),
+            'comp_center_close': float(p['center_close']),
+            'comp_fractal_high': _f(p['fractal_high']),
+            'comp_fractal_low': _f(p['fractal_low']),
+            'comp_center_rsi': float(p['center_rsi']),
+            'created_at': datetime.utcnow(),
+        })
+        signals.append(row)
+    return signals
+
+
+def _scan_hidden_divergences(engine, kind: str, lookback_fractals: int, progress_cb, limit: int, sma_filters: List[int]) -> pd.DataFrame:
+    fractal_type, _, price_op, _ = DIVERGENCE_KINDS[kind]
+    df = _fetch_fractals(engine, fractal_type)
+    if df.empty:
         if progress_cb:
-            progress_cb(0, 0, 'No bearish fractals found')
+            progress_cb(0, 0, f'No {kind} fractals found')
         return pd.DataFrame()
 
-    df = pd.DataFrame(rows, columns=[c for c in rows[0]._fields])
-    df['fractal_date'] = pd.to_datetime(df['fractal_date'])
-
     syms = sorted(df['symbol'].unique())
     if limit and limit > 0:
         syms = syms[:limit]
+        df = df[df['symbol'].isin(syms)]
 
     total = len(syms)
     if progress_cb:
-        progress_cb(0, total, f'Scanning {total} symbols for hidden bearish divergences')
+        progress_cb(0, total, f'Scanning {total} symbols for hidden {kind} divergences')
+
+    groups = {sym: g.reset_index(drop=True) for sym, g in df.sort_values(['symbol', 'fractal_date'], ascending=[True, False]).groupby('symbol', sort=False)}
+
+    # SMA filters: one set-based prefetch for every candidate instead of
+    # per-symbol queries inside the loop.
+    sma_passed = None
+    if sma_filters:
+        candidates = [s for s in syms if len(groups[s]) >= 2]
+        latest = pd.DataFrame([groups[s].iloc[0] for s in candidates], index=candidates)
+        try:
+            sma_passed = filter_by_sma(engine, latest, sma_filters, price_op) if candidates else set()
+        except Exception as e:
+            if progress_cb:
+                progress_cb(0, total, f'SMA filter error: {e}')
+            sma_passed = set()
 
     signals: List[dict] = []
 
     for idx, sym in enumerate(syms, start=1):
-        sdf = df[df['symbol'] == sym].sort_values('fractal_date', ascending=False).reset_index(drop=True)
+        sdf = groups[sym]
         if sdf.shape[0] < 2:
             if progress_cb:
-                progress_cb(idx, total, f'Skipping {sym} (not enough bearish fractals)')
+                progress_cb(idx, total, f'Skipping {sym} (not enough {kind} fractals)')
             continue
-        # SMA filters: prefer precomputed SMAs in `moving_averages`. If missing, compute once and upsert using compute_moving_averages.
-        if sma_filters:
-            try:
-                latest_date = pd.to_datetime(sdf.loc[0, 'fractal_date']).date()
-                windows = sorted(set(int(x) for x in sma_filters))
-                sma_cols = [f'sma_{w}' for w in windows]
-
-                def _check_ma_row_bear(ma_row, latest_close):
-                    for c in sma_cols:
-                        if c not in ma_row or pd.isna(ma_row.get(c)):
-                            return False
-                        try:
-                            if not (latest_close < float(ma_row.get(c))):
-                                return False
-                        except Exception:
-                            return False
-                    return True
-
-                ok = False
-                latest_close = float(sdf.loc[0, 'center_close'])
-                try:
-                    with engine.connect() as conn:
-                        q = text(f"SELECT trade_date, {', '.join(sma_cols)} FROM moving_averages WHERE symbol = :s AND trade_date <= :d ORDER BY trade_date DESC LIMIT 1")
-                        ma_df = pd.read_sql(q, con=conn, params={"s": sym, "d": latest_date.strftime('%Y-%m-%d')}, parse_dates=['trade_date'])
-                    if not ma_df.empty:
-                        if _check_ma_row_bear(ma_df.iloc[0], latest_close):
-                            ok = True
-                except Exception:
-                    ok = False
-
-                if not ok:
-                    import compute_moving_averages as cma
-                    with engine.begin() as conn:
-                        try:
-                            cma.ensure_table(conn, windows)
-                        except Exception:
-                            pass
-                        try:
-                            cma.compute_for_symbol(conn, sym, windows)
-                        except Exception:
-                            pass
-                    try:
-                        with engine.connect() as conn:
-                            q2 = text(f"SELECT trade_date, {', '.join(sma_cols)} FROM moving_averages WHERE symbol = :s AND trade_date <= :d ORDER BY trade_date DESC LIMIT 1")
-                            ma_df2 = pd.read_sql(q2, con=conn, params={"s": sym, "d": latest_date.strftime('%Y-%m-%d')}, parse_dates=['trade_date'])
-                        if not ma_df2.empty and _check_ma_row_bear(ma_df2.iloc[0], latest_close):
-                            ok = True
-                    except Exception:
-                        ok = False
-                if not ok:
-                    max_window = max(windows)
-                    with engine.connect() as conn:
-                        q = text("SELECT trade_date, close_price FROM nse_equity_bhavcopy_full WHERE symbol = :s AND series = 'EQ' AND trade_date <= :d ORDER BY trade_date DESC LIMIT :n")
-                        rows = conn.execute(q, {"s": sym, "d": latest_date.strftime('%Y-%m-%d'), "n": max_window + 20}).fetchall()
-                    if not rows or len(rows) < 1:
-                        if progress_cb:
-                            progress_cb(idx, total, f'Skipping {sym} (no price history for SMA)')
-                        continue
-                    closes = pd.Series([r[1] for r in rows], dtype='float')
-                    closes = closes.iloc[::-1].reset_index(drop=True)
-                    ok2 = True
-                    for w in windows:
-                        if len(closes) < w:
-                            ok2 = False
-                            break
-                        sma_val = closes.rolling(window=w).mean().iloc[-1]
-                        if not (latest_close < float(sma_val)):
-                            ok2 = False
-                            break
-                    if not ok2:
-                        if progress_cb:
-                            progress_cb(idx, total, f'Skipping {sym} (SMA filters not satisfied)')
-                        continue
-            except Exception:
-                if progress_cb:
-                    progress_cb(idx, total, f'Skipping {sym} (SMA filter error)')
-                continue
-        latest = sdf.loc[0]
-        for j in range(1, min(1 + lookback_fractals, len(sdf))):
-            past = sdf.loc[j]
-            try:
-                curr_close = float(latest['center_close']) if pd.notna(latest['center_close']) else None
-                past_close = float(past['center_close']) if pd.notna(past['center_close']) else None
-                curr_rsi = float(latest['center_rsi']) if pd.notna(latest['center_rsi']) else None
-                past_rsi = float(past['center_rsi']) if pd.notna(past['center_rsi']) else None
-            except Exception:
-                continue
-            if curr_close is None or past_close is None or curr_rsi is None or past_rsi is None:
-                continue
-            # hidden bearish: price lower but RSI higher
-            if (curr_close < past_close) and (curr_rsi > past_rsi):
-                signals.append({
-                    'symbol': sym,
-                    'signal_type': 'Hidden Bearish Divergence',
-                    'signal_date': pd.to_datetime(latest['fractal_date']).date(),
-                    'curr_fractal_date': pd.to_datetime(latest['fractal_date']).date(),
-                    'curr_center_close': curr_close,
-                    'curr_fractal_high': float(latest['fractal_high']) if pd.notna(latest['fractal_high']) else None,
-                    'curr_fractal_low': float(latest['fractal_low']) if pd.notna(latest['fractal_low']) else None,
-                    'curr_center_rsi': curr_rsi,
-                    'comp_fractal_date': pd.to_datetime(past['fractal_date']).date(),
-                    'comp_center_close': past_close,
-                    'comp_fractal_high': float(past['fractal_high']) if pd.notna(past['fractal_high']) else None,
-                    'comp_fractal_low': float(past['fractal_low']) if pd.notna(past['fractal_low']) else None,
-                    'comp_center_rsi': past_rsi,
-                    'buy_above_price': None,
-                    'sell_below_price': float(latest['fractal_low']) if pd.notna(latest['fractal_low']) else None,
-                    'created_at': datetime.utcnow()
-                })
+        if sma_passed is not None and sym not in sma_passed:
+            if progress_cb:
+                progress_cb(idx, total, f'Skipping {sym} (SMA filters not satisfied)')
+            continue
+        signals.extend(divergence_signals(sym, sdf, lookback_fractals, kind))
         if progress_cb:
             progress_cb(idx, total, f'Processed {sym} ({len(signals)} signals)')
 
     if not signals:
         if progress_cb:
-            progress_cb(total, total, 'No hidden bearish divergences found')
+            progress_cb(total, total, f'No hidden {kind} divergences found')
         return pd.DataFrame()
 
     df_signals = pd.DataFrame(signals)
+    # upsert into DB
     upsert_divergences(engine, df_signals)
     if progress_cb:
         progress_cb(total, total, f'Upserted {len(df_signals)} divergence signals')
     return df_signals
 
 
+def scan_hidden_bullish_divergences(engine, lookback_fractals: int = 5, progress_cb=None, limit: int = 0, sma_filters: List[int] = None) -> pd.DataFrame:
+    """Scan `nse_fractals` for hidden bullish divergences.
+
+    Returns a DataFrame of signal rows (but also upserts into DB).
+    """
+    return _scan_hidden_divergences(engine, 'bullish', lookback_fractals, progress_cb, limit, sma_filters)
+
+
+def scan_hidden_bearish_divergences(engine, lookback_fractals: int = 5, progress_cb=None, limit: int = 0, sma_filters: List[int] = None) -> pd.DataFrame:
+    """Scan `nse_fractals` for hidden bearish divergences.
+
+    Hidden bearish: price lower (center_close < past.center_close) but RSI higher (center_rsi > past.center_rsi).
+    Returns DataFrame of signals and upserts them.
+    """
+    return _scan_hidden_divergences(engine, 'bearish', lookback_fractals, progress_cb, limit, sma_filters)
+
+
 def upsert_divergences(engine, df: pd.DataFrame):
     if df is None or df.empty:
         print('No divergence signals to upsert')
@@ -657,6 +657,8 @@ class ScannerGUI:
         ttk.Label(f, text="Workers").grid(row=1, column=0, sticky="w")
         self.rsi_workers = tk.IntVar(value=4)
         ttk.Entry(f, textvariable=self.rsi_workers, width=6).grid(row=1, column=1, sticky="w")
+        self.rsi_incremental = tk.BooleanVar(value=False)
+        ttk.Checkbutton(f, text="Incremental (new BHAV days only)", variable=self.rsi_incremental).grid(row=1, column=2, columnspan=3, sticky="w")
 
         ttk.Label(f, text="Start (YYYY-MM-DD)").grid(row=2, column=0, sticky="w")
         self.rsi_start = tk.StringVar(value="2025-01-01")
@@ -2576,6 +2578,7 @@ class ScannerGUI:
                 workers = max(1, int(self.rsi_workers.get()))
                 start = self.rsi_start.get().strip() or None
                 end = self.rsi_end.get().strip() or None
+                incremental = bool(self.rsi_incremental.get())
 
                 eng = None
                 try:
@@ -2626,10 +2629,10 @@ class ScannerGUI:
                     except Exception:
                         pass
 
-                self.append_log(f"Starting RSI compute period={period} freqs={freqs} workers={workers} start={start} end={end}")
+                self.append_log(f"Starting RSI compute period={period} freqs={freqs} workers={workers} start={start} end={end} incremental={incremental}")
                 # reset cancel token
                 self.rsi_cancel_token['cancel'] = False
-                rc.run_rsi(eng, period=period, freqs=freqs, workers=workers, progress_cb=_progress, start=start, end=end, cancel_token=self.rsi_cancel_token)
+                rc.run_rsi(eng, period=period, freqs=freqs, workers=workers, progress_cb=_progress, start=start, end=end, cancel_token=self.rsi_cancel_token, incremental=incremental)
                 self.append_log('RSI compute finished')
                 def _done():
                     try:
@@ -2,19 +2,23 @@
 
 Functions:
 - compute_and_upsert_counts(engine_or_conn, as_of=None, lookback_days=365)
-- backfill_counts(engine_or_conn, lookback_days=365, progress_cb=None, parallel_workers=4)
+- backfill_counts(engine_or_conn, lookback_days=365, progress_cb=None, parallel_workers=4, start=None)
 
 This module reads BHAV table `nse_equity_bhavcopy_full` (series='EQ') and writes into
 `daily_52w_counts` table (dt DATE PRIMARY KEY, count_high INT, count_low INT).
 
-The implementation prefers pandas for clarity and opens fresh connections for per-date writes.
+The single-date path prefers pandas for clarity. The backfill streams the whole
+history once in date order and keeps per-symbol monotonic deques of the closes
+in the lookback window (see sweep_counts), so every row is read once instead of
+once per date in its window.
 """
 from __future__ import annotations
 import datetime
+from collections import deque
+from typing import Iterable, Iterator, Tuple
 import pandas as pd
 from sqlalchemy import text
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
@@ -116,75 +120,150 @@ def compute_and_upsert_counts(engine_or_conn, as_of: datetime.date | None = None
     return result
 
 
-def backfill_counts(engine_or_conn, lookback_days: int = 365, progress_cb=None, parallel_workers: int = 4):
-    """Backfill counts for all available BHAV dates. Uses ThreadPoolExecutor with per-date fresh connections.
+class _Window:
+    """Closes of one symbol inside the lookback window, as monotonic deques.
+
+    maxq holds (date, close) with strictly decreasing closes, minq strictly
+    increasing, so the window max/min is at the front of each.
+    """
+    __slots__ = ('maxq', 'minq')
+
+    def __init__(self):
+        self.maxq = deque()
+        self.minq = deque()
+
+    def push(self, dt, close: float, oldest) -> Tuple[bool, bool]:
+        """Add a close and return (is_new_high, is_new_low) against the window."""
+        maxq, minq = self.maxq, self.minq
+        while maxq and maxq[0][0] < oldest:
+            maxq.popleft()
+        while minq and minq[0][0] < oldest:
+            minq.popleft()
+
+        is_high = not maxq or close >= maxq[0][1]
+        is_low = not minq or close <= minq[0][1]
+
+        while maxq and maxq[-1][1] <= close:
+            maxq.pop()
+        maxq.append((dt, close))
+        while minq and minq[-1][1] >= close:
+            minq.pop()
+        minq.append((dt, close))
+        return is_high, is_low
+
+
+def sweep_counts(rows: Iterable[Tuple], lookback_days: int = 365, start: datetime.date | None = None) -> Iterator[dict]:
+    """Yield {date, count_high, count_low} for every date in one pass.
+
+    rows: (trade_date, symbol, close) ordered by trade_date. Same definition as
+    compute_counts_for_date: a symbol trading on the date counts as a new high
+    (low) when its close is >= max (<= min) of its closes in
+    [date - lookback_days, date]. Dates before start only fill the windows.
+    """
+    span = datetime.timedelta(days=lookback_days)
+    windows = {}
+    current = None
+    ch = cl = 0
+
+    for trade_date, symbol, close in rows:
+        if isinstance(trade_date, datetime.datetime):
+            trade_date = trade_date.date()
+        if trade_date != current:
+            if current is not None and (start is None or current >= start):
+                yield {"date": current, "count_high": ch, "count_low": cl}
+            current = trade_date
+            oldest = trade_date - span
+            ch = cl = 0
+
+        if close is None:
+            continue
+        close = float(close)
+        if close != close:  # NaN
+            continue
+
+        window = windows.get(symbol)
+        if window is None:
+            window = windows[symbol] = _Window()
+        is_high, is_low = window.push(trade_date, close, oldest)
+        ch += is_high
+        cl += is_low
+
+    if current is not None and (start is None or current >= start):
+        yield {"date": current, "count_high": ch, "count_low": cl}
+
+
+def _upsert_counts(engine, results: list):
+    if not results:
+        return
+    upsert_q = text(
+        "INSERT INTO daily_52w_counts (dt, count_high, count_low) VALUES (:d, :ch, :cl) "
+        "ON DUPLICATE KEY UPDATE count_high = VALUES(count_high), count_low = VALUES(count_low)"
+    )
+    params = [{"d": r['date'], "ch": int(r['count_high']), "cl": int(r['count_low'])} for r in results]
+    with engine.connect() as conn:
+        with conn.begin():
+            conn.execute(upsert_q, params)
+
+
+def backfill_counts(engine_or_conn, lookback_days: int = 365, progress_cb=None, parallel_workers: int = 4,
+                    start: datetime.date | None = None, batch_size: int = 250, fetch_size: int = 50000):
+    """Backfill counts for all available BHAV dates (or dates >= start) in one sweep.
+
+    Streams (trade_date, symbol, close) ordered by date through sweep_counts and
+    upserts the per-date counts in batches of batch_size dates.
+    parallel_workers is accepted for compatibility; the sweep is sequential.
     Returns summary dict.
     """
     engine = getattr(engine_or_conn, 'engine', None) or engine_or_conn
-    with engine.connect() as conn:
-        rows = conn.execute(text("SELECT DISTINCT trade_date FROM nse_equity_bhavcopy_full WHERE series='EQ' ORDER BY trade_date ASC")).fetchall()
-    dates = [r[0] for r in rows]
-    total = len(dates)
-    attempted = succeeded = failed = 0
+    read_from = start - datetime.timedelta(days=lookback_days) if start else None
 
-    # ensure table exists
     with engine.connect() as conn:
         _ensure_table(conn)
+        if start:
+            total = conn.execute(text("SELECT COUNT(DISTINCT trade_date) FROM nse_equity_bhavcopy_full WHERE series='EQ' AND trade_date >= :s"), {"s": start}).scalar() or 0
+        else:
+            total = conn.execute(text("SELECT COUNT(DISTINCT trade_date) FROM nse_equity_bhavcopy_full WHERE series='EQ'")).scalar() or 0
+
+    attempted = succeeded = failed = 0
+    pending = []
 
-    def _task(as_of):
+    def _flush():
+        nonlocal succeeded, failed
         try:
-            with engine.connect() as conn:
-                res = compute_counts_for_date(conn, as_of=as_of, lookback_days=lookback_days)
-            # upsert for this date
-            with engine.connect() as conn:
-                params = {"d": res['date'], "ch": int(res['count_high']), "cl": int(res['count_low'])}
-                upsert_q = text(
-                    "INSERT INTO daily_52w_counts (dt, count_high, count_low) VALUES (:d, :ch, :cl) "
-                    "ON DUPLICATE KEY UPDATE count_high = :ch, count_low = :cl"
-                )
-                with conn.begin():
-                    conn.execute(upsert_q, params)
-            return (as_of, True, None)
-        except Exception as e:
-            logger.exception("Backfill task error for %s", as_of)
-            return (as_of, False, e)
-
-    if parallel_workers and parallel_workers > 1:
-        with ThreadPoolExecutor(max_workers=parallel_workers) as ex:
-            futures = {ex.submit(_task, d): d for d in dates}
-            for fut in as_completed(futures):
-                attempted += 1
-                d = futures[fut]
-                try:
-                    as_of, ok, err = fut.result()
-                    if ok:
-                        succeeded += 1
-                    else:
-                        failed += 1
-                except Exception as e:
-                    failed += 1
-                if progress_cb:
-                    try:
-                        progress_cb(attempted, total)
-                    except Exception:
-                        pass
-    else:
-        for d in dates:
-            attempted += 1
-            ok = False
+            _upsert_counts(engine, pending)
+            succeeded += len(pending)
+        except Exception:
+            logger.exception("Backfill upsert failed for %s..%s", pending[0]['date'], pending[-1]['date'])
+            failed += len(pending)
+        pending.clear()
+        if progress_cb:
             try:
-                r = _task(d)
-                ok = r[1]
-                if ok:
-                    succeeded += 1
-                else:
-                    failed += 1
+                progress_cb(attempted, total)
             except Exception:
-                failed += 1
-            if progress_cb:
-                try:
-                    progress_cb(attempted, total)
-                except Exception:
-                    pass
+                pass
+
+    with engine.connect() as conn:
+        q = "SELECT trade_date, symbol, close_price FROM nse_equity_bhavcopy_full WHERE series='EQ'"
+        params = {}
+        if read_from:
+            q += " AND trade_date >= :a"
+            params["a"] = read_from
+        result = conn.execution_options(stream_results=True).execute(text(q + " ORDER BY trade_date"), params)
+
+        def _rows():
+            while True:
+                chunk = result.fetchmany(fetch_size)
+                if not chunk:
+                    return
+                yield from chunk
+
+        for res in sweep_counts(_rows(), lookback_days=lookback_days, start=start):
+            attempted += 1
+            pending.append(res)
+            if len(pending) >= batch_size:
+                _flush()
+
+    if pending:
+        _flush()
 
     return {"attempted": attempted, "succeeded": succeeded, "failed": failed}
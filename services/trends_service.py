@@ -1,7 +1,8 @@
 """Service layer for trend analysis business logic."""
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from sqlalchemy import text
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -261,6 +262,217 @@ def analyze_symbol_trend(symbol: str, trade_date: str, engine=None) -> Optional[
     }
 
 
+# ---------------------------------------------------------------------------
+# Vectorized trend engine
+#
+# Candles follow the SQL definitions above: a weekly candle is the Monday-based
+# WEEK(trade_date, 1) within the calendar YEAR, a monthly candle is the calendar
+# month, and each uses the first open and last close of the whole period.
+# Because neither period crosses a year boundary, every calendar year can be
+# computed independently from one range load.
+# ---------------------------------------------------------------------------
+
+TREND_COLUMNS = [
+    'symbol', 'trade_date', 'daily_trend', 'weekly_trend', 'monthly_trend', 'trend_rating',
+    'daily_open', 'daily_close', 'weekly_open', 'weekly_close', 'monthly_open', 'monthly_close',
+]
+
+# Rating for each (daily, weekly, monthly) UP/DOWN combination, indexed by
+# daily_up + 2 * weekly_up + 4 * monthly_up.
+_RATING_TABLE = np.array([
+    calculate_trend_rating(*("UP" if (code >> bit) & 1 else "DOWN" for bit in range(3)))
+    for code in range(8)
+])
+
+
+def _period_first_last(keys: List[np.ndarray], opens: np.ndarray, closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First open and last close of each run of equal keys, broadcast to every row.
+
+    Rows must be sorted so that each period is one contiguous run. NULL prices
+    are kept as-is (like ORDER BY ... LIMIT 1) rather than skipped.
+    """
+    n = len(opens)
+    starts = np.zeros(n, dtype=bool)
+    starts[0] = True
+    for key in keys:
+        starts[1:] |= key[1:] != key[:-1]
+    run_id = np.cumsum(starts) - 1
+    first = np.flatnonzero(starts)
+    last = np.append(first[1:] - 1, n - 1)
+    return opens[first][run_id], closes[last][run_id]
+
+
+def compute_trends(ohlc: pd.DataFrame) -> pd.DataFrame:
+    """Daily/weekly/monthly candle trends and rating for every (symbol, trade_date).
+
+    Args:
+        ohlc: Columns symbol, trade_date, open_price, close_price (any order).
+
+    Returns:
+        DataFrame with TREND_COLUMNS, sorted by symbol and trade_date.
+    """
+    if ohlc.empty:
+        return pd.DataFrame(columns=TREND_COLUMNS)
+
+    df = ohlc[['symbol', 'trade_date', 'open_price', 'close_price']].copy()
+    df['trade_date'] = pd.to_datetime(df['trade_date'])
+    df = df.sort_values(['symbol', 'trade_date'], kind='mergesort').reset_index(drop=True)
+
+    dates = df['trade_date']
+    symbol = df['symbol'].to_numpy()
+    year = dates.dt.year.to_numpy()
+    month = dates.dt.month.to_numpy()
+    monday = (dates - pd.to_timedelta(dates.dt.weekday, unit='D')).to_numpy()
+    opens = pd.to_numeric(df['open_price'], errors='coerce').to_numpy(dtype=float)
+    closes = pd.to_numeric(df['close_price'], errors='coerce').to_numpy(dtype=float)
+
+    week_open, week_close = _period_first_last([symbol, year, monday], opens, closes)
+    month_open, month_close = _period_first_last([symbol, year, month], opens, closes)
+
+    # close > open is UP, anything else (including NULLs) is DOWN
+    daily_up = closes > opens
+    weekly_up = week_close > week_open
+    monthly_up = month_close > month_open
+    up_down = np.array(["DOWN", "UP"], dtype=object)
+
+    return pd.DataFrame({
+        'symbol': symbol,
+        'trade_date': dates.dt.date.to_numpy(),
+        'daily_trend': up_down[daily_up.astype(int)],
+        'weekly_trend': up_down[weekly_up.astype(int)],
+        'monthly_trend': up_down[monthly_up.astype(int)],
+        'trend_rating': _RATING_TABLE[daily_up + 2 * weekly_up + 4 * monthly_up],
+        'daily_open': opens,
+        'daily_close': closes,
+        'weekly_open': week_open,
+        'weekly_close': week_close,
+        'monthly_open': month_open,
+        'monthly_close': month_close,
+    })
+
+
+def _candle_bounds(start: date, end: date) -> Tuple[date, date]:
+    """Widen [start, end] to whole weeks and months (clamped to the calendar year)."""
+    week_start = max(start - timedelta(days=start.weekday()), date(start.year, 1, 1))
+    week_end = min(end + timedelta(days=6 - end.weekday()), date(end.year, 12, 31))
+    month_start = start.replace(day=1)
+    month_end = (pd.Timestamp(end) + pd.offsets.MonthEnd(0)).date()
+    return min(week_start, month_start), max(week_end, month_end)
+
+
+def _year_chunks(start: date, end: date) -> List[Tuple[date, date]]:
+    return [
+        (max(start, date(y, 1, 1)), min(end, date(y, 12, 31)))
+        for y in range(start.year, end.year + 1)
+    ]
+
+
+def load_ohlc_range(conn, start: date, end: date) -> pd.DataFrame:
+    """All EQ open/close rows between start and end (inclusive) in one query."""
+    sql = text("""
+    SELECT symbol, trade_date, open_price, close_price
+    FROM nse_equity_bhavcopy_full
+    WHERE series = 'EQ' AND trade_date BETWEEN :start_date AND :end_date
+    """)
+    return pd.read_sql(sql, con=conn, params={"start_date": start, "end_date": end}, parse_dates=['trade_date'])
+
+
+def upsert_trends(conn, trends: pd.DataFrame, chunk_size: int = 5000) -> int:
+    """Bulk upsert trend rows into trend_analysis with batched executemany."""
+    if trends.empty:
+        return 0
+    sql = text("""
+    INSERT INTO trend_analysis (symbol, trade_date, daily_trend, weekly_trend, monthly_trend, trend_rating)
+    VALUES (:symbol, :trade_date, :daily_trend, :weekly_trend, :monthly_trend, :trend_rating)
+    ON DUPLICATE KEY UPDATE
+        daily_trend = VALUES(daily_trend),
+        weekly_trend = VALUES(weekly_trend),
+        monthly_trend = VALUES(monthly_trend),
+        trend_rating = VALUES(trend_rating),
+        updated_at = CURRENT_TIMESTAMP
+    """)
+    cols = ['symbol', 'trade_date', 'daily_trend', 'weekly_trend', 'monthly_trend', 'trend_rating']
+    records = trends[cols].astype({'trend_rating': float}).to_dict('records')
+    for i in range(0, len(records), chunk_size):
+        conn.execute(sql, records[i:i + chunk_size])
+    return len(records)
+
+
+def _existing_trend_dates(conn, start: date, end: date) -> set:
+    sql = text("SELECT DISTINCT trade_date FROM trend_analysis WHERE trade_date BETWEEN :start_date AND :end_date")
+    return {pd.Timestamp(r[0]).date() for r in conn.execute(sql, {"start_date": start, "end_date": end}).fetchall()}
+
+
+def compute_trends_for_range(engine, start: date, end: date, skip_existing: bool = False) -> pd.DataFrame:
+    """Load one range (widened to whole candles), compute, and upsert rows in [start, end].
+
+    Returns the computed rows for [start, end] (excluding skipped dates).
+    """
+    load_start, load_end = _candle_bounds(start, end)
+    with engine.connect() as conn:
+        ohlc = load_ohlc_range(conn, load_start, load_end)
+        skip = _existing_trend_dates(conn, start, end) if skip_existing else set()
+
+    trends = compute_trends(ohlc)
+    if not trends.empty:
+        keep = (trends['trade_date'] >= start) & (trends['trade_date'] <= end)
+        if skip:
+            keep &= ~trends['trade_date'].isin(list(skip))
+        trends = trends[keep].reset_index(drop=True)
+
+    with engine.begin() as conn:
+        upsert_trends(conn, trends)
+    return trends
+
+
+def rebuild_trends(engine, start: date, end: date, progress_callback=None, max_workers: int = 1,
+                   skip_existing: bool = False) -> int:
+    """Rebuild trend_analysis for [start, end], one calendar year per chunk.
+
+    Chunks are independent, so with max_workers > 1 they run on a thread pool
+    to overlap the range loads and upserts of different years.
+    """
+    chunks = _year_chunks(start, end)
+    total_processed = 0
+    start_time = time.time()
+
+    def _run(chunk):
+        return len(compute_trends_for_range(engine, chunk[0], chunk[1], skip_existing=skip_existing))
+
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_chunk = {executor.submit(_run, chunk): chunk for chunk in chunks}
+            for future in as_completed(future_to_chunk):
+                chunk_start, chunk_end = future_to_chunk[future]
+                try:
+                    count = future.result()
+                    total_processed += count
+                    if progress_callback:
+                        progress_callback(f"Completed {chunk_start} to {chunk_end} ({count} records)")
+                except Exception as e:
+                    if progress_callback:
+                        progress_callback(f"Error processing {chunk_start} to {chunk_end}: {e}")
+    else:
+        for i, (chunk_start, chunk_end) in enumerate(chunks, 1):
+            if progress_callback:
+                progress_callback(f"Processing {chunk_start} to {chunk_end} ({i}/{len(chunks)})")
+            total_processed += _run((chunk_start, chunk_end))
+
+    elapsed_time = time.time() - start_time
+    if progress_callback:
+        progress_callback(f"Processed {total_processed} records in {elapsed_time:.2f} seconds")
+    return total_processed
+
+
+def _trade_date_bounds(engine) -> Tuple[Optional[date], Optional[date]]:
+    sql = text("SELECT MIN(trade_date), MAX(trade_date) FROM nse_equity_bhavcopy_full WHERE series = 'EQ'")
+    with engine.connect() as conn:
+        row = conn.execute(sql).fetchone()
+    if not row or row[0] is None:
+        return None, None
+    return pd.Timestamp(row[0]).date(), pd.Timestamp(row[1]).date()
+
+
 def scan_current_day_trends(engine=None) -> pd.DataFrame:
     """Scan trends for all symbols on the latest trade date."""
     if engine is None:
@@ -275,59 +487,15 @@ def scan_current_day_trends(engine=None) -> pd.DataFrame:
     if not latest_date:
         return pd.DataFrame()
     
-    symbols = get_all_symbols(engine, latest_date)
-    results = []
-    
-    # Use a single connection for all operations to avoid connection pool issues
-    with engine.connect() as conn:
-        for symbol in symbols:
-            try:
-                trend_data = analyze_symbol_trend_with_conn(symbol, latest_date, conn)
-                if trend_data:
-                    # Save to database using the same connection
-                    save_trend_analysis_with_conn(
-                        conn, symbol, latest_date,
-                        trend_data['daily_trend'],
-                        trend_data['weekly_trend'],
-                        trend_data['monthly_trend'],
-                        trend_data['trend_rating']
-                    )
-                    results.append(trend_data)
-            except Exception as e:
-                print(f"Error analyzing {symbol}: {e}")
-                continue
-    
-    return pd.DataFrame(results)
-
-
-def process_date_batch(engine, trade_date: str, symbols: List[str], progress_callback=None) -> int:
-    """Process a batch of symbols for a specific trade date in parallel."""
-    processed_count = 0
-    
-    # Create a fresh connection for this thread
-    with engine.connect() as conn:
-        for symbol in symbols:
-            try:
-                trend_data = analyze_symbol_trend_with_conn(symbol, trade_date, conn)
-                if trend_data:
-                    save_trend_analysis_with_conn(
-                        conn, symbol, trade_date,
-                        trend_data['daily_trend'],
-                        trend_data['weekly_trend'],
-                        trend_data['monthly_trend'],
-                        trend_data['trend_rating']
-                    )
-                    processed_count += 1
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"Error analyzing {symbol} on {trade_date}: {e}")
-                continue
-    
-    return processed_count
+    # One load of the week and month around the latest date covers every symbol
+    latest = pd.Timestamp(latest_date).date()
+    results = compute_trends_for_range(engine, latest, latest)
+    results['trade_date'] = latest_date
+    return results
 
 
 def scan_all_historical_trends_parallel(engine=None, progress_callback=None, max_workers=4) -> int:
-    """Scan trends for all symbols across all available trade dates using parallel processing."""
+    """Scan trends for all symbols across all available trade dates, several years at a time."""
     if engine is None:
         # Use the working engine from reporting_adv_decl instead of ensure_engine
         import reporting_adv_decl as rad
@@ -336,61 +504,14 @@ def scan_all_historical_trends_parallel(engine=None, progress_callback=None, max
     # Ensure table exists
     create_trend_table(engine)
     
-    trade_dates = get_all_trade_dates(engine)
-    total_processed = 0
-    
-    start_time = time.time()
-    
-    if progress_callback:
-        progress_callback(f"Starting parallel processing with {max_workers} workers for {len(trade_dates)} trade dates...")
-    
-    # Process dates in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all date processing tasks
-        future_to_date = {}
-        
-        for i, trade_date in enumerate(trade_dates):
-            # Get symbols for this date
-            with engine.connect() as conn:
-                symbols_sql = text("SELECT DISTINCT symbol FROM nse_equity_bhavcopy_full WHERE trade_date = :trade_date AND series = 'EQ' ORDER BY symbol")
-                symbols_df = pd.read_sql(symbols_sql, con=conn, params={"trade_date": trade_date})
-                symbols = symbols_df['symbol'].tolist()
-            
-            if symbols:  # Only process if there are symbols for this date
-                # Split symbols into smaller batches for better parallel distribution
-                batch_size = max(50, len(symbols) // max_workers)  # At least 50 symbols per batch
-                symbol_batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
-                
-                for batch_idx, symbol_batch in enumerate(symbol_batches):
-                    future = executor.submit(process_date_batch, engine, trade_date, symbol_batch, progress_callback)
-                    future_to_date[future] = (trade_date, batch_idx + 1, len(symbol_batches), len(symbol_batch))
-        
-        # Collect results as they complete
-        completed_dates = set()
-        for future in as_completed(future_to_date):
-            trade_date, batch_num, total_batches, batch_size = future_to_date[future]
-            try:
-                batch_processed = future.result()
-                total_processed += batch_processed
-                
-                # Update progress
-                if trade_date not in completed_dates and progress_callback:
-                    progress_callback(f"Completed {trade_date} (batch {batch_num}/{total_batches}, {batch_size} symbols, {batch_processed} processed)")
-                
-                # Mark date as completed when all batches are done
-                if batch_num == total_batches:
-                    completed_dates.add(trade_date)
-                    
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"Error processing batch for {trade_date}: {e}")
+    first_date, last_date = _trade_date_bounds(engine)
+    if first_date is None:
+        return 0
     
-    elapsed_time = time.time() - start_time
     if progress_callback:
-        progress_callback(f"Parallel processing completed! Processed {total_processed} records in {elapsed_time:.2f} seconds")
-        progress_callback(f"Average rate: {total_processed / elapsed_time:.2f} records/second")
+        progress_callback(f"Starting rebuild with {max_workers} workers for {first_date} to {last_date}...")
     
-    return total_processed
+    return rebuild_trends(engine, first_date, last_date, progress_callback, max_workers=max_workers)
 
 
 def scan_all_historical_trends(engine=None, progress_callback=None) -> int:
@@ -403,37 +524,11 @@ def scan_all_historical_trends(engine=None, progress_callback=None) -> int:
     # Ensure table exists
     create_trend_table(engine)
     
-    trade_dates = get_all_trade_dates(engine)
-    total_processed = 0
+    first_date, last_date = _trade_date_bounds(engine)
+    if first_date is None:
+        return 0
     
-    # Use a single connection for all operations to avoid connection pool issues
-    with engine.connect() as conn:
-        for i, trade_date in enumerate(trade_dates):
-            if progress_callback:
-                progress_callback(f"Processing {trade_date} ({i+1}/{len(trade_dates)})")
-            
-            # Get symbols for this date using direct SQL to avoid multiple connections
-            symbols_sql = text("SELECT DISTINCT symbol FROM nse_equity_bhavcopy_full WHERE trade_date = :trade_date AND series = 'EQ' ORDER BY symbol")
-            symbols_df = pd.read_sql(symbols_sql, con=conn, params={"trade_date": trade_date})
-            symbols = symbols_df['symbol'].tolist()
-            
-            for symbol in symbols:
-                try:
-                    trend_data = analyze_symbol_trend_with_conn(symbol, trade_date, conn)
-                    if trend_data:
-                        save_trend_analysis_with_conn(
-                            conn, symbol, trade_date,
-                            trend_data['daily_trend'],
-                            trend_data['weekly_trend'],
-                            trend_data['monthly_trend'],
-                            trend_data['trend_rating']
-                        )
-                        total_processed += 1
-                except Exception as e:
-                    print(f"Error analyzing {symbol} on {trade_date}: {e}")
-                    continue
-    
-    return total_processed
+    return rebuild_trends(engine, first_date, last_date, progress_callback)
 
 
 def get_trend_results(trade_date: Optional[str] = None, limit: Optional[int] = None, engine=None) -> pd.DataFrame:
@@ -523,56 +618,11 @@ def scan_historical_trends_for_range(start_date: date, end_date: date, engine=No
     trade_dates = dates_df['trade_date'].tolist()
     print(f"Found {len(trade_dates)} trading dates in range")
     
-    # Use single connection for bulk processing
-    with engine.begin() as conn:
-        total_processed = 0
-        
-        for i, trade_date in enumerate(trade_dates, 1):
-            trade_date_str = trade_date.strftime('%Y-%m-%d') if hasattr(trade_date, 'strftime') else str(trade_date)
-            
-            print(f"Processing date {i}/{len(trade_dates)}: {trade_date_str}")
-            
-            # Check if already processed (duplicate prevention)
-            existing_sql = text("""
-            SELECT COUNT(*) as count 
-            FROM trend_analysis 
-            WHERE trade_date = :trade_date
-            """)
-            
-            existing_result = conn.execute(existing_sql, {'trade_date': trade_date_str}).fetchone()
-            if existing_result and existing_result.count > 0:
-                print(f"  Skipping {trade_date_str} - already processed")
-                continue
-            
-            # Get symbols for this date
-            symbols_sql = text("""
-            SELECT DISTINCT symbol 
-            FROM nse_equity_bhavcopy_full 
-            WHERE trade_date = :trade_date
-            AND series = 'EQ'
-            ORDER BY symbol
-            """)
-            
-            symbols_df = pd.read_sql(symbols_sql, con=conn, params={'trade_date': trade_date_str})
-            symbols = symbols_df['symbol'].tolist()
-            
-            if not symbols:
-                print(f"  No symbols found for {trade_date_str}")
-                continue
-            
-            # Process symbols for this date
-            date_processed = 0
-            for symbol in symbols:
-                try:
-                    trend_result = analyze_symbol_trend_with_conn(symbol, trade_date_str, conn)
-                    if trend_result:
-                        date_processed += 1
-                        total_processed += 1
-                except Exception as e:
-                    print(f"  Error processing {symbol} for {trade_date_str}: {e}")
-                    continue
-            
-            print(f"  Processed {date_processed} symbols for {trade_date_str}")
+    # Ensure table exists
+    create_trend_table(engine)
+    
+    # Dates that already have rows are skipped (duplicate prevention)
+    total_processed = rebuild_trends(engine, start_date, end_date, progress_callback=print, skip_existing=True)
     
     print(f"Historical trend analysis completed. Total records processed: {total_processed}")
     
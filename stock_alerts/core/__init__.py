@@ -3,9 +3,11 @@
 from .enums import AlertType, AlertCondition, AlertStatus, AssetType, NotificationChannel
 from .models import Alert, PriceData, User, AlertHistory, WatchlistItem
 from .evaluators import AlertEvaluator, PriceAlertEvaluator, VolumeAlertEvaluator, TechnicalAlertEvaluator
+from .alert_index import AlertIndex
 
 __all__ = [
     'AlertType', 'AlertCondition', 'AlertStatus', 'AssetType', 'NotificationChannel',
     'Alert', 'PriceData', 'User', 'AlertHistory', 'WatchlistItem',
     'AlertEvaluator', 'PriceAlertEvaluator', 'VolumeAlertEvaluator', 'TechnicalAlertEvaluator',
+    'AlertIndex',
 ]
@@ -0,0 +1,232 @@
+"""In-memory threshold index of active alerts.
+
+Price alerts are kept per symbol in sorted threshold ladders, so a price tick
+only returns the alerts whose condition can hold for that tick instead of
+every alert on the symbol:
+
+- PRICE_ABOVE / PRICE_BELOW: thresholds at or below / at or above the price
+- PRICE_CROSSES_ABOVE / _BELOW: thresholds between the previous and current
+  tick price of the symbol
+- PRICE_BETWEEN: bands whose lower bound is at or below the price
+- PCT_CHANGE_UP / _DOWN: targets at or below the tick's change_pct (the
+  change is measured from prev_close, so this is the same as a price
+  threshold of prev_close * (1 +/- target / 100))
+
+Volume, technical and custom alerts have no price threshold and are
+returned on every tick. Candidates are still run through the normal
+evaluators; the index only narrows which alerts are looked at.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+from .enums import AlertCondition, AlertStatus, AlertType
+from .models import Alert, PriceData
+
+
+class ThresholdLadder:
+    """Alert ids sorted by a numeric threshold."""
+
+    __slots__ = ('keys', 'ids')
+
+    def __init__(self):
+        self.keys: List[float] = []
+        self.ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, key: float, alert_id: str):
+        pos = bisect_right(self.keys, key)
+        self.keys.insert(pos, key)
+        self.ids.insert(pos, alert_id)
+
+    def remove(self, key: float, alert_id: str) -> bool:
+        pos = bisect_left(self.keys, key)
+        end = bisect_right(self.keys, key)
+        for i in range(pos, end):
+            if self.ids[i] == alert_id:
+                del self.keys[i]
+                del self.ids[i]
+                return True
+        return False
+
+    def at_or_below(self, value: float) -> List[str]:
+        """Ids with key <= value."""
+        return self.ids[:bisect_right(self.keys, value)]
+
+    def at_or_above(self, value: float) -> List[str]:
+        """Ids with key >= value."""
+        return self.ids[bisect_left(self.keys, value):]
+
+    def between(self, low: float, high: float, low_open: bool, high_open: bool) -> List[str]:
+        """Ids with key in the range, each end open or closed."""
+        start = bisect_right(self.keys, low) if low_open else bisect_left(self.keys, low)
+        end = bisect_left(self.keys, high) if high_open else bisect_right(self.keys, high)
+        return self.ids[start:end]
+
+
+# Conditions indexed by price threshold (only for AlertType.PRICE alerts)
+LADDER_CONDITIONS = (
+    AlertCondition.PRICE_ABOVE,
+    AlertCondition.PRICE_BELOW,
+    AlertCondition.PRICE_BETWEEN,
+    AlertCondition.PRICE_CROSSES_ABOVE,
+    AlertCondition.PRICE_CROSSES_BELOW,
+    AlertCondition.PCT_CHANGE_UP,
+    AlertCondition.PCT_CHANGE_DOWN,
+)
+
+
+def _band(alert: Alert):
+    target2 = alert.target_value_2 or alert.target_value
+    return min(alert.target_value, target2), max(alert.target_value, target2)
+
+
+class SymbolAlerts:
+    """Threshold ladders and unindexed alerts for one symbol."""
+
+    def __init__(self):
+        self.alerts: Dict[str, Alert] = {}
+        self.ladders: Dict[AlertCondition, ThresholdLadder] = {
+            condition: ThresholdLadder() for condition in LADDER_CONDITIONS
+        }
+        self.unindexed: Dict[str, Alert] = {}
+        # Price of the previous tick, the lower/upper end of a crossing
+        self.last_price: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    @staticmethod
+    def _ladder_key(alert: Alert) -> Optional[float]:
+        if alert.alert_type != AlertType.PRICE or alert.condition not in LADDER_CONDITIONS:
+            return None
+        if alert.condition == AlertCondition.PRICE_BETWEEN:
+            return _band(alert)[0]
+        return alert.target_value
+
+    def add(self, alert: Alert):
+        self.alerts[alert.id] = alert
+        key = self._ladder_key(alert)
+        if key is None:
+            self.unindexed[alert.id] = alert
+        else:
+            self.ladders[alert.condition].add(key, alert.id)
+
+    def remove(self, alert_id: str) -> Optional[Alert]:
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return None
+        key = self._ladder_key(alert)
+        if key is None:
+            self.unindexed.pop(alert_id, None)
+        else:
+            self.ladders[alert.condition].remove(key, alert_id)
+        return alert
+
+    def candidates(self, price_data: PriceData) -> List[Alert]:
+        """Alerts whose condition can hold for this tick; advances last_price."""
+        price = price_data.price
+        last = self.last_price
+        ladders = self.ladders
+        alerts = self.alerts
+
+        ids = ladders[AlertCondition.PRICE_ABOVE].at_or_below(price)
+        ids += ladders[AlertCondition.PRICE_BELOW].at_or_above(price)
+        ids += [
+            alert_id for alert_id in ladders[AlertCondition.PRICE_BETWEEN].at_or_below(price)
+            if _band(alerts[alert_id])[1] >= price
+        ]
+        change_pct = price_data.change_pct
+        if change_pct is not None:
+            ids += ladders[AlertCondition.PCT_CHANGE_UP].at_or_below(change_pct)
+            ids += ladders[AlertCondition.PCT_CHANGE_DOWN].at_or_below(-change_pct)
+
+        result = [alerts[alert_id] for alert_id in ids]
+
+        cross_above = ladders[AlertCondition.PRICE_CROSSES_ABOVE]
+        cross_below = ladders[AlertCondition.PRICE_CROSSES_BELOW]
+        if last is None:
+            # First tick since load: evaluate crossings against each alert's
+            # stored previous_price
+            crossed = cross_above.ids + cross_below.ids
+            result += [alerts[alert_id] for alert_id in crossed]
+        else:
+            # prev < target <= price / prev > target >= price
+            crossed = cross_above.between(last, price, low_open=True, high_open=False)
+            crossed += cross_below.between(price, last, low_open=False, high_open=True)
+            for alert_id in crossed:
+                alert = alerts[alert_id]
+                alert.previous_price = last
+                result.append(alert)
+
+        result.extend(self.unindexed.values())
+        self.last_price = price
+        return result
+
+
+class AlertIndex:
+    """Active alerts by yahoo_symbol, indexed by price threshold."""
+
+    def __init__(self, alerts: Iterable[Alert] = ()):
+        self._symbols: Dict[str, SymbolAlerts] = {}
+        self._symbol_of: Dict[str, str] = {}
+        for alert in alerts:
+            self.add(alert)
+
+    def __len__(self) -> int:
+        return len(self._symbol_of)
+
+    def __contains__(self, alert_id: str) -> bool:
+        return alert_id in self._symbol_of
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def has_symbol(self, yahoo_symbol: str) -> bool:
+        return yahoo_symbol in self._symbols
+
+    def get(self, alert_id: str) -> Optional[Alert]:
+        symbol = self._symbol_of.get(alert_id)
+        return self._symbols[symbol].alerts.get(alert_id) if symbol else None
+
+    def alerts_for(self, yahoo_symbol: str) -> List[Alert]:
+        entry = self._symbols.get(yahoo_symbol)
+        return list(entry.alerts.values()) if entry else []
+
+    def add(self, alert: Alert):
+        """Index an alert (replacing any previous version); non-active alerts are removed."""
+        self.remove(alert.id)
+        if alert.status != AlertStatus.ACTIVE:
+            return
+        entry = self._symbols.get(alert.yahoo_symbol)
+        if entry is None:
+            entry = self._symbols[alert.yahoo_symbol] = SymbolAlerts()
+        entry.add(alert)
+        self._symbol_of[alert.id] = alert.yahoo_symbol
+
+    def remove(self, alert_id: str) -> Optional[Alert]:
+        symbol = self._symbol_of.pop(alert_id, None)
+        if symbol is None:
+            return None
+        entry = self._symbols[symbol]
+        alert = entry.remove(alert_id)
+        if not entry:
+            del self._symbols[symbol]
+        return alert
+
+    def candidates(self, price_data: PriceData) -> List[Alert]:
+        """Alerts on price_data's symbol that the tick may trigger."""
+        entry = self._symbols.get(price_data.yahoo_symbol)
+        if entry is None:
+            return []
+        return entry.candidates(price_data)
+
+    def carry_last_prices(self, other: 'AlertIndex'):
+        """Copy per-symbol previous tick prices from another index (after a reload)."""
+        for symbol, entry in self._symbols.items():
+            previous = other._symbols.get(symbol)
+            if previous is not None:
+                entry.last_price = previous.last_price
@@ -0,0 +1,116 @@
+"""Rolling daily indicator state for live price polling.
+
+IndicatorState is seeded once from a symbol's daily history and then only
+advanced when a bar completes, so each poll just combines the carried state
+with the current (still forming) day's price instead of recomputing the
+indicators from a fresh history download.
+
+Live values treat today's price as the latest daily close:
+- sma_N: mean of the last N-1 completed closes and the current price
+- rsi_14: Wilder's RSI with one provisional step to the current price
+- high_52w / low_52w: extremes of the last 251 completed bars and today's range
+"""
+
+from collections import deque
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+RSI_PERIOD = 14
+SMA_WINDOWS = (20, 50)
+YEAR_BARS = 252
+
+
+class IndicatorState:
+    """Carried SMA/RSI/52-week state for one symbol."""
+
+    __slots__ = (
+        'last_date', 'last_close', '_closes', '_sums', '_changes', '_gain', '_loss',
+        '_highs', '_lows', '_high_52w', '_low_52w',
+    )
+
+    def __init__(self):
+        self.last_date: Optional[date] = None
+        self.last_close: Optional[float] = None
+        # Last max(window) - 1 completed closes and the running sum of the
+        # last window - 1 of them per SMA window
+        self._closes: deque = deque(maxlen=max(SMA_WINDOWS) - 1)
+        self._sums: Dict[int, float] = {w: 0.0 for w in SMA_WINDOWS}
+        # Wilder averages; simple averages until RSI_PERIOD changes are seen
+        self._changes = 0
+        self._gain = 0.0
+        self._loss = 0.0
+        self._highs: deque = deque(maxlen=YEAR_BARS - 1)
+        self._lows: deque = deque(maxlen=YEAR_BARS - 1)
+        self._high_52w: Optional[float] = None
+        self._low_52w: Optional[float] = None
+
+    def commit(self, bar_date: date, high: float, low: float, close: float):
+        """Fold one completed daily bar into the state (older bars are ignored)."""
+        if self.last_date is not None and bar_date <= self.last_date:
+            return
+
+        closes = self._closes
+        for w in SMA_WINDOWS:
+            self._sums[w] += close
+            if len(closes) >= w - 1:
+                self._sums[w] -= closes[-(w - 1)]
+        closes.append(close)
+
+        if self.last_close is not None:
+            change = close - self.last_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            self._changes += 1
+            if self._changes <= RSI_PERIOD:
+                self._gain += gain / RSI_PERIOD
+                self._loss += loss / RSI_PERIOD
+            else:
+                self._gain = (self._gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self._loss = (self._loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+
+        self._highs.append(high)
+        self._lows.append(low)
+        self._high_52w = max(self._highs)
+        self._low_52w = min(self._lows)
+
+        self.last_date = bar_date
+        self.last_close = close
+
+    def commit_many(self, dates: Iterable[date], highs: Iterable[float], lows: Iterable[float],
+                    closes: Iterable[float]):
+        for bar in zip(dates, highs, lows, closes):
+            self.commit(*bar)
+
+    def sma(self, window: int, price: float) -> Optional[float]:
+        if len(self._closes) < window - 1:
+            return None
+        return (self._sums[window] + price) / window
+
+    def rsi(self, price: float) -> Optional[float]:
+        if self._changes < RSI_PERIOD - 1 or self.last_close is None:
+            return None
+        change = price - self.last_close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self._changes < RSI_PERIOD:
+            avg_gain = self._gain + gain / RSI_PERIOD
+            avg_loss = self._loss + loss / RSI_PERIOD
+        else:
+            avg_gain = (self._gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+            avg_loss = (self._loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def live(self, price: float, high: float, low: float) -> Dict[str, Optional[float]]:
+        """Indicator values with today's forming bar at price/high/low."""
+        high_52w = high if self._high_52w is None else max(self._high_52w, high)
+        low_52w = low if self._low_52w is None else min(self._low_52w, low)
+        rsi = self.rsi(price)
+        sma_20 = self.sma(20, price)
+        sma_50 = self.sma(50, price)
+        return {
+            'rsi_14': round(rsi, 2) if rsi is not None else None,
+            'sma_20': round(sma_20, 2) if sma_20 is not None else None,
+            'sma_50': round(sma_50, 2) if sma_50 is not None else None,
+            'high_52w': high_52w,
+            'low_52w': low_52w,
+        }
@@ -73,6 +73,10 @@ class YahooFinanceConfig:
     
     # Rate limiting
     requests_per_minute: int = 100
+    max_concurrent_batches: int = 4
+    
+    # Daily history used to seed RSI/SMA/52-week state for a new symbol
+    indicator_history_period: str = '1y'
     
     # Retry settings
     max_retries: int = 3
@@ -149,6 +153,7 @@ class Config:
         config.yahoo = YahooFinanceConfig(
             market_hours_interval=int(os.getenv('PRICE_INTERVAL_MARKET', '5')),
             off_hours_interval=int(os.getenv('PRICE_INTERVAL_OFF', '60')),
+            max_concurrent_batches=int(os.getenv('PRICE_MAX_CONCURRENT_BATCHES', '4')),
         )
         
         # Notification config
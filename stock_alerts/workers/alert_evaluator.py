@@ -10,6 +10,7 @@ from .base_worker import BaseWorker
 from ..core.enums import AlertStatus, EventType, AssetType
 from ..core.models import Alert, PriceData, AlertHistory
 from ..core.evaluators import CompositeAlertEvaluator
+from ..core.alert_index import AlertIndex
 from ..events.events import Event, PriceUpdateEvent, AlertTriggeredEvent
 from ..events.event_bus import EventBus, get_event_bus
 from ..infrastructure.redis_client import RedisClient, get_redis
@@ -26,7 +27,10 @@ class AlertEvaluatorWorker(BaseWorker):
     Evaluates alerts against price updates.
     
     Listens for PRICE_UPDATE events and checks if any alerts should trigger.
-    Uses Redis cache for symbol->alerts mapping.
+    Active alerts are bulk-loaded at startup into an AlertIndex (sorted price
+    thresholds per symbol), kept current from ALERT_CREATED/UPDATED/DELETED
+    events and fully reloaded every few minutes as a safety net. Each reload
+    also expires alerts past expires_at, whether or not a tick reached them.
     Publishes ALERT_TRIGGERED events when conditions are met.
     """
     
@@ -43,9 +47,9 @@ class AlertEvaluatorWorker(BaseWorker):
         
         self.evaluator = CompositeAlertEvaluator()
         
-        # Cache of alerts by yahoo_symbol
-        self._alerts_cache: Dict[str, List[Alert]] = {}
-        self._cache_ttl = 300  # 5 minutes
+        # Threshold index of active alerts by yahoo_symbol
+        self._index = AlertIndex()
+        self._cache_ttl = 300  # 5 minutes between full reloads
         self._last_cache_refresh = datetime.min
         
         # Price update queue
@@ -60,12 +64,12 @@ class AlertEvaluatorWorker(BaseWorker):
         # Subscribe to price updates
         self.event_bus.subscribe(EventType.PRICE_UPDATE, self._on_price_update)
         
-        # Also listen for alert changes to invalidate cache
+        # Also listen for alert changes to keep the index current
         self.event_bus.subscribe(EventType.ALERT_CREATED, self._on_alert_change)
         self.event_bus.subscribe(EventType.ALERT_UPDATED, self._on_alert_change)
         self.event_bus.subscribe(EventType.ALERT_DELETED, self._on_alert_change)
         
-        # Initial cache load
+        # Warm-load every active alert in one query
         await self._refresh_alerts_cache()
         
         logger.info("Alert evaluator subscribed to price updates")
@@ -75,11 +79,20 @@ class AlertEvaluatorWorker(BaseWorker):
         await self._price_queue.put(event)
     
     async def _on_alert_change(self, event: Event):
-        """Handle alert change events - invalidate cache."""
-        yahoo_symbol = event.payload.get('yahoo_symbol')
-        if yahoo_symbol and yahoo_symbol in self._alerts_cache:
-            del self._alerts_cache[yahoo_symbol]
-            logger.debug(f"Invalidated cache for {yahoo_symbol}")
+        """Handle alert change events - update the index entry."""
+        alert_id = event.payload.get('alert_id')
+        if not alert_id:
+            return
+        
+        if event.event_type == EventType.ALERT_DELETED:
+            self._index.remove(alert_id)
+        else:
+            alert = await self._run_sync(self._load_alert, alert_id)
+            if alert is None:
+                self._index.remove(alert_id)
+            else:
+                self._index.add(alert)
+        logger.debug(f"Re-indexed alert {alert_id}")
     
     async def run(self):
         """Process price updates from queue."""
@@ -93,6 +106,9 @@ class AlertEvaluatorWorker(BaseWorker):
             # Process the price update
             await self._process_price_update(event)
             
+            # A busy queue must not hold off the periodic reload/expiry sweep
+            await self._maybe_refresh_cache()
+            
         except asyncio.TimeoutError:
             # No updates in queue, do maintenance
             await self._maybe_refresh_cache()
@@ -103,9 +119,7 @@ class AlertEvaluatorWorker(BaseWorker):
         if not yahoo_symbol:
             return
         
-        # Get alerts for this symbol
-        alerts = await self._get_alerts_for_symbol(yahoo_symbol)
-        if not alerts:
+        if not self._index.has_symbol(yahoo_symbol):
             return
         
         # Build PriceData from event
@@ -133,8 +147,8 @@ class AlertEvaluatorWorker(BaseWorker):
             logger.error(f"Error building PriceData: {e}")
             return
         
-        # Evaluate each alert
-        for alert in alerts:
+        # Evaluate only the alerts whose threshold this tick reached or crossed
+        for alert in self._index.candidates(price_data):
             self._alerts_evaluated += 1
             
             # Skip if not active or can't trigger
@@ -155,45 +169,45 @@ class AlertEvaluatorWorker(BaseWorker):
             # Update previous price for crossing conditions
             alert.previous_price = price_data.price
     
-    async def _get_alerts_for_symbol(self, yahoo_symbol: str) -> List[Alert]:
-        """Get alerts for a symbol from cache or DB."""
-        # Check cache
-        if yahoo_symbol in self._alerts_cache:
-            return self._alerts_cache[yahoo_symbol]
-        
-        # Load from database
-        alerts = await self._load_alerts_for_symbol(yahoo_symbol)
-        
-        # Cache the result
-        self._alerts_cache[yahoo_symbol] = alerts
+    async def _run_sync(self, func, *args):
+        """Run a blocking database call off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+    
+    def _load_active_alerts(self) -> List[Alert]:
+        """Load all active alerts from database in one query (blocking)."""
+        engine = self.db.get_sync_engine()
         
-        return alerts
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT * FROM price_alerts 
+                WHERE status = 'active'
+            """))
+            
+            alerts = []
+            for row in result:
+                try:
+                    alerts.append(self._row_to_alert(row._mapping))
+                except Exception as e:
+                    logger.error(f"Error parsing alert: {e}")
+            
+            return alerts
     
-    async def _load_alerts_for_symbol(self, yahoo_symbol: str) -> List[Alert]:
-        """Load alerts from database."""
+    def _load_alert(self, alert_id: str) -> Optional[Alert]:
+        """Load one alert from database (blocking); None if missing or unreadable."""
         try:
             engine = self.db.get_sync_engine()
             
             with engine.connect() as conn:
-                result = conn.execute(text("""
-                    SELECT * FROM price_alerts 
-                    WHERE yahoo_symbol = :symbol 
-                    AND status = 'active'
-                """), {'symbol': yahoo_symbol})
-                
-                alerts = []
-                for row in result:
-                    try:
-                        alert = self._row_to_alert(row._mapping)
-                        alerts.append(alert)
-                    except Exception as e:
-                        logger.error(f"Error parsing alert: {e}")
-                
-                return alerts
-                
+                row = conn.execute(text("""
+                    SELECT * FROM price_alerts WHERE id = :id
+                """), {'id': alert_id}).fetchone()
+            
+            return self._row_to_alert(row._mapping) if row is not None else None
+            
         except Exception as e:
-            logger.error(f"Error loading alerts for {yahoo_symbol}: {e}")
-            return []
+            logger.error(f"Error loading alert {alert_id}: {e}")
+            return None
     
     def _row_to_alert(self, row: dict) -> Alert:
         """Convert database row to Alert object."""
@@ -279,11 +293,13 @@ class AlertEvaluatorWorker(BaseWorker):
                     'id': alert.id,
                 })
             
-            # Update local cache
+            # Update local copy; one-shot alerts leave the index
             alert.status = AlertStatus(new_status)
             alert.last_triggered_at = datetime.now()
             alert.trigger_count += 1
             alert.previous_price = price
+            if alert.status != AlertStatus.ACTIVE:
+                self._index.remove(alert.id)
             
         except Exception as e:
             logger.error(f"Error updating alert {alert.id}: {e}")
@@ -322,15 +338,23 @@ class AlertEvaluatorWorker(BaseWorker):
                     UPDATE price_alerts SET status = 'expired' WHERE id = :id
                 """), {'id': alert.id})
             
-            # Invalidate cache
-            if alert.yahoo_symbol in self._alerts_cache:
-                del self._alerts_cache[alert.yahoo_symbol]
+            alert.status = AlertStatus.EXPIRED
+            self._index.remove(alert.id)
             
             logger.info(f"Alert {alert.id} expired")
             
         except Exception as e:
             logger.error(f"Error expiring alert: {e}")
     
+    def _expire_alerts(self, alert_ids: List[str]):
+        """Mark many alerts as expired in one statement batch (blocking)."""
+        engine = self.db.get_sync_engine()
+        
+        with engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE price_alerts SET status = 'expired' WHERE id = :id
+            """), [{'id': alert_id} for alert_id in alert_ids])
+    
     async def _maybe_refresh_cache(self):
         """Refresh cache if needed."""
         elapsed = (datetime.now() - self._last_cache_refresh).total_seconds()
@@ -338,10 +362,32 @@ class AlertEvaluatorWorker(BaseWorker):
             await self._refresh_alerts_cache()
     
     async def _refresh_alerts_cache(self):
-        """Refresh the entire alerts cache."""
-        self._alerts_cache.clear()
+        """Rebuild the alert index from the database in one bulk load."""
         self._last_cache_refresh = datetime.now()
-        logger.debug("Cleared alerts cache")
+        try:
+            alerts = await self._run_sync(self._load_active_alerts)
+        except Exception as e:
+            logger.error(f"Error loading active alerts: {e}")
+            return
+        
+        # Expire alerts whose threshold no tick has reached (candidates()
+        # never returns them, so _process_price_update can't expire them)
+        expired = [alert for alert in alerts if alert.is_expired()]
+        if expired:
+            try:
+                await self._run_sync(self._expire_alerts, [alert.id for alert in expired])
+                logger.info(f"Expired {len(expired)} alerts")
+            except Exception as e:
+                logger.error(f"Error expiring alerts: {e}")
+            for alert in expired:
+                alert.status = AlertStatus.EXPIRED
+            alerts = [alert for alert in alerts if alert.status == AlertStatus.ACTIVE]
+        
+        index = AlertIndex(alerts)
+        # Keep crossing state so a reload doesn't miss or repeat crossings
+        index.carry_last_prices(self._index)
+        self._index = index
+        logger.debug(f"Indexed {len(index)} active alerts for {len(index.symbols)} symbols")
     
     async def on_stop(self):
         """Cleanup on stop."""
@@ -6,12 +6,14 @@ from typing import Dict, List, Optional, Set
 from datetime import datetime, time
 import pytz
 
+import numpy as np
 import yfinance as yf
 import pandas as pd
 
 from .base_worker import BaseWorker
 from ..core.enums import AssetType, EventType
 from ..core.models import PriceData
+from ..core.indicators import IndicatorState
 from ..events.events import PriceUpdateEvent, PriceBatchUpdateEvent
 from ..infrastructure.redis_client import RedisClient, get_redis
 from ..infrastructure.config import Config, get_config
@@ -27,7 +29,9 @@ class PriceMonitorWorker(BaseWorker):
     Fetches real-time prices from Yahoo Finance.
     
     Features:
-    - Batch fetching by asset type for efficiency
+    - Batch fetching by asset type, one yf.download per batch
+    - Concurrent batches bounded by a semaphore
+    - RSI/SMA/52-week state carried across polls (seeded once per symbol)
     - Smart polling (faster during market hours)
     - Caches prices in Redis
     - Publishes PRICE_UPDATE events
@@ -52,6 +56,10 @@ class PriceMonitorWorker(BaseWorker):
         
         # Technical indicator computation
         self._compute_technicals = True
+        self._indicators: Dict[str, IndicatorState] = {}
+        
+        # Batches in flight across all asset types
+        self._batch_semaphore = asyncio.Semaphore(self.config.yahoo.max_concurrent_batches)
     
     @property
     def total_symbols(self) -> int:
@@ -78,6 +86,7 @@ class PriceMonitorWorker(BaseWorker):
     def remove_symbol(self, yahoo_symbol: str, asset_type: AssetType):
         """Remove symbol from monitoring."""
         self._symbols[asset_type].discard(yahoo_symbol)
+        self._indicators.pop(yahoo_symbol, None)
         self.redis.remove_monitored_symbol(yahoo_symbol, asset_type.value)
         logger.debug(f"Removed {yahoo_symbol} from monitoring")
     
@@ -144,10 +153,9 @@ class PriceMonitorWorker(BaseWorker):
         
         logger.debug(f"Fetching {len(symbols)} {asset_type.value} symbols")
         
-        # Batch the symbols
-        for i in range(0, len(symbols), batch_size):
-            batch = symbols[i:i + batch_size]
-            await self._fetch_batch(asset_type, batch)
+        # Batch the symbols; batches run concurrently up to the semaphore limit
+        batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+        await asyncio.gather(*(self._fetch_batch(asset_type, batch) for batch in batches))
     
     def _get_batch_size(self, asset_type: AssetType) -> int:
         """Get batch size for asset type."""
@@ -163,13 +171,14 @@ class PriceMonitorWorker(BaseWorker):
     async def _fetch_batch(self, asset_type: AssetType, symbols: List[str]):
         """Fetch a batch of symbols."""
         try:
-            # Run yfinance in executor (it's synchronous)
-            loop = asyncio.get_event_loop()
-            data = await loop.run_in_executor(
-                None,
-                self._fetch_yfinance_data,
-                symbols
-            )
+            # Run yfinance and indicator updates in executor (synchronous)
+            loop = asyncio.get_running_loop()
+            async with self._batch_semaphore:
+                data = await loop.run_in_executor(
+                    None,
+                    self._fetch_yfinance_data,
+                    symbols
+                )
             
             if data.empty:
                 logger.warning(f"No data returned for {symbols[:3]}...")
@@ -218,42 +227,76 @@ class PriceMonitorWorker(BaseWorker):
             logger.error(f"Batch fetch error for {asset_type.value}: {e}")
     
     def _fetch_yfinance_data(self, symbols: List[str]) -> pd.DataFrame:
-        """Synchronous yfinance data fetch."""
-        try:
-            # Use download for batch
-            tickers = yf.Tickers(' '.join(symbols))
-            
-            # Get current prices
-            data = {}
-            for symbol in symbols:
-                try:
-                    ticker = tickers.tickers.get(symbol)
-                    if ticker:
-                        info = ticker.fast_info
-                        hist = ticker.history(period='2d')
-                        
-                        if not hist.empty:
-                            latest = hist.iloc[-1]
-                            prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else latest['Close']
-                            
-                            data[symbol] = {
-                                'price': float(latest['Close']),
-                                'open': float(latest['Open']),
-                                'high': float(latest['High']),
-                                'low': float(latest['Low']),
-                                'volume': int(latest['Volume']),
-                                'prev_close': float(prev_close),
-                                'high_52w': getattr(info, 'year_high', None),
-                                'low_52w': getattr(info, 'year_low', None),
-                            }
-                except Exception as e:
-                    logger.debug(f"Error fetching {symbol}: {e}")
-            
-            return pd.DataFrame.from_dict(data, orient='index')
-            
-        except Exception as e:
-            logger.error(f"yfinance fetch error: {e}")
-            return pd.DataFrame()
+        """Synchronous yfinance data fetch.
+        
+        Symbols with indicator state only need the last few daily bars; new
+        symbols get a one-off history download that seeds their state.
+        """
+        seeded = [s for s in symbols if s in self._indicators]
+        unseeded = [s for s in symbols if s not in self._indicators]
+        
+        frames = []
+        for batch, period in ((seeded, '5d'), (unseeded, self.config.yahoo.indicator_history_period)):
+            if not batch:
+                continue
+            try:
+                wide = daily_fields(self._download(batch, period), batch)
+                frames.append(self._apply_bars(wide))
+            except Exception as e:
+                logger.error(f"yfinance fetch error: {e}")
+        
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames) if frames else pd.DataFrame()
+    
+    def _download(self, symbols: List[str], period: str) -> pd.DataFrame:
+        """One multi-ticker daily download."""
+        return yf.download(
+            symbols,
+            period=period,
+            interval='1d',
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
+    
+    def _apply_bars(self, wide: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Advance indicator state with completed bars; latest bar plus live indicators per symbol."""
+        latest = latest_bars(wide)
+        if latest.empty:
+            return latest
+        
+        dates = wide['Close'].index
+        highs = wide['High'].to_numpy(dtype=float)
+        lows = wide['Low'].to_numpy(dtype=float)
+        closes = wide['Close'].to_numpy(dtype=float)
+        
+        col_of = {symbol: i for i, symbol in enumerate(wide['Close'].columns)}
+        live = {}
+        for symbol in latest.index:
+            col = col_of[symbol]
+            rows = np.flatnonzero(~np.isnan(closes[:, col]))
+            # Every bar before the latest one is complete
+            completed = rows[:-1]
+            state = self._indicators.get(symbol)
+            if state is not None and len(rows) and state.last_date is not None \
+                    and state.last_date < dates[rows[0]].date():
+                # Polls stopped long enough to leave a gap; reseed next time
+                del self._indicators[symbol]
+                continue
+            if state is None:
+                state = self._indicators[symbol] = IndicatorState()
+            state.commit_many(
+                (d.date() for d in dates[completed]),
+                highs[completed, col], lows[completed, col], closes[completed, col],
+            )
+            if self._compute_technicals:
+                row = latest.loc[symbol]
+                live[symbol] = state.live(row['price'], row['high'], row['low'])
+        
+        if live:
+            latest = latest.join(pd.DataFrame.from_dict(live, orient='index'))
+        return latest
     
     def _extract_price_data(
         self,
@@ -292,8 +335,11 @@ class PriceMonitorWorker(BaseWorker):
             change=round(change, 2),
             change_pct=round(change_pct, 2),
             timestamp=datetime.now(),
-            high_52w=row.get('high_52w'),
-            low_52w=row.get('low_52w'),
+            rsi_14=_optional(row.get('rsi_14')),
+            sma_20=_optional(row.get('sma_20')),
+            sma_50=_optional(row.get('sma_50')),
+            high_52w=_optional(row.get('high_52w')),
+            low_52w=_optional(row.get('low_52w')),
         )
     
     async def on_stop(self):
@@ -301,6 +347,59 @@ class PriceMonitorWorker(BaseWorker):
         logger.info(f"Price monitor stats: {self._iterations} iterations, {self._error_count} errors")
 
 
+def _optional(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def daily_fields(data: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Split a yf.download frame into one dates x symbols frame per OHLCV field."""
+    fields = ('Open', 'High', 'Low', 'Close', 'Volume')
+    if data is None or data.empty:
+        empty = pd.DataFrame(columns=symbols, dtype=float)
+        return {f: empty for f in fields}
+    if isinstance(data.columns, pd.MultiIndex):
+        # group_by='ticker' puts the ticker on level 0
+        return {f: data.xs(f, axis=1, level=1).reindex(columns=symbols).astype(float) for f in fields}
+    # Flat columns: a single ticker
+    return {f: data[[f]].set_axis(symbols[:1], axis=1).astype(float) for f in fields}
+
+
+def latest_bars(wide: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Latest bar and previous close for every symbol at once.
+    
+    Uses each symbol's last row with a close and the close before it (the
+    latest close again if there is only one bar). Symbols without any close
+    are dropped.
+    """
+    close_frame = wide['Close']
+    close = close_frame.to_numpy(dtype=float)
+    if close.size == 0:
+        return pd.DataFrame()
+    n_rows = close.shape[0]
+    cols = np.arange(close.shape[1])
+    
+    valid = ~np.isnan(close)
+    has_bar = valid.any(axis=0)
+    last = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+    
+    earlier = valid.copy()
+    earlier[last, cols] = False
+    has_prev = earlier.any(axis=0)
+    prev = n_rows - 1 - np.argmax(earlier[::-1], axis=0)
+    
+    price = close[last, cols]
+    out = pd.DataFrame({
+        'price': price,
+        'open': wide['Open'].to_numpy(dtype=float)[last, cols],
+        'high': wide['High'].to_numpy(dtype=float)[last, cols],
+        'low': wide['Low'].to_numpy(dtype=float)[last, cols],
+        'volume': np.nan_to_num(wide['Volume'].to_numpy(dtype=float)[last, cols]).astype(np.int64),
+        'prev_close': np.where(has_prev, close[prev, cols], price),
+        'bar_date': close_frame.index[last],
+    }, index=close_frame.columns)
+    return out[has_bar]
+
+
 def get_yahoo_symbol(symbol: str, asset_type: AssetType) -> str:
     """Convert symbol to Yahoo Finance format."""
     if asset_type == AssetType.NSE_EQUITY:
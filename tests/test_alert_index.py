@@ -0,0 +1,134 @@
+import asyncio
+import copy
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from stock_alerts.core.alert_index import AlertIndex
+from stock_alerts.core.enums import AlertCondition, AlertStatus, AlertType, AssetType
+from stock_alerts.core.evaluators import CompositeAlertEvaluator
+from stock_alerts.core.models import Alert, PriceData
+from stock_alerts.events.event_bus import EventBus
+from stock_alerts.workers.alert_evaluator import AlertEvaluatorWorker
+
+PRICE_CONDITIONS = [
+    AlertCondition.PRICE_ABOVE, AlertCondition.PRICE_BELOW, AlertCondition.PRICE_BETWEEN,
+    AlertCondition.PRICE_CROSSES_ABOVE, AlertCondition.PRICE_CROSSES_BELOW,
+    AlertCondition.PCT_CHANGE_UP, AlertCondition.PCT_CHANGE_DOWN,
+]
+
+
+def make_alert(i, symbol, condition, target, target2=None, alert_type=AlertType.PRICE):
+    return Alert(
+        id=f"a{i}", user_id=1, symbol=symbol, yahoo_symbol=symbol, asset_type=AssetType.NSE_EQUITY,
+        alert_type=alert_type, condition=condition, target_value=target, target_value_2=target2,
+    )
+
+
+def make_tick(symbol, price, prev_close=100.0):
+    return PriceData(
+        symbol=symbol, yahoo_symbol=symbol, asset_type=AssetType.NSE_EQUITY, price=price,
+        prev_close=prev_close, open_price=prev_close, high=price, low=price, volume=1000,
+        change=price - prev_close, change_pct=(price - prev_close) / prev_close * 100,
+        timestamp=datetime.now(), rsi_14=55.0,
+    )
+
+
+def random_alerts(n=400, seed=7):
+    rng = random.Random(seed)
+    alerts = []
+    for i in range(n):
+        symbol = rng.choice(["AAA.NS", "BBB.NS"])
+        condition = rng.choice(PRICE_CONDITIONS)
+        if condition in (AlertCondition.PCT_CHANGE_UP, AlertCondition.PCT_CHANGE_DOWN):
+            alerts.append(make_alert(i, symbol, condition, round(rng.uniform(0, 6), 1)))
+        else:
+            alerts.append(make_alert(i, symbol, condition, float(rng.randint(90, 110)), float(rng.randint(90, 110))))
+    alerts.append(make_alert(n, "AAA.NS", AlertCondition.RSI_OVERBOUGHT, 50.0, alert_type=AlertType.TECHNICAL))
+    return alerts
+
+
+def fired(alerts, tick, evaluator):
+    hits = set()
+    for alert in alerts:
+        triggered, _ = evaluator.evaluate(alert, tick)
+        if triggered:
+            hits.add(alert.id)
+        alert.previous_price = tick.price
+    return hits
+
+
+def test_candidates_fire_exactly_like_full_scan():
+    evaluator = CompositeAlertEvaluator()
+    alerts = random_alerts()
+    full = {s: [a for a in alerts if a.yahoo_symbol == s] for s in ("AAA.NS", "BBB.NS")}
+    index = AlertIndex(copy.deepcopy(alerts))
+
+    rng = random.Random(1)
+    prices = {"AAA.NS": 100.0, "BBB.NS": 100.0}
+    for _ in range(300):
+        symbol = rng.choice(list(prices))
+        # Land on integer thresholds now and then to exercise the boundaries
+        step = rng.choice([-2.0, -1.0, 1.0, 2.0, rng.uniform(-3, 3)])
+        prices[symbol] = min(115.0, max(85.0, prices[symbol] + step))
+        tick = make_tick(symbol, prices[symbol])
+
+        candidates = index.candidates(tick)
+        assert fired(candidates, tick, evaluator) == fired(full[symbol], tick, evaluator)
+        assert len(candidates) <= len(full[symbol])
+
+
+def test_index_add_update_remove():
+    index = AlertIndex([make_alert(1, "AAA.NS", AlertCondition.PRICE_ABOVE, 100.0)])
+    assert [a.id for a in index.candidates(make_tick("AAA.NS", 101.0))] == ["a1"]
+
+    # Update moves the threshold; non-active alerts drop out
+    index.add(make_alert(1, "AAA.NS", AlertCondition.PRICE_ABOVE, 105.0))
+    assert index.candidates(make_tick("AAA.NS", 101.0)) == []
+
+    paused = make_alert(1, "AAA.NS", AlertCondition.PRICE_ABOVE, 100.0)
+    paused.status = AlertStatus.PAUSED
+    index.add(paused)
+    assert "a1" not in index and not index.has_symbol("AAA.NS")
+
+    index.add(make_alert(2, "BBB.NS", AlertCondition.PRICE_BELOW, 95.0))
+    assert index.remove("a2").id == "a2"
+    assert len(index) == 0
+
+
+class SQLiteDatabase:
+    """Stand-in for Database with a price_alerts table holding id/status."""
+
+    def __init__(self, alerts):
+        self.engine = create_engine("sqlite://", poolclass=StaticPool,
+                                    connect_args={"check_same_thread": False})
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE price_alerts (id TEXT PRIMARY KEY, status TEXT)"))
+            conn.execute(text("INSERT INTO price_alerts VALUES (:id, 'active')"),
+                         [{"id": alert.id} for alert in alerts])
+
+    def get_sync_engine(self):
+        return self.engine
+
+    def statuses(self):
+        with self.engine.connect() as conn:
+            return dict(conn.execute(text("SELECT id, status FROM price_alerts")).fetchall())
+
+
+def test_refresh_expires_alerts_no_tick_reaches():
+    live = make_alert(1, "AAA.NS", AlertCondition.PRICE_ABOVE, 150.0)
+    stale = make_alert(2, "AAA.NS", AlertCondition.PRICE_ABOVE, 150.0)
+    stale.expires_at = datetime.now() - timedelta(minutes=1)
+    db = SQLiteDatabase([live, stale])
+
+    worker = AlertEvaluatorWorker(redis_client=object(), database=db, event_bus=EventBus())
+    worker._load_active_alerts = lambda: [copy.deepcopy(live), copy.deepcopy(stale)]
+
+    asyncio.run(worker._refresh_alerts_cache())
+
+    # Far below the threshold: no tick would have expired a2 via candidates()
+    assert worker._index.candidates(make_tick("AAA.NS", 100.0)) == []
+    assert db.statuses() == {"a1": "active", "a2": "expired"}
+    assert "a1" in worker._index and "a2" not in worker._index
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bollinger.models import BBHistory, BollingerBands
+from bollinger.services.bb_calculator import BBCalculator, rolling_percentile_rank
+
+
+def make_prices(n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    return pd.DataFrame({
+        "date": pd.bdate_range("2022-01-03", periods=n),
+        "close": close,
+        "symbol": "TEST",
+    })
+
+
+def loop_percentile(series, window):
+    """Row-by-row reference (the previous BBCalculator implementation)."""
+    result = []
+    for i in range(len(series)):
+        if i < window - 1:
+            result.append(50.0)
+        else:
+            window_data = series.iloc[i - window + 1:i + 1]
+            result.append((window_data < series.iloc[i]).sum() / len(window_data) * 100)
+    return result
+
+
+def test_rolling_percentile_matches_loop():
+    result = BBCalculator().calculate(make_prices(), bandwidth_lookback=126)
+    assert result.success
+
+    df = make_prices()
+    middle = df["close"].rolling(20).mean()
+    std = df["close"].rolling(20).std()
+    bandwidth = (4 * std) / middle * 100
+    expected = pd.Series(loop_percentile(bandwidth, 126))[19:].to_numpy()[::-1]
+
+    np.testing.assert_allclose(result.history.bandwidth_percentile, expected)
+
+
+def test_rolling_percentile_min_periods_matches_pandas_apply():
+    values = pd.Series(np.r_[np.full(19, np.nan), np.random.default_rng(1).random(300)])
+    expected = values.rolling(window=126, min_periods=20).apply(
+        lambda x: (x.values < x.values[-1]).sum() / len(x) * 100
+    )
+    actual = rolling_percentile_rank(values.to_numpy(), 126, min_periods=20)
+    np.testing.assert_allclose(actual, expected.to_numpy(), equal_nan=True)
+
+
+def test_history_is_columnar_and_list_like():
+    result = BBCalculator().calculate(make_prices(n=60))
+    history = result.history
+
+    assert isinstance(history, BBHistory)
+    assert len(history) == 41
+    assert result.current == history[0]
+    assert isinstance(history[0], BollingerBands)
+    assert history[0].date == pd.Timestamp(make_prices(n=60)["date"].iloc[-1]).date()
+    assert history[0].date > history[-1].date
+
+    recent = history[:5]
+    assert isinstance(recent, BBHistory) and len(recent) == 5
+    assert [bb.percent_b for bb in recent] == pytest.approx(history.percent_b[:5].tolist())
+    assert list(history)[3] == history[3]
@@ -0,0 +1,73 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from bollinger.services.bb_calculator import BBCalculator
+from bollinger.services.daily_bb_compute import DailyBBCompute
+
+
+TRADE_DATE = date(2023, 6, 30)
+
+
+def make_long_frame(symbols, n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=TRADE_DATE, periods=n)
+    frames = []
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        frames.append(pd.DataFrame({"symbol": symbol, "date": dates, "close": close}))
+    # Shuffled like an unordered range query result
+    return pd.concat(frames).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def make_compute(workers, chunk_size=3):
+    return DailyBBCompute(engine=None, workers=workers, chunk_size=chunk_size)
+
+
+def test_group_history_keeps_sorted_tail_per_symbol():
+    frames = DailyBBCompute._group_history(make_long_frame(["A", "B"]), lookback_days=252)
+
+    assert set(frames) == {"A", "B"}
+    for df in frames.values():
+        assert len(df) == 252
+        assert list(df.columns) == ["date", "close"]
+        assert df["date"].is_monotonic_increasing
+        assert df["date"].iloc[-1] == pd.Timestamp(TRADE_DATE)
+
+
+def test_default_computes_in_process(monkeypatch):
+    # GUI callers don't pass workers and must not start a process pool
+    monkeypatch.setattr("bollinger.services.daily_bb_compute.ProcessPoolExecutor", None)
+    frames = DailyBBCompute._group_history(make_long_frame(["A", "B"]), lookback_days=252)
+
+    compute = DailyBBCompute(engine=None, chunk_size=1)
+    rows, errors = compute.compute_symbols(list(frames.items()), TRADE_DATE)
+
+    assert compute.workers == 1
+    assert errors == [] and [row["symbol"] for row in rows] == ["A", "B"]
+
+
+def test_bulk_paths_match_per_symbol_compute():
+    symbols = [f"SYM{i}" for i in range(7)]
+    frames = DailyBBCompute._group_history(make_long_frame(symbols), lookback_days=252)
+    items = [(s, frames[s]) for s in symbols] + [("SHORT", frames["SYM0"].tail(10)), ("NONE", None)]
+
+    expected = [
+        DailyBBCompute._compute_symbol(BBCalculator(), s, frames[s], TRADE_DATE) for s in symbols
+    ]
+
+    serial, serial_errors = make_compute(workers=1).compute_symbols(items, TRADE_DATE)
+    pooled, pooled_errors = make_compute(workers=2).compute_symbols(items, TRADE_DATE)
+
+    assert serial_errors == [] and pooled_errors == []
+    assert [row["symbol"] for row in serial] == symbols
+    assert serial == expected
+    assert pooled == expected
+
+
+def test_to_db_value_converts_numpy_and_nan():
+    assert DailyBBCompute._to_db_value(np.float64(1.5)) == 1.5
+    assert type(DailyBBCompute._to_db_value(np.bool_(True))) is bool
+    assert DailyBBCompute._to_db_value(float("nan")) is None
+    assert DailyBBCompute._to_db_value("uptrend") == "uptrend"
@@ -0,0 +1,120 @@
+import struct
+
+import pytest
+
+from dhan_trading.market_feed.feed_config import FeedResponseCode
+from dhan_trading.market_feed.feed_service import BinaryParser, QUOTE_DTYPE, FULL_DTYPE
+from dhan_trading.market_feed.decoder_benchmark import (
+    VARIANTS, make_full_packet, make_quote_packet, make_service, make_synthetic_frames, published_output,
+)
+
+
+def make_ticker_packet(security_id, ltp, ltt=1_700_000_000):
+    header = struct.pack('<BHBI', FeedResponseCode.TICKER_PACKET, 16, 1, security_id)
+    return header + struct.pack('<fI', ltp, ltt)
+
+
+def test_parse_quote_at_offset():
+    frame = make_ticker_packet(11, 10.5) + make_quote_packet(49081, 123.25)
+    quote = BinaryParser.parse_quote(memoryview(frame), 16)
+
+    assert quote.security_id == 49081
+    assert quote.exchange_segment == 2
+    assert quote.ltp == pytest.approx(123.25)
+    assert quote.ltq == 75
+    assert quote.volume == 100000
+    assert quote.day_high == pytest.approx(123.25 * 1.01, rel=1e-6)
+    assert BinaryParser.parse_quote(frame, 0) is None
+
+
+def test_parse_full_packet_depth():
+    depth = BinaryParser.parse_full_packet(make_full_packet(500, 200.0))
+
+    assert depth.open_interest == 70000
+    assert depth.bid_qtys == [100, 200, 300, 400, 500]
+    assert depth.ask_qtys == [120, 240, 360, 480, 600]
+    assert depth.bid_prices[1] == pytest.approx(199.95, rel=1e-6)
+    assert depth.ask_prices[4] == pytest.approx(200.2, rel=1e-6)
+
+
+def test_decode_homogeneous_frame_matches_parser():
+    frame = b''.join(make_quote_packet(1000 + i, 50.0 + i) for i in range(10))
+    decoded = BinaryParser.decode_frame(frame)
+
+    records = decoded[FeedResponseCode.QUOTE_PACKET]
+    assert records.dtype == QUOTE_DTYPE
+    assert len(records) == 10
+
+    quotes = BinaryParser.quotes_from_array(records)
+    for i, quote in enumerate(quotes):
+        expected = BinaryParser.parse_quote(frame, i * 50)
+        assert quote.security_id == expected.security_id
+        assert quote.ltp == expected.ltp
+        assert quote.volume == expected.volume
+        assert quote.day_low == expected.day_low
+
+
+def test_decode_mixed_frame():
+    frame = (make_quote_packet(1, 10.0) + make_full_packet(2, 20.0)
+             + make_ticker_packet(3, 30.0) + make_quote_packet(4, 40.0)
+             + b'\x04\x32')  # truncated trailing packet is dropped
+    decoded = BinaryParser.decode_frame(frame)
+
+    assert list(decoded[FeedResponseCode.QUOTE_PACKET]['security_id']) == [1, 4]
+    full = decoded[FeedResponseCode.FULL_PACKET]
+    assert full.dtype == FULL_DTYPE
+    assert list(full['depth'][0]['bid_qty']) == [100, 200, 300, 400, 500]
+    assert decoded[FeedResponseCode.TICKER_PACKET]['ltp'][0] == pytest.approx(30.0)
+
+
+def test_quote_records_only_for_quote_frames():
+    quotes = b''.join(make_quote_packet(1000 + i, 50.0 + i) for i in range(4))
+
+    records = BinaryParser.quote_records(quotes, min_packets=2)
+    assert records.dtype == QUOTE_DTYPE
+    assert list(records['security_id']) == [1000, 1001, 1002, 1003]
+    assert BinaryParser.quote_records(quotes, min_packets=5) is None
+    assert BinaryParser.quote_records(quotes + b'\x04\x32') is None
+    assert BinaryParser.quote_records(quotes[:50] + make_ticker_packet(3, 30.0) + quotes[:34]) is None
+
+
+def test_quote_rows_match_parse_quote():
+    frame = b''.join(make_quote_packet(1000 + i, 10.0 + i * 7.3) for i in range(12))
+    records = BinaryParser.decode_frame(frame)[FeedResponseCode.QUOTE_PACKET]
+
+    rows = BinaryParser.quote_rows_from_array(records, {1003: 55}, {1005: 9.5})
+    for i, row in enumerate(rows):
+        expected = BinaryParser.parse_quote(frame, i * 50)
+        expected.open_interest = 55 if i == 3 else None
+        expected.prev_close = 9.5 if i == 5 else None
+        assert row[:-1] == expected.to_row()[:-1]
+
+
+@pytest.mark.parametrize('encoding', ['msgpack', 'json'])
+@pytest.mark.parametrize('full_ratio', [0.0, 0.3])
+def test_handle_message_variants_publish_same_output(encoding, full_ratio):
+    frames = make_synthetic_frames(30, 12, full_ratio) + make_synthetic_frames(5, 2)
+    outputs = {}
+    for variant in VARIANTS:
+        service = make_service(variant, encoding)
+        service._oi_cache.update({security_id: 7 for security_id in range(30000, 90000, 2)})
+        for frame in frames:
+            service._handle_message(frame)
+        outputs[variant] = published_output(service.redis._client.calls)
+
+    assert outputs['legacy']
+    assert outputs['struct'] == outputs['legacy']
+    assert outputs['batch'] == outputs['legacy']
+
+
+def test_batch_path_builds_quotes_only_for_callbacks():
+    frame = b''.join(make_quote_packet(2000 + i, 50.0 + i) for i in range(10))
+    service = make_service('batch')
+    received = []
+    service.set_callbacks(on_quote=received.append)
+
+    service._handle_message(frame)
+
+    assert [q.security_id for q in received] == list(range(2000, 2010))
+    assert received[3].to_row()[:-1] == BinaryParser.parse_quote(frame, 150).to_row()[:-1]
+    assert service._stats['quotes_received'] == 10
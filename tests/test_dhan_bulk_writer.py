@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from dhan_trading.data_manager.bulk_writer import (
+    DAILY_OHLCV, MINUTE_OHLCV, BulkWriter, frame_rows,
+)
+from dhan_trading.data_manager.historical_downloader import DownloadProgress, HistoricalDownloader
+
+
+class RecordingEngine:
+    """Engine double that records executemany calls."""
+
+    def __init__(self, delay=0.0, fail_symbols=()):
+        self.calls = []
+        self.delay = delay
+        self.fail_symbols = set(fail_symbols)
+        self.lock = threading.Lock()
+
+    def begin(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exec_driver_sql(self, sql, rows):
+        time.sleep(self.delay)
+        if self.fail_symbols.intersection(r[0] for r in rows):
+            raise RuntimeError("deadlock")
+        with self.lock:
+            self.calls.append((sql, list(rows)))
+
+
+def daily_frame(symbol, n=1):
+    return pd.DataFrame({
+        'symbol': symbol, 'trade_date': pd.date_range("2024-01-01", periods=n).date,
+        'open_price': 1.0, 'high_price': 1.0, 'low_price': 1.0, 'close_price': 1.0, 'volume': 1,
+    })
+
+
+def minute_frame(symbol, n, start="2024-01-01 09:15"):
+    close = np.linspace(100, 101, n)
+    return pd.DataFrame({
+        'symbol': symbol, 'security_id': 11536,
+        'trade_datetime': pd.date_range(start, periods=n, freq="1min"),
+        'open_price': close, 'high_price': close + 1, 'low_price': close - 1,
+        'close_price': close, 'volume': np.arange(n, dtype=np.int64),
+    })
+
+
+def test_frame_rows_builds_python_tuples():
+    df = pd.DataFrame({
+        'symbol': ['TCS', 'TCS'], 'trade_date': [date(2024, 1, 1), date(2024, 1, 2)],
+        'open_price': [1.5, np.nan], 'high_price': [2.0, 2.5], 'low_price': [1.0, 1.5],
+        'close_price': [1.8, 2.2], 'volume': pd.array([100, None], dtype="Int64"),
+    })
+    rows = frame_rows(df, DAILY_OHLCV.columns)
+    assert rows == [('TCS', date(2024, 1, 1), 1.5, 2.0, 1.0, 1.8, 100),
+                    ('TCS', date(2024, 1, 2), None, 2.5, 1.5, 2.2, None)]
+    assert type(rows[0][2]) is float and type(rows[0][6]) is int
+
+    minute = frame_rows(minute_frame('TCS', 2), MINUTE_OHLCV.columns)
+    assert type(minute[0][2]) is datetime and minute[1][2] == datetime(2024, 1, 1, 9, 16)
+    assert MINUTE_OHLCV.sql.startswith("INSERT INTO dhan_minute_ohlcv (symbol, security_id, trade_datetime")
+    assert MINUTE_OHLCV.sql.count('%s') == 8 and "volume = VALUES(volume)" in MINUTE_OHLCV.sql
+
+
+def test_bulk_writer_coalesces_and_writes_everything():
+    engine = RecordingEngine(delay=0.01)
+    with BulkWriter(engine, max_queue=4, batch_rows=2000, chunk_size=500) as writer:
+        for i in range(20):
+            writer.submit(MINUTE_OHLCV, minute_frame(f"S{i}", 300))
+        writer.submit(DAILY_OHLCV, daily_frame('TCS'))
+
+    written = [row for sql, rows in engine.calls if 'dhan_minute_ohlcv' in sql for row in rows]
+    assert len(written) == 20 * 300 and len(set((r[0], r[2]) for r in written)) == 6000
+    assert all(len(rows) <= 500 for _, rows in engine.calls)
+    assert writer.rows_written == 6001 and writer.rows_failed == 0
+
+
+def test_bulk_writer_passes_write_errors_to_failed_frames():
+    engine = RecordingEngine(fail_symbols={'BAD'})
+    written, failed = [], []
+    with BulkWriter(engine) as writer:
+        for symbol in ('TCS', 'BAD'):
+            writer.submit(DAILY_OHLCV, daily_frame(symbol, 2),
+                          on_written=lambda s=symbol: written.append(s),
+                          on_failed=lambda e, s=symbol: failed.append((s, str(e))))
+            writer.flush()
+
+    assert written == ['TCS'] and failed == [('BAD', 'deadlock')]
+    assert writer.rows_written == 2 and writer.rows_failed == 2
+
+
+def test_download_reports_symbols_once_rows_are_committed():
+    engine = RecordingEngine(delay=0.02, fail_symbols={'BAD'})
+    downloader = HistoricalDownloader.__new__(HistoricalDownloader)
+    downloader.engine = engine
+    downloader.progress = DownloadProgress()
+    downloader._writer = None
+    downloader._local = threading.local()
+    downloader.lookup_security_ids_from_instruments = lambda: 0
+    downloader.get_stocks_to_download = lambda: pd.DataFrame(
+        {'symbol': ['TCS', 'BAD', 'NEW'], 'security_id': [1, 2, 3]})
+
+    def download_daily_data(symbol, **kwargs):
+        if symbol != 'NEW':
+            downloader._upsert_daily_data(daily_frame(symbol, 3))
+            downloader._upsert_daily_data(daily_frame(symbol, 2))
+            # Nothing is reported while the rows are only queued
+            assert not any(symbol in msg for msg in logged)
+            downloader._writer.flush()
+        return 5
+
+    downloader.download_daily_data = download_daily_data
+    logged = []
+    downloader.download_all_daily(log_cb=logged.append)
+
+    assert "✓ TCS: 5 daily records" in logged and "○ NEW: no new data" in logged
+    assert "✗ BAD: deadlock" in logged
+    assert downloader.progress.completed_stocks == 2 and downloader.progress.failed_stocks == 1
+    assert downloader.progress.total_candles == 5
@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from dhan_trading.data_manager.request_scheduler import (
+    PRIORITY_BACKFILL, PRIORITY_GAP_FILL, AdaptiveRateLimiter, ChunkCheckpoints, chunk_window,
+)
+
+
+def test_aimd_rate_and_cooldown():
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5, increase=0.5, initial_backoff=0.1, max_backoff=0.4)
+    assert limiter.throttled() == 0.1
+    assert limiter.rate == 2.0
+    # In-flight 429s during the cooldown don't cut the rate again
+    limiter.throttled()
+    assert limiter.rate == 2.0
+
+    time.sleep(0.11)
+    assert limiter.throttled() == 0.2 and limiter.rate == 1.0
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.rate == 4.0
+
+
+def test_gap_fill_is_served_before_queued_backfill():
+    limiter = AdaptiveRateLimiter(rate=50.0, burst=1, initial_backoff=0.2)
+    limiter.throttled()
+    order = []
+
+    def request(name, priority):
+        limiter.acquire(priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=request, args=(f"backfill{i}", PRIORITY_BACKFILL)) for i in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gap = threading.Thread(target=request, args=("gap", PRIORITY_GAP_FILL))
+    gap.start()
+    for t in threads + [gap]:
+        t.join(2)
+
+    assert order[0] == "gap" and sorted(order[1:]) == ["backfill0", "backfill1", "backfill2"]
+
+
+def test_chunk_windows_and_checkpoints_resume(tmp_path):
+    start, end = chunk_window(date(2024, 5, 17), 90)
+    assert end - start == timedelta(days=89) and start <= date(2024, 5, 17) <= end
+    assert chunk_window(start, 90) == chunk_window(end, 90)
+    assert chunk_window(start - timedelta(days=1), 90)[1] == start - timedelta(days=1)
+
+    path = tmp_path / "checkpoints.jsonl"
+    checkpoints = ChunkCheckpoints(path)
+    checkpoints.mark("TCS", "1m", start, 33000)
+    checkpoints.mark("TCS", "1m", start - timedelta(days=90), 0)
+    with open(path, "a") as f:
+        f.write('{"symbol": "INFY", "ki')  # torn line from an interrupted run
+
+    resumed = ChunkCheckpoints(path)
+    assert resumed.get("TCS", "1m", start) == 33000
+    assert resumed.get("TCS", "1m", start - timedelta(days=90)) == 0
+    assert resumed.get("INFY", "1m", start) is None
+    resumed.mark("INFY", "1m", start, 10)
+    assert ChunkCheckpoints(path).get("INFY", "1m", start) == 10
+
+
+def test_checkpoints_only_skip_covered_ranges(tmp_path):
+    start, end = chunk_window(date(2021, 3, 10), 90)
+    earliest = start + timedelta(days=40)  # Backfill horizon inside the window
+
+    path = tmp_path / "checkpoints.jsonl"
+    checkpoints = ChunkCheckpoints(path)
+    checkpoints.mark("TCS", "1m", start, 12000, earliest, end)
+    checkpoints.mark("TCS", "1m", start - timedelta(days=90), 0)  # No range recorded
+
+    resumed = ChunkCheckpoints(path)
+    assert resumed.get("TCS", "1m", start, earliest, end) == 12000
+    assert resumed.get("TCS", "1m", start, earliest + timedelta(days=5), end - timedelta(days=5)) == 12000
+    # A larger 'years' reaches days before the clamped request
+    assert resumed.get("TCS", "1m", start, start, end) is None
+    assert resumed.get("TCS", "1m", start - timedelta(days=90), start - timedelta(days=90), start) is None
+    assert resumed.get("TCS", "1m", start - timedelta(days=90)) == 0
+
+
+def test_checkpoints_compact_to_latest_entry_per_chunk(tmp_path):
+    start, end = chunk_window(date(2024, 5, 17), 90)
+    path = tmp_path / "checkpoints.jsonl"
+    checkpoints = ChunkCheckpoints(path)
+    checkpoints.mark("TCS", "1m", start, 100, start + timedelta(days=40), end)
+    checkpoints.mark("TCS", "1m", start, 33000, start, end)  # Re-marked by a longer backfill
+    checkpoints.mark("INFY", "1m", start, 0)
+    with open(path, "a") as f:
+        f.write('{"symbol": "INFY", "ki')  # torn line from an interrupted run
+    assert len(path.read_text().splitlines()) == 4
+
+    resumed = ChunkCheckpoints(path)
+    assert len(path.read_text().splitlines()) == 2
+    assert resumed.get("TCS", "1m", start, start, end) == 33000
+    assert resumed.get("INFY", "1m", start) == 0
+
+    resumed.mark("INFY", "1m", start, 10)
+    resumed.compact()
+    assert len(path.read_text().splitlines()) == 2
+    assert ChunkCheckpoints(path).get("INFY", "1m", start) == 10
+    assert ChunkCheckpoints(path).get("TCS", "1m", start, start, end) == 33000
@@ -0,0 +1,78 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from scanners.golden_death_cross.detector import (
+    attach_previous_signals,
+    find_crossovers,
+    signals_from_frame,
+)
+
+
+def make_frame(n_days=300, n_symbols=15, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=n_days)
+    frames = []
+    for j in range(n_symbols):
+        close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days))))
+        df = pd.DataFrame({
+            'symbol': f"S{j}.NS",
+            'date': dates,
+            'close': close,
+            # Rounded so equal SMAs (touches) occur
+            'sma_50': close.rolling(10).mean().round(1),
+            'sma_200': close.rolling(30).mean().round(1),
+        })
+        df.loc[rng.random(n_days) < 0.03, 'sma_50'] = np.nan
+        frames.append(df.sample(frac=1, random_state=j))
+    return pd.concat(frames, ignore_index=True)
+
+
+def row_loop(df):
+    """The original per-row detect_crossover loop."""
+    found = []
+    for symbol, group in df.groupby('symbol'):
+        group = group.sort_values('date')
+        previous = None
+        for i in range(1, len(group)):
+            a, b = group.iloc[i - 1], group.iloc[i]
+            if pd.isna(a['sma_50']) or pd.isna(a['sma_200']) or pd.isna(b['sma_50']) or pd.isna(b['sma_200']):
+                continue
+            if a['sma_50'] <= a['sma_200'] and b['sma_50'] > b['sma_200']:
+                kind = 'GOLDEN_CROSS'
+            elif a['sma_50'] >= a['sma_200'] and b['sma_50'] < b['sma_200']:
+                kind = 'DEATH_CROSS'
+            else:
+                continue
+            day = b['date'].date()
+            found.append((symbol, day, kind, previous[1] if previous else None, previous[0] if previous else None))
+            previous = (day, kind)
+    return found
+
+
+def test_vectorized_crossovers_match_row_loop():
+    df = make_frame()
+    signals = signals_from_frame(find_crossovers(df, 'sma_50', 'sma_200'))
+    got = [(s.symbol, s.signal_date, s.signal_type.value,
+            s.previous_signal_type.value if s.previous_signal_type else None, s.previous_signal_date)
+           for s in signals]
+    assert got and got == row_loop(df)
+    assert all(s.days_since_previous == (s.signal_date - s.previous_signal_date).days
+               for s in signals if s.previous_signal_type)
+
+
+def test_attach_previous_signals_is_strictly_before_per_symbol():
+    history = pd.DataFrame({
+        'symbol': ['A', 'A', 'B'],
+        'signal_date': [date(2024, 1, 1), date(2024, 2, 1), date(2024, 1, 5)],
+        'signal_type': ['GOLDEN_CROSS', 'DEATH_CROSS', 'GOLDEN_CROSS'],
+    })
+    targets = pd.DataFrame({
+        'symbol': ['A', 'B', 'A', 'C'],
+        'signal_date': [date(2024, 2, 1), date(2024, 3, 1), date(2024, 2, 2), date(2024, 1, 1)],
+    })
+    result = attach_previous_signals(targets, history)
+    assert result['previous_signal_type'].tolist()[:3] == ['GOLDEN_CROSS', 'GOLDEN_CROSS', 'DEATH_CROSS']
+    assert result['days_since_previous'].tolist()[:3] == [31, 56, 1]
+    assert pd.isna(result['previous_signal_type'].iloc[3])
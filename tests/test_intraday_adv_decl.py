@@ -0,0 +1,47 @@
+import random
+from datetime import datetime
+
+from realtime_market_breadth.core.realtime_adv_decl_calculator import IntradayAdvDeclCalculator
+
+
+def brute_force(calc):
+    stocks = list(calc.stocks.values())
+    by_key = lambda key, items: [s.symbol for s in sorted(items, key=key)]
+    return {
+        'counts': {st: sum(1 for s in stocks if s.status == st) for st in ('ADVANCE', 'DECLINE', 'UNCHANGED')},
+        'gainers': by_key(lambda s: (-s.change_pct, s.symbol), [s for s in stocks if s.status == 'ADVANCE'])[:10],
+        'losers': by_key(lambda s: (s.change_pct, s.symbol), [s for s in stocks if s.status == 'DECLINE'])[:10],
+        'active': by_key(lambda s: (-s.volume, s.symbol), stocks)[:10],
+    }
+
+
+def test_incremental_counts_and_leaderboards_match_rescan():
+    rng = random.Random(4)
+    calc = IntradayAdvDeclCalculator()
+    symbols = [f"S{i}.NS" for i in range(300)]
+    prev_close = {s: rng.uniform(50, 500) for s in symbols}
+
+    for _ in range(20):
+        batch = {}
+        for s in rng.sample(symbols, 150):
+            # Some ticks land exactly on prev_close (UNCHANGED)
+            ltp = prev_close[s] if rng.random() < 0.1 else prev_close[s] * rng.uniform(0.95, 1.05)
+            batch[s] = {'ltp': ltp, 'prev_close': prev_close[s], 'timestamp': datetime.now(),
+                        'volume': rng.randint(0, 10**6)}
+        calc.update_batch(batch)
+
+        expected = brute_force(calc)
+        breadth = calc.calculate_breadth()
+        assert (breadth['advances'], breadth['declines'], breadth['unchanged']) == tuple(expected['counts'].values())
+        assert breadth['total_stocks'] == len(calc.stocks)
+        assert [s.symbol for s in calc.get_top_gainers()] == expected['gainers']
+        assert [s.symbol for s in calc.get_top_losers()] == expected['losers']
+        assert [s.symbol for s in calc.get_most_active()] == expected['active']
+
+
+def test_clear_cache_resets_counters():
+    calc = IntradayAdvDeclCalculator()
+    calc.update_stock('A.NS', 101.0, 100.0, datetime.now(), 10)
+    calc.clear_cache()
+    assert calc.calculate_breadth()['advances'] == 0
+    assert calc.get_top_gainers() == [] and calc.get_most_active() == []
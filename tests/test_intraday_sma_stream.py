@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from intraday_breadth.sma_calculator import IntradaySMACalculator
+
+
+def make_session(n_symbols=12, n_bars=600, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-06-03 09:15", periods=n_bars, freq="5min", tz="Asia/Kolkata")
+    data = {}
+    for j in range(n_symbols):
+        close = 100 + rng.normal(0, 0.5, n_bars).cumsum()
+        df = pd.DataFrame({"open": close, "high": close + 0.2, "low": close - 0.2,
+                           "close": close, "volume": 1000}, index=index)
+        # Missing bars for some symbols, and one symbol that starts late
+        drop = rng.random(n_bars) < 0.02 if j % 3 == 0 else np.zeros(n_bars, dtype=bool)
+        if j == 1:
+            drop[:40] = True
+        data[f"S{j}.NS"] = df[~drop]
+    return data
+
+
+def upto(data, ts):
+    return {symbol: df[df.index <= ts] for symbol, df in data.items()}
+
+
+def test_incremental_breadth_matches_full_recompute():
+    full = make_session()
+    index = next(iter(full.values())).index
+    nifty = pd.DataFrame({"close": np.linspace(22000, 22500, len(index))}, index=index)
+
+    calc = IntradaySMACalculator()
+    calc.calculate_index_smas(nifty.iloc[:300])
+    calc.calculate_breadth_fast(upto(full, index[299]))
+
+    rng = np.random.default_rng(8)
+    pos = 299
+    while pos < len(index) - 1:
+        pos = min(len(index) - 1, pos + int(rng.integers(1, 4)))
+        stocks = upto(full, index[pos])
+        # The forming bar comes back revised on the next refresh
+        revised = {s: df.copy() for s, df in stocks.items()}
+        for df in revised.values():
+            df.iloc[-1, df.columns.get_loc("close")] += rng.normal(0, 0.3)
+        calc.update_incremental(nifty.iloc[:pos + 1], stocks)
+        index_smas, breadth = calc.update_incremental(nifty.iloc[:pos + 1], revised)
+
+    expected = IntradaySMACalculator().calculate_breadth_fast(revised)
+    pd.testing.assert_frame_equal(breadth, expected, check_exact=False)
+    pd.testing.assert_frame_equal(index_smas, IntradaySMACalculator().calculate_index_smas(nifty), check_exact=False)
+
+
+def test_new_symbol_falls_back_to_full_calculation():
+    full = make_session(n_symbols=4, n_bars=80)
+    index = next(iter(full.values())).index
+    calc = IntradaySMACalculator()
+    calc.calculate_breadth_fast({s: df for s, df in full.items() if s != "S3.NS"})
+
+    _, breadth = calc.update_incremental(pd.DataFrame(), full)
+    pd.testing.assert_frame_equal(breadth, IntradaySMACalculator().calculate_breadth_fast(full))
+    assert breadth.index[-1] == index[-1]
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from ranking.parallel import JobType, LocalPriceCache, RankingJob
+from ranking.parallel.dispatcher import ParallelRankingsDispatcher
+
+
+def make_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'quotes.db'}")
+    dates = pd.bdate_range('2025-01-01', periods=30).date
+    rows = [
+        {'symbol': sym, 'date': d, 'close': 100.0 + i + k}
+        for k, sym in enumerate(['AAA', 'BBB', 'CCC'])
+        for i, d in enumerate(dates)
+    ]
+    pd.DataFrame(rows).to_sql('yfinance_daily_quotes', engine, index=False)
+    return engine
+
+
+def test_price_cache_builds_once_then_maps(tmp_path):
+    engine = make_engine(tmp_path)
+    start = date(2025, 1, 1)
+
+    first = LocalPriceCache(engine, cache_dir=str(tmp_path / 'cache'))
+    panel, info = first.get_panel(start)
+    assert not info['cache_hit']
+    assert info['db_rows_loaded'] == 90
+    assert panel.symbols == ['AAA', 'BBB', 'CCC']
+
+    # A second worker process on the same host reads the files without the DB
+    second = LocalPriceCache(engine, cache_dir=str(tmp_path / 'cache'))
+    mapped, info = second.get_panel(start)
+    assert info == {'cache_hit': True, 'db_rows_loaded': 0}
+    assert isinstance(mapped.close, np.memmap)
+    np.testing.assert_array_equal(mapped.close, panel.close)
+
+
+def test_price_cache_build_prunes_old_versions(tmp_path):
+    engine = make_engine(tmp_path)
+    cache = LocalPriceCache(engine, cache_dir=str(tmp_path / 'cache'))
+
+    cache.get_panel(date(2025, 1, 1), version='v1')
+    cache.get_panel(date(2025, 1, 15), version='v1')
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+    # A new data version drops both v1 entries once its entry is built
+    cache.get_panel(date(2025, 1, 1), version='v2')
+    cache.get_panel(date(2025, 1, 15), version='v2')
+    entries = sorted(p.name for p in (tmp_path / 'cache').iterdir())
+    assert entries == sorted([cache.cache_key(date(2025, 1, 1), 'v2'),
+                              cache.cache_key(date(2025, 1, 15), 'v2')])
+
+
+def test_range_job_round_trip():
+    job = RankingJob(
+        job_type=JobType.BATCH_DATES,
+        calculation_date=date(2025, 3, 3),
+        end_date=date(2025, 3, 28),
+        history_start=date(2024, 1, 28),
+        data_version='2025-03-28:1000',
+    )
+    parsed = RankingJob.from_dict(job.to_dict())
+    assert parsed.is_range
+    assert (parsed.end_date, parsed.history_start, parsed.data_version) == (
+        job.end_date, job.history_start, job.data_version)
+
+
+def test_shard_date_ranges_splits_on_gaps(monkeypatch):
+    trading = list(pd.bdate_range('2025-03-03', periods=10).date)
+    dispatcher = object.__new__(ParallelRankingsDispatcher)
+    monkeypatch.setattr(dispatcher, 'get_trading_dates', lambda start, end: trading, raising=False)
+
+    # trading[4] was already calculated, so no range may span it
+    todo = trading[:4] + trading[5:]
+    ranges = dispatcher.shard_date_ranges(todo, dates_per_job=3)
+
+    assert ranges == [
+        (trading[0], trading[2]),
+        (trading[3], trading[3]),
+        (trading[5], trading[7]),
+        (trading[8], trading[9]),
+    ]
@@ -0,0 +1,106 @@
+import numpy as np
+
+from dhan_trading.visualizers.price_ladder import PriceLadder
+
+
+def reference_profile(prices, volumes, tick_size):
+    """Dict-based POC / 70% value area, as VolumeProfileData used to compute it."""
+    volume_at_price = {}
+    for price, volume in zip(prices, volumes):
+        bucket = round(price / tick_size) * tick_size
+        volume_at_price[bucket] = volume_at_price.get(bucket, 0) + volume
+
+    levels = sorted(volume_at_price)
+    poc = min(p for p in levels if volume_at_price[p] == max(volume_at_price.values()))
+    target = sum(volumes) * 0.7
+    low = high = levels.index(poc)
+    va = volume_at_price[poc]
+    while va < target and (low > 0 or high < len(levels) - 1):
+        low_vol = volume_at_price[levels[low - 1]] if low > 0 else 0
+        high_vol = volume_at_price[levels[high + 1]] if high < len(levels) - 1 else 0
+        if low_vol >= high_vol and low > 0:
+            low -= 1
+            va += low_vol
+        else:
+            high += 1
+            va += high_vol
+    return volume_at_price, poc, levels[low], levels[high]
+
+
+def random_session(n=5000, seed=7):
+    rng = np.random.default_rng(seed)
+    prices = 24500 + np.cumsum(rng.normal(0, 3, n)).round(1)
+    volumes = rng.integers(1, 500, n)
+    # Sparse gaps between levels
+    prices[::97] += 300
+    return prices, volumes
+
+
+def test_batch_matches_reference():
+    prices, volumes = random_session()
+    ladder = PriceLadder(tick_size=10.0)
+    ladder.add_many(prices, volumes, np.ones(len(prices)))
+
+    volume_at_price, poc, va_low, va_high = reference_profile(prices.tolist(), volumes.tolist(), 10.0)
+    assert ladder.to_dict('total') == volume_at_price
+    assert ladder.poc_price == poc
+    assert (ladder.value_area_low, ladder.value_area_high) == (va_low, va_high)
+
+
+def test_incremental_matches_batch():
+    prices, volumes = random_session(seed=3)
+    incremental = PriceLadder(tick_size=10.0)
+    batch = PriceLadder(tick_size=10.0)
+    for price, volume in zip(prices.tolist(), volumes.tolist()):
+        incremental.add(price, volume, 1)
+        # add_many recomputes POC from scratch and walks the area on read
+        batch.add_many([price], [volume], [1])
+
+        assert incremental.poc_price == batch.poc_price
+        assert incremental.value_area_low == batch.value_area_low
+        assert incremental.value_area_high == batch.value_area_high
+
+    assert incremental.to_dict('total') == batch.to_dict('total')
+
+    volume_at_price, poc, va_low, va_high = reference_profile(prices.tolist(), volumes.tolist(), 10.0)
+    assert incremental.poc_price == poc
+    assert (incremental.value_area_low, incremental.value_area_high) == (va_low, va_high)
+
+
+def test_value_area_walked_only_when_read(monkeypatch):
+    prices, volumes = random_session(seed=5, n=500)
+    ladder = PriceLadder(tick_size=10.0)
+    walks = []
+    refresh = PriceLadder._refresh_value_area
+    monkeypatch.setattr(PriceLadder, '_refresh_value_area',
+                        lambda self: (walks.append(self._va_stale), refresh(self)))
+
+    for price, volume in zip(prices.tolist(), volumes.tolist()):
+        ladder.add(price, volume, 1)
+    assert walks == []
+
+    ladder.value_area_low, ladder.value_area_high, ladder.value_area_low
+    assert walks == [True, False, False]
+
+
+def test_incremental_tracks_poc_and_value_area():
+    prices, volumes = random_session(seed=11)
+    sides = np.where(np.arange(len(prices)) % 3 == 0, -1, 1)
+    ladder = PriceLadder(tick_size=5.0)
+    for price, volume, side in zip(prices.tolist(), volumes.tolist(), sides.tolist()):
+        ladder.add(price, volume, side)
+
+        totals = ladder.to_dict('total')
+        assert ladder.poc_volume == max(totals.values())
+        in_area = sum(v for p, v in totals.items()
+                      if ladder.value_area_low <= p <= ladder.value_area_high)
+        assert in_area >= 0.7 * ladder.volume
+        assert ladder.value_area_low <= ladder.poc_price <= ladder.value_area_high
+
+    assert ladder.volume == int(volumes.sum())
+    assert sum(ladder.to_dict('buy').values()) == int(volumes[sides >= 0].sum())
+    assert sum(ladder.to_dict('sell').values()) == int(volumes[sides < 0].sum())
+
+    prices_desc, totals, _, _ = ladder.levels_descending()
+    assert list(prices_desc) == sorted(ladder.to_dict('total'), reverse=True)
+    assert totals.sum() == ladder.volume
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_alerts.core.indicators import IndicatorState
+from stock_alerts.workers.price_monitor import daily_fields, latest_bars
+
+
+def make_download(symbols, n=6, seed=2):
+    """Frame shaped like yf.download(..., group_by='ticker')."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-05-01", periods=n)
+    frames = {}
+    for sym in symbols:
+        close = 100 + rng.normal(0, 1, n).cumsum()
+        frames[sym] = pd.DataFrame({
+            "Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close,
+            "Volume": rng.integers(1000, 5000, n).astype(float),
+        }, index=dates)
+    return pd.concat(frames, axis=1)
+
+
+def test_latest_bars_vectorized_extraction():
+    data = make_download(["AAA.NS", "BBB.NS", "CCC.NS"])
+    data.loc[data.index[-1], ("BBB.NS", slice(None))] = np.nan  # BBB has no bar today
+    data.loc[:, ("CCC.NS", slice(None))] = np.nan               # CCC returned nothing
+
+    wide = daily_fields(data, ["AAA.NS", "BBB.NS", "CCC.NS", "DDD.NS"])
+    latest = latest_bars(wide)
+
+    assert list(latest.index) == ["AAA.NS", "BBB.NS"]
+    for sym, row_pos in (("AAA.NS", -1), ("BBB.NS", -2)):
+        bars = data[sym]
+        assert latest.loc[sym, "price"] == bars["Close"].iloc[row_pos]
+        assert latest.loc[sym, "prev_close"] == bars["Close"].iloc[row_pos - 1]
+        assert latest.loc[sym, "volume"] == int(bars["Volume"].iloc[row_pos])
+        assert latest.loc[sym, "bar_date"] == bars.index[row_pos]
+
+
+def reference_indicators(closes, highs, lows):
+    s = pd.Series(closes)
+    delta = s.diff().dropna()
+    gain, loss = delta.clip(lower=0), (-delta).clip(lower=0)
+    avg_gain, avg_loss = gain.iloc[:14].mean(), loss.iloc[:14].mean()
+    for g, l in zip(gain.iloc[14:], loss.iloc[14:]):
+        avg_gain = (avg_gain * 13 + g) / 14
+        avg_loss = (avg_loss * 13 + l) / 14
+    return {
+        "rsi_14": round(100 - 100 / (1 + avg_gain / avg_loss), 2),
+        "sma_20": round(s.iloc[-20:].mean(), 2),
+        "sma_50": round(s.iloc[-50:].mean(), 2),
+        "high_52w": max(highs[-252:]),
+        "low_52w": min(lows[-252:]),
+    }
+
+
+def test_indicator_state_matches_full_recompute():
+    rng = np.random.default_rng(9)
+    n = 300
+    closes = list(100 + rng.normal(0, 1.5, n).cumsum())
+    highs = [c + rng.uniform(0, 2) for c in closes]
+    lows = [c - rng.uniform(0, 2) for c in closes]
+    dates = [d.date() for d in pd.bdate_range("2023-01-02", periods=n)]
+
+    state = IndicatorState()
+    # Seed with history, then advance one completed bar per poll (with repeats)
+    state.commit_many(dates[:250], highs[:250], lows[:250], closes[:250])
+    for i in range(250, n - 1):
+        state.commit_many(dates[i - 3:i + 1], highs[i - 3:i + 1], lows[i - 3:i + 1], closes[i - 3:i + 1])
+
+    live = state.live(closes[-1], highs[-1], lows[-1])
+    expected = reference_indicators(closes, highs, lows)
+    assert live == pytest.approx(expected, abs=0.011)
+
+
+def test_indicator_state_needs_enough_history():
+    state = IndicatorState()
+    state.commit_many([pd.Timestamp("2024-01-01").date()], [11.0], [9.0], [10.0])
+    live = state.live(10.5, 10.6, 10.4)
+    assert live["rsi_14"] is None and live["sma_20"] is None
+    assert live["high_52w"] == 11.0 and live["low_52w"] == 9.0
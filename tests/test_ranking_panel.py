@@ -0,0 +1,67 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking.services import (
+    MomentumScoreService,
+    PricePanel,
+    RSRatingService,
+    TechnicalScoreService,
+    TrendTemplateService,
+)
+
+
+def make_price_data(num_symbols=12, periods=400):
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range(end='2025-10-28', periods=periods)
+    data = {}
+    for i in range(num_symbols):
+        # Stagger listing dates and drop a few rows to exercise ragged history
+        start = i * 15
+        drift = rng.normal(0.0005 * (i - 6), 0.01, periods - start)
+        close = 100 * np.exp(np.cumsum(drift))
+        df = pd.DataFrame({
+            'date': dates[start:].date,
+            'close': close,
+            'high': close * 1.01,
+            'low': close * 0.99,
+        })
+        if i % 3 == 0:
+            df = df.drop(df.index[50:55]).reset_index(drop=True)
+        data[f'SYM{i:02d}'] = df
+    return data
+
+
+@pytest.mark.parametrize('calc_date', [date(2025, 10, 28), date(2025, 6, 2)])
+@pytest.mark.parametrize('service_cls, fields', [
+    (RSRatingService, ['return_12m', 'rs_rating', 'rank', 'success']),
+    (MomentumScoreService, ['momentum_score', 'rank', 'percentile', 'return_1w', 'return_12m']),
+    (TechnicalScoreService, ['technical_score', 'rank', 'sma_50', 'pct_above_200sma', 'success']),
+    (TrendTemplateService, ['score', 'rank', 'high_52w', 'pct_from_low', 'success']),
+])
+def test_panel_matches_per_symbol_batch(service_cls, fields, calc_date):
+    data = make_price_data()
+    panel = PricePanel.from_price_data(data)
+    service = service_cls()
+
+    expected = service.calculate_batch(data, calc_date)
+    actual = service.calculate_panel(panel, calc_date)
+
+    assert set(actual) == set(expected)
+    for symbol, exp in expected.items():
+        got = actual[symbol]
+        for name in fields:
+            assert getattr(got, name) == pytest.approx(getattr(exp, name), abs=0.011), (symbol, name)
+
+
+def test_tail_right_aligns_last_observations():
+    data = make_price_data(num_symbols=3, periods=30)
+    panel = PricePanel.from_price_data(data)
+    window, counts = panel.tail(date(2025, 10, 28), 10)
+
+    for j, symbol in enumerate(panel.symbols):
+        closes = data[symbol]['close'].to_numpy()
+        assert counts[j] == len(closes)
+        np.testing.assert_allclose(window[:, j], closes[-10:])
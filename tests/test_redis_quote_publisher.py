@@ -0,0 +1,98 @@
+import fakeredis
+import pytest
+
+from dhan_trading.market_feed.feed_config import FeedConfig
+from dhan_trading.market_feed.redis_publisher import (
+    CHANNEL_QUOTES, STREAM_QUOTES, QuoteData, RedisPublisher, encode_quotes, _STREAM_FIELDS,
+)
+from dhan_trading.market_feed.redis_subscriber import RedisSubscriber
+
+
+def make_quote(security_id, ltp=100.0):
+    return QuoteData(
+        security_id=security_id, exchange_segment=2, ltp=ltp, ltq=75, ltt=1_700_000_000,
+        atp=ltp, volume=1000, total_sell_qty=10, total_buy_qty=20,
+        day_open=ltp, day_close=ltp, day_high=ltp, day_low=ltp, open_interest=500,
+    )
+
+
+def make_publisher(encoding='msgpack'):
+    config = FeedConfig()
+    config.REDIS_ENCODING = encoding
+    config.PUBLISH_FLUSH_MS = 60_000
+    publisher = RedisPublisher(config)
+    publisher._client = fakeredis.FakeRedis()
+    publisher._connected = True
+    return publisher
+
+
+class Collector(RedisSubscriber):
+    def __init__(self):
+        super().__init__(FeedConfig())
+        self.quotes = []
+
+    def on_quote(self, quote):
+        self.quotes.append(quote)
+
+
+def test_payload_roundtrip_msgpack_and_json():
+    quotes = [make_quote(i, 10.5 + i) for i in range(3)]
+
+    decoded = QuoteData.from_payload(encode_quotes(quotes))
+    assert decoded == quotes
+
+    assert QuoteData.from_json(quotes[0].to_json()) == quotes[0]
+    assert QuoteData.from_json(quotes[0].to_json().encode()) == quotes[0]
+    with pytest.raises(ValueError):
+        QuoteData.from_json(encode_quotes(quotes))
+
+
+def test_from_dict_accepts_raw_stream_entry():
+    entry = {b'security_id': b'42', b'exchange_segment': b'2', b'ltp': b'101.5', b'ltq': b'1',
+             b'ltt': b'0', b'atp': b'0', b'volume': b'7', b'total_sell_qty': b'0',
+             b'total_buy_qty': b'0', b'day_open': b'0', b'day_close': b'0',
+             b'day_high': b'0', b'day_low': b'0', b'open_interest': b'0', b'received_at': b'1.5'}
+    quote = QuoteData.from_dict(entry)
+    assert quote.security_id == 42
+    assert quote.ltp == 101.5
+    assert quote.volume == 7
+
+
+@pytest.mark.parametrize('encoding', ['msgpack', 'json'])
+def test_batch_is_published_in_one_flush(encoding):
+    publisher = make_publisher(encoding)
+    pubsub = publisher._client.pubsub()
+    pubsub.subscribe(CHANNEL_QUOTES)
+    pubsub.get_message(timeout=0.1)
+
+    for i in range(5):
+        assert publisher.publish_quote(make_quote(i))
+    assert publisher.get_stats()['pending_quotes'] == 5
+    assert publisher._client.xlen(STREAM_QUOTES) == 0
+
+    assert publisher.flush()
+    assert publisher._client.xlen(STREAM_QUOTES) == 5
+    assert publisher.get_stats()['batches_published'] == 1
+
+    collector = Collector()
+    while True:
+        message = pubsub.get_message(timeout=0.1)
+        if not message:
+            break
+        collector._handle_message(message)
+    assert [q.security_id for q in collector.quotes] == [0, 1, 2, 3, 4]
+
+
+def test_stream_entry_holds_str_of_each_field():
+    publisher = make_publisher()
+    quote = make_quote(7, 101.2345)
+    quote.open_interest = None
+    publisher.publish_quote(quote)
+    publisher.flush()
+
+    (_, entry), = publisher._client.xrange(STREAM_QUOTES)
+    entry = {k.decode(): v.decode() for k, v in entry.items()}
+    expected = {name: str(getattr(quote, name)) for name in _STREAM_FIELDS}
+    expected['open_interest'] = '0'
+    assert list(entry) == list(_STREAM_FIELDS)
+    assert entry == expected
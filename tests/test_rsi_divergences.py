@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from scanners.rsi_divergences import closes_pass, divergence_signals, sma_row_mask
+
+
+def make_fractals(closes, rsis):
+    dates = pd.date_range('2024-06-28', periods=len(closes), freq='-7D')  # newest first
+    return pd.DataFrame({
+        'symbol': 'TEST',
+        'fractal_date': dates,
+        'center_close': closes,
+        'center_rsi': rsis,
+        'fractal_high': [c + 1 if c is not None else None for c in closes],
+        'fractal_low': [c - 1 if c is not None else None for c in closes],
+    })
+
+
+def test_sma_row_mask_matches_per_symbol_check():
+    latest_close = pd.Series({'A': 110.0, 'B': 90.0, 'C': 105.0, 'D': 120.0})
+    ma_rows = pd.DataFrame(
+        {'sma_20': [100.0, 100.0, None], 'sma_50': [105.0, 80.0, 100.0]},
+        index=['A', 'B', 'C'],
+    )
+    cols = ['sma_20', 'sma_50']
+
+    above = sma_row_mask(latest_close, ma_rows, cols, 'gt')
+    below = sma_row_mask(latest_close, ma_rows, cols, 'lt')
+
+    # C has a missing SMA and D has no row at all: both fail either way
+    assert above.to_dict() == {'A': True, 'B': False, 'C': False, 'D': False}
+    assert below.to_dict() == {'A': False, 'B': False, 'C': False, 'D': False}
+
+
+def test_closes_pass_uses_trailing_window_means():
+    closes = np.arange(1.0, 61.0)  # oldest first, sma_20 = 50.5, sma_50 = 35.5
+    assert closes_pass(closes, 51.0, [20, 50], 'gt')
+    assert not closes_pass(closes, 40.0, [20, 50], 'gt')
+    assert closes_pass(closes, 30.0, [20, 50], 'lt')
+    assert not closes_pass(closes[-30:], 51.0, [20, 50], 'gt')  # too short for sma_50
+
+
+def test_divergence_signals_both_kinds():
+    bull = make_fractals([105, 100, 110, 101, None], [40, 45, 35, 50, 60])
+    rows = divergence_signals('TEST', bull, lookback_fractals=4, kind='bullish')
+    assert [r['comp_center_close'] for r in rows] == [100.0, 101.0]
+    assert all(r['signal_type'] == 'Hidden Bullish Divergence' for r in rows)
+    assert rows[0]['buy_above_price'] == 106.0 and 'sell_below_price' not in rows[0]
+
+    bear = make_fractals([95, 100, 90, 99], [60, 55, 65, 50])
+    rows = divergence_signals('TEST', bear, lookback_fractals=2, kind='bearish')
+    assert [r['comp_center_close'] for r in rows] == [100.0]
+    assert rows[0]['sell_below_price'] == 94.0 and rows[0]['buy_above_price'] is None
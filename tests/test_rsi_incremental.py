@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanners.rsi_calculator import _compute_symbol, _update_symbol
+
+FREQS = ['daily', 'weekly', 'monthly']
+
+
+def make_rows(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=n)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return list(zip(dates, closes))
+
+
+def as_map(rows):
+    return {(r['trade_date'], r['period']): r['rsi'] for r in rows}
+
+
+@pytest.mark.parametrize('split', [250, 253, 399])  # Wednesday, Friday-week boundary, last day
+def test_incremental_matches_full_rebuild(split):
+    rows = make_rows()
+    _, full_rows, _ = _compute_symbol('TEST', rows, FREQS, 9)
+    _, base_rows, states = _compute_symbol('TEST', rows[:split], FREQS, 9)
+
+    new = pd.Series([c for _, c in rows[split:]], index=pd.DatetimeIndex([d for d, _ in rows[split:]]))
+    inc_rows, new_states = _update_symbol('TEST', new, states, 9)
+
+    for f in FREQS:
+        merged = as_map(base_rows[f])
+        merged.update(as_map(inc_rows.get(f, [])))
+        expected = as_map(full_rows[f])
+        assert merged.keys() == expected.keys()
+        assert list(merged.values()) == pytest.approx([expected[k] for k in merged], abs=1e-9)
+        assert new_states[f]['source_date'] == rows[-1][0]
+
+
+def test_incremental_writes_only_changed_bars():
+    rows = make_rows()
+    _, _, states = _compute_symbol('TEST', rows[:-1], FREQS, 9)
+
+    last_date, last_close = rows[-1]
+    inc_rows, _ = _update_symbol('TEST', pd.Series([last_close], index=pd.DatetimeIndex([last_date])), states, 9)
+
+    # One new daily bar; the open week and month are rewritten in place
+    assert [r['trade_date'] for r in inc_rows['daily']] == [last_date.date()]
+    assert len(inc_rows['weekly']) == 1
+    assert len(inc_rows['monthly']) == 1
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking.historical import SlidingRankingsEngine
+from ranking.parallel.worker import RankingWorker
+from ranking.services import CompositeScoreService, PricePanel
+
+
+def make_price_frame(num_symbols=15, periods=420):
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range(end='2025-10-28', periods=periods).date
+    frames = []
+    for i in range(num_symbols):
+        start = i * 20
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0004 * (i - 7), 0.012, periods - start)))
+        frames.append(pd.DataFrame({'symbol': f'SYM{i:02d}', 'date': dates[start:], 'close': close}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def worker_snapshot(prices, calc_date):
+    """Rank one date the way RankingWorker._process_job does."""
+    worker = object.__new__(RankingWorker)
+    worker.composite_service = CompositeScoreService()
+
+    window = prices[(prices['date'] >= calc_date - timedelta(days=400)) & (prices['date'] <= calc_date)]
+    pivot = window.pivot_table(index='date', columns='symbol', values='close', aggfunc='last')
+    rows = []
+    for symbol in window.loc[window['date'] == calc_date, 'symbol']:
+        series = pivot[symbol].dropna()
+        ranking = worker._calculate_symbol_ranking(symbol, series, pivot, calc_date)
+        if ranking:
+            rows.append(ranking)
+    return pd.DataFrame(rows).set_index('symbol').sort_index()
+
+
+@pytest.mark.parametrize('offset', [0, 40, 150])
+def test_sliding_snapshot_matches_worker(offset):
+    prices = make_price_frame()
+    engine = SlidingRankingsEngine(PricePanel.from_frame(prices))
+    calc_date = sorted(prices['date'].unique())[-1 - offset]
+
+    result = engine.snapshot(calc_date, min_stocks=5)
+    assert result['success']
+    got = result['rankings'].set_index('symbol').sort_index()
+    expected = worker_snapshot(prices, calc_date)
+
+    assert list(got.index) == list(expected.index)
+    for col in ['rs_rating', 'momentum_score', 'trend_template_score', 'technical_score']:
+        np.testing.assert_allclose(got[col], expected[col], atol=0.11, err_msg=col)
+
+
+def test_iter_snapshots_reports_thin_dates():
+    prices = make_price_frame(num_symbols=3, periods=80)
+    engine = SlidingRankingsEngine(PricePanel.from_frame(prices))
+    dates = sorted(prices['date'].unique())[-3:]
+
+    results = list(engine.iter_snapshots(dates, min_stocks=50))
+    assert [d for d, _ in results] == dates
+    assert all(not r['success'] and 'stocks on date' in r['error'] for _, r in results)
@@ -0,0 +1,66 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from services.trends_service import (
+    _candle_bounds, calculate_trend_rating, compute_trends, determine_candle_trend,
+)
+
+
+def make_ohlc(symbols=("AAA", "BBB"), start="2023-12-20", end="2024-02-10", seed=5):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, end)
+    frames = []
+    for sym in symbols:
+        # Drop a few days per symbol so periods have ragged membership
+        days = dates[rng.random(len(dates)) > 0.1]
+        frames.append(pd.DataFrame({
+            "symbol": sym,
+            "trade_date": days,
+            "open_price": rng.uniform(90, 110, len(days)).round(2),
+            "close_price": rng.uniform(90, 110, len(days)).round(2),
+        }))
+    return pd.concat(frames).sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def reference_trend(ohlc, symbol, d):
+    """Per-row equivalent of analyze_symbol_trend_with_conn's SQL candles."""
+    s = ohlc[ohlc["symbol"] == symbol].sort_values("trade_date")
+    iso_week = lambda x: (x.year, (x - pd.Timedelta(days=x.weekday())).date())
+    week = s[[iso_week(x) == iso_week(d) for x in s["trade_date"]]]
+    month = s[(s["trade_date"].dt.year == d.year) & (s["trade_date"].dt.month == d.month)]
+    day = s[s["trade_date"] == d].iloc[0]
+    trends = (
+        determine_candle_trend(day["open_price"], day["close_price"]),
+        determine_candle_trend(week["open_price"].iloc[0], week["close_price"].iloc[-1]),
+        determine_candle_trend(month["open_price"].iloc[0], month["close_price"].iloc[-1]),
+    )
+    return trends + (calculate_trend_rating(*trends),)
+
+
+def test_compute_trends_matches_per_symbol_candles():
+    ohlc = make_ohlc()
+    trends = compute_trends(ohlc)
+
+    assert len(trends) == len(ohlc)
+    for row in trends.itertuples():
+        expected = reference_trend(ohlc, row.symbol, pd.Timestamp(row.trade_date))
+        assert (row.daily_trend, row.weekly_trend, row.monthly_trend, row.trend_rating) == expected
+
+
+def test_week_spanning_new_year_is_split():
+    ohlc = pd.DataFrame({
+        "symbol": "AAA",
+        "trade_date": pd.to_datetime(["2024-12-30", "2024-12-31", "2025-01-01", "2025-01-02"]),
+        "open_price": [100.0, 101.0, 90.0, 91.0],
+        "close_price": [101.0, 102.0, 89.0, 95.0],
+    })
+    trends = compute_trends(ohlc)
+    assert trends["weekly_open"].tolist() == [100.0, 100.0, 90.0, 90.0]
+    assert trends["weekly_trend"].tolist() == ["UP", "UP", "UP", "UP"]
+
+
+def test_candle_bounds_cover_whole_periods():
+    assert _candle_bounds(date(2024, 3, 1), date(2024, 3, 1)) == (date(2024, 2, 26), date(2024, 3, 31))
+    assert _candle_bounds(date(2025, 1, 1), date(2025, 1, 1)) == (date(2025, 1, 1), date(2025, 1, 31))
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility_patterns.core.vcp_detector import VCPDetector, find_local_extrema
+from volatility_patterns.core.vcp_stream import StreamingVCPDetector
+
+
+def make_prices(n_days=600, seed=0):
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n_days))))
+    return pd.DataFrame({
+        'date': pd.bdate_range('2021-01-04', periods=n_days),
+        'open': close * (1 + rng.normal(0, 0.005, n_days)),
+        'high': close * (1 + rng.uniform(0, 0.03, n_days)),
+        'low': close * (1 - rng.uniform(0, 0.03, n_days)),
+        'close': close,
+        'prev_close': close.shift(1),
+        'volume': rng.integers(100_000, 1_000_000, n_days).astype(float),
+    })
+
+
+def loop_extrema(values, window, find_highs):
+    """The original per-bar _find_swing_points loop."""
+    series = pd.Series(values)
+    found = []
+    for i in range(window, len(series) - window):
+        left = series.iloc[i - window:i]
+        right = series.iloc[i + 1:i + window + 1]
+        if find_highs:
+            hit = series.iloc[i] > left.max() and series.iloc[i] > right.max()
+        else:
+            hit = series.iloc[i] < left.min() and series.iloc[i] < right.min()
+        if hit:
+            found.append(i)
+    return found
+
+
+def pattern_key(pattern):
+    return (
+        pattern.pattern_end,
+        pattern.pattern_start,
+        len(pattern.contractions),
+        pattern.current_stage,
+        round(pattern.quality_score, 9),
+        round(pattern.breakout_level, 9),
+        tuple((c.start_date, c.end_date, round(c.volatility_ratio, 9), round(c.volume_decline, 9))
+              for c in pattern.contractions),
+    )
+
+
+@pytest.mark.parametrize('find_highs', [True, False])
+def test_local_extrema_match_loop(find_highs):
+    rng = np.random.default_rng(7)
+    values = np.round(rng.normal(0, 1, 400).cumsum(), 1)  # Rounded so ties occur
+    values[rng.random(400) < 0.02] = np.nan
+    for window in (1, 3, 5):
+        expected = loop_extrema(values, window, find_highs)
+        assert find_local_extrema(values, window, find_highs).tolist() == expected
+
+
+def test_local_extrema_short_series():
+    assert len(find_local_extrema(np.arange(10.0), window=5)) == 0
+
+
+@pytest.mark.parametrize('seed', [0, 2, 6])
+def test_streaming_matches_detect_vcp_patterns(seed):
+    data = make_prices(seed=seed)
+
+    expected = VCPDetector().detect_vcp_patterns(data, 'TEST')
+    streamed = StreamingVCPDetector().detect_all_patterns(data, 'TEST')
+
+    assert sorted(map(pattern_key, streamed)) == sorted(map(pattern_key, expected))
+    assert streamed
+    assert [p.pattern_end for p in streamed] == sorted(p.pattern_end for p in streamed)
+
+
+def test_streaming_min_quality_filters():
+    data = make_prices(seed=2)
+    detector = StreamingVCPDetector()
+
+    everything = detector.detect_all_patterns(data, 'TEST', min_quality=0)
+    strict = detector.detect_all_patterns(data, 'TEST', min_quality=60)
+
+    assert len(strict) < len(everything)
+    assert [p for p in everything if p.quality_score >= 60] == strict
+
+
+def test_streaming_short_history():
+    assert StreamingVCPDetector().detect_all_patterns(make_prices(n_days=15), 'TEST') == []
@@ -0,0 +1,50 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from scanners.week52_v2 import sweep_counts
+
+
+def make_history(n_days=600, n_symbols=30, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2021-01-04', periods=n_days)
+    rows = []
+    for j in range(n_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        listed = rng.integers(0, n_days // 2)
+        for i in range(listed, n_days):
+            if rng.random() < 0.05:  # missing bars
+                continue
+            rows.append((dates[i].date(), f"S{j}", float(np.round(close[i], 1))))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+def brute_force(rows, lookback_days, as_of):
+    """compute_counts_for_date's definition, evaluated directly."""
+    df = pd.DataFrame(rows, columns=['trade_date', 'symbol', 'close'])
+    window = df[(df.trade_date >= as_of - datetime.timedelta(days=lookback_days)) & (df.trade_date <= as_of)]
+    g = window.groupby('symbol')['close']
+    today = window[window.trade_date == as_of].set_index('symbol')['close']
+    return int((today >= g.max().reindex(today.index)).sum()), int((today <= g.min().reindex(today.index)).sum())
+
+
+def test_sweep_matches_per_date_windows():
+    rows = make_history()
+    results = list(sweep_counts(rows, lookback_days=365))
+
+    assert [r['date'] for r in results] == sorted({r[0] for r in rows})
+    for res in results[::37] + results[-3:]:
+        assert (res['count_high'], res['count_low']) == brute_force(rows, 365, res['date'])
+
+
+def test_sweep_start_only_emits_later_dates():
+    rows = make_history(n_days=200)
+    start = rows[len(rows) // 2][0]
+
+    full = {r['date']: r for r in sweep_counts(rows, lookback_days=30)}
+    partial = list(sweep_counts(rows, lookback_days=30, start=start))
+
+    assert partial[0]['date'] >= start
+    assert all(r == full[r['date']] for r in partial)
@@ -32,6 +32,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from volatility_patterns.data.data_service import DataService
 from volatility_patterns.core.vcp_detector import VCPDetector, VCPPattern
+from volatility_patterns.core.vcp_stream import StreamingVCPDetector
 from volatility_patterns.analysis.vcp_scanner import VCPScanner
 
 
@@ -151,6 +152,8 @@ class VCPBacktester:
         self.data_service = DataService()
         self.scanner = VCPScanner()
         self.detector = VCPDetector()
+        self.stream_detector = StreamingVCPDetector()
+        self._price_cache: Dict[str, Dict[str, np.ndarray]] = {}
         self.logger = logging.getLogger(__name__)
         
     def detect_historical_patterns(
@@ -159,7 +162,7 @@ class VCPBacktester:
         lookback_days: int = 365
     ) -> Dict[str, List[VCPPattern]]:
         """
-        Detect VCP patterns in historical data across multiple time windows
+        Detect VCP patterns in historical data with one streaming pass per symbol
         
         Args:
             symbols: List of stock symbols to analyze
@@ -183,22 +186,12 @@ class VCPBacktester:
                 if len(data) < 100:
                     continue
                 
-                # Use rolling windows to detect patterns at different time points
-                patterns = []
-                window_size = 250  # ~1 year rolling window
-                step_size = 30    # Move window by 1 month
-                
-                for i in range(0, len(data) - window_size, step_size):
-                    window_data = data.iloc[i:i + window_size].copy()
-                    
-                    if len(window_data) >= 200:  # Minimum data for pattern detection
-                        window_patterns = self.detector.detect_vcp_patterns(
-                            window_data, symbol, lookback_days=180
-                        )
-                        
-                        for pattern in window_patterns:
-                            if pattern.quality_score >= self.config.min_quality_score:
-                                patterns.append(pattern)
+                # One streaming pass evaluates the base ending at every bar;
+                # the prices are kept for entry and exit simulation
+                self._price_cache[symbol] = self._price_arrays(data)
+                patterns = self.stream_detector.detect_all_patterns(
+                    data, symbol, min_quality=self.config.min_quality_score
+                )
                 
                 historical_patterns[symbol] = patterns
                 self.logger.info(f"{symbol}: Found {len(patterns)} historical patterns")
@@ -298,16 +291,37 @@ class VCPBacktester:
             (not self.config.require_setup_complete or pattern.is_setup_complete)
         )
     
+    def _price_arrays(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Columnar OHLC arrays keyed for date search"""
+        data = data.sort_values('date')
+        arrays = {
+            column: data[column].to_numpy(dtype=float)
+            for column in ('open', 'high', 'low', 'close')
+        }
+        arrays['date'] = pd.to_datetime(data['date']).to_numpy().astype('datetime64[D]')
+        return arrays
+    
+    def _get_prices(self, symbol: str) -> Optional[Dict[str, np.ndarray]]:
+        """Preloaded prices for a symbol, loading its history once if needed"""
+        if symbol not in self._price_cache:
+            start_date = self.config.start_date - timedelta(days=400)
+            data = self.data_service.get_ohlcv_data(symbol, start_date, self.config.end_date)
+            if len(data) == 0:
+                return None
+            self._price_cache[symbol] = self._price_arrays(data)
+        return self._price_cache[symbol]
+    
     def _get_entry_price(self, symbol: str, entry_date: date) -> Optional[float]:
         """Get the actual entry price for a given date"""
         try:
-            # Get data for entry date
-            end_date = entry_date + timedelta(days=5)  # Look ahead a few days
-            data = self.data_service.get_ohlcv_data(symbol, entry_date, end_date)
+            prices = self._get_prices(symbol)
+            if prices is None:
+                return None
             
-            if len(data) > 0:
-                # Use the open price of the first available trading day
-                return float(data.iloc[0]['open'])
+            # Use the open price of the first trading day within a few days
+            i = np.searchsorted(prices['date'], np.datetime64(entry_date, 'D'))
+            if i < len(prices['date']) and prices['date'][i] <= np.datetime64(entry_date + timedelta(days=5), 'D'):
+                return float(prices['open'][i])
             
         except Exception as e:
             self.logger.error(f"Error getting entry price for {symbol} on {entry_date}: {e}")
@@ -317,66 +331,55 @@ class VCPBacktester:
     def _simulate_trade_exit(self, trade: Trade, symbol: str) -> bool:
         """Simulate trade exit based on exit rules"""
         try:
-            # Get price data from entry date onwards
+            prices = self._get_prices(symbol)
+            if prices is None:
+                return False
+            
+            # Price bars from entry date through the end of the holding period
             end_date = min(
                 trade.entry_date + timedelta(days=self.config.max_hold_days),
                 self.config.end_date
             )
+            first = np.searchsorted(prices['date'], np.datetime64(trade.entry_date, 'D'))
+            stop = np.searchsorted(prices['date'], np.datetime64(end_date, 'D'), side='right')
             
-            data = self.data_service.get_ohlcv_data(
-                symbol, 
-                trade.entry_date, 
-                end_date
-            )
-            
-            if len(data) < 2:
+            if stop - first < 2:
                 return False
             
             # Calculate stop loss and profit target levels
             stop_loss_price = trade.entry_price * (1 - self.config.stop_loss_pct / 100)
             profit_target_price = trade.entry_price * (1 + self.config.profit_target_pct / 100)
             
-            highest_price = trade.entry_price
+            # Day-by-day levels after the entry day: the trailing stop follows
+            # the highest high so far, including the current day's
+            high = prices['high'][first + 1:stop]
+            low = prices['low'][first + 1:stop]
+            highest_price = np.fmax.accumulate(np.fmax(high, trade.entry_price))
+            trailing_stop_price = highest_price * (1 - self.config.trailing_stop_pct / 100)
+            effective_stop = np.fmax(stop_loss_price, trailing_stop_price)
             
-            # Simulate day-by-day price action
-            for i, row in data.iterrows():
-                if i == 0:  # Skip entry day
-                    continue
-                
-                current_date = row['date'].date()
-                high = float(row['high'])
-                low = float(row['low'])
-                close = float(row['close'])
-                
-                # Update highest price for trailing stop
-                if high > highest_price:
-                    highest_price = high
-                
-                # Calculate trailing stop
-                trailing_stop_price = highest_price * (1 - self.config.trailing_stop_pct / 100)
-                effective_stop = max(stop_loss_price, trailing_stop_price)
-                
-                # Check exit conditions
-                if low <= effective_stop:
+            stop_hit = low <= effective_stop
+            target_hit = high >= profit_target_price
+            exits = np.flatnonzero(stop_hit | target_hit)
+            
+            if len(exits) > 0:
+                i = exits[0]
+                trade.exit_date = prices['date'][first + 1 + i].astype(date)
+                if stop_hit[i]:
                     # Hit stop loss
-                    trade.exit_date = current_date
-                    trade.exit_price = effective_stop
+                    trade.exit_price = float(effective_stop[i])
                     trade.exit_reason = "STOP_LOSS"
-                    return True
-                
-                elif high >= profit_target_price:
+                else:
                     # Hit profit target
-                    trade.exit_date = current_date
                     trade.exit_price = profit_target_price
                     trade.exit_reason = "PROFIT_TARGET"
-                    return True
+                return True
             
             # Exit at end of holding period
-            if len(data) > 1:
-                trade.exit_date = data.iloc[-1]['date'].date()
-                trade.exit_price = float(data.iloc[-1]['close'])
-                trade.exit_reason = "TIME_LIMIT"
-                return True
+            trade.exit_date = prices['date'][stop - 1].astype(date)
+            trade.exit_price = float(prices['close'][stop - 1])
+            trade.exit_reason = "TIME_LIMIT"
+            return True
             
         except Exception as e:
             self.logger.error(f"Error simulating exit for {trade.symbol}: {e}")
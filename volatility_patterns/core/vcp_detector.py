@@ -24,9 +24,44 @@ from dataclasses import dataclass
 from datetime import date, timedelta
 import logging
 
+from numpy.lib.stride_tricks import sliding_window_view
+
 from .technical_indicators import TechnicalIndicators
 
 
+def find_local_extrema(values: np.ndarray, window: int = 5, find_highs: bool = True) -> np.ndarray:
+    """
+    Vectorized swing point detection
+    
+    A position is a swing high (low) when its value is strictly above (below)
+    every value in the `window` bars on each side; the first and last
+    `window` bars are never swing points. Missing neighbours are ignored.
+    
+    Args:
+        values: Price series
+        window: Bars compared on each side
+        find_highs: True for swing highs, False for swing lows
+        
+    Returns:
+        Sorted positions of the swing points
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * window + 1:
+        return np.empty(0, dtype=np.intp)
+    
+    windows = sliding_window_view(values, window)
+    center = values[window:n - window]
+    if find_highs:
+        # side[j] = max(values[j:j + window]), ignoring NaN
+        side = np.fmax.reduce(windows, axis=1)
+        hits = (center > side[:n - 2 * window]) & (center > side[window + 1:])
+    else:
+        side = np.fmin.reduce(windows, axis=1)
+        hits = (center < side[:n - 2 * window]) & (center < side[window + 1:])
+    return np.flatnonzero(hits) + window
+
+
 @dataclass
 class VCPContraction:
     """Represents a single contraction within a VCP pattern"""
@@ -166,40 +201,51 @@ class VCPDetector:
         bases = []
         lookback_period = min(252, len(data))  # 1 year or available data
         
-        for i in range(lookback_period, len(data)):
-            # Look for potential base start
-            current_high = data['high'].iloc[i-lookback_period:i].max()
-            current_close = data['close'].iloc[i]
+        for i in np.flatnonzero(self._base_end_mask(data, lookback_period)):
+            base_start_idx = i - lookback_period
+            base_end_idx = i
+            base_high = data['high'].iloc[base_start_idx:base_end_idx+1].max()
+            base_low = data['low'].iloc[base_start_idx:base_end_idx+1].min()
             
-            # Check if we're potentially in a base (not making new highs)
-            if current_close < current_high * 0.98:  # 2% below high
-                base_start_idx = i - lookback_period
-                base_end_idx = i
-                
-                # Verify base characteristics
-                base_data = data.iloc[base_start_idx:base_end_idx+1]
-                base_duration = len(base_data)
-                
-                if base_duration >= 20:  # Minimum 4 weeks
-                    base_high = base_data['high'].max()
-                    base_low = base_data['low'].min()
-                    base_range = (base_high - base_low) / base_low * 100
-                    
-                    # Base should be reasonable range (not too tight or too wide)
-                    if 5 <= base_range <= 50:
-                        bases.append({
-                            'start_idx': base_start_idx,
-                            'end_idx': base_end_idx,
-                            'start_date': data.iloc[base_start_idx]['date'],
-                            'end_date': data.iloc[base_end_idx]['date'],
-                            'duration': base_duration,
-                            'high': base_high,
-                            'low': base_low,
-                            'range_percent': base_range
-                        })
+            bases.append({
+                'start_idx': base_start_idx,
+                'end_idx': base_end_idx,
+                'start_date': data.iloc[base_start_idx]['date'],
+                'end_date': data.iloc[base_end_idx]['date'],
+                'duration': lookback_period + 1,
+                'high': base_high,
+                'low': base_low,
+                'range_percent': (base_high - base_low) / base_low * 100
+            })
         
         return bases
     
+    def _base_end_mask(self, data: pd.DataFrame, lookback_period: int) -> np.ndarray:
+        """
+        Flag the bars that end a base of lookback_period + 1 bars
+        
+        Bar i ends a base when its close is 2% or more below the highest
+        high of the lookback_period bars before it, the base lasts at least
+        4 weeks, and the base's high-low range is between 5% and 50%.
+        """
+        n = len(data)
+        mask = np.zeros(n, dtype=bool)
+        if n <= lookback_period or lookback_period + 1 < 20:  # Minimum 4 weeks
+            return mask
+        
+        high = data['high']
+        prior_high = high.rolling(lookback_period, min_periods=1).max().shift(1)
+        base_high = high.rolling(lookback_period + 1, min_periods=1).max()
+        base_low = data['low'].rolling(lookback_period + 1, min_periods=1).min()
+        base_range = (base_high - base_low) / base_low * 100
+        
+        # Not making new highs (2% below high), with a reasonable range
+        # (not too tight or too wide)
+        mask = ((data['close'] < prior_high * 0.98) &
+                (base_range >= 5) & (base_range <= 50)).to_numpy(copy=True)
+        mask[:lookback_period] = False
+        return mask
+    
     def _analyze_contractions(
         self, 
         data: pd.DataFrame, 
@@ -254,35 +300,16 @@ class VCPDetector:
         find_highs: bool = True
     ) -> List[Dict]:
         """Find swing highs or lows in price data"""
-        swing_points = []
-        
-        for i in range(window, len(data) - window):
-            current_price = data[price_col].iloc[i]
-            
-            if find_highs:
-                # Check if this is a swing high
-                left_max = data[price_col].iloc[i-window:i].max()
-                right_max = data[price_col].iloc[i+1:i+window+1].max()
-                
-                if current_price > left_max and current_price > right_max:
-                    swing_points.append({
-                        'idx': i,
-                        'date': data.iloc[i]['date'],
-                        'price': current_price
-                    })
-            else:
-                # Check if this is a swing low
-                left_min = data[price_col].iloc[i-window:i].min()
-                right_min = data[price_col].iloc[i+1:i+window+1].min()
-                
-                if current_price < left_min and current_price < right_min:
-                    swing_points.append({
-                        'idx': i,
-                        'date': data.iloc[i]['date'],
-                        'price': current_price
-                    })
-        
-        return swing_points
+        positions = find_local_extrema(data[price_col].to_numpy(), window, find_highs)
+        
+        return [
+            {
+                'idx': int(i),
+                'date': data.iloc[i]['date'],
+                'price': data[price_col].iloc[i]
+            }
+            for i in positions
+        ]
     
     def _create_contraction(
         self, 
@@ -0,0 +1,268 @@
+"""
+Streaming VCP Detection
+=======================
+
+Single-pass VCP detection over a symbol's full price history, for
+backtests and historical scans.
+
+VCPDetector.detect_vcp_patterns examines one base per bar, and the bases of
+neighbouring bars overlap almost entirely: running it on stepped windows
+recomputes the same indicators, swing points and contractions over and over.
+StreamingVCPDetector applies the same rules but does each piece of work once
+per symbol:
+
+- indicators are calculated once over the whole history
+- swing highs are found once with vectorized local-extrema detection
+- the contraction between each pair of consecutive swing highs is measured
+  once and shared by every base containing it
+- bases are then evaluated bar by bar with prefix counts, emitting
+  patterns as the detector advances
+
+Author: GitHub Copilot
+Date: November 2025
+"""
+
+import pandas as pd
+import numpy as np
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, replace
+from typing import Iterator, List, Optional
+
+from .vcp_detector import VCPDetector, VCPPattern, VCPContraction, find_local_extrema
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """Mean ignoring NaN (NaN when nothing is left), like pandas Series.mean"""
+    valid = ~np.isnan(values)
+    count = valid.sum()
+    return float(np.nansum(values) / count) if count else np.nan
+
+
+@dataclass
+class _SwingContraction:
+    """Contraction between two consecutive swing highs, measured once"""
+    contraction: Optional[VCPContraction]  # As a non-first contraction with a full ATR lookback
+    start: int  # Position of the swing high
+    current_volatility: float  # Mean ATR over the contraction
+
+
+class StreamingVCPDetector(VCPDetector):
+    """
+    Streaming VCP Detection Engine
+
+    Finds the patterns detect_vcp_patterns would report for the base ending
+    at every bar of a history, in one pass over that history.
+    """
+
+    SWING_WINDOW = 5
+    ATR_LOOKBACK = 20  # Bars of ATR before a contraction it is compared with
+
+    def iter_patterns(
+        self,
+        data: pd.DataFrame,
+        symbol: str,
+        min_quality: float = 60.0
+    ) -> Iterator[VCPPattern]:
+        """
+        Yield VCP patterns in order of their base's end date
+
+        Args:
+            data: OHLCV data with a date column, oldest first
+            symbol: Stock symbol
+            min_quality: Minimum quality score (detect_vcp_patterns uses 60)
+
+        Yields:
+            VCPPattern for each bar whose base forms a valid VCP
+        """
+        data = self._calculate_indicators(data.reset_index(drop=True))
+        lookback_period = min(252, len(data))
+        base_ends = np.flatnonzero(self._base_end_mask(data, lookback_period))
+        if len(base_ends) == 0:
+            return
+
+        prices = {
+            column: data[column].to_numpy(dtype=float)
+            for column in ('high', 'low', 'volume', 'vol_ma_20', 'atr_20')
+        }
+        high, low, atr = prices['high'], prices['low'], prices['atr_20']
+        dates = pd.to_datetime(data['date']).dt.date.tolist()
+        stages = self._stages(data)
+
+        swings = find_local_extrema(high, self.SWING_WINDOW).tolist()
+        measured = [
+            self._measure(prices, dates, swings[k], swings[k + 1])
+            for k in range(len(swings) - 1)
+        ]
+
+        # Valid contractions, in order, with prefix counts of the rules
+        # _is_valid_vcp checks on every contraction after the first
+        valid = [k for k, c in enumerate(measured) if c.contraction.is_valid]
+        valid_starts = [measured[k].start for k in valid]
+        declines = np.concatenate([[0], np.cumsum([measured[k].contraction.volume_decline > 0 for k in valid])])
+        compressions = np.concatenate([[0], np.cumsum([measured[k].contraction.volatility_ratio < 1.0 for k in valid])])
+
+        for end in base_ends:
+            start = end - lookback_period
+
+            # Swing highs inside the base (window bars clear of both edges)
+            first_swing = bisect_left(swings, start + self.SWING_WINDOW)
+            swing_stop = bisect_right(swings, end - self.SWING_WINDOW)
+            lo = bisect_left(valid, first_swing)
+            hi = bisect_left(valid, swing_stop - 1)
+            count = hi - lo
+            if count < self.min_contractions:
+                continue
+
+            # Contractions starting within ATR_LOOKBACK bars of the base start
+            # compare against a truncated ATR window
+            full = min(hi, max(lo + 1, bisect_left(valid_starts, start + self.ATR_LOOKBACK)))
+            decreasing = compressions[hi] - compressions[full]
+            for j in range(lo + 1, full):
+                if self._volatility_ratio(measured[valid[j]], atr, start) < 1.0:
+                    decreasing += 1
+
+            rest = count - 1
+            if decreasing / rest < 0.5 or (declines[hi] - declines[lo + 1]) / rest < 0.4:
+                continue
+
+            contractions = []
+            for j in range(lo, hi):
+                item = measured[valid[j]]
+                contraction = item.contraction
+                if j < full:
+                    contraction = replace(contraction, volatility_ratio=self._volatility_ratio(item, atr, start))
+                if j == lo:
+                    contraction = replace(contraction, volume_decline=0.0)
+                contractions.append(contraction)
+
+            pattern = self._build_pattern(
+                symbol, contractions, dates[start], dates[end], lookback_period + 1,
+                high[start:end + 1].max(), low[start:end + 1].min(), int(stages[end])
+            )
+            if pattern.quality_score >= min_quality:
+                yield pattern
+
+    def detect_all_patterns(
+        self,
+        data: pd.DataFrame,
+        symbol: str,
+        min_quality: float = 60.0
+    ) -> List[VCPPattern]:
+        """All patterns in a history, in order of their base's end date"""
+        return list(self.iter_patterns(data, symbol, min_quality))
+
+    def _measure(self, prices: dict, dates: list, start: int, next_high: int) -> _SwingContraction:
+        """
+        Measure the contraction from a swing high to the lowest low before
+        the next swing high (the metrics of _create_contraction)
+        """
+        end = start + int(np.nanargmin(prices['low'][start:next_high + 1]))
+
+        high_price = np.nanmax(prices['high'][start:end + 1])
+        low_price = np.nanmin(prices['low'][start:end + 1])
+        range_percent = (high_price - low_price) / low_price * 100
+        duration_days = end - start + 1
+        volume_avg = _nanmean(prices['volume'][start:end + 1])
+
+        volume_decline = 0.0
+        prev_period_volume = prices['vol_ma_20'][start]
+        if prev_period_volume > 0:
+            volume_decline = (prev_period_volume - volume_avg) / prev_period_volume
+
+        item = _SwingContraction(
+            contraction=None,
+            start=start,
+            current_volatility=_nanmean(prices['atr_20'][start:end + 1])
+        )
+        item.contraction = VCPContraction(
+            start_date=dates[start],
+            end_date=dates[end],
+            duration_days=duration_days,
+            high_price=high_price,
+            low_price=low_price,
+            range_percent=range_percent,
+            volume_avg=volume_avg,
+            volume_decline=volume_decline,
+            volatility_ratio=self._volatility_ratio(item, prices['atr_20'], 0),
+            is_valid=(
+                duration_days >= 3 and  # Minimum 3 days
+                range_percent >= 2 and  # Minimum 2% range
+                range_percent <= 25  # Maximum 25% range
+            )
+        )
+        return item
+
+    def _volatility_ratio(self, item: _SwingContraction, atr: np.ndarray, base_start: int) -> float:
+        """Contraction ATR vs the ATR before it, not looking back past the base start"""
+        prev_volatility = _nanmean(atr[max(base_start, item.start - self.ATR_LOOKBACK):item.start])
+        if prev_volatility > 0:
+            return item.current_volatility / prev_volatility
+        return 1.0
+
+    def _stages(self, data: pd.DataFrame) -> np.ndarray:
+        """Weinstein stage at every bar (vectorized _determine_stage)"""
+        close = data['close'].to_numpy(dtype=float)
+        sma_150 = data['sma_150'].to_numpy(dtype=float)
+        sma_200 = data['sma_200'].to_numpy(dtype=float)
+        sma_150_prev = data['sma_150'].shift(20).to_numpy(dtype=float)
+        sma_200_prev = data['sma_200'].shift(20).to_numpy(dtype=float)
+
+        stages = np.select(
+            [
+                (close > sma_150) & (sma_150 > sma_200) & (sma_150 > sma_150_prev) & (sma_200 > sma_200_prev),
+                (close < sma_150) & (sma_150 < sma_150_prev),
+                close > sma_150,
+            ],
+            [2, 4, 3],
+            default=1
+        )
+        stages[np.isnan(sma_150) | np.isnan(sma_200)] = 1
+        stages[:200] = 1  # Insufficient data
+        return stages
+
+    def _build_pattern(
+        self,
+        symbol: str,
+        contractions: List[VCPContraction],
+        start_date,
+        end_date,
+        duration: int,
+        base_high: float,
+        base_low: float,
+        current_stage: int
+    ) -> VCPPattern:
+        """VCPPattern from a base's contractions (same metrics as _create_vcp_pattern)"""
+        first_contraction = contractions[0]
+        last_contraction = contractions[-1]
+
+        total_decline = (base_high - base_low) / base_high * 100
+        volatility_compression = (first_contraction.range_percent / last_contraction.range_percent
+                                  if last_contraction.range_percent > 0 else 1.0)
+        volume_compression = first_contraction.volume_avg / last_contraction.volume_avg
+        relative_strength = 75.0  # Placeholder, as in _create_vcp_pattern
+
+        quality_score = self._calculate_quality_score(
+            contractions, volatility_compression, volume_compression,
+            total_decline, current_stage, relative_strength
+        )
+
+        return VCPPattern(
+            symbol=symbol,
+            pattern_start=start_date,
+            pattern_end=end_date,
+            base_duration=duration,
+            contractions=contractions,
+            total_decline=total_decline,
+            volatility_compression=volatility_compression,
+            volume_compression=volume_compression,
+            current_stage=current_stage,
+            relative_strength=relative_strength,
+            quality_score=quality_score,
+            is_setup_complete=(
+                len(contractions) >= self.min_contractions and
+                volatility_compression >= self.min_volatility_compression and
+                current_stage == 2
+            ),
+            breakout_level=base_high * 1.02,
+            stop_loss_level=base_low * 0.92
+        )